@@ -0,0 +1,147 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Benchmarks of the framework engines.
+
+Each ``bench_*`` module provides a ``run()`` function returning a list of results
+(dictionaries) and can be launched on its own, e.g.::
+
+    python -m fuddly.benchmarks.bench_csp
+
+All of them can also be launched at once, and their results compared with the ones of a
+previous run (refer to ``python -m fuddly.benchmarks -h``).
+"""
+
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+
+def measure(func, max_iterations, max_duration=None):
+    """
+    Call `func` until it returns `False`, or `max_iterations` calls or `max_duration`
+    seconds are reached.
+
+    Returns:
+        tuple: number of successful iterations and elapsed time (in seconds)
+    """
+    count = 0
+    start = time.perf_counter()
+    while count < max_iterations:
+        if func() is False:
+            break
+        count += 1
+        if max_duration is not None and time.perf_counter() - start > max_duration:
+            break
+    return count, time.perf_counter() - start
+
+
+def make_result(bench, case, count, elapsed, unit, **extra):
+    """
+    Build the result of a benchmark case. The `extra` parameters identify the case
+    along with `bench` and `case` (e.g., the backend or the size of the inputs). Measured
+    values that do not identify the case should be added to the result afterwards.
+    """
+    result = {
+        'bench': bench,
+        'case': case,
+        'key': ':'.join([bench, case] + ['{!s}={!s}'.format(k, v) for k, v in sorted(extra.items())]),
+        'count': count,
+        'elapsed': round(elapsed, 6),
+        'rate': round(count / elapsed, 3) if elapsed > 0 else None,
+        'unit': unit,
+    }
+    result.update(extra)
+    return result
+
+
+@contextlib.contextmanager
+def stdout_to_stderr():
+    """
+    Redirect the standard output to the standard error (at the file descriptor level, as
+    the framework does not always write through ``sys.stdout``), so that the results
+    are the only thing printed on the standard output.
+    """
+    sys.stdout.flush()
+    saved_fd = os.dup(1)
+    os.dup2(2, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
+
+
+@contextlib.contextmanager
+def tuto_framework(fmk=None):
+    """
+    Provide `fmk` if it is not `None`, or else a framework running the ``tuto`` project
+    with the ``mydf`` data model. In the latter case, the framework relies on a temporary
+    fmkDB and is stopped afterwards.
+    """
+    if fmk is not None:
+        yield fmk
+        return
+
+    from fuddly.framework.plumbing import FmkPlumbing
+
+    with tempfile.TemporaryDirectory() as folder:
+        fmk = FmkPlumbing(quiet=True, fmkdb_path=os.path.join(folder, 'fmkDB.db'))
+        fmk.start()
+        try:
+            if not fmk.run_project(name='tuto', dm_name=['mydf']):
+                raise RuntimeError("the 'tuto' project cannot be launched")
+            yield fmk
+        finally:
+            fmk.stop()
+
+
+def find_targets(fmk, tg_class):
+    """
+    Returns:
+        list: IDs of the targets of the current project that are instances of `tg_class`
+        and are not monitored by any probe
+    """
+    return [tg_id for tg_id, tg in enumerate(fmk.get_available_targets())
+            if isinstance(tg, tg_class) and not tg.extensions]
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Compare the rates of `results` with the ones of `baseline` (results of a previous run).
+
+    Returns:
+        list: tuples ``(key, baseline_rate, rate)`` of the cases whose rate dropped by
+        more than `tolerance` (a ratio)
+    """
+    previous = {r['key']: r['rate'] for r in baseline if r.get('rate')}
+    regressions = []
+    for r in results:
+        old_rate = previous.get(r['key'])
+        if old_rate and (r['rate'] or 0) < old_rate * (1 - tolerance):
+            regressions.append((r['key'], old_rate, r['rate']))
+    return regressions
@@ -0,0 +1,148 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+Run the benchmarks of the framework engines and emit their results as a JSON document,
+which can be compared with the one of a previous run (e.g., of a previous commit)::
+
+    python -m fuddly.benchmarks -o before.json
+    python -m fuddly.benchmarks --baseline before.json --tolerance 0.2
+
+The exit status is 2 if some rates dropped by more than the tolerance.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+from fuddly.benchmarks import compare, stdout_to_stderr, tuto_framework
+
+# the framework modules may print warnings (e.g., about optional modules) when imported
+with stdout_to_stderr():
+    from fuddly.benchmarks import (bench_csp, bench_encoders, bench_fmkdb, bench_models,
+                                   bench_primitives, bench_sending, bench_walkers)
+    import fuddly.framework.global_resources as gr
+
+benches = {
+    'primitives': bench_primitives,
+    'encoders': bench_encoders,
+    'models': bench_models,
+    'walkers': bench_walkers,
+    'csp': bench_csp,
+    'fmkdb': bench_fmkdb,
+    'sending': bench_sending,
+}
+
+# benchmarks relying on a framework running the tuto project
+fmk_benches = ['models', 'walkers', 'csp', 'sending']
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+def run(names, max_duration=None):
+    """
+    Args:
+        names (list): names of the benchmarks to run (keys of :data:`benches`)
+        max_duration (float): if not `None`, supersede the maximum duration of each case
+          of every benchmark
+
+    Returns:
+        dict: the results of the benchmarks along with information on the environment
+    """
+    kwargs = {} if max_duration is None else {'max_duration': max_duration}
+    results = []
+    for name in [n for n in names if n not in fmk_benches]:
+        results += benches[name].run(**kwargs)
+
+    if set(names) & set(fmk_benches):
+        with tuto_framework() as fmk:
+            for name in [n for n in names if n in fmk_benches]:
+                results += benches[name].run(fmk=fmk, **kwargs)
+
+    return {
+        'fuddly_version': gr.fuddly_version,
+        'commit': _git_commit(),
+        'python': sys.version,
+        'platform': platform.platform(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m fuddly.benchmarks',
+                                     description='Benchmarks of the framework engines')
+    parser.add_argument('names', nargs='*', default=[], metavar='BENCH',
+                        help='Benchmarks to run among: {:s} (default is all)'.format(', '.join(benches)))
+    parser.add_argument('--max-duration', type=float, default=None,
+                        help='Maximum duration (in seconds) of each case, for every benchmark')
+    parser.add_argument('-o', '--output', metavar='PATH', default=None,
+                        help='Write the results to this file instead of the standard output')
+    parser.add_argument('--baseline', metavar='PATH', default=None,
+                        help='Results of a previous run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Drop of rate (ratio) below which a case is not considered '
+                             'as a regression. Default is 0.1')
+    args = parser.parse_args(argv)
+    unknown = [n for n in args.names if n not in benches]
+    if unknown:
+        parser.error('unknown benchmarks: {:s}'.format(', '.join(unknown)))
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    with stdout_to_stderr():
+        report = run(args.names or list(benches), max_duration=args.max_duration)
+
+    output = json.dumps(report, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+    if baseline is not None:
+        regressions = compare(report['results'], baseline['results'], tolerance=args.tolerance)
+        for key, old_rate, rate in regressions:
+            print('*** regression: {:s} ({!s} -> {!s})'.format(key, old_rate, rate), file=sys.stderr)
+        if regressions:
+            return 2
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Benchmark of the CSP backends (python-constraint, native solver and z3) on the CSP
+models of the tutorial data model, and on a wide-domain variant of the ``x = 3y + z``
+equation.
+"""
+
+import argparse
+import copy
+import json
+
+from fuddly.benchmarks import measure, make_result, stdout_to_stderr, tuto_framework
+from fuddly.framework.constraint_helpers import CSP, CSPBackend, Constraint, Z3Constraint
+from fuddly.libs.external_modules import csp_module, z3_module
+
+tuto_csp_atoms = ['csp', 'csp_ns', 'csp_str', 'csp_z3', 'csp_basic', 'csp_default']
+
+
+def _available_backends(csp):
+    if csp.z3_problem:
+        return [CSPBackend.Z3] if z3_module else []
+    backends = [CSPBackend.Native]
+    if csp_module:
+        backends.insert(0, CSPBackend.PythonConstraint)
+    return backends
+
+def _walk_solutions(csp, max_solutions, max_duration):
+    def next_solution():
+        csp.next_solution()
+        return not csp.exhausted_solutions
+
+    csp.reset()
+    return measure(next_solution, max_solutions, max_duration=max_duration)
+
+def _bench_csp(case, csp, max_solutions, max_duration):
+    results = []
+    for backend in _available_backends(csp):
+        csp_copy = copy.copy(csp)
+        if not csp_copy.z3_problem:
+            csp_copy.backend = backend
+        count, elapsed = _walk_solutions(csp_copy, max_solutions, max_duration)
+        results.append(make_result('csp', case, count, elapsed, 'solutions/s',
+                                   backend=backend.name))
+    return results
+
+def _wide_equation_csps():
+    domains = {'x_val': (0, 2**16 - 1), 'y_val': (0, 2**14 - 1), 'z_val': (0, 3)}
+    csps = [CSP(constraints=[Constraint(relation=lambda x, y, z: x == 3*y + z,
+                                        vars=('x_val', 'y_val', 'z_val'))])]
+    if z3_module:
+        csps.append(CSP(constraints=[Z3Constraint(relation='x_val == 3*y_val + z_val',
+                                                  vars=('x_val', 'y_val', 'z_val'))]))
+    for csp in csps:
+        for var, (mini, maxi) in domains.items():
+            csp.set_var_domain(var, None, min=mini, max=maxi)
+        csp.freeze()
+    return csps
+
+def run(max_solutions=200, max_duration=10, fmk=None):
+    """
+    Args:
+        max_solutions (int): maximum number of solutions to walk for each case
+        max_duration (float): maximum duration (in seconds) for each case
+        fmk (FmkPlumbing): framework with the ``tuto`` project loaded. If `None`, a
+          framework is started (and stopped) for the benchmark.
+    """
+    results = []
+    for csp in _wide_equation_csps():
+        results += _bench_csp('wide_equation', csp, max_solutions, max_duration)
+
+    with tuto_framework(fmk) as fmk:
+        for atom_name in tuto_csp_atoms:
+            csp = fmk.dm.get_atom(atom_name).get_csp()
+            results += _bench_csp(atom_name, csp, max_solutions, max_duration)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of the CSP backends')
+    parser.add_argument('--max-solutions', type=int, default=200,
+                        help='Maximum number of solutions to walk for each case')
+    parser.add_argument('--max-duration', type=float, default=10,
+                        help='Maximum duration (in seconds) for each case')
+    args = parser.parse_args(argv)
+
+    with stdout_to_stderr():
+        results = run(max_solutions=args.max_solutions, max_duration=args.max_duration)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+Microbenchmark of the table-driven and batch codecs of :mod:`fuddly.framework.encoders`,
+compared to their former byte-by-byte implementations (kept here as references).
+"""
+
+import argparse
+import binascii
+import json
+import random
+
+from fuddly.benchmarks import measure, make_result
+from fuddly.framework import encoders
+
+
+class LegacyGSM7bitPacking(object):
+
+    def encode(self, msg):
+        msg_sz = len(msg)
+        l = []
+        idx = 0
+        off_cpt = 0
+        while idx < msg_sz:
+            off = off_cpt % 7
+            c_idx = idx
+            if off == 0 and off_cpt > 0:
+                c_idx = idx + 1
+            if c_idx+1 < msg_sz:
+                l.append((msg[c_idx]>>off)+((msg[c_idx+1]<<(7-off))&0x00FF))
+            elif c_idx < msg_sz:
+                l.append(msg[c_idx]>>off)
+            idx = c_idx + 1
+            off_cpt += 1
+        return bytes(l)
+
+    def decode(self, msg):
+        msg_sz = len(msg)
+        l = []
+        c_idx = 0
+        off_cpt = 0
+        lsb = 0
+        while c_idx < msg_sz:
+            off = off_cpt % 7
+            if off == 0 and off_cpt > 0:
+                l.append(lsb)
+                lsb = 0
+            l.append(((msg[c_idx]<<off)&0x007F)+lsb)
+            lsb = msg[c_idx]>>(7-off)
+            c_idx += 1
+            off_cpt += 1
+        return bytes(l)
+
+
+class LegacyGSMPhoneNum(object):
+
+    def encode(self, msg):
+        tel_num = b''
+        for idx in range(0, len(msg), 2):
+            if idx+1 < len(msg):
+                tel_num += msg[idx+1:idx+2]+msg[idx:idx+1]
+            else:
+                tel_num += b'F'+msg[idx:idx+1]
+        return binascii.a2b_hex(tel_num)
+
+    def decode(self, msg):
+        tel_num = binascii.b2a_hex(msg)
+        zone = tel_num[0:2]
+        tel_num = tel_num[2:]
+        dec = b''
+        for idx in range(0, len(tel_num), 2):
+            if idx+1 < len(tel_num):
+                dec += tel_num[idx+1:idx+2]+tel_num[idx:idx+1]
+        if dec[-1:] == b'f':
+            dec = dec[:-1]
+        return zone+dec
+
+
+class LegacyBitReverse(object):
+
+    def encode(self, val):
+        return b''.join(bytes([sum(1<<(7-i) for i in range(8) if b>>i&1)]) for b in val[::-1])
+
+    decode = encode
+
+
+def random_input(codec, size, rng=random):
+    """Valid random input for `codec` ('gsm7', 'phone_num' or 'bit_reverse')"""
+    if codec == 'gsm7':
+        return bytes(rng.choices(range(0x20, 0x7F), k=size))
+    elif codec == 'phone_num':
+        return bytes(rng.choices(b'0123456789', k=size))
+    else:
+        return bytes(rng.getrandbits(8) for _ in range(size))
+
+
+CODECS = {
+    'gsm7': (encoders.GSM7bitPacking_Enc, LegacyGSM7bitPacking),
+    'phone_num': (encoders.GSMPhoneNum_Enc, LegacyGSMPhoneNum),
+    'bit_reverse': (encoders.BitReverse_Enc, LegacyBitReverse),
+}
+
+
+def run(sizes=(16, 1024, 65536), batch=64, max_iterations=1000, max_duration=2):
+    """
+    Args:
+        sizes (tuple): sizes (in bytes) of the values to encode
+        batch (int): number of values encoded at once through ``encode_many()``
+        max_iterations (int): maximum number of calls for each case
+        max_duration (float): maximum duration (in seconds) for each case
+    """
+    results = []
+    for codec, (enc_cls, legacy_cls) in CODECS.items():
+        enc, legacy = enc_cls(), legacy_cls()
+        for size in sizes:
+            val = random_input(codec, size)
+            encoded = enc.encode(val)
+            if encoded != legacy.encode(val) or enc.decode(encoded) != legacy.decode(encoded):
+                raise AssertionError(f'{codec}: mismatch with the legacy implementation')
+            vals = [random_input(codec, size) for _ in range(batch)]
+
+            for impl, func in (('legacy', lambda: legacy.encode(val)),
+                               ('table', lambda: enc.encode(val)),
+                               ('stream', lambda: b''.join(enc.encode_stream(val))),
+                               ('batch', lambda: enc.encode_many(vals))):
+                count, elapsed = measure(func, max_iterations, max_duration=max_duration)
+                nb = count * batch if impl == 'batch' else count
+                results.append(make_result('encoders', f'{codec}_encode', nb, elapsed, 'values/s',
+                                           impl=impl, size=size))
+
+            for impl, func in (('legacy', lambda: legacy.decode(encoded)),
+                               ('table', lambda: enc.decode(encoded))):
+                count, elapsed = measure(func, max_iterations, max_duration=max_duration)
+                results.append(make_result('encoders', f'{codec}_decode', count, elapsed, 'values/s',
+                                           impl=impl, size=size))
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Microbenchmark of the framework encoders')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 1024, 65536],
+                        help='Sizes (in bytes) of the values to encode')
+    parser.add_argument('--batch', type=int, default=64,
+                        help='Number of values encoded at once in batch mode')
+    parser.add_argument('--max-iterations', type=int, default=1000,
+                        help='Maximum number of calls for each case')
+    parser.add_argument('--max-duration', type=float, default=2,
+                        help='Maximum duration (in seconds) for each case')
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes, batch=args.batch,
+                  max_iterations=args.max_iterations, max_duration=args.max_duration)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
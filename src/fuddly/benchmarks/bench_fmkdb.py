@@ -0,0 +1,115 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+Benchmark of the fmkDB: number of records per second inserted in a temporary
+database, for the data alone and for the data along with what is usually logged with
+them (generation/disruption steps, feedback and framework information).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import time
+
+from fuddly.benchmarks import measure, make_result, stdout_to_stderr
+from fuddly.framework.database import Database
+
+
+def _insert_data(fmkdb, content):
+    now = datetime.datetime.now()
+    return fmkdb.insert_data('BENCH', Database.DEFAULT_DM_NAME, content, len(content),
+                             now, now, 'EmptyTarget', 'bench')
+
+def _insert_data_and_logs(fmkdb, content):
+    now = datetime.datetime.now()
+    data_id = _insert_data(fmkdb, content)
+    fmkdb.insert_steps(data_id, 1, 'BENCH', 'g_bench', None, None, None)
+    fmkdb.insert_steps(data_id, 2, 'tTYPE', 'sd_fuzz_typed_nodes', None, 'deep=True',
+                       b'current fuzzed node: bench')
+    fmkdb.insert_feedback(data_id, 'bench_probe', now, b'OK', status_code=0)
+    fmkdb.insert_fmk_info(data_id, 'Data sent', now)
+    return data_id
+
+cases = [
+    ('data', _insert_data),
+    ('data_with_logs', _insert_data_and_logs),
+]
+
+def run(sizes=(64, 4096, 65536), max_inserts=5000, max_duration=5):
+    """
+    Args:
+        sizes (tuple): sizes (in bytes) of the inserted data
+        max_inserts (int): maximum number of data inserted for each case
+        max_duration (float): maximum duration (in seconds) for each case
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        fmkdb = Database(fmkdb_path=os.path.join(folder, 'fmkDB.db'))
+        if not fmkdb.start():
+            raise RuntimeError('the fmkDB cannot be started')
+        try:
+            fmkdb.insert_data_model(Database.DEFAULT_DM_NAME)
+            fmkdb.insert_project('bench')
+            fmkdb.insert_dmaker(Database.DEFAULT_DM_NAME, 'BENCH', 'g_bench', True, True)
+            fmkdb.insert_dmaker(Database.DEFAULT_DM_NAME, 'tTYPE', 'sd_fuzz_typed_nodes', False, True)
+            for size in sizes:
+                content = os.urandom(size)
+                for case, insert in cases:
+                    start = time.perf_counter()
+                    count, submission = measure(lambda: insert(fmkdb, content), max_inserts,
+                                                max_duration=max_duration)
+                    # statements are handled in order, thus this one returns once the
+                    # previous insertions have been committed
+                    fmkdb.execute_sql_statement('SELECT COUNT(*) FROM DATA;')
+                    elapsed = time.perf_counter() - start
+                    result = make_result('fmkdb', case, count, elapsed, 'inserts/s', size=size)
+                    result['submission_rate'] = round(count / submission, 3) if submission > 0 else None
+                    results.append(result)
+        finally:
+            fmkdb.stop()
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of the fmkDB insertions')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 4096, 65536],
+                        help='Sizes (in bytes) of the inserted data')
+    parser.add_argument('--max-inserts', type=int, default=5000,
+                        help='Maximum number of data inserted for each case')
+    parser.add_argument('--max-duration', type=float, default=5,
+                        help='Maximum duration (in seconds) for each case')
+    args = parser.parse_args(argv)
+
+    with stdout_to_stderr():
+        results = run(sizes=args.sizes, max_inserts=args.max_inserts,
+                      max_duration=args.max_duration)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+Benchmark of the bundled data models: build time of their atoms (from their descriptions
+and from the on-disk cache), ``freeze``/``to_bytes`` throughput of each atom, and
+absorption throughput on the sample files they ship with.
+"""
+
+import argparse
+import importlib.resources
+import json
+import os
+import tempfile
+
+from fuddly.benchmarks import measure, make_result, stdout_to_stderr, tuto_framework
+from fuddly.framework.data_model import DataModelCache
+
+
+def _fresh_instance(dm, dm_db):
+    new_dm = type(dm)()
+    new_dm.name = dm.name
+    new_dm.module_name = dm.module_name
+    new_dm._dm_db = dm_db
+    new_dm.pre_build()
+    return new_dm
+
+def _bench_build(dm, dm_db, max_iterations, max_duration):
+    built = []
+    def build():
+        new_dm = _fresh_instance(dm, dm_db)
+        new_dm.build_data_model()
+        built.append(new_dm)
+        del built[:-1]
+
+    count, elapsed = measure(build, max_iterations, max_duration=max_duration)
+    result = make_result('models', 'build', count, elapsed, 'builds/s', dm=dm.name)
+    result['atoms'] = len(list(built[-1].atom_identifiers())) if built else 0
+    results = [result]
+
+    with tempfile.TemporaryDirectory() as folder:
+        cache = DataModelCache(folder=folder)
+        cache.store(built[-1])
+        if cache.load(_fresh_instance(dm, dm_db)):
+            count, elapsed = measure(lambda: cache.load(_fresh_instance(dm, dm_db)),
+                                     max_iterations, max_duration=max_duration)
+            results.append(make_result('models', 'cache_load', count, elapsed, 'loads/s',
+                                       dm=dm.name))
+
+    return results
+
+def _bench_freeze(dm, max_iterations, max_duration):
+    results = []
+    for atom_id in dm.atom_identifiers():
+        atom = dm.get_atom(atom_id)
+        produced = [0]
+        def freeze():
+            atom.unfreeze(recursive=True)
+            atom.freeze()
+            produced[0] += len(atom.to_bytes())
+
+        try:
+            atom.freeze()
+            count, elapsed = measure(freeze, max_iterations, max_duration=max_duration)
+        except Exception as e:
+            result = make_result('models', 'freeze', 0, 0, 'freezes/s', dm=dm.name, atom=atom_id)
+            result['error'] = repr(e)
+        else:
+            result = make_result('models', 'freeze', count, elapsed, 'freezes/s',
+                                 dm=dm.name, atom=atom_id)
+            result['mb_per_s'] = round(produced[0] / elapsed / 1e6, 3) if elapsed > 0 else None
+        results.append(result)
+    return results
+
+def _samples(dm):
+    try:
+        folder = importlib.resources.files(dm.module_name).joinpath('samples')
+        filenames = sorted(next(os.walk(folder))[2])
+    except (ModuleNotFoundError, TypeError, StopIteration):
+        return []
+    suffix = '.' + dm.file_extension if dm.file_extension else ''
+    return [os.path.join(folder, f) for f in filenames if f.endswith(suffix)]
+
+def _bench_absorption(dm, max_iterations, max_duration):
+    results = []
+    for path in _samples(dm):
+        with open(path, 'rb') as f:
+            data = f.read()
+        absorbed = dm.absorb(data)[0] is not None
+        count, elapsed = measure(lambda: dm.absorb(data)[0] is not None,
+                                 max_iterations if absorbed else 0, max_duration=max_duration)
+        result = make_result('models', 'absorption', count, elapsed, 'absorptions/s',
+                             dm=dm.name, sample=os.path.basename(path))
+        result['absorbed'] = absorbed
+        result['mb_per_s'] = round(count * len(data) / elapsed / 1e6, 3) if elapsed > 0 else None
+        results.append(result)
+    return results
+
+def run(data_models=None, max_iterations=100, max_duration=2, fmk=None):
+    """
+    Args:
+        data_models (list): names of the data models to benchmark. If `None`, all the
+          data models known by the framework are considered.
+        max_iterations (int): maximum number of iterations for each case
+        max_duration (float): maximum duration (in seconds) for each case
+        fmk (FmkPlumbing): framework used to retrieve the data models. If `None`, a
+          framework is started (and stopped) for the benchmark.
+    """
+    results = []
+    with tuto_framework(fmk) as fmk:
+        dm_db = {dm.name: dm for dm in fmk.iter_data_models()}
+        for name in sorted(dm_db) if data_models is None else data_models:
+            dm = dm_db[name]
+            dm.load_data_model(dm_db)
+            results += _bench_freeze(dm, max_iterations, max_duration)
+            results += _bench_absorption(dm, max_iterations, max_duration)
+            # last, as building again some data models alters the atoms previously built
+            results += _bench_build(dm, dm_db, max_iterations, max_duration)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of the bundled data models')
+    parser.add_argument('--data-models', nargs='+', default=None,
+                        help='Names of the data models to benchmark (default is all)')
+    parser.add_argument('--max-iterations', type=int, default=100,
+                        help='Maximum number of iterations for each case')
+    parser.add_argument('--max-duration', type=float, default=2,
+                        help='Maximum duration (in seconds) for each case')
+    args = parser.parse_args(argv)
+
+    with stdout_to_stderr():
+        results = run(data_models=args.data_models, max_iterations=args.max_iterations,
+                      max_duration=args.max_duration)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Microbenchmark of the mutation primitives of :mod:`fuddly.framework.basic_primitives`,
+with their NumPy and pure-Python implementations.
+"""
+
+import argparse
+import json
+import math
+
+from fuddly.benchmarks import measure, make_result
+from fuddly.framework import basic_primitives as bp
+from fuddly.libs.external_modules import numpy_module
+
+
+def _cases(size, mutants):
+    data = bytes(range(256)) * (size // 256 + 1)
+    data = data[:size]
+    buf = bytearray(data)
+    return [
+        ('rand_string', lambda: bp.rand_string(size=size)),
+        ('corrupt_bytes', lambda: bp.corrupt_bytes(data, p=0.05)),
+        ('corrupt_bytes_ctrl_char', lambda: bp.corrupt_bytes(data, p=0.05, ctrl_char=True)),
+        ('corrupt_bytes_inplace', lambda: bp.corrupt_bytes_inplace(buf, p=0.05)),
+        ('corrupt_bits', lambda: bp.corrupt_bits(data, p=0.01)),
+        ('corrupt_bits_ascii', lambda: bp.corrupt_bits(data, p=0.01, ascii=True)),
+        ('corrupt_bits_inplace', lambda: bp.corrupt_bits_inplace(buf, p=0.01)),
+        ('corrupt_bytes_mutants', lambda: bp.corrupt_bytes_mutants(data, mutants, p=0.05)),
+        ('corrupt_bits_mutants', lambda: bp.corrupt_bits_mutants(data, mutants, p=0.01)),
+    ]
+
+def run(sizes=(64, 4096, 65536), mutants=32, max_iterations=1000, max_duration=2):
+    """
+    Args:
+        sizes (tuple): sizes (in bytes) of the inputs to mutate
+        mutants (int): number of mutants generated by the ``*_mutants`` primitives
+        max_iterations (int): maximum number of calls for each case
+        max_duration (float): maximum duration (in seconds) for each case
+    """
+    backends = ['numpy', 'python'] if numpy_module else ['python']
+    saved_threshold, saved_str_threshold = bp.NUMPY_THRESHOLD, bp.NUMPY_STR_THRESHOLD
+    results = []
+    try:
+        for backend in backends:
+            bp.NUMPY_THRESHOLD = saved_threshold if backend == 'numpy' else math.inf
+            bp.NUMPY_STR_THRESHOLD = saved_str_threshold if backend == 'numpy' else math.inf
+            for size in sizes:
+                for case, func in _cases(size, mutants):
+                    count, elapsed = measure(func, max_iterations, max_duration=max_duration)
+                    results.append(make_result('primitives', case, count, elapsed, 'calls/s',
+                                               backend=backend, size=size))
+    finally:
+        bp.NUMPY_THRESHOLD, bp.NUMPY_STR_THRESHOLD = saved_threshold, saved_str_threshold
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Microbenchmark of the mutation primitives')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 4096, 65536],
+                        help='Sizes (in bytes) of the inputs to mutate')
+    parser.add_argument('--mutants', type=int, default=32,
+                        help='Number of mutants generated by the *_mutants primitives')
+    parser.add_argument('--max-iterations', type=int, default=1000,
+                        help='Maximum number of calls for each case')
+    parser.add_argument('--max-duration', type=float, default=2,
+                        help='Maximum duration (in seconds) for each case')
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes, mutants=args.mutants,
+                  max_iterations=args.max_iterations, max_duration=args.max_duration)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
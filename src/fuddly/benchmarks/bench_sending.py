@@ -0,0 +1,126 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+End-to-end benchmark of the sending loop (data sent per second) against an
+:class:`EmptyTarget` and a :class:`TestTarget`, with and without logging in the fmkDB.
+The mean time spent in each stage of the sending loop is reported along with the results.
+"""
+
+import argparse
+import json
+
+from fuddly.benchmarks import find_targets, measure, make_result, stdout_to_stderr, tuto_framework
+from fuddly.framework.data import DataProcess
+from fuddly.framework.perf import PerfRecorder
+from fuddly.framework.target_helpers import EmptyTarget
+from fuddly.framework.targets.debug import TestTarget
+
+target_classes = [EmptyTarget, TestTarget]
+
+
+def _stage_means(stats):
+    """
+    Mean duration (in ms) of each stage. The stages that are only recorded per scope
+    (e.g., per generator) are averaged over all their scopes.
+    """
+    global_stats = {}
+    scoped_stats = {}
+    for stage, scope, count, _, _, _, mean in stats:
+        if scope == PerfRecorder.GLOBAL:
+            global_stats[stage] = (count, mean * count)
+        else:
+            nb, total = scoped_stats.get(stage, (0, 0))
+            scoped_stats[stage] = (nb + count, total + mean * count)
+
+    scoped_stats.update(global_stats)
+    return {stage: round(scoped_stats[stage][1] / scoped_stats[stage][0] / 1e6, 4)
+            for stage in PerfRecorder.STAGES if stage in scoped_stats}
+
+def _bench_sending(fmk, tg_class, atom, max_sends, max_duration):
+    tg_id = find_targets(fmk, tg_class)[0]
+    fmk.reload_all(tg_ids=[tg_id])
+
+    results = []
+    for fmkdb in (True, False):
+        if fmkdb:
+            fmk.enable_fmkdb()
+        else:
+            fmk.disable_fmkdb()
+        fmk.reset_perf_records()
+
+        count, elapsed = measure(
+            lambda: bool(fmk.process_data_and_send(DataProcess([atom]), console_display=False)),
+            max_sends, max_duration=max_duration)
+
+        result = make_result('sending', tg_class.__name__, count, elapsed, 'sends/s',
+                             atom=atom, fmkdb=fmkdb)
+        result['stages_ms'] = _stage_means(fmk.perf.get_stats())
+        results.append(result)
+
+    fmk.enable_fmkdb()
+    return results
+
+def run(atom='TESTNODE', max_sends=1000, max_duration=5, fmk=None):
+    """
+    Args:
+        atom (str): atom of the ``mydf`` data model to be generated and sent
+        max_sends (int): maximum number of data sent for each case
+        max_duration (float): maximum duration (in seconds) for each case
+        fmk (FmkPlumbing): framework with the ``tuto`` project loaded. If `None`, a
+          framework is started (and stopped) for the benchmark. Otherwise, the performance
+          records of the framework are reset and the benchmarked targets are loaded.
+    """
+    results = []
+    with tuto_framework(fmk) as fmk:
+        perf_enabled = fmk.perf.enabled
+        if not perf_enabled:
+            fmk.enable_perf_recording()
+        try:
+            for tg_class in target_classes:
+                results += _bench_sending(fmk, tg_class, atom, max_sends, max_duration)
+        finally:
+            if not perf_enabled:
+                fmk.disable_perf_recording()
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='End-to-end benchmark of the sending loop')
+    parser.add_argument('--atom', default='TESTNODE',
+                        help='Atom of the mydf data model to be generated and sent')
+    parser.add_argument('--max-sends', type=int, default=1000,
+                        help='Maximum number of data sent for each case')
+    parser.add_argument('--max-duration', type=float, default=5,
+                        help='Maximum duration (in seconds) for each case')
+    args = parser.parse_args(argv)
+
+    with stdout_to_stderr():
+        results = run(atom=args.atom, max_sends=args.max_sends, max_duration=args.max_duration)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+Benchmark of the ModelWalker-based disruptors (steps per second) on atoms of the
+tutorial data model. When a disruptor has walked through the whole atom, it is reset
+and walks through it again, until the maximum number of steps or the maximum duration
+is reached.
+"""
+
+import argparse
+import json
+
+from fuddly.benchmarks import measure, make_result, stdout_to_stderr, tuto_framework
+
+disruptors = ['tWALK', 'tTYPE', 'tALT', 'tSEP', 'tSTRUCT']
+tuto_atoms = ['TESTNODE', 'SHAPE', 'XML5']
+
+
+def _bench_walker(fmk, atom, disruptor, max_steps, max_duration):
+    actions = [atom, disruptor]
+    walk = {'steps': 0, 'nb': 0}
+    def step():
+        if fmk.process_data(actions) is not None:
+            walk['steps'] += 1
+            return True
+        if walk['steps'] == 0:
+            # nothing to walk through
+            return False
+        walk['steps'] = 0
+        walk['nb'] += 1
+        fmk.cleanup_dmaker(dmaker_type=atom, reset_existing_seed=True)
+        return step()
+
+    fmk.cleanup_all_dmakers(reset_existing_seed=True)
+    count, elapsed = measure(step, max_steps, max_duration=max_duration)
+    result = make_result('walkers', disruptor, count, elapsed, 'steps/s', atom=atom)
+    result['walks'] = walk['nb']
+    return result
+
+def run(atoms=None, max_steps=1000, max_duration=5, fmk=None):
+    """
+    Args:
+        atoms (list): atoms of the ``mydf`` data model to walk through (default is
+          :data:`tuto_atoms`)
+        max_steps (int): maximum number of steps for each case
+        max_duration (float): maximum duration (in seconds) for each case
+        fmk (FmkPlumbing): framework with the ``tuto`` project loaded. If `None`, a
+          framework is started (and stopped) for the benchmark.
+    """
+    results = []
+    with tuto_framework(fmk) as fmk:
+        for atom in tuto_atoms if atoms is None else atoms:
+            for disruptor in disruptors:
+                results.append(_bench_walker(fmk, atom, disruptor, max_steps, max_duration))
+        fmk.cleanup_all_dmakers(reset_existing_seed=True)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of the ModelWalker-based disruptors')
+    parser.add_argument('--atoms', nargs='+', default=None,
+                        help='Atoms of the mydf data model to walk through')
+    parser.add_argument('--max-steps', type=int, default=1000,
+                        help='Maximum number of steps for each case')
+    parser.add_argument('--max-duration', type=float, default=5,
+                        help='Maximum duration (in seconds) for each case')
+    args = parser.parse_args(argv)
+
+    with stdout_to_stderr():
+        results = run(atoms=args.atoms, max_steps=args.max_steps, max_duration=args.max_duration)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
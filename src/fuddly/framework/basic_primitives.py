@@ -25,51 +25,192 @@ import sys
 import random
 import string
 import array
+import threading
 
 from fuddly.framework.global_resources import convert_to_internal_repr
+from fuddly.libs.external_modules import numpy_module, np
+
+# Under these numbers of random draws, the pure-Python implementations are faster than
+# the NumPy ones (because of the NumPy setup cost).
+NUMPY_THRESHOLD = 64
+NUMPY_STR_THRESHOLD = 256
+
+CTRL_CHARS = bytes(range(0, 32)) + b'\x7f'
+
+# Maximum number of random keys (float64) drawn at once to select the positions to
+# corrupt within several mutants (i.e., 8 MiB)
+MUTANT_KEYS_MAX = 1 << 20
+
+_rng_local = threading.local()
+
+
+def _numpy_rng():
+    # The generator is reseeded from the random module at each use, so that random.seed()
+    # still makes the mutations reproducible. (Setting the state of an existing generator
+    # is much cheaper than creating a new one.)
+    try:
+        rng = _rng_local.rng
+    except AttributeError:
+        rng = _rng_local.rng = np.random.Generator(np.random.PCG64())
+    rng.bit_generator.state = {
+        'bit_generator': 'PCG64',
+        'state': {'state': random.getrandbits(128), 'inc': random.getrandbits(127) << 1 | 1},
+        'has_uint32': 0,
+        'uinteger': 0
+    }
+    return rng
+
+
+def _use_numpy(nb_draws, threshold=None):
+    threshold = NUMPY_THRESHOLD if threshold is None else threshold
+    return numpy_module and nb_draws >= threshold
+
 
 def rand_string(size=None, min=1, max=10, str_set=string.printable):
 
-    out = ""
     if size is None:
         size = random.randint(min, max)
     else:
         # if size is not an int, TypeError is raised with python3
         assert isinstance(size, int)
 
-    while len(out) < size:
-        val = random.choice(str_set)
-        out += val
+    if _use_numpy(size, NUMPY_STR_THRESHOLD) and all(ord(c) < 256 for c in str_set):
+        charset = np.frombuffer(str_set.encode('latin-1'), dtype=np.uint8)
+        indexes = _numpy_rng().integers(0, len(charset), size)
+        return charset[indexes].tobytes().decode('latin-1')
 
-    return out
+    return ''.join(random.choices(str_set, k=size))
 
 
-def corrupt_bytes(s, p=0.01, n=None, ctrl_char=False):
-    """Corrupt a given percentage or number of bytes from a string"""
-    s = bytearray(s)
-    l = len(s)
+def _nb_corruptions(length, p, n):
     if n is None:
-        n = max(1,int(l*p))
-    for i in random.sample(range(l), n):
+        n = max(1, int(length*p))
+    return n
+
+
+def corrupt_bytes_inplace(buf, p=0.01, n=None, ctrl_char=False):
+    """
+    Corrupt in place a given percentage or number of bytes from a writable buffer
+    (`bytearray` or `memoryview`)
+    """
+    l = len(buf)
+    n = _nb_corruptions(l, p, n)
+
+    if _use_numpy(n):
+        rng = _numpy_rng()
+        arr = np.frombuffer(buf, dtype=np.uint8)
+        positions = rng.choice(l, n, replace=False)
         if ctrl_char:
-            s[i] = random.choice([x for x in range(0,32)] + [0x7f])
+            arr[positions] = np.frombuffer(CTRL_CHARS, dtype=np.uint8)[rng.integers(0, len(CTRL_CHARS), n)]
         else:
-            s[i] = (s[i]+random.randint(1,255))%256
+            arr[positions] += rng.integers(1, 256, n, dtype=np.uint8)
+    else:
+        for i in random.sample(range(l), n):
+            if ctrl_char:
+                buf[i] = random.choice(CTRL_CHARS)
+            else:
+                buf[i] = (buf[i]+random.randint(1,255))%256
+
 
+def corrupt_bytes(s, p=0.01, n=None, ctrl_char=False):
+    """Corrupt a given percentage or number of bytes from a string"""
+    s = bytearray(s)
+    corrupt_bytes_inplace(s, p=p, n=n, ctrl_char=ctrl_char)
     return bytes(s)
 
+
+def corrupt_bits_inplace(buf, p=0.01, n=None, ascii=False):
+    """
+    Flip in place a given percentage or number of bits from a writable buffer
+    (`bytearray` or `memoryview`)
+    """
+    l = len(buf)*8
+    n = _nb_corruptions(l, p, n)
+
+    if _use_numpy(n):
+        arr = np.frombuffer(buf, dtype=np.uint8)
+        positions = _numpy_rng().choice(l, n, replace=False)
+        byte_idx = positions // 8
+        # several bits of the same byte can be flipped, thus an unbuffered operation is needed
+        np.bitwise_xor.at(arr, byte_idx, np.left_shift(1, positions % 8).astype(np.uint8))
+        if ascii:
+            arr[byte_idx] &= 0x7f
+    else:
+        for i in random.sample(range(l), n):
+            buf[i//8] ^= 1 << (i%8)
+            if ascii:
+                buf[i//8] &= 0x7f
+
+
 def corrupt_bits(s, p=0.01, n=None, ascii=False):
     """Flip a given percentage or number of bits from a string"""
     s = bytearray(s)
+    corrupt_bits_inplace(s, p=p, n=n, ascii=ascii)
+    return bytes(s)
+
+
+def _numpy_mutants(s, k, n, nb_positions, rng):
+    """Return `k` copies of `s` (as a 2D array) and `n` distinct random positions per copy"""
+    mutants = np.tile(np.frombuffer(bytes(s), dtype=np.uint8), (k, 1))
+    rows_per_chunk = MUTANT_KEYS_MAX // nb_positions
+    if n >= nb_positions:
+        positions = np.broadcast_to(np.arange(nb_positions), (k, nb_positions))
+    elif rows_per_chunk == 0 or (n * 8 < nb_positions and k * nb_positions > 1 << 16):
+        # sparse corruption of big inputs: drawing the positions of each mutant is cheaper
+        positions = np.stack([rng.choice(nb_positions, n, replace=False) for _ in range(k)])
+    else:
+        # the n smallest of random keys give n distinct positions per row (the keys are
+        # drawn by chunks of rows to bound the memory they use)
+        positions = np.concatenate([
+            np.argpartition(rng.random((min(rows_per_chunk, k - i), nb_positions)), n-1,
+                            axis=1)[:, :n]
+            for i in range(0, k, rows_per_chunk)])
+    return mutants, positions
+
+
+def corrupt_bytes_mutants(s, k, p=0.01, n=None, ctrl_char=False):
+    """
+    Generate `k` mutants of the string `s`, each one having a given percentage or number
+    of corrupted bytes
+    """
+    l = len(s)
+    n = min(_nb_corruptions(l, p, n), l)
+
+    if not _use_numpy(k*n):
+        return [corrupt_bytes(s, n=n, ctrl_char=ctrl_char) for _ in range(k)]
+
+    rng = _numpy_rng()
+    mutants, positions = _numpy_mutants(s, k, n, l, rng)
+    rows = np.arange(k)[:, None]
+    if ctrl_char:
+        ctrl = np.frombuffer(CTRL_CHARS, dtype=np.uint8)
+        mutants[rows, positions] = ctrl[rng.integers(0, len(ctrl), positions.shape)]
+    else:
+        mutants[rows, positions] += rng.integers(1, 256, positions.shape, dtype=np.uint8)
+
+    return [m.tobytes() for m in mutants]
+
+
+def corrupt_bits_mutants(s, k, p=0.01, n=None, ascii=False):
+    """
+    Generate `k` mutants of the string `s`, each one having a given percentage or number
+    of flipped bits
+    """
     l = len(s)*8
-    if n is None:
-        n = max(1,int(l*p))
-    for i in random.sample(range(l), n):
-        s[i//8] ^= 1 << (i%8)
-        if ascii:
-            s[i//8] &= 0x7f
+    n = min(_nb_corruptions(l, p, n), l)
+
+    if not _use_numpy(k*n):
+        return [corrupt_bits(s, n=n, ascii=ascii) for _ in range(k)]
+
+    mutants, positions = _numpy_mutants(s, k, n, l, _numpy_rng())
+    rows = np.broadcast_to(np.arange(k)[:, None], positions.shape)
+    byte_idx = positions // 8
+    np.bitwise_xor.at(mutants, (rows, byte_idx), np.left_shift(1, positions % 8).astype(np.uint8))
+    if ascii:
+        mutants[rows, byte_idx] &= 0x7f
+
+    return [m.tobytes() for m in mutants]
 
-    return bytes(s)
 
 def calc_parity_bit(x):
     """return 0 if the number of bits is even, otherwise returns 1"""
@@ -1,11 +1,14 @@
 import datetime
+import os
 import select
+import selectors
 import socket
 import subprocess
 import sys
 import threading
 import time
 import getpass
+import uuid
 
 from fuddly.framework import error_handling as eh
 from fuddly.libs.external_modules import ssh_module, ssh, serial_module, serial
@@ -23,20 +26,37 @@ class Backend(object):
             codec (str): codec used by the monitored system to answer.
         """
         self._started = False
+        self._users = 0
         self.codec = codec
         self._sync_lock = threading.Lock()
 
     def start(self):
         with self._sync_lock:
+            # A backend can be shared by several probes: it is only stopped
+            # once each of them has called stop().
+            self._users += 1
             if not self._started:
                 self._started = True
                 self._start()
 
     def stop(self):
+        with self._sync_lock:
+            self._users = max(0, self._users - 1)
+            if self._started and self._users == 0:
+                self._started = False
+                self._stop()
+
+    def reset(self):
+        """
+        Restart the communication channel if it is started, whatever the number of its users
+        (e.g., when the connection does not work anymore).
+        """
         with self._sync_lock:
             if self._started:
                 self._started = False
                 self._stop()
+                self._start()
+                self._started = True
 
     def exec_command(self, cmd):
         with self._sync_lock:
@@ -69,6 +89,188 @@ class Backend(object):
         pass
 
 
+class ShellRequest(object):
+    """
+    Pending command of a :class:`ShellSession`, returned by :meth:`ShellSession.submit`.
+    """
+
+    def __init__(self, cmd):
+        self.cmd = cmd
+        self.output = None
+        self.status = None
+        self._error = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def set_result(self, output, status):
+        self.output = output
+        self.status = status
+        self._done.set()
+
+    def set_error(self, error):
+        self._error = error
+        self._done.set()
+
+    def result(self, timeout=None):
+        """
+        Wait for the command to be executed.
+
+        Returns:
+            bytes: output of the command (stdout and stderr are merged)
+        """
+        if not self._done.wait(timeout):
+            raise BackendError('Read timeout', status=-1)
+        if self._error is not None:
+            raise self._error
+        if self.status in (126, 127):
+            raise BackendError('Command cannot be executed: {!r}'.format(self.output))
+        return self.output
+
+
+class ShellSession(object):
+    """
+    Multiplex the commands of several users (e.g., probes) through one long-lived shell.
+
+    The commands submitted within ``batch_window`` seconds are written to the shell
+    as a single script where each command is followed by a sentinel line carrying its
+    exit status. Their outputs are then split back apart, thus one round-trip is performed
+    per batch instead of one per command.
+
+    The session is driven by a thread which only needs the two following callables
+    to interact with the shell:
+
+    - ``send(data)``: write the bytes ``data`` to the shell standard input;
+    - ``recv(timeout)``: return the bytes available on the shell output, ``b''`` if the
+      shell terminated, or ``None`` if nothing has been received before ``timeout``.
+
+    If the shell does not answer in time, or terminates, the pending commands fail with a
+    :class:`BackendError` and the session is flagged as broken (as its output would then
+    be out of sync).
+    """
+
+    def __init__(self, send, recv, close=None, batch_window=0.005, timeout=None,
+                 codec='latin-1'):
+        """
+        Args:
+            send: callable writing to the shell.
+            recv: callable reading from the shell.
+            close: (optional) callable releasing the shell once the session is closed.
+            batch_window (float): time in seconds to wait for other commands to be
+              submitted before sending a batch.
+            timeout (float): timeout in seconds for a batch to be executed. None means
+              no timeout.
+            codec (str): codec used to encode the commands.
+        """
+        self._send = send
+        self._recv = recv
+        self._close = close
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self.codec = codec
+        self.batch_count = 0
+        self._pending = []
+        self._broken = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='ShellSession', daemon=True)
+        self._thread.start()
+
+    @property
+    def broken(self):
+        return self._broken
+
+    def submit(self, cmd):
+        """
+        Args:
+            cmd (str): command to execute within the shell
+
+        Returns:
+            ShellRequest: use :meth:`ShellRequest.result` to retrieve the output
+        """
+        req = ShellRequest(cmd)
+        with self._cond:
+            if self._closed or self._broken:
+                req.set_error(BackendError('Shell session not active anymore', status=-3))
+            else:
+                self._pending.append(req)
+                self._cond.notify()
+        return req
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        if self._close is not None:
+            # also unblock the session thread if it waits for the shell
+            self._close()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    break
+            if self.batch_window:
+                time.sleep(self.batch_window)
+            with self._cond:
+                batch, self._pending = self._pending, []
+            try:
+                self._exchange(batch)
+            except Exception as err:
+                if not isinstance(err, BackendError):
+                    err = BackendError('Shell session failure: {!s}'.format(err), status=-3)
+                with self._cond:
+                    self._broken = True
+                    batch += self._pending
+                    self._pending = []
+                for req in batch:
+                    if not req.done:
+                        req.set_error(err)
+                break
+
+        with self._cond:
+            for req in self._pending:
+                req.set_error(BackendError('Shell session closed', status=-2))
+            self._pending = []
+
+    def _exchange(self, batch):
+        token = uuid.uuid4().hex
+        script = ''.join("{{ {:s}\n}} </dev/null 2>&1; printf '\\n%s %d\\n' {:s} $?\n"
+                         .format(req.cmd, token) for req in batch)
+        self._send(bytes(script, self.codec))
+        self.batch_count += 1
+
+        marker = bytes('\n' + token + ' ', self.codec)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        buf = bytearray()
+        for req in batch:
+            while True:
+                pos = buf.find(marker)
+                if pos != -1:
+                    eol = buf.find(b'\n', pos + len(marker))
+                    if eol != -1:
+                        break
+                if deadline is None:
+                    chunk = self._recv(None)
+                else:
+                    chunk = self._recv(max(0, deadline - time.monotonic()))
+                if chunk is None:
+                    raise BackendError('Read timeout', status=-1)
+                elif not chunk:
+                    raise BackendError('Shell session closed', status=-2)
+                buf += chunk
+            req.set_result(bytes(buf[:pos]), int(buf[pos+len(marker):eol]))
+            del buf[:eol+1]
+
+
 class SSH_Backend(Backend):
 
     NO_PASSWORD = 10
@@ -83,7 +285,7 @@ class SSH_Backend(Backend):
                  proxy_jump_username=None, proxy_jump_password=None,
                  proxy_jump_pkey_path=None, proxy_jump_pkey_password=NO_PASSWORD,
                  codec='latin-1',
-                 timeout=None, get_pty=False):
+                 timeout=None, get_pty=False, multiplexed=False, batch_window=0.005):
         """
         Args:
             target_addr (str): IP of the SSH server.
@@ -114,6 +316,12 @@ class SSH_Backend(Backend):
             get_pty (bool): Request a pseudo-terminal from the server. It implies that processes
               executed from this ssh session will be attached to the pty and will be killed
               once the session is closed. (Otherwise they could remain on the server.)
+            multiplexed (bool): If True, commands are executed within one persistent shell
+              session instead of a new SSH channel each. The commands submitted concurrently
+              (e.g., by several probes sharing this backend) are sent in a single round-trip.
+              Refer to :class:`ShellSession`. In this mode, stdout and stderr are merged.
+            batch_window (float): only relevant in multiplexed mode. Time in seconds to wait
+              for other commands before sending a batch.
         """
         Backend.__init__(self, codec=codec)
         if not ssh_module:
@@ -139,7 +347,10 @@ class SSH_Backend(Backend):
 
         self.timeout = timeout
         self.get_pty = get_pty
+        self.multiplexed = multiplexed
+        self.batch_window = batch_window
         self.client = None
+        self._session = None
 
     @staticmethod
     def _create_pkey(pkey_path, pkey_password, prompt='PKey Password:'):
@@ -210,9 +421,39 @@ class SSH_Backend(Backend):
                             password=self.password, pkey=self.pkey, sock=sock)
 
     def _stop(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         self.client.close()
 
+    def _open_session(self):
+        if self._session is not None:
+            self._session.close()
+        try:
+            chan = self.client.get_transport().open_session()
+            chan.set_combine_stderr(True)
+            chan.exec_command('/bin/sh')
+        except (AttributeError, ssh.ssh_exception.SSHException):
+            raise BackendError('SSH connection not active anymore. Need {} reset'.format(self.__class__.__name__),
+                               status=-3)
+
+        def recv(timeout):
+            chan.settimeout(timeout)
+            try:
+                return chan.recv(65536)
+            except socket.timeout:
+                return None
+
+        self._session = ShellSession(chan.sendall, recv, close=chan.close,
+                                     batch_window=self.batch_window, timeout=self.timeout,
+                                     codec=self.codec)
+
     def _exec_command(self, cmd):
+        if self.multiplexed:
+            if self._session is None or self._session.broken:
+                self._open_session()
+            return self._session.submit(cmd)
+
         try:
             ssh_in, ssh_out, ssh_err = self.client.exec_command(cmd, timeout=self.timeout, get_pty=self.get_pty)
         except ssh.ssh_exception.SSHException:
@@ -222,6 +463,9 @@ class SSH_Backend(Backend):
         return ssh_out, ssh_err
 
     def read_output(self, chan_desc):
+        if isinstance(chan_desc, ShellRequest):
+            return chan_desc.result()
+
         ssh_out, ssh_err = chan_desc
         out_data = err_data = ''
         out_exception = err_exception = None
@@ -286,6 +530,8 @@ class SSH_Backend(Backend):
 
     def set_timeout(self, timeout):
         self.timeout = timeout
+        if self._session is not None:
+            self._session.timeout = timeout
 
 class Serial_Backend(Backend):
     """
@@ -424,23 +670,84 @@ class Shell_Backend(Backend):
     """
     Backend to execute shell commands locally
     """
-    def __init__(self, timeout=None, codec='latin-1'):
+    def __init__(self, timeout=None, codec='latin-1', persistent=False, batch_window=0):
         """
         Args:
             timeout (float): timeout in seconds for reading the result of the command
             codec (str): codec used by the monitored system to answer.
+            persistent (bool): If True, commands are executed within one long-lived ``/bin/sh``
+              instead of a new subprocess each, which avoids paying the shell startup on
+              every command. The backend can be shared by several probes, whose commands
+              are then serialized through the same shell. Refer to :class:`ShellSession`.
+              In this mode, stdout and stderr are merged.
+            batch_window (float): only relevant in persistent mode. Time in seconds to wait
+              for other commands before sending a batch.
         """
         Backend.__init__(self, codec=codec)
         self._timeout = timeout
         self._app = None
+        self.persistent = persistent
+        self.batch_window = batch_window
+        self._shell = None
+        self._selector = None
+        self._session = None
 
     def _start(self):
         pass
 
     def _stop(self):
-        pass
+        self._close_session()
+
+    def _open_session(self):
+        self._close_session()
+        try:
+            shell = subprocess.Popen(['/bin/sh'], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT)
+        except OSError as err:
+            raise BackendError('Cannot start the shell: {!s}'.format(err), status=-3)
+
+        out_fd = shell.stdout.fileno()
+        os.set_blocking(out_fd, False)
+        selector = selectors.DefaultSelector()
+        selector.register(out_fd, selectors.EVENT_READ)
+
+        def send(data):
+            shell.stdin.write(data)
+            shell.stdin.flush()
+
+        def recv(timeout):
+            if not selector.select(timeout):
+                return None
+            try:
+                return os.read(out_fd, 65536)
+            except BlockingIOError:
+                return None
+
+        def close():
+            # the end of the shell unblocks the session thread
+            shell.kill()
+            shell.wait()
+
+        self._shell = shell
+        self._selector = selector
+        self._session = ShellSession(send, recv, close=close, batch_window=self.batch_window,
+                                     timeout=self._timeout, codec=self.codec)
+
+    def _close_session(self):
+        if self._session is None:
+            return
+        self._session.close()
+        self._selector.close()
+        self._shell.stdin.close()
+        self._shell.stdout.close()
+        self._session = self._shell = self._selector = None
 
     def _exec_command(self, cmd):
+        if self.persistent:
+            if self._session is None or self._session.broken:
+                self._open_session()
+            return self._session.submit(cmd)
+
         self._app = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         ready_to_read, ready_to_write, in_error = \
             select.select([self._app.stdout, self._app.stderr], [], [], self._timeout)
@@ -448,6 +755,9 @@ class Shell_Backend(Backend):
         return ready_to_read, in_error
 
     def read_output(self, chan_desc):
+        if isinstance(chan_desc, ShellRequest):
+            return chan_desc.result()
+
         ready_to_read, in_error = chan_desc
         if in_error:
             # the command does not exist on the system
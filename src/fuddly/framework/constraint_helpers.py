@@ -22,6 +22,7 @@
 ################################################################################
 
 import copy
+from enum import Enum
 from typing import Tuple, List
 
 import z3
@@ -31,6 +32,7 @@ if z3_module:
     from z3 import *
 
 import fuddly.framework.global_resources as gr
+import fuddly.framework.csp_solver as native_csp
 
 _Z3_MODEL_NOT_COMPUTED = 1
 
@@ -38,6 +40,21 @@ class ConstraintError(Exception): pass
 class CSPDefinitionError(Exception): pass
 class CSPUnsat(Exception): pass
 
+
+class CSPBackend(Enum):
+    """
+    Backends able to solve a CSP. :class:`Constraint` objects can be solved either by
+    python-constraint or by the native solver (:mod:`fuddly.framework.csp_solver`), while
+    :class:`Z3Constraint` objects are always solved by z3.
+    """
+    PythonConstraint = 1
+    Native = 2
+    Z3 = 3
+
+    @classmethod
+    def default(cls):
+        return cls.PythonConstraint if csp_module else cls.Native
+
 class Constraint(object):
     relation = None
     vars = None
@@ -156,13 +173,22 @@ class CSP(object):
     _default_model = None  # used in the context of python-constraint
     _exhausted_solutions = None
     _is_solution_queried = False
+    _backend = None
     highlight_variables = None
 
     z3_problem = None
 
     def __init__(self, constraints: Constraint or Z3Constraint or List[Constraint or Z3Constraint],
-                 highlight_variables=False):
-        assert csp_module or z3_module, "the CSP backbone is disabled because of missing CSP backends!"
+                 highlight_variables=False, backend: CSPBackend = None):
+        """
+
+        Args:
+            constraints: the constraints of the CSP
+            highlight_variables (bool): highlight the nodes that are variables of the CSP
+            backend (CSPBackend): backend used to solve :class:`Constraint` objects. If `None`,
+              python-constraint is used if available, otherwise the native solver is used.
+              Not relevant for :class:`Z3Constraint` objects.
+        """
 
         self.z3_problem = False
 
@@ -200,6 +226,17 @@ class CSP(object):
                     if not r_copy.var_to_varns or v not in r_copy.var_to_varns:
                         self._var_to_varns[v] = v
 
+        assert z3_module or not self.z3_problem, \
+            "the CSP backbone is disabled because of missing z3 backend!"
+        if self.z3_problem:
+            self._backend = CSPBackend.Z3
+        else:
+            self._backend = CSPBackend.default() if backend is None else backend
+            assert self._backend is not CSPBackend.Z3, \
+                "Z3 backend can only be used with Z3Constraint objects"
+            assert csp_module or self._backend is not CSPBackend.PythonConstraint, \
+                "python-constraint backend is requested but the module is missing!"
+
         self._var_node_mapping = {}
         self._var_domain = {}
         self._var_default_value = {}
@@ -233,6 +270,8 @@ class CSP(object):
 
         if self.z3_problem:
             self._solver = Solver()
+        elif self._backend is CSPBackend.Native:
+            self._problem = native_csp.Problem()
         else:
             self._problem = cst.Problem()
 
@@ -244,6 +283,17 @@ class CSP(object):
         self._exhausted_solutions = False
         self._is_solution_queried = False
 
+    @property
+    def backend(self):
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: CSPBackend):
+        assert not self.z3_problem, "the backend of a Z3 CSP cannot be changed"
+        assert backend in (CSPBackend.PythonConstraint, CSPBackend.Native)
+        self._backend = backend
+        self.reset()
+
     def iter_vars(self):
         for v in self._vars:
             yield v
@@ -404,7 +454,11 @@ class CSP(object):
                             dom = [default]
                             self._default_value_constraints_added = True
                         elif isinstance(dom, tuple) and len(dom) == 2:
-                            dom = range(dom[0], dom[1] + 1)
+                            if self._backend is CSPBackend.Native:
+                                # interval domains are enumerated lazily by the native solver
+                                dom = native_csp.IntervalDomain(dom[0], dom[1])
+                            else:
+                                dom = range(dom[0], dom[1] + 1)
 
                         try:
                             self._problem.addVariable(v, dom)
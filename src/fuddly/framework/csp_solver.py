@@ -0,0 +1,316 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+"""
+Built-in CSP solver used by :class:`fuddly.framework.constraint_helpers.CSP` when the
+native backend is selected.
+
+Integer ranges are kept as :class:`IntervalDomain` (bounds plus a sparse set of pruned
+values) and are never expanded into lists. Constraints are arbitrary boolean functions,
+thus propagation is performed by support checking (generalized arc-consistency), bounded
+by a budget in order to stay cheap on wide domains. Solutions are enumerated lazily by a
+backtracking search with forward checking.
+
+The :class:`Problem` interface mirrors the subset of ``constraint.Problem`` used by
+the framework, so that both backends can be used interchangeably.
+"""
+
+import itertools
+
+
+class IntervalDomain(object):
+    """
+    Integer domain `[mini, maxi]` which is enumerated lazily.
+    Values pruned inside the bounds are tracked in a sparse set.
+    """
+
+    def __init__(self, mini, maxi):
+        self.mini = mini
+        self.maxi = maxi
+        self._removed = set()
+
+    @property
+    def size(self):
+        if self.maxi < self.mini:
+            return 0
+        return self.maxi - self.mini + 1 - len(self._removed)
+
+    def __iter__(self):
+        v = self.mini
+        while v <= self.maxi:
+            if v not in self._removed:
+                yield v
+            v += 1
+
+    def __contains__(self, value):
+        return self.mini <= value <= self.maxi and value not in self._removed
+
+    def remove(self, value):
+        if value == self.mini:
+            self.mini += 1
+            while self.mini in self._removed:
+                self._removed.discard(self.mini)
+                self.mini += 1
+        elif value == self.maxi:
+            self.maxi -= 1
+            while self.maxi in self._removed:
+                self._removed.discard(self.maxi)
+                self.maxi -= 1
+        elif self.mini < value < self.maxi:
+            self._removed.add(value)
+
+    def get_state(self):
+        return self.mini, self.maxi, frozenset(self._removed)
+
+    def set_state(self, state):
+        self.mini, self.maxi, removed = state
+        self._removed = set(removed)
+
+    def __repr__(self):
+        return f'IntervalDomain({self.mini}, {self.maxi}, pruned={len(self._removed)})'
+
+
+class ValueDomain(object):
+    """
+    Domain described by an explicit list of values (duplicates are ignored and
+    the original order is preserved).
+    """
+
+    def __init__(self, values):
+        self._values = list(dict.fromkeys(values))
+
+    @property
+    def size(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(list(self._values))
+
+    def __contains__(self, value):
+        return value in self._values
+
+    def remove(self, value):
+        self._values.remove(value)
+
+    def get_state(self):
+        return tuple(self._values)
+
+    def set_state(self, state):
+        self._values = list(state)
+
+    def __repr__(self):
+        return f'ValueDomain({self._values!r})'
+
+
+class Problem(object):
+    """
+    Native CSP solver.
+
+    Args:
+        support_limit (int): maximum number of tuples that can be checked to establish
+          the support of one value during propagation. Above it, the value is kept and
+          will be checked during the search instead.
+        prune_limit (int): domains bigger than this limit are not pruned value by value
+          (only their bounds are tightened), their values being checked lazily during
+          the search.
+        bound_budget (int): maximum number of values that can be removed from each bound
+          of a wide domain during one revision.
+    """
+
+    support_limit = 256
+    prune_limit = 256
+    bound_budget = 32
+
+    def __init__(self, support_limit=None, prune_limit=None, bound_budget=None):
+        if support_limit is not None:
+            self.support_limit = support_limit
+        if prune_limit is not None:
+            self.prune_limit = prune_limit
+        if bound_budget is not None:
+            self.bound_budget = bound_budget
+        self.reset()
+
+    def reset(self):
+        self._domains = {}
+        self._constraints = []
+        self._var_constraints = {}
+
+    def addVariable(self, variable, domain):
+        if variable in self._domains:
+            raise ValueError(f'Tried to insert duplicated variable {variable!r}')
+
+        if isinstance(domain, (IntervalDomain, ValueDomain)):
+            dom = domain
+        elif isinstance(domain, range) and domain.step == 1:
+            dom = IntervalDomain(domain.start, domain.stop - 1)
+        else:
+            dom = ValueDomain(domain)
+
+        if dom.size == 0:
+            raise ValueError(f'Domain of variable {variable!r} is empty')
+
+        self._domains[variable] = dom
+        self._var_constraints[variable] = []
+
+    def addVariables(self, variables, domain):
+        for v in variables:
+            self.addVariable(v, domain)
+
+    def addConstraint(self, constraint, variables):
+        cst = (constraint, tuple(variables))
+        self._constraints.append(cst)
+        for v in cst[1]:
+            self._var_constraints.setdefault(v, []).append(cst)
+
+    def getSolution(self):
+        return next(self.getSolutionIter(), None)
+
+    def getSolutions(self):
+        return list(self.getSolutionIter())
+
+    def getSolutionIter(self):
+        for _, variables in self._constraints:
+            for v in variables:
+                if v not in self._domains:
+                    raise ValueError(f'Constraint refers to an unknown variable {v!r}')
+
+        if not self._propagate():
+            return iter(())
+
+        return self._search({})
+
+    def _domain_product_size(self, variables, limit):
+        size = 1
+        for v in variables:
+            size *= self._domains[v].size
+            if size > limit:
+                break
+        return size
+
+    def _has_support(self, relation, variables, var, value, assignment):
+        others = [v for v in variables if v != var and v not in assignment]
+        if self._domain_product_size(others, self.support_limit) > self.support_limit:
+            # Too costly to decide: the value is kept and will be checked by the search
+            return True
+
+        args = dict(assignment)
+        args[var] = value
+        for values in itertools.product(*(self._domains[v] for v in others)):
+            args.update(zip(others, values))
+            if relation(*(args[v] for v in variables)):
+                return True
+        return False
+
+    def _revise(self, relation, variables, var, assignment, trail):
+        dom = self._domains[var]
+        changed = False
+
+        if dom.size <= self.prune_limit:
+            for value in dom:
+                if not self._has_support(relation, variables, var, value, assignment):
+                    self._save(var, trail)
+                    dom.remove(value)
+                    changed = True
+        else:
+            # wide interval: only the bounds are tightened, within the budget
+            budget = self.bound_budget
+            while budget > 0 and dom.size > 0 \
+                    and not self._has_support(relation, variables, var, dom.mini, assignment):
+                self._save(var, trail)
+                dom.remove(dom.mini)
+                changed = True
+                budget -= 1
+            budget = self.bound_budget
+            while budget > 0 and dom.size > 0 \
+                    and not self._has_support(relation, variables, var, dom.maxi, assignment):
+                self._save(var, trail)
+                dom.remove(dom.maxi)
+                changed = True
+                budget -= 1
+
+        return changed
+
+    def _save(self, var, trail):
+        if trail is not None and var not in trail:
+            trail[var] = self._domains[var].get_state()
+
+    def _propagate(self, assignment=None, trail=None, variables=None):
+        assignment = {} if assignment is None else assignment
+        if variables is None:
+            queue = list(self._constraints)
+        else:
+            queue = []
+            for v in variables:
+                queue += self._var_constraints[v]
+
+        in_queue = set(map(id, queue))
+        while queue:
+            cst = queue.pop(0)
+            in_queue.discard(id(cst))
+            relation, cst_vars = cst
+            for var in cst_vars:
+                if var in assignment:
+                    continue
+                if self._revise(relation, cst_vars, var, assignment, trail):
+                    dom_size = self._domains[var].size
+                    if dom_size == 0:
+                        return False
+                    elif dom_size > self.support_limit:
+                        # the domain is still too wide to help deciding the support of
+                        # the neighbours' values, so re-queuing them would be useless.
+                        continue
+                    for c in self._var_constraints[var]:
+                        if c is not cst and id(c) not in in_queue:
+                            queue.append(c)
+                            in_queue.add(id(c))
+        return True
+
+    def _select_variable(self, assignment):
+        unassigned = [v for v in self._domains if v not in assignment]
+        if not unassigned:
+            return None
+        return min(unassigned,
+                   key=lambda v: (self._domains[v].size, -len(self._var_constraints[v])))
+
+    def _is_consistent(self, var, assignment):
+        for relation, cst_vars in self._var_constraints[var]:
+            if all(v in assignment for v in cst_vars):
+                if not relation(*(assignment[v] for v in cst_vars)):
+                    return False
+        return True
+
+    def _search(self, assignment):
+        var = self._select_variable(assignment)
+        if var is None:
+            yield dict(assignment)
+            return
+
+        for value in self._domains[var]:
+            assignment[var] = value
+            if self._is_consistent(var, assignment):
+                trail = {}
+                if self._propagate(assignment, trail, variables=(var,)):
+                    yield from self._search(assignment)
+                for v, state in trail.items():
+                    self._domains[v].set_state(state)
+            del assignment[var]
@@ -22,10 +22,12 @@
 ################################################################################
 
 import collections
+import time
 
 from fuddly.framework.global_resources import *
 from fuddly.framework.node import Node, Env
 from fuddly.framework.database import Database
+from fuddly.framework.perf import serialization_timer
 
 
 class DataBackend(object):
@@ -63,6 +65,9 @@ class DataBackend(object):
     def to_bytes(self):
         raise NotImplementedError
 
+    def to_buffers(self):
+        return [self.to_bytes()]
+
     def show(self, raw_limit=200, log_func=sys.stdout.write, debug=False):
         raise NotImplementedError
 
@@ -102,6 +107,9 @@ class NodeBackend(DataBackend):
     def to_bytes(self):
         return self._node.to_bytes()
 
+    def to_buffers(self):
+        return self._node.to_buffers()
+
     def show(self, raw_limit=200, log_func=sys.stdout.write, debug=False):
         self._node.show(raw_limit=raw_limit, log_func=log_func, debug=debug)
 
@@ -271,6 +279,10 @@ class Data(object):
         self.info = {}
         self._history = None
 
+        # set by the framework when the data can be regenerated from its data makers
+        # (refer to framework.replay)
+        self.replay_recipe = None
+
         self.tg_ids = tg_ids  # targets ID
 
         # callback related
@@ -369,7 +381,29 @@ class Data(object):
         self._backend.data_model = dm
 
     def to_bytes(self):
-        return self._backend.to_bytes()
+        timer = serialization_timer()
+        if timer is None:
+            return self._backend.to_bytes()
+        start = time.perf_counter_ns()
+        try:
+            return self._backend.to_bytes()
+        finally:
+            timer[0] += time.perf_counter_ns() - start
+
+    def to_buffers(self):
+        """
+        Returns:
+            list: buffers whose concatenation gives :meth:`to_bytes`. For node contents,
+            one buffer per terminal node, which avoids joining them before sending.
+        """
+        timer = serialization_timer()
+        if timer is None:
+            return self._backend.to_buffers()
+        start = time.perf_counter_ns()
+        try:
+            return self._backend.to_buffers()
+        finally:
+            timer[0] += time.perf_counter_ns() - start
 
     def to_str(self):
         return self._backend.to_str()
@@ -580,6 +614,9 @@ class Data(object):
     def copy_callback_from(self, data):
         self._callbacks = copy.copy(data._callbacks)
 
+    def has_callbacks(self):
+        return any(self._callbacks.values())
+
     @property
     def origin(self):
         return self._origin
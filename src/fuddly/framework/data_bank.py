@@ -0,0 +1,269 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+Bounded storage of :class:`Data` for the Data Bank and the workspace of the framework.
+"""
+
+import collections
+import mmap
+import os
+import pickle
+import tempfile
+
+import fuddly.framework.global_resources as gr
+from fuddly.framework.data import Data
+
+
+class SpillStore(object):
+    """
+    Append-only file (deleted when closed) where records are written, and read back
+    through a memory mapping of the file. The space of the discarded records is
+    reclaimed once it exceeds the one of the records in use.
+    """
+
+    compaction_threshold = 1 << 24
+
+    def __init__(self, folder=None):
+        self._folder = gr.workspace_folder if folder is None else folder
+        self._file = None
+        self._mmap = None
+        self._records = {}
+        self._size = 0
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def _open(self):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self._folder)
+            self._size = 0
+            self._dead = 0
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def write(self, key, blob):
+        self.discard(key)
+        self._open()
+        self._file.seek(self._size)
+        self._file.write(blob)
+        self._records[key] = (self._size, len(blob))
+        self._size += len(blob)
+
+    def read(self, key):
+        offset, length = self._records[key]
+        if self._mmap is None or offset + length > len(self._mmap):
+            self._unmap()
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap[offset:offset + length]
+
+    def discard(self, key):
+        record = self._records.pop(key, None)
+        if record is None:
+            return
+        self._dead += record[1]
+        if not self._records:
+            self.close()
+        elif self._dead > max(self.compaction_threshold, self._size - self._dead):
+            self._compact()
+
+    def _compact(self):
+        records = {key: self.read(key) for key in self._records}
+        self.close()
+        for key, blob in records.items():
+            self.write(key, blob)
+
+    def close(self):
+        self._unmap()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._records = {}
+        self._size = 0
+        self._dead = 0
+
+
+class DataBank(object):
+    """
+    Indexed storage of :class:`Data`, where at most `max_live_entries` data are kept in
+    memory (the least recently used ones are evicted first). The evicted data are spilled
+    to a :class:`SpillStore` as their bytes along with a recipe to rebuild them: the
+    data model and the atom they come from, their data ID, and the history and
+    information of the data makers that produced them.
+
+    Spilled data are rebuilt when they are accessed, by absorbing their bytes with the
+    atom they come from. If the absorption fails (e.g., because the data have been
+    disrupted), they are rebuilt as raw data. Either way, the rebuilt data have the same
+    bytes as the original ones, but their other attributes (callbacks, feedback timeout, ...)
+    are not restored.
+
+    Args:
+        max_live_entries (int): maximum number of data kept in memory. If `None`, the
+          storage behaves as a simple dictionary.
+        dm_resolver: function returning the data model from its name (or `None` if
+          it is not available), used to rebuild the spilled data
+        folder (str): folder of the spill file (default is the fuddly workspace folder)
+    """
+
+    def __init__(self, max_live_entries=None, dm_resolver=None, folder=None):
+        self.max_live_entries = max_live_entries
+        self._dm_resolver = dm_resolver
+        self._entries = {}
+        self._live = collections.OrderedDict()
+        self._spill_store = SpillStore(folder=folder)
+        self._last_idx = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, idx):
+        return idx in self._entries
+
+    @property
+    def spilled_entries(self):
+        return len(self._spill_store)
+
+    def append(self, data):
+        """
+        Returns:
+            int: the index of the stored data (starting from 1)
+        """
+        self._last_idx += 1
+        self._entries[self._last_idx] = None
+        self._make_live(self._last_idx, data)
+        return self._last_idx
+
+    def get(self, idx, materialize=True, keep=True):
+        """
+        Args:
+            idx (int): index of the data
+            materialize (bool): if `False`, spilled data are rebuilt as raw data (no
+              absorption), and are not kept in memory afterwards. Cheaper when only the
+              bytes and the history of the data are needed.
+            keep (bool): if `False`, spilled data are not kept in memory afterwards
+              (they stay in the spill file), even if they are materialized.
+
+        Returns:
+            Data: the data or `None` if `idx` is not in the bank
+        """
+        if idx not in self._entries:
+            return None
+
+        data = self._live.get(idx)
+        if data is not None:
+            self._live.move_to_end(idx)
+            return data
+
+        data = self._rebuild(pickle.loads(self._spill_store.read(idx)), materialize)
+        if materialize and keep:
+            self._spill_store.discard(idx)
+            self._make_live(idx, data)
+        return data
+
+    def last(self):
+        return self.get(self._last_idx) if self._entries else None
+
+    def indexes(self):
+        return list(self._entries)
+
+    def items(self, materialize=True, keep=True):
+        for idx in self.indexes():
+            yield idx, self.get(idx, materialize=materialize, keep=keep)
+
+    def __iter__(self):
+        # spilled data are rebuilt one at a time and are not brought back in memory
+        for _, data in self.items(keep=False):
+            yield data
+
+    def remove_oldest(self, nb):
+        for idx in self.indexes()[:nb]:
+            del self._entries[idx]
+            if self._live.pop(idx, None) is None:
+                self._spill_store.discard(idx)
+
+    def clear(self):
+        self._entries = {}
+        self._live.clear()
+        self._spill_store.close()
+        self._last_idx = 0
+
+    def _make_live(self, idx, data):
+        self._live[idx] = data
+        while self.max_live_entries is not None and len(self._live) > self.max_live_entries:
+            old_idx, old_data = self._live.popitem(last=False)
+            self._spill_store.write(old_idx, self._serialize(old_data))
+
+    @staticmethod
+    def _serialize(data):
+        dm = data.get_data_model()
+        recipe = {
+            'dm': None if dm is None else dm.name,
+            'atom': data.content.name if data.has_node_content() else None,
+            'data_id': data.get_data_id(),
+            'initial_dmaker': data.get_initial_dmaker(),
+            'history': data.get_history(),
+            'info': data.info,
+        }
+        try:
+            return pickle.dumps((data.to_bytes(), recipe), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # user inputs are only kept for display purpose when they cannot be serialized
+            def to_str(dmaker):
+                return None if dmaker is None else (dmaker[0], dmaker[1], str(dmaker[2]))
+            recipe['initial_dmaker'] = to_str(recipe['initial_dmaker'])
+            if recipe['history'] is not None:
+                recipe['history'] = [to_str(dmaker) for dmaker in recipe['history']]
+            return pickle.dumps((data.to_bytes(), recipe), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _rebuild(self, record, materialize):
+        content, recipe = record
+
+        dm = None
+        if recipe['dm'] is not None and self._dm_resolver is not None:
+            dm = self._dm_resolver(recipe['dm'])
+
+        atom = None
+        if materialize and dm is not None and recipe['atom'] is not None:
+            try:
+                atom, _ = dm.absorb(content, atom_name=recipe['atom'])
+            except Exception:
+                atom = None
+
+        data = Data(content if atom is None else atom)
+        if dm is not None:
+            data.set_data_model(dm)
+        data.set_data_id(recipe['data_id'])
+        if recipe['initial_dmaker'] is not None:
+            data.set_initial_dmaker(recipe['initial_dmaker'])
+        data.set_history(recipe['history'])
+        data.info = recipe['info']
+        return data
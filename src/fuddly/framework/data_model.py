@@ -21,6 +21,11 @@
 #
 ################################################################################
 
+import hashlib
+import io
+import json
+import pickle
+import tempfile
 import threading
 
 from fuddly.framework import global_resources as gr
@@ -45,6 +50,11 @@ class DataModel(object):
 
     knowledge_source = None
 
+    #: If ``True``, what :meth:`build_data_model` produces is cached on disk
+    #: (refer to :class:`DataModelCache`). The cache is always used for the data models
+    #: provided with fuddly.
+    build_cache = False
+
     def pre_build(self):
         """
         This method is called when a data model is loaded.
@@ -272,6 +282,7 @@ class DataModel(object):
         self._decoded_data = None
         self._included_data_models = None
         self._dm_access_lock = threading.Lock()
+        self._dependencies = set()
 
     def _backend(self, atom):
         if isinstance(atom, (Node, dict)):
@@ -313,6 +324,7 @@ class DataModel(object):
             raise ValueError('Requested atom does not exist!')
 
     def get_external_atom(self, dm_name, data_id, name=None):
+        self._dependencies.add(dm_name)
         dm = self._dm_db[dm_name]
         dm.load_data_model(self._dm_db)
         try:
@@ -326,11 +338,25 @@ class DataModel(object):
         self.pre_build()
         if not self._built:
             self._dm_db = dm_db
-            self.build_data_model()
+            self._build_or_load_data_model()
             raw_data = self.import_file_contents(extension=self.file_extension)
             self.register(*list(map(lambda x: x[0], raw_data.values())))
             self._built = True
 
+    def _is_bundled(self):
+        return self.module_name is not None and self.module_name.startswith('fuddly.data_models.')
+
+    def _build_or_load_data_model(self):
+        cache = DataModelCache() if self.build_cache or self._is_bundled() else None
+        loaded = cache.load(self) if cache is not None else None
+        if loaded:
+            return
+
+        self.build_data_model()
+        # `None` means the built data model is known to be not serializable
+        if loaded is False:
+            cache.store(self)
+
     def merge_with(self, data_model):
         if self._included_data_models is None:
             self._included_data_models = {}
@@ -478,3 +504,165 @@ class NodeBackend(object):
 
     def get_all_confs(self):
         return sorted(self._confs)
+
+
+def _rebuild_generator(template, args, kwargs):
+    return template(*args, **kwargs)
+
+
+class _DataModelPickler(pickle.Pickler):
+
+    def persistent_id(self, obj):
+        # data models are not serialized but referenced by their names
+        if isinstance(obj, DataModel):
+            return obj.name
+        return None
+
+    def reducer_override(self, obj):
+        obj_dict = getattr(obj, '__dict__', None)
+        if isinstance(obj_dict, dict) and 'rebuild_info' in obj_dict:
+            return _rebuild_generator, obj_dict['rebuild_info']
+        return NotImplemented
+
+
+class _DataModelUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, data_model):
+        pickle.Unpickler.__init__(self, file)
+        self._dm = data_model
+
+    def persistent_load(self, pid):
+        if pid == self._dm.name:
+            return self._dm
+        dm_db = self._dm._dm_db
+        if dm_db is None or pid not in dm_db:
+            raise pickle.UnpicklingError('unknown data model {!r}'.format(pid))
+        return dm_db[pid]
+
+
+class DataModelCache(object):
+    """
+    On-disk cache of what :meth:`DataModel.build_data_model` produces (the atoms and
+    the atoms registered for decoding, along with any other attribute set by the method).
+    The next loads of the data model deserialize them instead of building them again
+    from their descriptions.
+
+    An entry is bound to a hash of the source files of the data model (and of the data
+    models it clones atoms from) and of the framework, thus any change to them invalidates it.
+    These hashes are stored in a JSON header along with the format version of the entry and
+    the hash of its serialized content, which are all checked before the content is
+    deserialized. When the built data model cannot be serialized (e.g., because some of its
+    nodes rely on lambdas), it is recorded as such and the data model is always built.
+    """
+
+    format_version = 1
+    excluded_attributes = ('_dm_db', '_dm_access_lock', '_built')
+    _fmk_digest = None
+
+    def __init__(self, folder=None):
+        self.folder = gr.dm_cache_folder if folder is None else folder
+
+    @staticmethod
+    def _digest_sources(folder, digest):
+        for root, dirs, files in os.walk(folder):
+            dirs.sort()
+            for f in sorted(files):
+                if f.endswith('.py'):
+                    with open(os.path.join(root, f), 'rb') as src:
+                        digest.update(src.read())
+
+    @classmethod
+    def data_model_digest(cls, data_model):
+        """
+        Return the hash of the source files of the package of the data model and of the
+        framework, or `None` if the source files cannot be found.
+        """
+        module = sys.modules.get(type(data_model).__module__)
+        src = getattr(module, '__file__', None)
+        if src is None:
+            return None
+
+        if cls._fmk_digest is None:
+            digest = hashlib.sha256('{:s} {:s}'.format(gr.fuddly_version, sys.version).encode())
+            cls._digest_sources(gr.fmk_folder, digest)
+            cls._fmk_digest = digest.digest()
+
+        digest = hashlib.sha256(cls._fmk_digest)
+        cls._digest_sources(os.path.dirname(os.path.abspath(src)), digest)
+        return digest.hexdigest()
+
+    def _path(self, data_model):
+        return os.path.join(self.folder, '{!s}.pickle'.format(data_model.name))
+
+    def _digests(self, data_model, dm_names):
+        digests = {}
+        for name in dm_names:
+            dm = data_model if name == data_model.name else data_model._dm_db.get(name)
+            digests[name] = None if dm is None else self.data_model_digest(dm)
+        return digests
+
+    def load(self, data_model):
+        """
+        Restore the built state of the data model from the cache.
+
+        Returns:
+            bool: ``True`` if it has been restored, ``False`` if there is no valid entry
+            for this data model, and ``None`` if it is known to be not serializable.
+        """
+        try:
+            with open(self._path(data_model), 'rb') as f:
+                header = json.loads(f.readline())
+                blob = f.read()
+        except (OSError, ValueError):
+            # missing or corrupted entry
+            return False
+
+        if not isinstance(header, dict):
+            return False
+        digests = header.get('digests')
+        if header.get('version') != self.format_version \
+                or not isinstance(digests, dict) or None in digests.values() \
+                or header.get('content') != hashlib.sha256(blob).hexdigest() \
+                or self._digests(data_model, digests) != digests:
+            return False
+
+        try:
+            state = _DataModelUnpickler(io.BytesIO(blob), data_model).load()
+        except Exception:
+            # obsolete entry
+            return False
+
+        if state is None:
+            return None
+
+        state['_dependencies'] = set(digests) - {data_model.name}
+        for k, v in state.items():
+            setattr(data_model, k, v)
+        return True
+
+    def store(self, data_model):
+        """
+        Store the built state of the data model in the cache.
+        """
+        digests = self._digests(data_model, {data_model.name} | data_model._dependencies)
+        if None in digests.values():
+            return
+
+        state = {k: v for k, v in vars(data_model).items() if k not in self.excluded_attributes}
+        buf = io.BytesIO()
+        try:
+            _DataModelPickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(state)
+            blob = buf.getvalue()
+        except Exception:
+            blob = pickle.dumps(None)
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+            header = {'version': self.format_version, 'digests': digests,
+                      'content': hashlib.sha256(blob).hexdigest()}
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(header).encode() + b'\n')
+                f.write(blob)
+            os.replace(tmp_path, self._path(data_model))
+        except OSError:
+            pass
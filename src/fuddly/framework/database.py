@@ -27,6 +27,9 @@ import re
 import math
 import threading
 import copy
+import collections
+import hashlib
+import zlib
 from datetime import datetime, date, timedelta
 from typing import Optional
 
@@ -38,6 +41,72 @@ from fuddly.libs.external_modules import *
 from fuddly.libs.utils import chunk_lines
 
 
+# The contents stored in the BLOBS table are prefixed with the codec used to compress them
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+COMPRESSION_MIN_SIZE = 64
+
+
+def blob_key(raw):
+    return hashlib.sha256(raw).digest()
+
+
+def pack_content(raw):
+    if len(raw) >= COMPRESSION_MIN_SIZE:
+        if zstd_module:
+            packed = bytes([CODEC_ZSTD]) + zstd.ZstdCompressor(level=3).compress(raw)
+        else:
+            packed = bytes([CODEC_ZLIB]) + zlib.compress(raw, 6)
+        if len(packed) <= len(raw):
+            return packed
+
+    return bytes([CODEC_NONE]) + raw
+
+
+def unpack_content(packed):
+    if packed is None:
+        return None
+
+    codec, payload = packed[0], memoryview(packed)[1:]
+    if codec == CODEC_NONE:
+        return bytes(payload)
+    elif codec == CODEC_ZLIB:
+        return zlib.decompress(payload)
+    elif codec == CODEC_ZSTD:
+        if not zstd_module:
+            raise ValueError('the zstandard module is needed to read this content')
+        return zstd.ZstdDecompressor().decompress(payload)
+    else:
+        raise ValueError('unknown codec {:d}'.format(codec))
+
+
+class PackedContent(object):
+    """
+    Content to be stored in the BLOBS table. It is compressed when the SQL statement is
+    executed, that is within the thread of the fmkDB.
+    """
+
+    __slots__ = ('raw',)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def __conform__(self, protocol):
+        if protocol is sqlite3.PrepareProtocol:
+            return pack_content(self.raw)
+
+
+def content_of(table):
+    """
+    Returns:
+        str: SQL expression of the content of a record from `table` (whose content
+        is stored in the BLOBS table)
+    """
+    return "(SELECT UNPACK(BLOBS.CONTENT) FROM BLOBS WHERE BLOBS.HASH == {:s}.CONTENT_HASH)".format(table)
+
+
 def register_adapters_and_converters():
     def adapt_date(val):
         return val.isoformat()
@@ -164,6 +233,9 @@ class Database(object):
 
     FEEDBACK_TRAIL_TIME_WINDOW = 10 # seconds
 
+    # number of content hashes kept in memory to avoid resubmitting known contents
+    BLOB_CACHE_SIZE = 4096
+
     def __init__(self, fmkdb_path=None):
 
         self.name = Database.DEFAULT_DB_NAME
@@ -179,6 +251,9 @@ class Database(object):
 
         self.fbk_timeout_re = re.compile('.*feedback timeout = (.*)s$')
 
+        self._known_blobs = collections.OrderedDict()
+        self._known_blobs_lock = threading.Lock()
+
         # self.current_project = None
         #
         # self.last_feedback = {}
@@ -222,7 +297,13 @@ class Database(object):
                 for t in tables:
                     cur.execute('select * from {!s}'.format(t))
                     self._ref_names[t] = list(map(lambda x: x[0], cur.description))
-                    cursor.execute('select * from {!s}'.format(t))
+                    try:
+                        cursor.execute('select * from {!s}'.format(t))
+                    except sqlite3.OperationalError:
+                        # table introduced after the creation of this database
+                        cur.execute("select sql from sqlite_master WHERE type='table' and name=?", (t,))
+                        cursor.execute(cur.fetchone()[0])
+                        cursor.execute('select * from {!s}'.format(t))
                     names = list(map(lambda x: x[0], cursor.description))
                     if self._ref_names[t] != names:
                         valid = False
@@ -232,6 +313,101 @@ class Database(object):
 
         return valid
 
+    def _table_columns(self):
+        con = sqlite3.connect(self.fmk_db_path)
+        with con:
+            tables = {
+                t: [c[1] for c in con.execute('PRAGMA table_info({!s})'.format(t))]
+                for t, in con.execute("select name from sqlite_master WHERE type='table'")
+            }
+        con.close()
+        return tables
+
+    def needs_migration(self):
+        """
+        Returns:
+            bool: ``True`` if the database has been created by a previous version of fuddly
+            and has to be converted with :meth:`migrate` before being used
+        """
+        if not os.path.isfile(self.fmk_db_path):
+            return False
+        return 'CONTENT' in self._table_columns().get('DATA', [])
+
+    def migrate(self):
+        """
+        Convert a database whose contents are stored within the DATA, FEEDBACK and
+        ASYNC_DATA tables into the current format, where they are deduplicated and compressed
+        in the BLOBS table. The former database is kept with the suffix ``.bak``.
+        Must be called while the database is stopped (:meth:`start` refuses databases in
+        the former format).
+
+        Returns:
+            dict: statistics about the migration, or ``None`` if the database does not need
+            to be migrated
+        """
+        db_path = self.fmk_db_path
+        old_tables = self._table_columns()
+
+        if 'CONTENT' not in old_tables.get('DATA', []):
+            return None
+
+        new_path = db_path + '.migrating'
+        if os.path.exists(new_path):
+            os.remove(new_path)
+
+        stats = {'records': 0, 'blobs': 0, 'content_size': 0, 'blobs_size': 0}
+        new_con = sqlite3.connect(new_path)
+        with open(gr.fmk_folder + self.DDL_fname) as fd:
+            new_con.executescript(fd.read())
+        # records are copied as is, even those not complying with the foreign keys
+        new_con.execute('PRAGMA foreign_keys = off')
+        new_con.execute('ATTACH DATABASE ? AS old', (db_path,))
+
+        with new_con:
+            new_tables = [t for t, in new_con.execute(
+                "select name from main.sqlite_master WHERE type='table'")
+                          if not t.startswith('sqlite') and t in old_tables]
+            for t in new_tables:
+                new_cols = [c[1] for c in new_con.execute('PRAGMA main.table_info({!s})'.format(t))]
+                cols = [c for c in new_cols if c in old_tables[t]]
+                if 'CONTENT_HASH' not in new_cols or 'CONTENT' not in old_tables[t]:
+                    new_con.execute('INSERT INTO main.{t!s}({c!s}) SELECT {c!s} FROM old.{t!s}'
+                                    .format(t=t, c=','.join(cols)))
+                    continue
+
+                stmt = 'INSERT INTO main.{t!s}({c!s},CONTENT_HASH) VALUES({p!s})'\
+                    .format(t=t, c=','.join(cols), p=','.join('?'*(len(cols)+1)))
+                records = new_con.execute('SELECT {c!s},CONTENT FROM old.{t!s} ORDER BY rowid'
+                                          .format(t=t, c=','.join(cols)))
+                for rec in records:
+                    content = rec[-1]
+                    hash_value = None
+                    if content is not None:
+                        content = bytes(content)
+                        hash_value = blob_key(content)
+                        packed = pack_content(content)
+                        cur = new_con.execute(
+                            'INSERT OR IGNORE INTO main.BLOBS(HASH,SIZE,CONTENT) VALUES(?,?,?)',
+                            (hash_value, len(content), packed))
+                        stats['records'] += 1
+                        stats['content_size'] += len(content)
+                        if cur.rowcount > 0:
+                            stats['blobs'] += 1
+                            stats['blobs_size'] += len(packed)
+                    new_con.execute(stmt, rec[:-1] + (hash_value,))
+
+        new_con.execute('DETACH DATABASE old')
+        new_con.close()
+
+        stats['old_db_size'] = os.path.getsize(db_path)
+        stats['new_db_size'] = os.path.getsize(new_path)
+        stats['backup'] = db_path + '.bak'
+        os.replace(db_path, stats['backup'])
+        os.replace(new_path, db_path)
+        self._known_blobs.clear()
+
+        return stats
+
     def column_names_from(self, table):
         return self._ref_names[table]
 
@@ -256,6 +432,7 @@ class Database(object):
 
         connection.create_function("REGEXP", 2, regexp)
         connection.create_function("BINREGEXP", 2, regexp_bin)
+        connection.create_function("UNPACK", 1, unpack_content, deterministic=True)
 
         while True:
 
@@ -272,7 +449,7 @@ class Database(object):
 
             last_stmt_error = True
             for stmt in sql_stmts:
-                sql_stmt, sql_params, outcome_type, sql_error = stmt
+                sql_stmt, sql_params, outcome_type, sql_error, on_success = stmt
                 try:
                     if sql_params is None:
                         cursor.execute(sql_stmt)
@@ -285,6 +462,8 @@ class Database(object):
                     last_stmt_error = True
                 else:
                     last_stmt_error = False
+                    if on_success is not None:
+                        on_success()
 
             if outcome_type is not None:
                 with self._sql_stmt_outcome_lock:
@@ -315,7 +494,8 @@ class Database(object):
             self._sql_handler_thread.join()
 
 
-    def submit_sql_stmt(self, stmt, params=None, outcome_type: Optional[int] = None, error_msg=''):
+    def submit_sql_stmt(self, stmt, params=None, outcome_type: Optional[int] = None, error_msg='',
+                        on_success=None):
         """
         This method is the only one that should submit request to the threaded SQL handler.
         It is also synchronized to guarantee request order (especially needed when you wait for
@@ -326,6 +506,8 @@ class Database(object):
             params (tuple): parameters
             outcome_type (int): type of the expected outcomes. If `None`, no outcomes are expected
             error_msg (str): specific error message to display in case of an error
+            on_success (callable): called by the SQL handler once the statement has been
+              committed
 
         Returns:
             `None` or the expected outcomes
@@ -333,7 +515,7 @@ class Database(object):
         with self._sync_lock:
 
             with self._sql_stmt_submitted_cond:
-                self._sql_stmt_list.append((stmt, params, outcome_type, error_msg))
+                self._sql_stmt_list.append((stmt, params, outcome_type, error_msg, on_success))
                 self._sql_stmt_submitted_cond.notify()
 
             if outcome_type is not None:
@@ -380,6 +562,12 @@ class Database(object):
             print("/!\\ WARNING /!\\: Fuddly's FmkDB unavailable because python-sqlite3 is not installed!")
             return False
 
+        if self.needs_migration():
+            print("*** ERROR: The database {:s} has been created by a previous version of fuddly. "
+                  "Convert it with 'fmkdb.py --fmkdb {:s} --migrate' ***"
+                  .format(self.fmk_db_path, self.fmk_db_path))
+            return False
+
         self._sql_handler_thread = threading.Thread(None, self._sql_handler, 'db_handler')
         self._sql_handler_thread.start()
 
@@ -443,9 +631,10 @@ class Database(object):
         if not self.enabled:
             return None
 
-        blob = sqlite3.Binary(raw_data)
+        # the content is not stored when the data can be regenerated (refer to insert_replay())
+        blob = None if raw_data is None else self._store_content(raw_data)
 
-        stmt = "INSERT INTO DATA(GROUP_ID,TYPE,DM_NAME,CONTENT,SIZE,SENT_DATE,ACK_DATE,"\
+        stmt = "INSERT INTO DATA(GROUP_ID,TYPE,DM_NAME,CONTENT_HASH,SIZE,SENT_DATE,ACK_DATE,"\
                "TARGET,PRJ_NAME)"\
                " VALUES(?,?,?,?,?,?,?,?,?)"
         params = (group_id, dtype, dm_name, blob, sz, sent_date, ack_date, str(target_ref), prj_name)
@@ -464,6 +653,33 @@ class Database(object):
         return self._data_id
 
 
+    def _store_content(self, raw_data):
+        """
+        Submit the storage of `raw_data` in the BLOBS table if it is not already there.
+
+        Returns:
+            bytes: the digest of `raw_data` to be used as a reference to the BLOBS table
+        """
+        hash_value = blob_key(raw_data)
+        with self._known_blobs_lock:
+            if hash_value in self._known_blobs:
+                self._known_blobs.move_to_end(hash_value)
+                return hash_value
+
+        def stored():
+            # the blob is only known once it is in the table
+            with self._known_blobs_lock:
+                self._known_blobs[hash_value] = None
+                if len(self._known_blobs) > self.BLOB_CACHE_SIZE:
+                    self._known_blobs.popitem(last=False)
+
+        stmt = "INSERT OR IGNORE INTO BLOBS(HASH,SIZE,CONTENT) VALUES(?,?,?)"
+        params = (hash_value, len(raw_data), PackedContent(raw_data))
+        err_msg = 'while inserting a value into table BLOBS!'
+        self.submit_sql_stmt(stmt, params=params, error_msg=err_msg, on_success=stored)
+
+        return hash_value
+
     def get_next_data_id(self, prev_id=None):
         if prev_id is None and self._data_id is None:
             return None
@@ -478,9 +694,9 @@ class Database(object):
         if not self.enabled:
             return None
 
-        blob = sqlite3.Binary(raw_data)
+        blob = self._store_content(raw_data)
 
-        stmt = "INSERT INTO ASYNC_DATA(CURRENT_DATA_ID,TYPE,DM_NAME,CONTENT,SIZE,SENT_DATE,"\
+        stmt = "INSERT INTO ASYNC_DATA(CURRENT_DATA_ID,TYPE,DM_NAME,CONTENT_HASH,SIZE,SENT_DATE,"\
                "TARGET,PRJ_NAME)"\
                " VALUES(?,?,?,?,?,?,?,?)"
 
@@ -552,10 +768,10 @@ class Database(object):
         if not self.enabled:
             return None
 
-        if content:
-            content = sqlite3.Binary(content)
+        if content is not None:
+            content = self._store_content(content)
 
-        stmt = "INSERT INTO FEEDBACK(DATA_ID,SOURCE,DATE,CONTENT,STATUS)"\
+        stmt = "INSERT INTO FEEDBACK(DATA_ID,SOURCE,DATE,CONTENT_HASH,STATUS)"\
                " VALUES(?,?,?,?,?)"
         params = (data_id, str(source), timestamp, content, status_code)
         err_msg = 'while inserting a value into table FEEDBACK!'
@@ -600,6 +816,50 @@ class Database(object):
         err_msg = 'while inserting a value into table FMKINFO!'
         self.submit_sql_stmt(stmt, params=params, error_msg=err_msg)
 
+    def insert_evolution_stats(self, population, generation, size, best_score, mean_score,
+                               worst_score, date, prj_name):
+        if not self.enabled:
+            return None
+
+        stmt = "INSERT INTO EVOLUTION_STATS(POPULATION,GENERATION,SIZE,BEST_SCORE,MEAN_SCORE,"\
+               "WORST_SCORE,DATE,PRJ_NAME)"\
+               " VALUES(?,?,?,?,?,?,?,?)"
+        params = (population, generation, size, best_score, mean_score, worst_score, date, prj_name)
+        err_msg = 'while inserting a value into table EVOLUTION_STATS!'
+        self.submit_sql_stmt(stmt, params=params, error_msg=err_msg)
+
+    def insert_perf(self, data_id, generation, disruption, to_bytes, sending, tg_readiness,
+                    feedback, probes, fmkdb):
+        if not self.enabled:
+            return None
+
+        stmt = "INSERT OR REPLACE INTO PERF(ID,GENERATION,DISRUPTION,TO_BYTES,SENDING,"\
+               "TG_READINESS,FEEDBACK,PROBES,FMKDB)"\
+               " VALUES(?,?,?,?,?,?,?,?,?)"
+        params = (data_id, generation, disruption, to_bytes, sending, tg_readiness,
+                  feedback, probes, fmkdb)
+        err_msg = 'while inserting a value into table PERF!'
+        self.submit_sql_stmt(stmt, params=params, error_msg=err_msg)
+
+    def insert_replay(self, data_id, seed, case_index, chain, content_hash):
+        if not self.enabled:
+            return None
+
+        stmt = "INSERT OR REPLACE INTO REPLAY(DATA_ID,SEED,CASE_INDEX,CHAIN,CONTENT_HASH)"\
+               " VALUES(?,?,?,?,?)"
+        params = (data_id, seed, case_index, sqlite3.Binary(chain), content_hash)
+        err_msg = 'while inserting a value into table REPLAY!'
+        self.submit_sql_stmt(stmt, params=params, error_msg=err_msg)
+
+    def insert_data_content(self, data_id, raw_data):
+        if not self.enabled:
+            return None
+
+        stmt = "UPDATE DATA SET CONTENT_HASH = ? WHERE ID == ?"
+        params = (self._store_content(raw_data), data_id)
+        err_msg = 'while updating the content of a data in table DATA!'
+        self.submit_sql_stmt(stmt, params=params, error_msg=err_msg)
+
     def insert_analysis(self, data_id, content, date, impact=False):
         if not self.enabled:
             return None
@@ -615,21 +875,31 @@ class Database(object):
 
         stmt = \
             '''
-            SELECT DATA.ID, DATA.CONTENT, DATA.TYPE, DMAKERS.NAME, DATA.DM_NAME
+            SELECT DATA.ID, {content:s}, DATA.TYPE, DMAKERS.NAME, DATA.DM_NAME
             FROM DATA INNER JOIN DMAKERS
               ON DATA.TYPE = DMAKERS.TYPE AND DATA.DM_NAME = DMAKERS.DM_NAME AND DMAKERS.CLONE_TYPE IS NULL
             WHERE DATA.ID >= {sid:d} {ign_eid:s} AND DATA.ID <= {eid:d}
             UNION ALL
-            SELECT DATA.ID, DATA.CONTENT, DMAKERS.CLONE_TYPE AS TYPE, DMAKERS.CLONE_NAME AS NAME,
+            SELECT DATA.ID, {content:s}, DMAKERS.CLONE_TYPE AS TYPE, DMAKERS.CLONE_NAME AS NAME,
                    DATA.DM_NAME
             FROM DATA INNER JOIN DMAKERS
               ON DATA.TYPE = DMAKERS.TYPE AND DMAKERS.CLONE_TYPE IS NOT NULL
             WHERE DATA.ID >= {sid:d} {ign_eid:s} AND DATA.ID <= {eid:d}
-            '''.format(sid = start_id, eid = end_id, ign_eid = ign_end_id)
+            '''.format(sid = start_id, eid = end_id, ign_eid = ign_end_id, content=content_of('DATA'))
 
         ret = self.submit_sql_stmt(stmt, outcome_type=Database.OUTCOME_DATA)
         return ret
 
+    def fetch_replay_recipe(self, data_id):
+        """
+        Returns:
+            tuple: (seed, case_index, chain, content_hash) or `None` if the data has not
+            been recorded for replay
+        """
+        stmt = "SELECT SEED, CASE_INDEX, CHAIN, CONTENT_HASH FROM REPLAY WHERE DATA_ID == ?"
+        ret = self.submit_sql_stmt(stmt, params=(data_id,), outcome_type=Database.OUTCOME_DATA)
+        return ret[0] if ret else None
+
 
     def _get_color_function(self, colorized):
         if not colorized:
@@ -643,8 +913,8 @@ class Database(object):
         colorize = self._get_color_function(colorized)
 
         data = self.execute_sql_statement(
-            "SELECT * FROM DATA "
-            "WHERE ID == {data_id:d};".format(data_id=data_id)
+            "SELECT ID, GROUP_ID, TYPE, DM_NAME, {content:s}, SIZE, SENT_DATE, ACK_DATE, TARGET, PRJ_NAME "
+            "FROM DATA WHERE ID == {data_id:d};".format(data_id=data_id, content=content_of('DATA'))
         )
 
         if not data:
@@ -674,7 +944,7 @@ class Database(object):
         )
 
         async_data = self.execute_sql_statement(
-            f"SELECT ID, CURRENT_DATA_ID, TYPE, DM_NAME, CONTENT, SIZE, SENT_DATE,"
+            f"SELECT ID, CURRENT_DATA_ID, TYPE, DM_NAME, {content_of('ASYNC_DATA')}, SIZE, SENT_DATE,"
             f"       TARGET, PRJ_NAME FROM ASYNC_DATA "
             f"WHERE PRJ_NAME == ?"
             f"  AND ( CURRENT_DATA_ID == ?"
@@ -692,17 +962,17 @@ class Database(object):
 
         if fbk_src:
             feedback = self.execute_sql_statement(
-                "SELECT SOURCE, DATE, STATUS, CONTENT FROM FEEDBACK "
+                "SELECT SOURCE, DATE, STATUS, {content:s} FROM FEEDBACK "
                 "WHERE DATA_ID == ? AND SOURCE REGEXP ? "
-                "ORDER BY SOURCE ASC;",
+                "ORDER BY SOURCE ASC;".format(content=content_of('FEEDBACK')),
                 params=(data_id, fbk_src)
             )
         else:
             feedback = self.execute_sql_statement(
-                "SELECT SOURCE, DATE, STATUS, CONTENT FROM FEEDBACK "
+                "SELECT SOURCE, DATE, STATUS, {content:s} FROM FEEDBACK "
                 "WHERE DATA_ID == {data_id:d} "
                 "ORDER BY SOURCE"
-                " ASC;".format(data_id=data_id)
+                " ASC;".format(data_id=data_id, content=content_of('FEEDBACK'))
             )
 
         comments = self.execute_sql_statement(
@@ -931,7 +1201,10 @@ class Database(object):
         msg = ''
         if with_data:
             msg += colorize("\n Sent Data:\n", rgb=Color.FMKINFOGROUP)
-            if decode_data:
+            if data_content is None:
+                msg += colorize("Not stored (it can be regenerated from its data makers)",
+                                rgb=Color.WARNING)
+            elif decode_data:
                 atom_name = data_type.lower() if user_atom_name is None else user_atom_name
                 msg += decoder_func(data_content, atom_name=atom_name, colorized=colorized)
             else:
@@ -1126,14 +1399,15 @@ class Database(object):
 
         if last is not None:
             records = self.execute_sql_statement(
-                "SELECT ID, TYPE, DM_NAME, SENT_DATE, CONTENT FROM DATA "
+                "SELECT ID, TYPE, DM_NAME, SENT_DATE, {content:s} FROM DATA "
                 "WHERE {start:d} <= ID and ID <= {end:d};".format(start=first,
-                                                                  end=last)
+                                                                  end=last,
+                                                                  content=content_of('DATA'))
             )
         else:
             records = self.execute_sql_statement(
-                "SELECT ID, TYPE, DM_NAME, SENT_DATE, CONTENT FROM DATA "
-                "WHERE ID == {data_id:d};".format(data_id=first)
+                "SELECT ID, TYPE, DM_NAME, SENT_DATE, {content:s} FROM DATA "
+                "WHERE ID == {data_id:d};".format(data_id=first, content=content_of('DATA'))
             )
 
         if records:
@@ -1145,6 +1419,11 @@ class Database(object):
             for rec in records:
                 data_id, data_type, dm_name, sent_date, content = rec
 
+                if content is None:
+                    print(colorize("*** Data ID #{:d} has not been stored (it can be regenerated "
+                                   "from its data makers) ***".format(data_id), rgb=Color.WARNING))
+                    continue
+
                 file_extension = dm_name
 
                 if sent_date is None:
@@ -1185,6 +1464,12 @@ class Database(object):
         if not self.check_data_existence(data_id, colorized=colorized):
             return
 
+        hashes = self.execute_sql_statement(
+            "SELECT CONTENT_HASH FROM DATA WHERE ID == {data_id:d} "
+            "UNION SELECT CONTENT_HASH FROM FEEDBACK "
+            "WHERE DATA_ID == {data_id:d};".format(data_id=data_id)
+        )
+
         comments = self.execute_sql_statement(
             "DELETE FROM COMMENTS "
             "WHERE DATA_ID == {data_id:d};".format(data_id=data_id)
@@ -1205,11 +1490,36 @@ class Database(object):
             "WHERE DATA_ID == {data_id:d};".format(data_id=data_id)
         )
 
+        perf = self.execute_sql_statement(
+            "DELETE FROM PERF "
+            "WHERE ID == {data_id:d};".format(data_id=data_id)
+        )
+
+        replay = self.execute_sql_statement(
+            "DELETE FROM REPLAY "
+            "WHERE DATA_ID == {data_id:d};".format(data_id=data_id)
+        )
+
         data = self.execute_sql_statement(
             "DELETE FROM DATA "
             "WHERE ID == {data_id:d};".format(data_id=data_id)
         )
 
+        # contents are shared between records, thus only the orphaned ones are removed
+        hashes = [h for h, in hashes or [] if h is not None]
+        if hashes:
+            self.execute_sql_statement(
+                "DELETE FROM BLOBS WHERE HASH IN ({:s}) "
+                "AND NOT EXISTS (SELECT 1 FROM DATA WHERE CONTENT_HASH == BLOBS.HASH) "
+                "AND NOT EXISTS (SELECT 1 FROM FEEDBACK WHERE CONTENT_HASH == BLOBS.HASH) "
+                "AND NOT EXISTS (SELECT 1 FROM ASYNC_DATA WHERE CONTENT_HASH == BLOBS.HASH);"
+                .format(','.join('?'*len(hashes))),
+                params=hashes
+            )
+            with self._known_blobs_lock:
+                for h in hashes:
+                    self._known_blobs.pop(h, None)
+
         print(colorize("*** Data {:d} and all related records have been removed ***".format(data_id),
                        rgb=Color.FMKINFO))
 
@@ -1338,13 +1648,14 @@ class Database(object):
 
         if fbk_src:
             fbk_records = self.execute_sql_statement(
-                "SELECT DATA_ID, STATUS, SOURCE, CONTENT FROM FEEDBACK "
-                "WHERE SOURCE REGEXP ?;",
+                "SELECT DATA_ID, STATUS, SOURCE, {content:s} FROM FEEDBACK "
+                "WHERE SOURCE REGEXP ?;".format(content=content_of('FEEDBACK')),
                 params=(fbk_src,)
             )
         else:
             fbk_records = self.execute_sql_statement(
-                "SELECT DATA_ID, STATUS, SOURCE, CONTENT FROM FEEDBACK;"
+                "SELECT DATA_ID, STATUS, SOURCE, {content:s} FROM FEEDBACK;".format(
+                    content=content_of('FEEDBACK'))
             )
 
         prj_records = self.get_project_record(prj_name)
@@ -1404,14 +1715,15 @@ class Database(object):
 
         if fbk_src:
             fbk_records = self.execute_sql_statement(
-                "SELECT DATA_ID, CONTENT, SOURCE FROM FEEDBACK "
-                "WHERE SOURCE REGEXP ? AND BINREGEXP(?,CONTENT);",
+                "SELECT * FROM (SELECT DATA_ID, {content:s} AS CONTENT, SOURCE FROM FEEDBACK "
+                "               WHERE SOURCE REGEXP ?) "
+                "WHERE BINREGEXP(?,CONTENT);".format(content=content_of('FEEDBACK')),
                 params=(fbk_src, fbk)
             )
         else:
             fbk_records = self.execute_sql_statement(
-                "SELECT DATA_ID, CONTENT, SOURCE FROM FEEDBACK "
-                "WHERE BINREGEXP(?,CONTENT);",
+                "SELECT * FROM (SELECT DATA_ID, {content:s} AS CONTENT, SOURCE FROM FEEDBACK) "
+                "WHERE BINREGEXP(?,CONTENT);".format(content=content_of('FEEDBACK')),
                 params=(fbk,)
             )
 
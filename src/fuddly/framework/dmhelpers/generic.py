@@ -174,6 +174,22 @@ class MH(object):
 ################################
 
 
+def _rebuildable(template):
+    """
+    Make the *generators* returned by the `template` rebuildable from the parameters
+    they have been created with, as they are defined locally and thus cannot be
+    serialized directly (refer to :class:`fuddly.framework.data_model.DataModelCache`).
+    """
+    @functools.wraps(template)
+    def wrapper(*args, **kwargs):
+        gen = template(*args, **kwargs)
+        gen.rebuild_info = (wrapper, args, kwargs)
+        return gen
+
+    return wrapper
+
+
+@_rebuildable
 def LEN(vt=fvt.INT_str, base_len=0,
         set_attrs=None, clear_attrs=None, after_encoding=True, freezable=False):
     """
@@ -219,6 +235,7 @@ def LEN(vt=fvt.INT_str, base_len=0,
     return Length(vt, set_attrs, clear_attrs)
 
 
+@_rebuildable
 def QTY(node_name, vt=fvt.INT_str,
         set_attrs=None, clear_attrs=None, freezable=False):
     """
@@ -254,6 +271,7 @@ def QTY(node_name, vt=fvt.INT_str,
     return Qty(node_name, vt, set_attrs, clear_attrs)
 
 
+@_rebuildable
 def TIMESTAMP(time_format="%H%M%S", utc=False,
               set_attrs=None, clear_attrs=None):
     """
@@ -278,6 +296,7 @@ def TIMESTAMP(time_format="%H%M%S", utc=False,
     return functools.partial(timestamp, time_format, utc, set_attrs, clear_attrs)
 
 
+@_rebuildable
 def CRC(vt=fvt.INT_str, poly=0x104c11db7, init_crc=0, xor_out=0xFFFFFFFF, rev=True,
         set_attrs=None, clear_attrs=None, after_encoding=True, freezable=False,
         base=16, letter_case='upper', min_sz=4, reverse_str=False):
@@ -356,6 +375,7 @@ def CRC(vt=fvt.INT_str, poly=0x104c11db7, init_crc=0, xor_out=0xFFFFFFFF, rev=Tr
 
 
 
+@_rebuildable
 def WRAP(func, vt=fvt.String,
          set_attrs=None, clear_attrs=None, after_encoding=True, freezable=False):
     """
@@ -414,6 +434,7 @@ def WRAP(func, vt=fvt.String,
     return WrapFunc(vt, func, set_attrs, clear_attrs)
 
 
+@_rebuildable
 def CYCLE(vals, depth=1, vt=fvt.String,
           set_attrs=None, clear_attrs=None):
     """
@@ -466,6 +487,7 @@ def CYCLE(vals, depth=1, vt=fvt.String,
     return Cycle(vals, depth, vt, set_attrs, clear_attrs)
 
 
+@_rebuildable
 def OFFSET(use_current_position=True, depth=1, vt=fvt.INT_str,
            set_attrs=None, clear_attrs=None, after_encoding=True, freezable=False):
     """
@@ -550,6 +572,7 @@ def OFFSET(use_current_position=True, depth=1, vt=fvt.INT_str,
     return Offset(use_current_position, depth, vt, set_attrs, clear_attrs)
 
 
+@_rebuildable
 def COPY_VALUE(path, depth=None, vt=None,
                set_attrs=None, clear_attrs=None, after_encoding=True):
     """
@@ -633,6 +656,7 @@ def COPY_VALUE(path, depth=None, vt=None,
     return CopyValue(path, depth, vt, set_attrs, clear_attrs)
 
 
+@_rebuildable
 def SELECT(idx=None, path=None, filter_func=None, fallback_node=None, clone=True,
            set_attrs=None, clear_attrs=None):
     """
@@ -28,12 +28,21 @@ import copy
 import binascii
 
 from fuddly.framework.global_resources import *
+from fuddly.libs.external_modules import numpy_module, np
+
+# BIT_REVERSE_TABLE[x] is x with its bits order reversed
+BIT_REVERSE_TABLE = bytes(int('{:08b}'.format(x)[::-1], 2) for x in range(256))
 
 class EncoderUnrecognizedValueError(Exception): pass
 class EncoderSizeNotFoundError(Exception): pass
 
 class Encoder(object):
 
+    #: Size alignment (in bytes) of the input chunks that can be encoded separately and then
+    #: concatenated to get the encoded value of the whole input.
+    #: `None` if the encoding of the input cannot be split.
+    stream_alignment = None
+
     def __init__(self, encoding_arg=None):
         self.encoding_arg = encoding_arg
         self.reset()
@@ -75,6 +84,54 @@ class Encoder(object):
         """
         raise NotImplementedError
 
+    def encode_many(self, vals):
+        """
+        Encode a batch of values. Can be overloaded by encoders that can
+        process several values at once more efficiently.
+
+        Args:
+            vals (list): the values (bytes)
+
+        Returns:
+            list: the encoded values
+        """
+        return [self.encode(v) for v in vals]
+
+    def decode_many(self, vals):
+        """
+        Decode a batch of encoded values. Can be overloaded by encoders that can
+        process several values at once more efficiently.
+
+        Args:
+            vals (list): the encoded values (bytes)
+
+        Returns:
+            list: the decoded values
+        """
+        return [self.decode(v) for v in vals]
+
+    def encode_stream(self, val, chunk_size=65536):
+        """
+        Generator that encodes `val` chunk by chunk, without copying it, if the encoder
+        supports it (refer to :attr:`stream_alignment`). Otherwise the whole encoded value
+        is produced at once.
+
+        Args:
+            val: bytes-like object (e.g., ``memoryview``) to encode
+            chunk_size (int): size of the chunks (rounded down to the stream alignment)
+
+        Yields:
+            bytes: the successive parts of the encoded value
+        """
+        view = memoryview(val).cast('B')
+        if self.stream_alignment is None:
+            yield self.encode(view.tobytes())
+            return
+
+        chunk_size = max(chunk_size - chunk_size % self.stream_alignment, self.stream_alignment)
+        for off in range(0, max(len(view), 1), chunk_size):
+            yield self.encode(view[off:off+chunk_size])
+
     def init_encoding_scheme(self, arg):
         """
         To be optionally overloaded by a subclass that deals with encoding,
@@ -171,8 +228,34 @@ class Wrap_Enc(Encoder):
 
 
 class GSM7bitPacking_Enc(Encoder):
+    """
+    GSM 7-bit default alphabet packing (3GPP TS 23.038): each character is a septet, and
+    8 septets are packed in 7 bytes. Accepts bytes-like objects.
+    """
+
+    stream_alignment = 8
+
+    # NumPy is used from this size (smaller values are packed through Python integers)
+    numpy_threshold = 64
 
     def encode(self, msg):
+        if msg and max(msg) > 0x7F:
+            # not GSM 7-bit characters, the legacy algorithm is kept for them
+            return self._encode_generic(msg)
+
+        msg_sz = len(msg)
+        enc_sz = (msg_sz * 7 + 7) // 8
+        if numpy_module and msg_sz >= self.numpy_threshold:
+            septets = np.frombuffer(msg, dtype=np.uint8)
+            bits = np.unpackbits(septets[:, None], axis=1, bitorder='little')[:, :7]
+            return np.packbits(bits.ravel(), bitorder='little').tobytes()
+
+        packed = 0
+        for c in reversed(bytes(msg)):
+            packed = (packed << 7) | c
+        return packed.to_bytes(enc_sz, 'little')
+
+    def _encode_generic(self, msg):
         msg_sz = len(msg)
         l = []
         idx = 0
@@ -189,70 +272,83 @@ class GSM7bitPacking_Enc(Encoder):
             idx = c_idx + 1
             off_cpt += 1
 
-        return b''.join(map(lambda x: struct.pack('B', x), l))
+        return bytes(l)
 
     def decode(self, msg):
         msg_sz = len(msg)
-        l = []
-        c_idx = 0
-        off_cpt = 0
-        lsb = 0
-        while c_idx < msg_sz:
-            off = off_cpt % 7
-            if off == 0 and off_cpt > 0:
-                l.append(lsb)
-                lsb = 0
-            if c_idx < msg_sz:
-                l.append(((msg[c_idx]<<off)&0x007F)+lsb)
-                lsb = msg[c_idx]>>(7-off)
-            c_idx += 1
-            off_cpt += 1
+        if msg_sz == 0:
+            return b''
+
+        # a trailing septet is not decoded when the size is a multiple of 7
+        dec_sz = msg_sz + (msg_sz - 1) // 7
+        if numpy_module and msg_sz >= self.numpy_threshold:
+            bits = np.unpackbits(np.frombuffer(msg, dtype=np.uint8), bitorder='little')
+            septets = bits[:dec_sz * 7].reshape(dec_sz, 7)
+            return np.packbits(septets, axis=1, bitorder='little').tobytes()
 
-        return b''.join(map(lambda x: struct.pack('B', x), l))
+        packed = int.from_bytes(msg, 'little')
+        return bytes((packed >> (7 * i)) & 0x7F for i in range(dec_sz))
 
 class GSMPhoneNum_Enc(Encoder):
+    """
+    Encode a phone number (string of digits) in semi-octets, as in GSM messages.
+    Accepts bytes-like objects.
+    """
+
+    stream_alignment = 2
 
     def encode(self, msg):
-        tel = msg
-        tel_sz = len(tel)
-        tel_num = b''
-        for idx in range(0, tel_sz, 2):
-            if idx+1<tel_sz:
-                tel_num += tel[idx+1:idx+2]+tel[idx:idx+1]
-            else:
-                tel_num += b'F'+tel[idx:idx+1]
+        tel = bytes(msg)
+        if len(tel) % 2:
+            tel += b'F'
+        # swap the digits of each pair
+        tel_num = bytearray(tel)
+        tel_num[0::2] = tel[1::2]
+        tel_num[1::2] = tel[0::2]
         return binascii.a2b_hex(tel_num)
 
     def decode(self, msg):
         tel_num = binascii.b2a_hex(msg)
         zone = tel_num[0:2]
         tel_num = tel_num[2:]
-        dec = b''
-        tel_sz = len(tel_num)
-        for idx in range(0, tel_sz, 2):
-            if idx+1<tel_sz:
-                dec += tel_num[idx+1:idx+2]+tel_num[idx:idx+1]
+        dec = bytearray(tel_num)
+        dec[0::2] = tel_num[1::2]
+        dec[1::2] = tel_num[0::2]
         if dec[-1:] == b'f':
             dec = dec[:-1]
-        return zone+dec
+        return zone+bytes(dec)
 
 class BitReverse_Enc(Encoder):
+    """
+    Reverse the bits order of the whole value. Accepts bytes-like objects.
+    """
 
     def _reverse_bits(self, x, nb_bits=8):
         """ Reverse bits order of x """
+        if nb_bits == 8:
+            return BIT_REVERSE_TABLE[x]
         return sum(1<<(nb_bits-1-i) for i in range(nb_bits) if x>>i&1)
 
     def encode(self, val):
-        sz = len(val)
-        byte_list = struct.unpack('B'*sz, val)
-        rev_list = b''
-        for b in byte_list[::-1]:
-            rev_list += struct.pack('B', self._reverse_bits(b))
-        return rev_list
+        return bytes(val)[::-1].translate(BIT_REVERSE_TABLE)
 
     def decode(self, val):
         return self.encode(val)
 
+    def encode_many(self, vals):
+        # all the values are translated at once
+        sizes = [len(v) for v in vals]
+        translated = b''.join(vals).translate(BIT_REVERSE_TABLE)
+        encoded = []
+        off = 0
+        for sz in sizes:
+            encoded.append(translated[off:off+sz][::-1])
+            off += sz
+        return encoded
+
+    def decode_many(self, vals):
+        return self.encode_many(vals)
+
 class BitInverter_Enc(Encoder, EncoderAbsorptionHelper):
 
     def encode(self, byte_str):
@@ -260,19 +356,7 @@ class BitInverter_Enc(Encoder, EncoderAbsorptionHelper):
             return b''
 
         # inverse bit order of val
-        int8_val = byte_str[0]
-        int8_val_inv = 0
-        int8_val_inv += (int8_val << 7) & 0x80
-        int8_val_inv += (int8_val << 5) & 0x40
-        int8_val_inv += (int8_val << 3) & 0x20
-        int8_val_inv += (int8_val << 1) & 0x10
-        int8_val_inv += (int8_val >> 7) & 0x01
-        int8_val_inv += (int8_val >> 5) & 0x02
-        int8_val_inv += (int8_val >> 3) & 0x04
-        int8_val_inv += (int8_val >> 1) & 0x08
-        inverted_byte_str = struct.pack('B', int8_val_inv)
-
-        return inverted_byte_str
+        return BIT_REVERSE_TABLE[byte_str[0]:byte_str[0]+1]
 
     def decode(self, byte_str):
         return self.encode(byte_str)
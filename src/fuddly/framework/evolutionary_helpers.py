@@ -26,13 +26,17 @@ import math
 import re
 import functools
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from operator import attrgetter
 
 from fuddly.framework.tactics_helpers import *
 from fuddly.framework.global_resources import UI
 from fuddly.framework.scenario import *
+from fuddly.framework.monitor import Probe
+from fuddly.framework.target_helpers import Target
 from fuddly.framework.error_handling import ExtinctPopulationError, PopulationError, CrossOverError
 from fuddly.framework.data import DataProcess
+from fuddly.framework.replay import ReplayRecorder
 
 class Population(object):
     """ Population to be used within an evolutionary scenario """
@@ -107,19 +111,24 @@ class Individual(object):
         raise NotImplementedError
 
 class CrossoverHelper(object):
+    """ Swap nodes between two individuals in place (parents to keep unaltered are copied first) """
 
     class Operand(object):
 
         def __init__(self, node):
             self.node = node
-            self.leafs = []
-
+            # path -> node table, filled during a single walk of the graph, so that the
+            # crossover points do not need to be searched for again
+            self.nodes = {}
             for path, node in self.node.iter_paths():
-                if node.is_term() and path not in self.leafs:
-                    self.leafs.append(path)
+                self.nodes.setdefault(path, node)
+            self.leafs = [path for path, node in self.nodes.items() if node.is_term()]
 
             self.shared = None
 
+        def get_node(self, path):
+            return self.nodes[path]
+
         def compute_sub_graphs(self, percentage):
             random.shuffle(self.leafs)
             self.shared = self.leafs[:int(round(len(self.leafs) * percentage))]
@@ -136,15 +145,15 @@ class CrossoverHelper(object):
 
                     current_path = self.shared[index]
 
-                    slash_index = current_path[::-1].find('/')
+                    slash_index = current_path.rfind('/')
                     # check if we are dealing with the root node
                     if slash_index == -1:
                         index += 1
                         continue
 
-                    parent_path = current_path[:-current_path[::-1].find('/') - 1]
+                    parent_path = current_path[:slash_index]
                     children_nb = self._count_brothers(index, parent_path)
-                    if children_nb == self.node.get_first_node_by_path(parent_path).cc.get_subnode_qty():
+                    if children_nb == self.nodes[parent_path].cc.get_subnode_qty():
                         self._merge_brothers(index, parent_path, children_nb)
                         change = True
                         index += 1
@@ -152,11 +161,11 @@ class CrossoverHelper(object):
                     else:
                         index += children_nb
 
-        def _count_brothers(self, index, pattern):
+        def _count_brothers(self, index, parent_path):
             count = 1
-            p = re.compile(u'^' + pattern + '($|/*)')
+            prefix = parent_path + '/'
             for i in range(index + 1, len(self.shared)):
-                if re.match(p, self.shared[i]) is not None:
+                if self.shared[i].startswith(prefix):
                     count += 1
             return count
 
@@ -167,10 +176,11 @@ class CrossoverHelper(object):
 
     @staticmethod
     def _swap_nodes(node_1, node_2):
-        node_2_copy = node_2.get_clone()
+        # set_contents() already performs a deep copy, thus only one
+        # temporary clone is needed to swap the two nodes
         node_1_copy = node_1.get_clone()
+        node_1.set_contents(node_2)
         node_2.set_contents(node_1_copy)
-        node_1.set_contents(node_2_copy)
 
     @staticmethod
     def _get_nodes(node):
@@ -228,8 +238,8 @@ class CrossoverHelper(object):
         swap_nb = len(ind_1_operand.shared) if len(ind_1_operand.shared) < len(ind_2_operand.shared) else len(ind_2_operand.shared)
 
         for i in range(swap_nb):
-            node_1 = ind_1_operand.node.get_first_node_by_path(ind_1_operand.shared[i])
-            node_2 = ind_2_operand.node.get_first_node_by_path(ind_2_operand.shared[i])
+            node_1 = ind_1_operand.get_node(ind_1_operand.shared[i])
+            node_2 = ind_2_operand.get_node(ind_2_operand.shared[i])
             cls._swap_nodes(node_1, node_2)
 
         cls._add_default_crossover_info(ind_1, ind_2,
@@ -383,11 +393,174 @@ class DefaultPopulation(Population):
         return self.__class__.__name__ + '[max_sz={}, max_gen={}]'.format(self.MAX_SIZE, self.MAX_GENERATION_NB)
 
 
+class FeedbackFitness(object):
+    """
+    Fitness function computing the score of an individual from the feedback retrieved after
+    its sending. The more the target has been impacted (negative feedback status), the higher the score.
+
+    Args:
+        target_weight (float): weight of the status reported by the targets (and by any other
+          feedback source which is not a probe)
+        probe_weight (float): weight of the status reported by the probes
+        coverage_func (func): optional function that takes an individual as parameter and return
+          a coverage metric (e.g., the number of new edges reached within the target)
+        coverage_weight (float): weight of the metric returned by ``coverage_func``
+    """
+
+    def __init__(self, target_weight=1.0, probe_weight=1.0, coverage_func=None, coverage_weight=1.0):
+        self.target_weight = target_weight
+        self.probe_weight = probe_weight
+        self.coverage_func = coverage_func
+        self.coverage_weight = coverage_weight
+
+    def __call__(self, individual):
+        score = 0.0
+        if individual.feedback:
+            for src, status, _, _ in individual.feedback:
+                if status is None or status >= 0:
+                    continue
+                weight = self.probe_weight if isinstance(src.obj, Probe) else self.target_weight
+                score += weight * -status
+
+        if self.coverage_func is not None:
+            score += self.coverage_weight * self.coverage_func(individual)
+
+        return score
+
+
+class EvolutionaryPopulation(DefaultPopulation):
+    """
+    Population driven by a fitness function (by default a :class:`FeedbackFitness`).
+    Survivors are selected through tournaments, the best individuals being kept
+    unaltered from one generation to the next (elitism).
+    """
+
+    def _initialize(self, init_process, max_size=100, max_generation_nb=50,
+                    crossover_algo=CrossoverHelper.crossover_algo1,
+                    fitness=None, elite_nb=2, tournament_size=3, survival_rate=0.5,
+                    workers=None, record_stats=True):
+        """
+            Configure the population
+
+            Args:
+                init_process (string): individuals that compose this population will be built using
+                  the provided :class:`framework.data.DataProcess`
+                max_size (integer): maximum size of the population to manipulate
+                max_generation_nb (integer): criteria used to stop the evolution process
+                crossover_algo (func): Crossover algorithm to use
+                fitness (func): function that takes an individual and return its score.
+                  If ``None``, a :class:`FeedbackFitness` with default weights is used.
+                elite_nb (integer): number of the best individuals that go through the next
+                  generation without being mutated
+                tournament_size (integer): number of individuals competing in each tournament
+                survival_rate (float): ratio of the population that survives to each generation
+                workers (integer): if greater than 1, the crossovers are performed
+                  by a pool of ``workers`` threads
+                record_stats (bool): if ``True``, the fitness statistics of each generation are
+                  recorded in the table ``EVOLUTION_STATS`` of the FmkDB
+        """
+        DefaultPopulation._initialize(self, init_process, max_size=max_size,
+                                      max_generation_nb=max_generation_nb,
+                                      crossover_algo=crossover_algo)
+        assert 0 < survival_rate <= 1
+        assert tournament_size >= 1
+
+        self.fitness = FeedbackFitness() if fitness is None else fitness
+        self.elite_nb = elite_nb
+        self.tournament_size = tournament_size
+        self.survival_rate = survival_rate
+        self.workers = workers
+        self.record_stats = record_stats
+        self._elites = []
+
+    def reset(self):
+        DefaultPopulation.reset(self)
+        self._elites = []
+
+    def _compute_scores(self):
+        for individual in self._individuals:
+            individual.score = self.fitness(individual)
+
+        if self.record_stats:
+            self._fmk.fmkdb_insert_evolution_stats(self, self.generation,
+                                                   [ind.score for ind in self._individuals])
+
+    def _tournament(self, candidates):
+        contenders = random.sample(candidates, min(self.tournament_size, len(candidates)))
+        return max(contenders, key=attrgetter('score'))
+
+    def _kill(self):
+        """ Keep the elites and select the other survivors through tournaments """
+        ranked = sorted(self._individuals, key=attrgetter('score'), reverse=True)
+        survivors_nb = max(2, int(math.ceil(len(ranked) * self.survival_rate)))
+
+        self._elites = ranked[:min(self.elite_nb, survivors_nb)]
+        candidates = ranked[len(self._elites):]
+        survivors = list(self._elites)
+        while len(survivors) < survivors_nb and candidates:
+            winner = self._tournament(candidates)
+            candidates.remove(winner)
+            survivors.append(winner)
+
+        self._individuals = survivors
+
+    def _mutate(self):
+        """ Mutate every survivor except the elites """
+        # mutation relies on the framework (disruptor C), thus it is not parallelized
+        for individual in self._individuals:
+            if individual not in self._elites:
+                individual.mutate()
+
+    def _crossover(self):
+        """ Compensates the kills through crossovers between parents selected by tournaments """
+        parents = list(self._individuals)
+        if len(parents) < 2:
+            return
+
+        pairs = []
+        nb = self.MAX_SIZE - len(self._individuals)
+        while nb > 0:
+            ind_1 = self._tournament(parents)
+            ind_2 = self._tournament([p for p in parents if p is not ind_1])
+            # parents are not altered, especially the elites
+            pairs.append((copy.copy(ind_1.data), copy.copy(ind_2.data)))
+            nb -= 2
+
+        def cross(pair):
+            try:
+                return self.crossover_algo(*pair)
+            except CrossOverError:
+                return ()
+
+        if self.workers is not None and self.workers > 1:
+            # each crossover uses its own generator, seeded from the shared one, so that the
+            # offspring does not depend on the scheduling of the workers
+            seed = random.getrandbits(63)
+
+            def seeded_cross(idx, pair):
+                with ReplayRecorder.seeded_rng(seed, idx):
+                    return cross(pair)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                offspring = list(executor.map(seeded_cross, range(len(pairs)), pairs))
+        else:
+            offspring = list(map(cross, pairs))
+
+        for children in offspring:
+            for data in children:
+                if len(self._individuals) >= self.MAX_SIZE:
+                    break
+                self._individuals.append(DefaultIndividual(self._fmk, data))
+
+    def __repr__(self):
+        return self.__class__.__name__ + '[max_sz={}, max_gen={}, elites={}]'\
+            .format(self.MAX_SIZE, self.MAX_GENERATION_NB, self.elite_nb)
+
 
 class EvolutionaryScenariosFactory(object):
 
     @staticmethod
-    def build(fmk, name, population_cls, args):
+    def build(fmk, name, population_cls, args, vtg_ids=None):
         """
         Create a scenario that takes advantage of an evolutionary approach
         Args:
@@ -395,22 +568,57 @@ class EvolutionaryScenariosFactory(object):
             name (string): name of the scenario to create
             population_cls (classobj): population class to instantiate
             args (dict of str: object): arguments that will be used to instantiate a population
+            vtg_ids (list): virtual IDs of the targets to use. If more than one is provided,
+              each step sends one individual to each target, and the feedback of each target
+              (and of its related probes) is attributed to the individual it received. The
+              feedback that cannot be related to a target is ignored.
 
         Returns:
             Scenario : evolutionary scenario
         """
 
         population = population_cls(fmk, **args)
+        generator_name = 'POPULATION#{!s}'.format(random.randint(1,100000))
 
-        def cbk_after(env, current_step, next_step, fbk_gate):
-            # set the feedback of the last played individual
-            population[population.index - 1].feedback = list(fbk_gate)
+        if vtg_ids is None or len(vtg_ids) < 2:
 
-            return True
+            def cbk_after(env, current_step, next_step, fbk_gate):
+                # set the feedback of the last played individual
+                population[population.index - 1].feedback = list(fbk_gate)
+
+                return True
+
+            step = Step(data_desc=DataProcess(process=[(generator_name,
+                                                        UI(population=population))]),
+                        vtg_ids=vtg_ids)
+
+        else:
+
+            def cbk_after(env, current_step, next_step, fbk_gate):
+                batch = population[max(0, population.index - len(vtg_ids)):population.index]
+                # data IDs are not known for the very first sending of a session
+                id2ind = {ind.data.estimated_data_id: ind for ind in batch
+                          if ind.data.estimated_data_id is not None}
+                for ind in batch:
+                    ind.feedback = []
+                for entry in fbk_gate:
+                    src = entry[0]
+                    tg = src.obj if isinstance(src.obj, Target) else src.related_tg
+                    ind = id2ind.get(tg.get_last_sent_data_id()) if tg is not None else None
+                    if ind is None:
+                        # the feedback would otherwise bias the fitness of the whole batch
+                        fmk.lg.log_fmk_info("Feedback from {!s} ignored by the population: "
+                                            "it cannot be related to one of its individuals"
+                                            .format(src), do_record=False)
+                    else:
+                        ind.feedback.append(entry)
+
+                return True
+
+            step = Step(data_desc=[DataProcess(process=[(generator_name, UI(population=population))])
+                                   for _ in vtg_ids],
+                        vtg_ids=list(vtg_ids))
 
-        generator_name = 'POPULATION#{!s}'.format(random.randint(1,100000))
-        step = Step(data_desc=DataProcess(process=[(generator_name,
-                                                    UI(population=population))]))
         step.connect_to(step, cbk_after_fbk=cbk_after)
 
         return Scenario(name, anchor=step)
@@ -42,12 +42,20 @@ CREATE TABLE DMAKERS (
     NAME)
 );
 
+-- contents of DATA, FEEDBACK and ASYNC_DATA, keyed by their SHA-256 digest, and
+-- prefixed with the codec used to compress them (0: none, 1: zlib, 2: zstd)
+CREATE TABLE BLOBS (
+    HASH      BLOB PRIMARY KEY,
+    SIZE      INTEGER,
+    CONTENT   BLOB
+) WITHOUT ROWID;
+
 CREATE TABLE DATA (
     ID        INTEGER  PRIMARY KEY ASC AUTOINCREMENT,
     GROUP_ID  INTEGER,
     TYPE      TEXT,
     DM_NAME   TEXT REFERENCES DATAMODEL (NAME),
-    CONTENT   BLOB,
+    CONTENT_HASH  BLOB REFERENCES BLOBS (HASH),
     SIZE      INTEGER,
     SENT_DATE TIMESTAMP,
     ACK_DATE  TIMESTAMP,
@@ -80,7 +88,7 @@ CREATE TABLE FEEDBACK (
     DATA_ID  INTEGER REFERENCES DATA (ID),
     SOURCE   TEXT,
     DATE     TIMESTAMP,
-    CONTENT  BLOB,
+    CONTENT_HASH  BLOB REFERENCES BLOBS (HASH),
     STATUS   INTEGER
 );
 
@@ -112,13 +120,45 @@ CREATE TABLE ASYNC_DATA (
     CURRENT_DATA_ID   INTEGER REFERENCES DATA (ID),
     TYPE      TEXT,
     DM_NAME   TEXT REFERENCES DATAMODEL (NAME),
-    CONTENT   BLOB,
+    CONTENT_HASH  BLOB REFERENCES BLOBS (HASH),
     SIZE      INTEGER,
     SENT_DATE TIMESTAMP,
     TARGET TEXT,
     PRJ_NAME TEXT REFERENCES PROJECT (NAME)
 );
 
+CREATE TABLE EVOLUTION_STATS (
+    ID           INTEGER  PRIMARY KEY ASC AUTOINCREMENT,
+    POPULATION   TEXT,
+    GENERATION   INTEGER,
+    SIZE         INTEGER,
+    BEST_SCORE   REAL,
+    MEAN_SCORE   REAL,
+    WORST_SCORE  REAL,
+    DATE         TIMESTAMP,
+    PRJ_NAME     TEXT REFERENCES PROJECT (NAME)
+);
+
+CREATE TABLE PERF (
+    ID            INTEGER  PRIMARY KEY REFERENCES DATA (ID),
+    GENERATION    REAL,
+    DISRUPTION    REAL,
+    TO_BYTES      REAL,
+    SENDING       REAL,
+    TG_READINESS  REAL,
+    FEEDBACK      REAL,
+    PROBES        REAL,
+    FMKDB         REAL
+);
+
+CREATE TABLE REPLAY (
+    DATA_ID       INTEGER  PRIMARY KEY REFERENCES DATA (ID),
+    SEED          INTEGER,
+    CASE_INDEX    INTEGER,
+    CHAIN         BLOB,
+    CONTENT_HASH  TEXT
+);
+
 CREATE VIEW STATS AS
     SELECT TYPE, sum(CPT) as TOTAL
     FROM (
@@ -26,6 +26,7 @@ import random
 import string
 import copy
 import re
+import types
 
 from pprint import pprint as pp
 
@@ -53,6 +54,11 @@ class ModelWalker(object):
     Note: the change of a non-terminal node does not reset the
     indirect parents (just the direct parent), otherwise it could lead
     to a combinatorial explosion, with limited interest...
+
+    The walk can be restricted to the range of steps [initial_step, initial_step+max_steps-1],
+    which enables to share out disjoint ranges of a walk between several workers. Note
+    that the steps before `initial_step` are still walked through (the state of the walk
+    is spread over the nodes of the model and the consumer), but they are not yielded.
     '''
 
     def __init__(self, root_node, node_consumer, make_determinist=False, make_random=False,
@@ -96,9 +102,9 @@ class ModelWalker(object):
     def __iter__(self):
 
         self._cpt = 1
-        gen = self.walk_graph_rec([self._root_node], structure_has_changed=False,
-                                  consumed_nodes=set(), parent_node=self._root_node,
-                                  consumer=self._consumer)
+        gen = self._walk(self.walk_graph_rec([self._root_node], structure_has_changed=False,
+                                             consumed_nodes=set(), parent_node=self._root_node,
+                                             consumer=self._consumer))
         for consumed_node, orig_node_val in gen:
             self._root_node.freeze(resolve_csp=True)
 
@@ -156,6 +162,28 @@ class ModelWalker(object):
         node.unfreeze(recursive=True, dont_change_state=True, ignore_entanglement=True)
         consumer.do_after_reset(node)
 
+    @staticmethod
+    def _walk(walk_gen):
+        """
+        Drive the generators of walk_graph_rec() through an explicit stack. When a generator
+        needs to walk through a list of nodes, it yields the generator in charge of it (marked
+        with '# WALK') instead of iterating over it. This generator is then driven from here,
+        so that the produced cases (marked with '# YIELD') are not passed through every
+        generator of the upper levels, and the depth of the walked graph is not limited by
+        the recursion limit.
+        """
+        stack = [walk_gen]
+        while stack:
+            try:
+                item = next(stack[-1])
+            except StopIteration:
+                stack.pop()
+                continue
+            if isinstance(item, types.GeneratorType):
+                stack.append(item)
+            else:
+                yield item
+
     def walk_graph_rec(self, node_list, structure_has_changed, consumed_nodes, parent_node, consumer):
 
         reset = False
@@ -204,10 +232,8 @@ class ModelWalker(object):
                 # node is terminal, and we go to Step 2. Otherwise, we
                 # call ourselves recursively with the list of subnodes
                 if fnodes:
-                    generator = self.walk_graph_rec(fnodes, structure_has_changed, consumed_nodes,
-                                                    parent_node=node, consumer=consumer)
-                    for consumed_node, orig_node_val in generator:
-                        yield consumed_node, orig_node_val # YIELD
+                    yield self.walk_graph_rec(fnodes, structure_has_changed, consumed_nodes,
+                                              parent_node=node, consumer=consumer) # WALK
 
                 ### STEP 2 ###
 
@@ -341,10 +367,8 @@ class ModelWalker(object):
                                         #  - new_consumer = copy.copy(consumer) with a special reset (TBC)
                                         #  - tTYPE or the walker need to be changed somehow so that it could discover
                                         #    other NT shapes linked to node existence.
-                                        generator = self.walk_graph_rec(fnodes, structure_has_changed, consumed_nodes,
-                                                                        parent_node=parent_node, consumer=consumer)
-                                        for consumed_node, orig_node_val in generator:
-                                            yield consumed_node, orig_node_val # YIELD
+                                        yield self.walk_graph_rec(fnodes, structure_has_changed, consumed_nodes,
+                                                                  parent_node=parent_node, consumer=consumer) # WALK
 
 
                 # We reach this case if the consumer is not interested
@@ -376,9 +400,8 @@ class ModelWalker(object):
                         consumed_nodes = set()
 
                     else:
-                        gen = self.walk_graph_rec(node_list[:idx], False, set(), parent_node=parent_node, consumer=consumer)
-                        for consumed_node, orig_node_val in gen:
-                            yield consumed_node, orig_node_val # YIELD
+                        yield self.walk_graph_rec(node_list[:idx], False, set(), parent_node=parent_node,
+                                                  consumer=consumer) # WALK
 
                         # we need to reassess all the subnodes of the
                         # guilty node that has produced the
@@ -105,6 +105,9 @@ user_targets_folder = fuddly_data_folder + 'user_targets' + os.sep
 ensure_dir(user_targets_folder)
 ensure_file(user_targets_folder + os.sep + '__init__.py')
 
+dm_cache_folder = fuddly_data_folder + 'dm_cache' + os.sep
+ensure_dir(dm_cache_folder)
+
 fmk_folder = app_folder + os.sep + 'framework' + os.sep
 
 internal_repr_codec = 'utf8'
@@ -67,17 +67,28 @@ class FeedbackCollector(object):
         self._feedback_collector_tstamped = collections.OrderedDict()
         self._tstamped_bstring = None
 
-    def add_fbk_from(self, ref, fbk, status=0):
+    def add_fbk_from(self, ref, fbk, status=0, related_data=None):
+        """
+        Args:
+            ref: reference of the feedback source
+            fbk: feedback content
+            status (int): status code, negative for error
+            related_data (Data): [optional] data that triggered the feedback. The feedback of
+              a same source is then recorded separately for each data, so that it can be
+              attached to the right data ID when several data are sent in one shot.
+        """
         now = datetime.datetime.now()
+        key = (ref, id(related_data))
         with self.fbk_lock:
-            if ref not in self._feedback_collector:
-                self._feedback_collector[ref] = {}
-                self._feedback_collector[ref]['data'] = []
-                self._feedback_collector[ref]['status'] = 0
-                self._feedback_collector_tstamped[ref] = []
-            self._feedback_collector[ref]['data'].append(fbk)
-            self._feedback_collector[ref]['status'] = status
-            self._feedback_collector_tstamped[ref].append(now)
+            if key not in self._feedback_collector:
+                self._feedback_collector[key] = {}
+                self._feedback_collector[key]['data'] = []
+                self._feedback_collector[key]['status'] = 0
+                self._feedback_collector[key]['related_data'] = related_data
+                self._feedback_collector_tstamped[key] = []
+            self._feedback_collector[key]['data'].append(fbk)
+            self._feedback_collector[key]['status'] = status
+            self._feedback_collector_tstamped[key].append(now)
 
     def has_fbk_collector(self):
         return len(self._feedback_collector) > 0
@@ -86,17 +97,25 @@ class FeedbackCollector(object):
         with self.fbk_lock:
             fbk_collector = copy.copy(self._feedback_collector)
             fbk_collector_ts = copy.copy(self._feedback_collector_tstamped)
-        for ref, fbk in fbk_collector.items():
-            yield ref, fbk['data'], fbk['status'], fbk_collector_ts[ref]
-
-    def iter_and_cleanup_collector(self):
+        for key, fbk in fbk_collector.items():
+            yield key[0], fbk['data'], fbk['status'], fbk_collector_ts[key]
+
+    def iter_and_cleanup_collector(self, with_related_data=False):
+        """
+        Args:
+            with_related_data (bool): if True, the data related to each feedback record
+              (refer to :meth:`add_fbk_from`) is yielded as a fifth element
+        """
         with self.fbk_lock:
             fbk_collector = self._feedback_collector
             fbk_collector_ts = self._feedback_collector_tstamped
             self._feedback_collector = collections.OrderedDict()
             self._feedback_collector_tstamped = collections.OrderedDict()
-        for ref, fbk in fbk_collector.items():
-            yield ref, fbk['data'], fbk['status'], fbk_collector_ts[ref]
+        for key, fbk in fbk_collector.items():
+            if with_related_data:
+                yield key[0], fbk['data'], fbk['status'], fbk_collector_ts[key], fbk['related_data']
+            else:
+                yield key[0], fbk['data'], fbk['status'], fbk_collector_ts[key]
 
     def set_error_code(self, err_code):
         self._err_code = err_code
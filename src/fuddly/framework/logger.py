@@ -28,6 +28,7 @@ import sys
 import datetime
 import threading
 import itertools
+import collections
 
 from typing import List, Tuple
 
@@ -36,6 +37,7 @@ from fuddly.libs.utils import get_caller_object
 from fuddly.framework.data import Data
 from fuddly.framework.global_resources import *
 from fuddly.framework.database import Database
+from fuddly.framework.replay import content_hash
 from fuddly.framework.knowledge.feedback_collector import FeedbackSource
 from fuddly.libs.utils import ExternalDisplay, Accumulator
 from fuddly.framework import global_resources as gr
@@ -50,6 +52,10 @@ class Logger(object):
 
     fmkDB = None
 
+    # number of the contents of data recorded for replay that are kept until their feedback
+    # is known (the oldest ones are dropped first)
+    unstored_contents_max = 256
+
     FLUSH_API = 1
     WRITE_API = 2
     PRETTY_PRINT_API = 3
@@ -207,6 +213,8 @@ class Logger(object):
         self.reset_current_state()
         self._current_sent_date = None
         self._last_data_IDs = {}  # per target_ref
+        # contents of the last data that have been recorded for replay, until their feedback is known
+        self._unstored_contents = collections.OrderedDict()
         self.last_data_recordable = None
 
         with self._tg_fbk_lck:
@@ -363,6 +371,7 @@ class Logger(object):
         self.reset_current_state()
         self._current_sent_date = None
         self._last_data_IDs = {}
+        self._unstored_contents = collections.OrderedDict()
         self.last_data_recordable = None
 
         self._stop_log_handler()
@@ -391,12 +400,16 @@ class Logger(object):
             dm_name = Database.DEFAULT_DM_NAME if dm is None else dm.name
             self._current_group_id = group_id
 
+            # data that can be regenerated are only stored if they trigger negative feedback
+            recipe = self._current_data.replay_recipe
+            raw_data = self._current_data.to_bytes()
+
             last_data_id = None
             for tg_ref, ack_date in self._current_ack_dates.items():
                 last_data_id = self.fmkDB.insert_data(
                     init_dmaker,
                     dm_name,
-                    self._current_data.to_bytes(),
+                    raw_data if recipe is None else None,
                     self._current_size,
                     self._current_sent_date,
                     ack_date,
@@ -414,6 +427,13 @@ class Logger(object):
 
                 self._current_data.set_data_id(last_data_id)
 
+                if recipe is not None:
+                    self.fmkDB.insert_replay(last_data_id, recipe.seed, recipe.case_index,
+                                             recipe.chain, content_hash(raw_data))
+                    self._unstored_contents[last_data_id] = raw_data
+                    if len(self._unstored_contents) > self.unstored_contents_max:
+                        self._unstored_contents.popitem(last=False)
+
                 step_id_start = 1
 
                 for step_id, dmaker in enumerate(
@@ -511,7 +531,8 @@ class Logger(object):
             else:
                 self._current_fmk_info.append((info, now))
 
-    def collect_feedback(self, content, status_code=None, subref=None, fbk_src=None):
+    def collect_feedback(self, content, status_code=None, subref=None, fbk_src=None,
+                         related_tg=None, related_data=None):
         """
         Used within the scope of the Logger feedback-collector infrastructure.
         If your target implement the interface :meth:`Target.get_feedback`, no need to
@@ -524,13 +545,18 @@ class Logger(object):
             status_code (int): should be negative for error
             subref (str): specific reference to distinguish internal log sources within the same caller
             fbk_src: [optional] source object of the feedback
+            related_tg: [optional] target the feedback is related to, when several
+              targets are used
+            related_data (Data): [optional] data the feedback is related to, when several
+              data are sent in one shot. The feedback is then attached to its data ID.
         """
         now = datetime.datetime.now()
         fbk_src = get_caller_object() if fbk_src is None else fbk_src
 
         with self._tg_fbk_lck:
             self._tg_fbk.append(
-                (now, FeedbackSource(fbk_src, subref=subref), content, status_code)
+                (now, FeedbackSource(fbk_src, subref=subref, related_tg=related_tg),
+                 content, status_code, related_data)
             )
 
     def shall_record(self):
@@ -540,7 +566,8 @@ class Logger(object):
             # feedback will not be recorded because data is not recorded
             return False
 
-    def _log_feedback(self, source, content, status_code, timestamp, record=True):
+    def _log_feedback(self, source, content, status_code, timestamp, record=True,
+                      related_data=None):
         processed_feedback = self._process_target_feedback(content)
         fbk_cond = status_code is not None and status_code < 0
         hdr_color = Color.FEEDBACK_ERR if fbk_cond else Color.FEEDBACK
@@ -579,7 +606,10 @@ class Logger(object):
 
         if record:
             assert isinstance(source, FeedbackSource)
-            if source.related_tg is not None:
+            related_data_id = None if related_data is None else related_data.get_data_id()
+            if related_data_id is not None:
+                data_id = related_data_id
+            elif source.related_tg is not None:
                 try:
                     data_id = self._last_data_IDs[source.related_tg]
                 except KeyError:
@@ -594,6 +624,9 @@ class Logger(object):
                 ids = self._last_data_IDs.values()
                 data_id = max(ids) if ids else None
 
+            if fbk_cond and data_id in self._unstored_contents:
+                self.fmkDB.insert_data_content(data_id, self._unstored_contents.pop(data_id))
+
             if isinstance(content, list):
                 for fbk, ts in zip(content, timestamp):
                     self.fmkDB.insert_feedback(
@@ -645,8 +678,9 @@ class Logger(object):
             self.log_fn(preamble, do_record=record, rgb=Color.FMKINFO)
 
         for idx, fbk_record in enumerate(fbk_list):
-            timestamp, fbk_src, fbk, status = fbk_record
-            self._log_feedback(fbk_src, fbk, status, timestamp, record=record)
+            timestamp, fbk_src, fbk, status, data = fbk_record
+            self._log_feedback(fbk_src, fbk, status, timestamp, record=record,
+                               related_data=data)
             collected_status[fbk_src.obj] = status
 
         if epilogue is not None:
@@ -655,14 +689,16 @@ class Logger(object):
         return collected_status
 
     def log_target_feedback_from(
-        self, source, content, status_code, timestamp, preamble=None, epilogue=None
+        self, source, content, status_code, timestamp, preamble=None, epilogue=None,
+        related_data=None
     ):
         record = self.shall_record()
 
         if preamble is not None:
             self.log_fn(preamble, do_record=record, rgb=Color.FMKINFO)
 
-        self._log_feedback(source, content, status_code, timestamp, record=record)
+        self._log_feedback(source, content, status_code, timestamp, record=record,
+                           related_data=related_data)
 
         if epilogue is not None:
             self.log_fn(epilogue, do_record=record, rgb=Color.FMKINFO)
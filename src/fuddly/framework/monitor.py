@@ -22,6 +22,7 @@
 ################################################################################
 
 
+import os
 import threading
 import datetime
 import time
@@ -29,6 +30,7 @@ import traceback
 import re
 
 from fuddly.framework.comm_backends import BackendError
+from fuddly.framework.perf import LatencyHistogram
 from fuddly.libs.external_modules import *
 from fuddly.framework.global_resources import *
 
@@ -127,15 +129,18 @@ class ProbeUser(object):
         Wait for the probe to trigger a specific event
         """
         timeout = ProbeUser.timeout if timeout is None else timeout
-        start = datetime.datetime.now()
+        deadline = time.monotonic() + timeout
 
         while not event.is_set():
-            if (datetime.datetime.now() - start).total_seconds() >= timeout:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 self.stop()
                 raise ProbeTimeoutError(self._probe.__class__.__name__, timeout)
             if not self.is_alive() or not self._go_on():
                 break
-            event.wait(1)
+            # the event wakes us up as soon as it is set, the period only matters
+            # to notice a probe that has died
+            event.wait(min(remaining, 1))
 
     def _clear(self):
         """ Clear all events """
@@ -190,6 +195,11 @@ class BlockingProbeUser(ProbeUser):
         self._blocking_event = threading.Event()
         self._probe_status_event = threading.Event()
 
+        self._arm_request_date = None
+        self._blocking_date = None
+        self.arm_latency = LatencyHistogram()
+        self.status_latency = LatencyHistogram()
+
     @property
     def after_target_feedback_retrieval(self):
         return self._after_target_feedback_retrieval
@@ -199,6 +209,7 @@ class BlockingProbeUser(ProbeUser):
         self._continue_event.set()
 
     def notify_data_ready(self):
+        self._arm_request_date = time.monotonic_ns()
         self._arm_event.set()
 
 
@@ -223,6 +234,7 @@ class BlockingProbeUser(ProbeUser):
             self._probe_status_event.clear()
 
     def notify_blocking(self):
+        self._blocking_date = time.monotonic_ns()
         self._blocking_event.set()
 
     def notify_error(self):
@@ -236,6 +248,8 @@ class BlockingProbeUser(ProbeUser):
         self._blocking_event.clear()
         self._continue_event.clear()
         self._probe_status_event.clear()
+        self.arm_latency = LatencyHistogram()
+        self.status_latency = LatencyHistogram()
 
     def _wait_for_data_ready(self):
         """
@@ -255,6 +269,7 @@ class BlockingProbeUser(ProbeUser):
         return True
 
     def _notify_armed(self):
+        self.arm_latency.add(time.monotonic_ns() - self._arm_request_date)
         self._armed_event.set()
 
     def _wait_for_fmk_sync(self):
@@ -312,6 +327,7 @@ class BlockingProbeUser(ProbeUser):
                 self._handle_exception('during main()')
                 return
 
+            self.status_latency.add(time.monotonic_ns() - self._blocking_date)
             self._notify_status_retrieved()
 
         try:
@@ -438,6 +454,19 @@ class Monitor(object):
     def is_probe_stuck(self, probe):
         return self.probe_users[self._get_probe_ref(probe)].is_stuck()
 
+    def get_probe_latency_stats(self, probe):
+        """
+        Returns:
+            dict: for a blocking probe, the :class:`framework.perf.LatencyHistogram` of the
+            durations (in ns) the probe took to be armed (key ``'arm'``) and to provide
+            its status once the framework has unblocked it (key ``'status'``).
+            None for a basic probe.
+        """
+        probe_user = self.probe_users[self._get_probe_ref(probe)]
+        if isinstance(probe_user, BlockingProbeUser):
+            return {'arm': probe_user.arm_latency, 'status': probe_user.status_latency}
+        return None
+
     def get_probes_names(self):
         probes_names = []
         for probe_name, _ in self.probe_users.items():
@@ -463,14 +492,14 @@ class Monitor(object):
 
         if timeout is None:
             timeout = ProbeUser.timeout
-        timeout = datetime.timedelta(seconds=timeout)
-        start = datetime.datetime.now()
+        # The probes handle the event concurrently (each one within its own thread), thus they
+        # share the same deadline and the overall wait lasts as long as the slowest probe.
+        deadline = time.monotonic() + timeout
 
         for _, probe_user in probes:
             if isinstance(probe_user, probe_user_class):
-                timeout -= start - datetime.datetime.now()
                 try:
-                    probe_user_wait_method(probe_user, timeout.total_seconds())
+                    probe_user_wait_method(probe_user, max(deadline - time.monotonic(), 0))
                 except ProbeTimeoutError as e:
                     self.fmk_ops.set_error("Timeout! Probe '{:s}' seems to be stuck in one of these methods: {:s}"
                                            .format(e.probe_name, e.blocking_methods),
@@ -583,9 +612,10 @@ class Probe(object):
     def _stop(self, dm, target, logger):
         if not self._started:
             return
+        # reset first, as the probe may be stopped concurrently by the framework and by its own thread
+        self._started = False
         logger.print_console("__ probe '{:s}' is stopping __".format(self.__class__.__name__), nl_before=True, nl_after=True)
         self.stop(dm, target, logger)
-        self._started = False
 
     def start(self, dm, target, logger):
         """
@@ -759,7 +789,8 @@ class ProbePID(Probe):
         return pid
 
     def start(self, dm, target, logger):
-        self.backend.start()
+        if self.backend is not None:
+            self.backend.start()
         self._saved_pid = self._get_pid(logger)
         if self._saved_pid < 0:
             msg = "*** INIT ERROR: unable to retrieve process PID ***\n"
@@ -857,7 +888,8 @@ class ProbeMem(Probe):
         return rss
 
     def start(self, dm, target, logger):
-        self.backend.start()
+        if self.backend is not None:
+            self.backend.start()
         self._max_mem = None
         self._saved_mem = self._get_mem()
         self._last_status_ok = True
@@ -920,6 +952,187 @@ class ProbeMem(Probe):
         self._max_mem = self._saved_mem
 
 
+class ProcfsProcess(object):
+    """
+    Give access to the ``/proc/<pid>/`` entries of a local process identified by its name.
+
+    The entries are read through file descriptors that are kept open as long as the process
+    lives, thus no process is spawned and no path is resolved on each read. As these file
+    descriptors refer to the process that has been looked up, a restarted process (even
+    with the same PID) is never mistaken for the original one.
+    """
+
+    def __init__(self, process_name, procfs_path='/proc'):
+        """
+        Args:
+            process_name (str): regular expression matched against the process names
+              (as `pgrep` does).
+            procfs_path (str): mount point of the procfs.
+        """
+        self.process_name = process_name
+        self.procfs_path = procfs_path
+        self.pid = None
+        self._fds = {}
+
+    def find_pids(self):
+        """
+        Returns:
+            list: PIDs of the running (i.e., non-zombie) processes matching the name
+        """
+        pids = []
+        for entry in os.listdir(self.procfs_path):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.procfs_path, entry, 'stat'), 'rb') as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            name = stat[stat.find(b'(')+1:stat.rfind(b')')].decode('latin-1')
+            if re.search(self.process_name, name) and self._is_running(stat):
+                pids.append(int(entry))
+        return sorted(pids)
+
+    def attach(self, pid):
+        self.detach()
+        self.pid = pid
+
+    def detach(self):
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds = {}
+        self.pid = None
+
+    def read(self, entry):
+        """
+        Args:
+            entry (str): name of the entry to read (e.g., 'stat', 'status')
+
+        Returns:
+            bytes: content of the entry, or None if the process does not exist anymore
+            (it is then detached)
+        """
+        if self.pid is None:
+            return None
+        try:
+            fd = self._fds.get(entry)
+            if fd is None:
+                fd = self._fds[entry] = os.open(os.path.join(self.procfs_path, str(self.pid), entry),
+                                                os.O_RDONLY)
+            return os.pread(fd, 4096, 0)
+        except OSError:
+            self.detach()
+            return None
+
+    def is_running(self):
+        stat = self.read('stat')
+        if stat is None or not self._is_running(stat):
+            self.detach()
+            return False
+        return True
+
+    @staticmethod
+    def _is_running(stat):
+        # the state follows the name which may contain any character
+        state = stat[stat.rfind(b')')+1:].split(maxsplit=1)[0]
+        return state not in (b'Z', b'X')
+
+
+class ProcfsProbePID(ProbePID):
+    """
+    Variant of :class:`ProbePID` for a local process which retrieves the process PID
+    directly from the procfs instead of running a command through a backend. Thus,
+    it can be used with a short delay at a low cost.
+
+    Attributes:
+        process_name (str): name of the process to monitor (regular expression).
+        max_attempts (int): maximum number of attempts for getting
+          the process ID.
+        delay_between_attempts (float): delay in seconds between
+          each attempt.
+        delay (float): delay before retrieving the process PID.
+        procfs_path (str): mount point of the procfs.
+    """
+    procfs_path = '/proc'
+
+    def __init__(self):
+        assert self.process_name != None
+        self._process = ProcfsProcess(self.process_name, procfs_path=self.procfs_path)
+        Probe.__init__(self)
+
+    def _get_pid(self, logger):
+        if self._process.is_running():
+            return self._process.pid
+
+        pids = self._process.find_pids()
+        if len(pids) > 1:
+            logger.print_console("*** ERROR: more than one PID detected for process name '{:s}'"
+                                 " --> {!s}".format(self.process_name, pids),
+                                 rgb=Color.ERROR,
+                                 nl_before=True)
+            return -10
+        elif len(pids) == 1:
+            self._process.attach(pids[0])
+            return pids[0]
+        else:
+            # process not found
+            return -1
+
+    def stop(self, dm, target, logger):
+        self._process.detach()
+
+
+class ProcfsProbeMem(ProbeMem):
+    """
+    Variant of :class:`ProbeMem` for a local process which reads the process memory (RSS)
+    consumption directly from the procfs instead of running a command through a backend.
+    The RSS is expressed in kB, like with the `ps` command.
+
+    Attributes:
+        process_name (str): name of the process to monitor (regular expression).
+        threshold (int): memory (RSS) threshold in kB that the monitored process should
+          not exceed.
+        tolerance (int): tolerance expressed in percentage of the memory (RSS) the process was
+          using at the beginning of the monitoring (or after each time the tolerance has been
+          exceeded).
+        procfs_path (str): mount point of the procfs.
+    """
+    procfs_path = '/proc'
+
+    def __init__(self):
+        assert self.process_name != None
+        self._process = ProcfsProcess(self.process_name, procfs_path=self.procfs_path)
+        self._saved_mem = None
+        self._max_mem = None
+        self._last_status_ok = None
+        Probe.__init__(self)
+
+    def _get_mem(self):
+        status = self._process.read('status')
+        if status is None:
+            pids = self._process.find_pids()
+            if not pids:
+                # process not found
+                return -1
+            self._process.attach(pids[0])
+            status = self._process.read('status')
+            if status is None:
+                return -1
+
+        rss = re.search(rb'^VmRSS:\s+(\d+)', status, re.MULTILINE)
+        if rss is None:
+            if re.search(rb'^State:\s+[ZX]', status, re.MULTILINE):
+                # the process has terminated
+                self._process.detach()
+                return -1
+            return -10
+
+        return int(rss.group(1))
+
+    def stop(self, dm, target, logger):
+        self._process.detach()
+
+
 class ProbeCmd(Probe):
     """
     Generic probe that enables you to execute shell commands and retrieve the output.
@@ -961,6 +1174,12 @@ class ProbeCmd(Probe):
                 self.chan_desc = self.backend.exec_command(self.recurrent_command)
             data = self.backend.read_output(self.chan_desc)
         except BackendError as err:
+            if err.status == -3:
+                # the connection is not active anymore, it is restarted for the next probing
+                try:
+                    self.backend.reset()
+                except Exception as exc:
+                    return ProbeStatus(-1, info='{!s} (reset failure: {!s})'.format(err, exc))
             return ProbeStatus(-1, info=str(err))
 
         return ProbeStatus(0, info=data)
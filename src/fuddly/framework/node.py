@@ -39,7 +39,6 @@ import time
 from pprint import pprint as pp
 
 from enum import Enum
-from random import shuffle
 
 from fuddly.framework.basic_primitives import *
 from fuddly.libs.external_modules import *
@@ -8369,7 +8368,13 @@ class Node(object):
                     ignore_entanglement=True,
                 )
 
-    def to_bytes(self, conf=None, recursive=True):
+    def to_buffers(self, conf=None, recursive=True):
+        """
+        Same as :meth:`to_bytes` but the values of the terminal nodes are not joined.
+
+        Returns:
+            list: the bytes of each terminal node, in order
+        """
         def tobytes_helper(node_internals):
             if isinstance(node_internals, bytes):
                 return node_internals
@@ -8380,17 +8385,13 @@ class Node(object):
 
         node_internals_list = self.freeze(conf=conf, recursive=recursive)
         if isinstance(node_internals_list, list):
-            node_internals_list = list(flatten(node_internals_list))
-            if node_internals_list:
-                # if issubclass(node_internals_list[0].__class__, NodeInternals):
-                node_internals_list = list(map(tobytes_helper, node_internals_list))
-                val = b"".join(node_internals_list)
-            else:
-                val = b""
+            # if issubclass(node_internals_list[0].__class__, NodeInternals):
+            return list(map(tobytes_helper, flatten(node_internals_list)))
         else:
-            val = node_internals_list
+            return [node_internals_list]
 
-        return val
+    def to_bytes(self, conf=None, recursive=True):
+        return b"".join(self.to_buffers(conf=conf, recursive=recursive))
 
     def to_str(self, conf=None, recursive=True):
         val = self.to_bytes(conf=conf, recursive=recursive)
@@ -9249,8 +9250,10 @@ class Env(object):
         return self._color_enabled
 
     def __getattr__(self, name):
-        if hasattr(self.env4NT, name):
-            return self.env4NT.__getattribute__(name)
+        # env4NT is looked up in __dict__ as it does not exist yet when unpickling
+        env4NT = self.__dict__.get('env4NT')
+        if env4NT is not None and hasattr(env4NT, name):
+            return env4NT.__getattribute__(name)
         else:
             raise AttributeError
 
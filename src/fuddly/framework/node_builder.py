@@ -55,7 +55,7 @@ class NodeBuilder(object):
         'name', 'contents', 'qty', 'clone', 'type', 'alt', 'conf',
         'custo_set', 'custo_clear', 'evolution_func', 'description',
         'default_qty', 'namespace', 'from_namespace', 'highlight',
-        'constraints', 'constraints_highlight',
+        'constraints', 'constraints_highlight', 'constraints_backend',
         # NonTerminal Node description keys
         'weight', 'shape_type', 'section_type', 'duplicate_mode', 'weights',
         'separator', 'prefix', 'suffix', 'unique', 'always',
@@ -112,6 +112,7 @@ class NodeBuilder(object):
 
         self._constraint_backend_necessary = False
         self._constraint_highlight = False
+        self._constraint_solver = None
         self._constraints_storage = []
 
         self.dm = dm
@@ -471,8 +472,10 @@ class NodeBuilder(object):
 
         constraints = desc.get('constraints', None)
         c_hlight = desc.get('constraints_highlight', None)
+        c_backend = desc.get('constraints_backend', None)
         if constraints is not None:
-            self._register_todo(n, self._setup_constraints, args=(constraints, ns, c_hlight), prio=self.VERYLOW_PRIO)
+            self._register_todo(n, self._setup_constraints, args=(constraints, ns, c_hlight, c_backend),
+                                prio=self.VERYLOW_PRIO)
 
         return n
 
@@ -910,18 +913,22 @@ class NodeBuilder(object):
 
         return node
 
-    def _setup_constraints(self, node, constraints, root_namespace, constraint_highlight):
+    def _setup_constraints(self, node, constraints, root_namespace, constraint_highlight,
+                           constraint_backend):
         self._constraint_backend_necessary = True
         self._constraints_storage.append((constraints, root_namespace))
         if constraint_highlight:
             self._constraint_highlight = True
+        if constraint_backend is not None:
+            self._constraint_solver = constraint_backend
 
     def _enable_constraints(self, node):
         constraints = []
         for cst_list, _ in self._constraints_storage:
             constraints += cst_list
 
-        csp = CSP(constraints=constraints, highlight_variables=self._constraint_highlight)
+        csp = CSP(constraints=constraints, highlight_variables=self._constraint_highlight,
+                  backend=self._constraint_solver)
 
         known_vars = set()
         for cst_list, ns in self._constraints_storage:
@@ -0,0 +1,227 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+Per-stage timing of the sending loop of the framework.
+
+:class:`PerfRecorder` records the duration (in nanoseconds, from a monotonic clock) of the
+stages each data goes through (generation, disruption, serialization, sending, ...). When
+it is disabled, recording a stage only costs a test. Durations are aggregated in
+:class:`LatencyHistogram` objects per stage and per scope (data maker, target, ...).
+"""
+
+import contextlib
+import threading
+import time
+
+
+_serialization = threading.local()
+
+
+def serialization_timer():
+    """
+    Returns:
+        list: the accumulator of the durations of the serializations of
+        :class:`framework.data.Data` performed by the current thread (refer to
+        :func:`timing_serialization`), or `None`
+    """
+    return getattr(_serialization, 'timer', None)
+
+
+@contextlib.contextmanager
+def timing_serialization():
+    """
+    Accumulate in the yielded list (single item) the durations (in ns) of the serializations of
+    :class:`framework.data.Data` performed by the current thread within this context.
+    """
+    timer = _serialization.timer = [0]
+    try:
+        yield timer
+    finally:
+        _serialization.timer = None
+
+
+class LatencyHistogram(object):
+    """
+    Log-linear histogram of durations (in ns). Buckets are powers of 2 split into
+    ``2**SUB_BITS`` sub-buckets, so that percentiles are computed with a relative
+    precision better than ``1/2**SUB_BITS`` while the memory stays bounded.
+    """
+
+    SUB_BITS = 4
+
+    def __init__(self):
+        self._buckets = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @classmethod
+    def _bucket(cls, value):
+        shift = max(value.bit_length() - cls.SUB_BITS - 1, 0)
+        return shift, value >> shift
+
+    def add(self, value):
+        bucket = self._bucket(value)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, p):
+        """
+        Return the value under which `p` percent of the durations fall (the middle of
+        the related bucket, bounded by the minimum and maximum durations).
+        """
+        if not self.count:
+            return None
+
+        rank = max(p / 100 * self.count, 1)
+        seen = 0
+        for shift, mantissa in sorted(self._buckets):
+            seen += self._buckets[(shift, mantissa)]
+            if seen >= rank:
+                value = (mantissa << shift) + ((1 << shift) - 1) / 2
+                return min(max(value, self.min), self.max)
+
+
+class PerfRecorder(object):
+    """
+    Record the duration of the stages of the sending loop.
+
+    The durations of a sending cycle (i.e., what happened since the previous call to
+    :meth:`end_cycle`) are also accumulated per stage, so that they can be
+    stored along with the data that have been sent. A cycle is specific to the thread
+    recording the durations, so that the data prefetched by another thread are not accounted
+    in the cycle of the data in flight (refer to :meth:`add_to_cycle`).
+    """
+
+    GENERATION = 'generation'
+    DISRUPTION = 'disruption'
+    TO_BYTES = 'to_bytes'
+    SENDING = 'sending'
+    TG_READINESS = 'tg_readiness'
+    FEEDBACK = 'feedback'
+    PROBES = 'probes'
+    FMKDB = 'fmkdb'
+
+    STAGES = (GENERATION, DISRUPTION, TO_BYTES, SENDING, TG_READINESS, FEEDBACK, PROBES, FMKDB)
+
+    #: scope of the stages that are not specific to a data maker or a target
+    GLOBAL = '*'
+
+    def __init__(self):
+        self.enabled = False
+        self.persist = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self, persist=False):
+        with self._lock:
+            self._cycles = {}
+        self.enabled = True
+        self.persist = persist
+
+    def disable(self):
+        self.enabled = False
+        self.persist = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._cycles = {}
+
+    def start(self):
+        """
+        Returns:
+            the current time, to be provided to :meth:`stop`, or `None` if the recorder
+            is disabled
+        """
+        return time.perf_counter_ns() if self.enabled else None
+
+    def stop(self, stage, start, scope=GLOBAL, cycle=True):
+        """
+        Record the duration of `stage` since `start`.
+
+        Args:
+            stage (str): one of :attr:`STAGES`
+            start: the value returned by :meth:`start`
+            scope (str): data maker, target, ... the stage relates to
+            cycle (bool): if `False`, the duration is not accounted in the current
+              cycle (e.g., because it overlaps with the one of another scope)
+        """
+        if start is None:
+            return
+        self.record(stage, time.perf_counter_ns() - start, scope=scope, cycle=cycle)
+
+    def record(self, stage, duration, scope=GLOBAL, cycle=True):
+        with self._lock:
+            hist = self._histograms.get((stage, scope))
+            if hist is None:
+                hist = self._histograms[(stage, scope)] = LatencyHistogram()
+            hist.add(duration)
+            if cycle:
+                current = self._cycles.setdefault(threading.get_ident(), {})
+                current[stage] = current.get(stage, 0) + duration
+
+    def add_to_cycle(self, durations):
+        """
+        Account in the cycle of the current thread durations recorded within another one
+        (as returned by :meth:`end_cycle`).
+        """
+        if not durations:
+            return
+        with self._lock:
+            current = self._cycles.setdefault(threading.get_ident(), {})
+            for stage, duration in durations.items():
+                current[stage] = current.get(stage, 0) + duration
+
+    def end_cycle(self):
+        """
+        Returns:
+            dict: the durations accumulated per stage by the current thread since its
+            previous call
+        """
+        with self._lock:
+            return self._cycles.pop(threading.get_ident(), {})
+
+    def get_stats(self):
+        """
+        Returns:
+            list: tuples ``(stage, scope, count, p50, p99, max, mean)`` (durations in ns)
+            ordered by stage
+        """
+        with self._lock:
+            items = list(self._histograms.items())
+
+        order = {s: idx for idx, s in enumerate(self.STAGES)}
+        items.sort(key=lambda x: (order.get(x[0][0], len(order)), x[0][0], x[0][1] != self.GLOBAL, x[0][1]))
+        return [(stage, scope, h.count, h.percentile(50), h.percentile(99), h.max, h.mean)
+                for (stage, scope), h in items]
@@ -38,16 +38,22 @@ import datetime
 import time
 import signal
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import wraps, partial
 from typing import Sequence
 
 from fuddly.framework.data import Data, DataProcess
+from fuddly.framework.data_bank import DataBank
 from fuddly.framework.database import FeedbackGate
 from fuddly.framework.knowledge.feedback_collector import FeedbackSource
 from fuddly.framework.error_handling import *
 from fuddly.framework.evolutionary_helpers import EvolutionaryScenariosFactory
 from fuddly.framework.logger import *
 from fuddly.framework.monitor import *
+from fuddly.framework.perf import PerfRecorder, timing_serialization
+from fuddly.framework.prefetch import DataPrefetcher
+from fuddly.framework.replay import ReplayRecorder, content_hash
 from fuddly.framework.operator_helpers import *
 from fuddly.framework.project import *
 from fuddly.framework.scenario import *
@@ -124,6 +130,7 @@ class ExportableFMKOps(object):
         self.process_data = fmk.process_data
         self.unregister_task = fmk._unregister_task
         self.handle_data_desc = fmk.handle_data_desc
+        self.fmkdb_insert_evolution_stats = fmk.fmkdb_insert_evolution_stats
 
 
 class FmkFeedback(object):
@@ -286,8 +293,11 @@ class FmkPlumbing(object):
         self._tg_ids = [0]  # further initialized as a list
         self.available_targets_desc = None  # further initialized as a dict (tg -> str description)
         self._currently_used_targets = []
+        self._tg_executor = None  # used to dispatch operations to several targets concurrently
 
         self.mon = None
+        self.perf = PerfRecorder()
+        self.replay = ReplayRecorder()
 
         self.__started = False
         self.__first_loading = True
@@ -326,6 +336,13 @@ class FmkPlumbing(object):
         self.fmk_error = []
         self._sending_error = None
         self._stop_sending = None
+        self._prefetch_depth = 0
+        self._prefetcher = None
+        # data lists prefetched but not sent when a sending loop ended early (data_desc key ->
+        # deque of (data list, recorded durations)). They are served first by the next loop.
+        self._unsent_prefetched = {}
+        self._batch_size = 1
+        self._fbk_timeout_tuners = {}
 
         self.__tg_enabled = False
         self.__prj_to_be_reloaded = False
@@ -353,7 +370,9 @@ class FmkPlumbing(object):
         self.fmkDB = Database(fmkdb_path=self._fmkdb_path)
         ok = self.fmkDB.start()
         if not ok:
-            raise InvalidFmkDB("The database {:s} is invalid!".format(self.fmkDB.fmk_db_path))
+            raise InvalidFmkDB("The database {:s} is invalid! (if it has been created by a previous "
+                               "version of fuddly, convert it with 'fmkdb.py --migrate')"
+                               .format(self.fmkDB.fmk_db_path))
 
         self.last_data_id = None
         self.next_data_id = None
@@ -423,6 +442,10 @@ class FmkPlumbing(object):
         self.fmkDB.current_project = obj
 
     def set_error(self, msg="", context=None, code=Error.Reserved):
+        if self._prefetcher is not None and self._prefetcher.in_producer():
+            # reported when the data being prefetched will be handed to the sending loop
+            self._prefetcher.defer(partial(self.set_error, msg, context=context, code=code))
+            return
         self.error = True
         self.fmk_error.append(Error(msg, context=context, code=code))
         if self.lg:
@@ -480,7 +503,11 @@ class FmkPlumbing(object):
         else:
             self.set_health_check_timeout(sending_delay, target=target, do_show=do_show)
 
-    def _handle_user_code_exception(self, msg="", context=None):
+    def _handle_user_code_exception(self, msg="", context=None, trace=None):
+        if self._prefetcher is not None and self._prefetcher.in_producer():
+            self._prefetcher.defer(partial(self._handle_user_code_exception, msg, context=context,
+                                           trace=traceback.format_exc()))
+            return
         self.set_error(msg, code=Error.UserCodeError, context=context)
         if self.lg:
             self.lg.log_error("Exception in user code detected! Outcomes " \
@@ -488,7 +515,10 @@ class FmkPlumbing(object):
                               "    (_ cause: '%s' _)" % msg)
         self.print("Exception in user code:")
         self.print("-" * 60)
-        traceback.print_exc(file=self.printer)
+        if trace is None:
+            traceback.print_exc(file=self.printer)
+        else:
+            self.printer.write(trace)
         self.print("-" * 60)
 
     def _handle_fmk_exception(self, cause=""):
@@ -718,14 +748,19 @@ class FmkPlumbing(object):
                                      "will be terminated.".format(tg_desc))
         return target_recovered
 
-    def monitor_probes(self, prefix=None, force_record=False):
+    def monitor_probes(self, prefix=None, force_record=False, record_perf=False):
         oks = {x: True for x in self.targets.values()}
         prefix_printed = False
 
+        # durations per target of the handling of the probe statuses (when record_perf is set)
+        durations = {}
+
         for probe in self.mon.iter_probes():
             if self.mon.is_probe_launched(probe):
+                perf_start = self.perf.start() if record_perf else None
                 pstatus = self.mon.get_probe_status(probe)
                 err = pstatus.value
+                tg = None
                 if err < 0 or force_record:
                     tg = self.mon.get_probe_related_tg(probe)
                     if err < 0:
@@ -738,9 +773,16 @@ class FmkPlumbing(object):
                     priv = pstatus.get_private_info()
                     self.lg.log_probe_feedback(probe=probe, content=priv, status_code=err,
                                                timestamp=tstamp, related_tg=tg)
+                if perf_start is not None and tg is not None:
+                    durations[tg] = durations.get(tg, 0) + time.perf_counter_ns() - perf_start
 
         for tg, ok in oks.items():
+            perf_start = self.perf.start() if record_perf else None
             ret = self._recover_target(tg) if not ok else True
+            if perf_start is not None and (tg in durations or not ok):
+                self.perf.record(PerfRecorder.PROBES,
+                                 durations.get(tg, 0) + time.perf_counter_ns() - perf_start,
+                                 scope=self.available_targets_desc.get(tg, str(tg)), cycle=False)
 
             if prefix and not ok:
                 self.lg.print_console("*" * (len(prefix) + 8) + "\n", rgb=Color.FMKINFO)
@@ -1263,6 +1305,9 @@ class FmkPlumbing(object):
                         return
 
                 self._enable_target()
+                if len(self.targets) > 1:
+                    self._tg_executor = ThreadPoolExecutor(max_workers=len(self.targets),
+                                                           thread_name_prefix='fmk_target')
                 self.mon.start()
 
                 need_monitoring = False
@@ -1297,9 +1342,10 @@ class FmkPlumbing(object):
                     self.monitor_probes(force_record=True)
 
             finally:
-                self.__current = []
-                self.__db_idx = 0
-                self.__data_bank = {}
+                self.__current = DataBank(max_live_entries=self.prj.wkspace_max_live_entries,
+                                          dm_resolver=self._name2dm.get)
+                self.__data_bank = DataBank(max_live_entries=self.prj.data_bank_max_live_entries,
+                                            dm_resolver=self._name2dm.get)
 
                 self._start()
 
@@ -1327,6 +1373,9 @@ class FmkPlumbing(object):
                     self._handle_user_code_exception()
                 finally:
                     self._disable_target()
+                    if self._tg_executor is not None:
+                        self._tg_executor.shutdown(wait=True)
+                        self._tg_executor = None
 
             self.lg.stop()
             self.prj.stop()
@@ -1414,8 +1463,13 @@ class FmkPlumbing(object):
         self.print(colorize("  [ General Information ]", rgb=Color.INFO))
         self.print(colorize("                  FmkDB enabled: ", rgb=Color.SUBINFO) + repr(self.fmkDB.enabled))
         self.print(colorize("              Workspace enabled: ", rgb=Color.SUBINFO) + repr(self.prj.wkspace_enabled))
+        self.print(colorize("                      Workspace: ", rgb=Color.SUBINFO) +
+                   "{:d} data ({:d} spilled to disk)".format(len(self.__current), self.__current.spilled_entries))
+        self.print(colorize("                      Data Bank: ", rgb=Color.SUBINFO) +
+                   "{:d} data ({:d} spilled to disk)".format(len(self.__data_bank), self.__data_bank.spilled_entries))
         self.print(colorize("                  Sending delay: ", rgb=Color.SUBINFO) + delay_str)
         self.print(colorize("   Number of data sent in burst: ", rgb=Color.SUBINFO) + str(self._burst))
+        self.print(colorize("   Number of data sent in batch: ", rgb=Color.SUBINFO) + str(self._batch_size))
         self.print(colorize(" Target(s) health-check timeout: ", rgb=Color.SUBINFO) + str(self._hc_timeout_max))
 
         for tg_id, tg in self.targets.items():
@@ -1426,6 +1480,8 @@ class FmkPlumbing(object):
             else:
                 fbk_mode = tg.fbk_wait_until_recv_msg
             fbk_timeout = str(tg.feedback_timeout)
+            if tg in self._fbk_timeout_tuners:
+                fbk_timeout += " (adaptive, max = {!s})".format(self._fbk_timeout_tuners[tg].max_timeout)
             tg_name = self.available_targets_desc[tg]
 
             self.print(colorize("\n  [ Target Specific Information - ({:d}) {!s} ]".format(tg_id, tg_name), rgb=Color.INFO))
@@ -1795,6 +1851,58 @@ class FmkPlumbing(object):
             self.lg.log_fmk_info("Wrong burst value!", do_record=False)
             return False
 
+    @EnforceOrder(accepted_states=["S1", "S2"])
+    def set_prefetch_depth(self, depth, do_record=False):
+        """
+        Set the number of data that :meth:`process_data_and_send` prepares in advance
+        (within a separate thread, while the framework waits for the feedback of the data
+        in flight). 0 disables prefetching.
+        """
+        if depth >= 0:
+            self._prefetch_depth = int(depth)
+            self.lg.log_fmk_info("Number of data prefetched = %d" % self._prefetch_depth,
+                                 do_record=do_record)
+            return True
+        else:
+            self.lg.log_fmk_info("Wrong prefetch depth value!", do_record=False)
+            return False
+
+    @EnforceOrder(accepted_states=["S1", "S2"])
+    def set_sending_batch_size(self, size, do_record=False):
+        """
+        Set the number of independent data that :meth:`process_data_and_send` hands over
+        to the targets in one call (i.e., through :meth:`Target.send_multiple_data`), so that
+        the sending rate is not bounded by the round trip of each data. The feedback is still
+        attached to the data ID of the data it relates to, if the target provides this
+        information. A batch is handled as one sending regarding the burst counter.
+        1 disables batching.
+        """
+        if size >= 1:
+            self._batch_size = int(size)
+            self.lg.log_fmk_info("Number of data sent in batch = %d" % self._batch_size,
+                                 do_record=do_record)
+            return True
+        else:
+            self.lg.log_fmk_info("Wrong batch size value!", do_record=False)
+            return False
+
+    @contextmanager
+    def _prefetching_window(self):
+        """
+        Let the data prefetcher (if any) produce the next data while the sending loop waits
+        """
+        if self._prefetcher is None or self._prefetcher.in_producer():
+            yield
+        else:
+            with self._prefetcher.idle():
+                yield
+
+    def _discard_prefetched_data(self):
+        if self._prefetcher is not None:
+            self._prefetcher.discard()
+        for unsent in self._unsent_prefetched.values():
+            unsent.clear()
+
     @EnforceOrder(accepted_states=["S1", "S2"])
     def set_health_check_timeout(
         self, timeout, target=None, do_record=True, do_show=True
@@ -1825,6 +1933,18 @@ class FmkPlumbing(object):
     def set_feedback_timeout(self, timeout, tg_id=None, do_record=True, do_show=True):
         self._fbk_timeout_max = 0
 
+        if timeout is None or timeout >= 0:
+            # the new timeout becomes the upper bound of the adaptive ones
+            targets = self.targets.values() if tg_id is None else [self.targets[tg_id]]
+            for tg in targets:
+                tuner = self._fbk_timeout_tuners.get(tg)
+                if tuner is None:
+                    continue
+                elif timeout:
+                    tuner.reset(max_timeout=timeout)
+                else:
+                    del self._fbk_timeout_tuners[tg]
+
         if tg_id is None:
             max_sending_delay = 0
             for tg in self.targets.values():
@@ -1865,6 +1985,72 @@ class FmkPlumbing(object):
             self.lg.log_fmk_info("Wrong timeout value!", do_record=False)
             return False
 
+    @EnforceOrder(accepted_states=["S1", "S2"])
+    def set_adaptive_feedback_timeout(self, enabled=True, tg_id=None, do_record=True, **params):
+        """
+        Adapt the feedback timeout of the target `tg_id` (or of every target if None) to its
+        response latencies, which are computed from the target acknowledgment dates.
+        The current feedback timeout of the target becomes the upper bound of the adaptive one,
+        and is restored once the adaptation is disabled. Each change of the timeout is recorded
+        in the FmkDB along with the data after which it has been decided.
+
+        Args:
+            enabled (bool): enable or disable the adaptation
+            tg_id (int): target ID
+            do_record (bool): record the activation in the FmkDB
+            params: parameters of :class:`fuddly.framework.target_helpers.FeedbackTimeoutTuner`
+              (e.g., `percentile`, `margin`, `min_samples`)
+        """
+        targets = self.targets.values() if tg_id is None else [self.targets[tg_id]]
+        for tg in targets:
+            tg_desc = self._get_detailed_target_desc(tg)
+            tuner = self._fbk_timeout_tuners.pop(tg, None)
+            if not enabled:
+                if tuner is not None:
+                    self._apply_feedback_timeout(tg, tuner.max_timeout)
+                    self.lg.log_fmk_info("Target {!s} adaptive feedback timeout disabled "
+                                         "(feedback timeout = {:.3f}s)".format(tg_desc, tuner.max_timeout),
+                                         do_record=do_record)
+                continue
+
+            max_timeout = tg.feedback_timeout if tuner is None else tuner.max_timeout
+            if not max_timeout:
+                self.lg.log_fmk_info("Target {!s} has no feedback timeout to adapt".format(tg_desc),
+                                     do_record=False)
+                continue
+            if tuner is not None:
+                self._apply_feedback_timeout(tg, max_timeout)
+            self._fbk_timeout_tuners[tg] = FeedbackTimeoutTuner(max_timeout, **params)
+            self.lg.log_fmk_info("Target {!s} adaptive feedback timeout enabled "
+                                 "(max = {:.3f}s)".format(tg_desc, max_timeout), do_record=do_record)
+
+    def _apply_feedback_timeout(self, tg, timeout):
+        tg.set_feedback_timeout(timeout)
+        self.set_health_check_timeout(timeout + tg.sending_delay, target=tg,
+                                      do_record=False, do_show=False)
+
+    def _tune_feedback_timeouts(self):
+        for tg in self._currently_used_targets:
+            tuner = self._fbk_timeout_tuners.get(tg)
+            if tuner is None:
+                continue
+            sending_date = tg.get_last_sending_date()
+            if sending_date is None:
+                continue
+            ack_date = tg.get_last_target_ack_date()
+            if ack_date is not None and ack_date >= sending_date:
+                changed = tuner.add_latency((ack_date - sending_date).total_seconds())
+            else:
+                changed = tuner.add_timeout()
+
+            if changed:
+                self._apply_feedback_timeout(tg, tuner.timeout)
+                self.lg.log_fmk_info(
+                    "Target {!s} adaptive feedback timeout = {:.3f}s (p{:g} latency = {:.3f}s "
+                    "over {:d} samples, {:d} missing acks)".format(
+                        self._get_detailed_target_desc(tg), tuner.timeout, tuner.percentile,
+                        tuner.get_percentile(), tuner.sample_count, tuner.timeouts))
+
     @EnforceOrder(accepted_states=["S1", "S2"])
     def set_feedback_mode(self, mode, tg_id=None, do_record=False, do_show=True):
         def _set_fbk_mode(tg):
@@ -2361,7 +2547,7 @@ class FmkPlumbing(object):
     def process_data_and_send( self, data_desc=None, id_from_fmkdb=None, id_from_db=None,
                               max_loop=1, tg_ids=None,
                               verbose=False, console_display=True,
-                              save_generator_seed=False):
+                              save_generator_seed=False, prefetch=None, batch=None):
         """
         Send data to the selected targets. These data can follow a specific processing before
         being emitted. The latter depends on what is provided in `data_desc`.
@@ -2383,6 +2569,19 @@ class FmkPlumbing(object):
             save_generator_seed: If random Generators are used, the generated data will be internally saved
               and will be reused next time this generator will be called, until
               FmkPlumbing.cleanup_dmaker(... reset_existing_seed=True) is called on this Generator.
+            prefetch: Number of data to prepare in advance from `data_desc`, within a separate
+              thread, while the framework waits for the feedback of the data in flight (refer
+              to :class:`framework.prefetch.DataPrefetcher`). The generation of a data carrying
+              callbacks (e.g., within a Scenario) or ending a DataProcess is not anticipated, and
+              prefetched data are discarded if the data makers are reset. The prefetched data that
+              are not sent when the loop ends early are sent first by the next call with the same
+              `data_desc` (as the data makers have moved past them), unless the data makers are
+              reset in between. If `None`, the value set through :meth:`set_prefetch_depth` is
+              used.
+            batch: Number of data generated from `data_desc` that are sent in one call to the
+              targets (refer to :meth:`set_sending_batch_size`). A data carrying callbacks or
+              ending a DataProcess is always sent on its own. `max_loop` still counts
+              each data. If `None`, the value set through :meth:`set_sending_batch_size` is used.
 
         Returns:
             The list of data that have been sent. `None` if nothing was sent due to some error.
@@ -2411,10 +2610,8 @@ class FmkPlumbing(object):
                 data_desc.seed = data
 
             data_desc = data_desc if isinstance(data_desc, list) else [data_desc]
-            cpt = 0
-            sent_data = []
-            while cpt < max_loop or max_loop == -1:
-                cpt += 1
+
+            def build_data_list():
                 data_list = []
                 for d_desc in data_desc:
                     data = self.handle_data_desc(d_desc, resolve_dataprocess=True,
@@ -2425,15 +2622,73 @@ class FmkPlumbing(object):
                     if tg_ids:
                         data.tg_ids = tg_ids
                     data_list.append(data)
+                return data_list
+
+            # durations recorded while prefetching a data list (id -> durations per stage). They
+            # are accounted in the cycle of the data list once it is sent, instead of the cycle
+            # of the data in flight.
+            perf_cycles = {}
+
+            def prefetch_data_list():
+                data_list = build_data_list()
+                perf_cycles[id(data_list)] = self.perf.end_cycle()
+                return data_list
+
+            def get_prefetched_data_list():
+                data_list = self._prefetcher.get()
+                if data_list is not None:
+                    self.perf.add_to_cycle(perf_cycles.pop(id(data_list), None))
+                return data_list
+
+            desc_key = self._data_desc_key(data_desc, tg_ids, save_generator_seed)
+            # registered during the loop so that a reset of the data makers also clears it
+            unsent = self._unsent_prefetched.setdefault(desc_key, collections.deque())
+            count = None if max_loop == -1 else max_loop - len(unsent)
+
+            prefetch = self._prefetch_depth if prefetch is None else prefetch
+            if prefetch > 0 and max_loop != 1 and self._prefetcher is None \
+                    and (count is None or count > 0):
+                self._prefetcher = DataPrefetcher(
+                    prefetch_data_list, prefetch, count=count, sync_point=self._is_sync_point)
+                self._prefetcher.start()
+                produce_data_list = get_prefetched_data_list
+            else:
+                produce_data_list = build_data_list
 
-                go_on, sdata = self.send_data_and_log(data_list, verbose=verbose,
-                                                      console_display=console_display)
-                if sdata:
-                    for d in sdata:
-                        sent_data.append(d)
+            def next_data_list():
+                if unsent:
+                    data_list, perf_cycle = unsent.popleft()
+                    self.perf.add_to_cycle(perf_cycle)
+                    return data_list
+                return produce_data_list()
 
-                if not go_on:
-                    break
+            batch = self._batch_size if batch is None else batch
+
+            sent_data = []
+            try:
+                for data_list in self._iter_batches(next_data_list, max_loop, batch):
+                    go_on, sdata = self.send_data_and_log(data_list, verbose=verbose,
+                                                          console_display=console_display)
+                    if sdata:
+                        for d in sdata:
+                            sent_data.append(d)
+
+                    if not go_on:
+                        break
+            finally:
+                if produce_data_list is not build_data_list:
+                    prefetcher, self._prefetcher = self._prefetcher, None
+                    stopped = prefetcher.stop()
+                    unsent.extend((dlist, perf_cycles.pop(id(dlist), None)) for dlist in stopped)
+                    if prefetcher.discarded > len(stopped):
+                        self.lg.log_fmk_info("{:d} prefetched data have been discarded"
+                                             .format(prefetcher.discarded - len(stopped)),
+                                             do_record=False)
+                if not unsent:
+                    self._unsent_prefetched.pop(desc_key, None)
+                else:
+                    self.lg.log_fmk_info("{:d} prefetched data not sent are kept for the next "
+                                         "sending loop".format(len(unsent)), do_record=False)
 
         else:
             cpt = 0
@@ -2452,6 +2707,57 @@ class FmkPlumbing(object):
 
         return sent_data
 
+    @staticmethod
+    def _data_desc_key(data_desc, tg_ids, save_generator_seed):
+        """
+        Returns:
+            tuple: key identifying the data that `data_desc` will produce, so that the unsent
+            prefetched data are only served to a sending loop processing the same `data_desc`
+        """
+        key = []
+        for d_desc in data_desc:
+            if isinstance(d_desc, DataProcess):
+                seed = d_desc.seed if d_desc.seed is None or isinstance(d_desc.seed, str) \
+                    else id(d_desc.seed)
+                key.append((repr(d_desc.process), seed, repr(d_desc.tg_ids)))
+            elif isinstance(d_desc, str):
+                key.append(d_desc)
+            else:
+                key.append(id(d_desc))
+        return tuple(key), repr(tg_ids), save_generator_seed
+
+    @staticmethod
+    def _is_sync_point(data_list):
+        # the handling of such data depends on what happened to the previous ones
+        return any(d.is_unusable() or d.has_callbacks() for d in data_list)
+
+    def _iter_batches(self, next_data_list, max_loop, batch):
+        """
+        Yield the data lists provided by `next_data_list()` (at most `max_loop` of them,
+        -1 meaning no limit), by merging up to `batch` consecutive ones.
+        """
+        pending = []
+        cpt = 0
+        while cpt < max_loop or max_loop == -1:
+            cpt += 1
+            data_list = next_data_list()
+            if data_list is None:
+                break
+
+            if batch > 1 and not self._is_sync_point(data_list):
+                pending.append(data_list)
+                if len(pending) >= batch:
+                    yield [d for dlist in pending for d in dlist]
+                    pending = []
+            else:
+                if pending:
+                    yield [d for dlist in pending for d in dlist]
+                    pending = []
+                yield data_list
+
+        if pending:
+            yield [d for dlist in pending for d in dlist]
+
     @EnforceOrder(accepted_states=["S2"])
     def send_data_and_log(self, data_list, verbose=False, console_display=True):
         if not console_display:
@@ -2468,7 +2774,8 @@ class FmkPlumbing(object):
 
         # we delay sending after calling self._do_sending_and_logging_init(data_list)
         # as this delay can be changed while data is handled by this method.
-        go_on = self._delay_sending()
+        with self._prefetching_window():
+            go_on = self._delay_sending()
         if not go_on:
             return False, None
 
@@ -2511,16 +2818,29 @@ class FmkPlumbing(object):
             except ValueError:
                 # empty list
                 max_fbk_timeout = self._fbk_timeout_default
-            for tg in self.targets.values():
-                if tg not in self._currently_used_targets:
-                    tg.collect_unsolicited_feedback(timeout=max_fbk_timeout)
+
+            # unused targets are collected concurrently and share the same deadline
+            deadline = time.monotonic() + max_fbk_timeout
+
+            def collect(tg):
+                return tg.collect_unsolicited_feedback(timeout=max(0, deadline - time.monotonic()))
+
+            unused_targets = [tg for tg in self.targets.values()
+                              if tg not in self._currently_used_targets]
+            with self._prefetching_window():
+                for tg, outcome in self._call_on_targets(unused_targets, collect):
+                    try:
+                        outcome()
+                    except:
+                        self._handle_user_code_exception()
 
         # the provided data_list can be changed after having called self._send_data()
         multiple_data = len(data_list) > 1
 
         if self.prj.wkspace_enabled:
             if self.prj.wkspace_size == 1:
-                self.__current = [data_list[-1]]
+                self.__current.clear()
+                self.__current.append(data_list[-1])
             else:
                 for dt in data_list:
                     self.__current.append(dt)
@@ -2529,37 +2849,54 @@ class FmkPlumbing(object):
                     self.lg.log_fmk_info(f"Workspace is full (size={self.prj.wkspace_size}). Older "
                                          f"entries will be removed (ratio={self.prj.wkspace_free_slot_ratio_when_full*100}%)")
                     fslots = int(self.prj.wkspace_free_slot_ratio_when_full * self.prj.wkspace_size)
-                    self.__current = self.__current[wkspace_len - self.prj.wkspace_size + fslots:]
+                    self.__current.remove_oldest(wkspace_len - self.prj.wkspace_size + fslots)
 
         for dt in data_list:
             dt.make_recordable()
 
         # When checking target readiness, feedback timeout is taken into account indirectly
         # through the call to Target.is_feedback_received()
-        cont0 = self.wait_for_target_readiness() >= 0
+        perf_start = self.perf.start()
+        with self._prefetching_window():
+            cont0 = self.wait_for_target_readiness() >= 0
+        self.perf.stop(PerfRecorder.TG_READINESS, perf_start)
 
+        perf_start = self.perf.start()
         if multiple_data:
             self._log_data(data_list, verbose=verbose)
         else:
             self._log_data(data_list[0], verbose=verbose)
+        self.perf.stop(PerfRecorder.FMKDB, perf_start)
 
         cont1 = True
         cont2 = True
         # That means this is the end of a burst
         if self._burst_countdown == self._burst:
-            cont1 = self.retrieve_and_log_target_feedback()
+            perf_start = self.perf.start()
+            cont1 = self.retrieve_and_log_target_feedback(record_perf=True)
+            self.perf.stop(PerfRecorder.FEEDBACK, perf_start)
+            if self._fbk_timeout_tuners:
+                self._tune_feedback_timeouts()
 
+        perf_start = self.perf.start()
         self.mon.notify_target_feedback_retrieval()
-        self.mon.wait_for_probe_status_retrieval()
+        with self._prefetching_window():
+            self.mon.wait_for_probe_status_retrieval()
 
         if self._burst_countdown == self._burst:
             # We handle probe feedback if any
-            cont2 = self.monitor_probes(force_record=True)
+            cont2 = self.monitor_probes(force_record=True, record_perf=True)
             for tg in self._currently_used_targets:
                 tg.cleanup()
+        self.perf.stop(PerfRecorder.PROBES, perf_start)
 
         self._do_after_feedback_retrieval(data_list)
 
+        if self.perf.enabled:
+            perf_cycle = self.perf.end_cycle()
+            if self.perf.persist:
+                self.fmkdb_insert_perf(data_list, perf_cycle)
+
         if not console_display:
             self.lg.display_on_term = lg_display_on_term_save
 
@@ -2633,9 +2970,30 @@ class FmkPlumbing(object):
 
             self._currently_used_targets = used_targets
 
-            for tg in self._currently_used_targets:
-                try:
+            serializations = []
+
+            def send(tg):
+                tg_start = self.perf.start()
+                if tg_start is None:
                     tg.send_pending_data(from_fmk=True)
+                    return
+                # the serialization of the data is timed when it is done by the target
+                with timing_serialization() as serialization:
+                    try:
+                        tg.send_pending_data(from_fmk=True)
+                    finally:
+                        scope = self.available_targets_desc.get(tg, str(tg))
+                        self.perf.stop(PerfRecorder.SENDING, tg_start, scope=scope, cycle=False)
+                        if serialization[0]:
+                            self.perf.record(PerfRecorder.TO_BYTES, serialization[0], scope=scope,
+                                             cycle=False)
+                            serializations.append(serialization[0])
+
+            perf_start = self.perf.start()
+            outcomes = self._call_on_targets(self._currently_used_targets, send)
+            for tg, outcome in outcomes:
+                try:
+                    outcome()
                 except TargetStuck as e:
                     self.lg.log_target_feedback_from(
                         source=FeedbackSource(self),
@@ -2651,6 +3009,9 @@ class FmkPlumbing(object):
                     self._sending_error = True
                 else:
                     self.mon.notify_data_sending_event()
+            self.perf.stop(PerfRecorder.SENDING, perf_start)
+            if serializations:
+                self.perf.record(PerfRecorder.TO_BYTES, sum(serializations))
 
             self._do_after_sending_data(data_list)
 
@@ -2753,7 +3114,7 @@ class FmkPlumbing(object):
 
                 tg_ids = self._vtg_to_tg(dt)
                 for tg_id in tg_ids:
-                    tg = self.targets[tg_id]
+                    tg = self.targets[tg_id].get_data_recipient(dt)
                     ack_date = tg.get_last_target_ack_date()
                     self.lg.set_target_ack_date(FeedbackSource(tg), date=ack_date)
 
@@ -2773,6 +3134,22 @@ class FmkPlumbing(object):
 
                 self.lg.reset_current_state()
 
+    def _call_on_targets(self, targets, func):
+        """
+        Call `func(tg)` for each target of `targets`. The calls are performed concurrently
+        if several targets are involved.
+
+        Returns:
+            list: the pairs `(tg, outcome)` in the same order as `targets`. `outcome()` returns
+            the value returned by `func(tg)` or raises the exception it triggered.
+        """
+        if len(targets) < 2 or self._tg_executor is None:
+            # the call is done when its outcome is requested
+            return [(tg, partial(func, tg)) for tg in targets]
+
+        futures = [(tg, self._tg_executor.submit(func, tg)) for tg in targets]
+        return [(tg, fut.result) for tg, fut in futures]
+
     @EnforceOrder(accepted_states=["S2"])
     def _setup_new_sending(self):
         if self._burst > 1 and self._burst_countdown == self._burst:
@@ -2782,7 +3159,7 @@ class FmkPlumbing(object):
         self._current_sent_date = self.lg.start_new_log_entry(preamble=p)
 
     @EnforceOrder(accepted_states=["S2"])
-    def retrieve_and_log_target_feedback(self, residual=False):
+    def retrieve_and_log_target_feedback(self, residual=False, record_perf=False):
         collected_status, err_detected2 = None, False
         ok = True
         if self.__tg_enabled:
@@ -2798,6 +3175,7 @@ class FmkPlumbing(object):
                 pass
 
             for tg in self.targets.values():
+                perf_start = self.perf.start() if record_perf else None
                 if collected_status:
                     status = collected_status.get(tg, tg.STATUS_THRESHOLD_FOR_RECOVERY)
                     status = tg.STATUS_THRESHOLD_FOR_RECOVERY if status is None else status
@@ -2808,6 +3186,8 @@ class FmkPlumbing(object):
                 go_on = self._recover_target(tg) if err_detected1 or err_detected2 else True
                 if not go_on:
                     ok = False
+                self.perf.stop(PerfRecorder.FEEDBACK, perf_start,
+                               scope=self.available_targets_desc.get(tg, str(tg)), cycle=False)
 
         return ok
 
@@ -2833,7 +3213,7 @@ class FmkPlumbing(object):
                 err_detected = True
 
             if tg_fbk.has_fbk_collector():
-                for ref, fbk, status, tstamp in tg_fbk.iter_and_cleanup_collector():
+                for ref, fbk, status, tstamp, data in tg_fbk.iter_and_cleanup_collector(with_related_data=True):
                     if status < tg.STATUS_THRESHOLD_FOR_RECOVERY:
                         err_detected = True
                     self.lg.log_target_feedback_from(source=FeedbackSource(tg, subref=ref,
@@ -2842,7 +3222,8 @@ class FmkPlumbing(object):
                                                      status_code=status,
                                                      timestamp=tstamp,
                                                      preamble=preamble,
-                                                     epilogue=epilogue)
+                                                     epilogue=epilogue,
+                                                     related_data=data)
 
             raw_fbk = tg_fbk.get_bytes()
             if raw_fbk is not None:
@@ -3002,14 +3383,25 @@ class FmkPlumbing(object):
         if isinstance(data, Data):
             data = [data]
         for d in data:
-            self.__db_idx += 1
-            self.__data_bank[self.__db_idx] = d
+            self.__data_bank.append(d)
 
     @EnforceOrder(accepted_states=["S2"])
     def fmkdb_fetch_data(self, start_id=1, end_id=-1):
+        records = self.fmkDB.fetch_data(start_id=start_id, end_id=end_id)
+        regenerated = self._regenerate_data([rec[0] for rec in records if rec[1] is None])
+
         data_list = []
-        for record in self.fmkDB.fetch_data(start_id=start_id, end_id=end_id):
+        for record in records:
             data_id, content, dtype, dmk_name, dm_name = record
+            if content is None:
+                data = regenerated.get(data_id)
+                if data is None:
+                    continue
+                data.set_data_id(data_id)
+                data.from_fmkdb = True
+                data_list.append(data)
+                continue
+
             data = Data(content)
             data.set_data_id(data_id)
             data.set_initial_dmaker((str(dtype), str(dmk_name), None))
@@ -3026,6 +3418,137 @@ class FmkPlumbing(object):
 
         return data_list
 
+    def _regenerate_data(self, data_ids):
+        """
+        Regenerate data that have been recorded for replay (refer to :meth:`enable_replay_recording`)
+        by running their data makers chain again. As the data makers need to be reset for that
+        purpose, it should not be done while a chain is in use.
+
+        Returns:
+            dict: the regenerated data (whose content matches the recorded hash) per data ID
+        """
+        regenerated = {}
+        if not data_ids:
+            return regenerated
+
+        if self.dm is None:
+            self.set_error("Data {!s} cannot be regenerated without the data model they come from "
+                           "being loaded".format(data_ids), code=Error.FmkWarning)
+            return regenerated
+
+        sessions = {}
+        for data_id in data_ids:
+            recipe = self.fmkDB.fetch_replay_recipe(data_id)
+            if recipe is None:
+                self.set_error("Data {:d} has not been stored and cannot be regenerated".format(data_id),
+                               code=Error.FmkWarning)
+                continue
+            seed, case_index, chain, hash_value = recipe
+            sessions.setdefault((seed, chain), {})[case_index] = (data_id, hash_value)
+
+        def run(seed, cases, case_indexes, action_list, valid_gen, save_gen_seed):
+            self._cleanup_all_dmakers(reset_existing_seed=True)
+            for idx in case_indexes:
+                data = self._process_recorded_data(seed, idx, action_list, valid_gen=valid_gen,
+                                                   save_gen_seed=save_gen_seed)
+                if idx in cases:
+                    data_id, hash_value = cases[idx]
+                    if data is not None and content_hash(data.to_bytes()) == hash_value:
+                        regenerated[data_id] = data
+                        del cases[idx]
+
+        for (seed, chain), cases in sessions.items():
+            try:
+                chain = ReplayRecorder.load_chain(chain)
+            except ValueError as err:
+                for data_id, _ in cases.values():
+                    self.set_error("Data {:d} cannot be regenerated: {!s}".format(data_id, err),
+                                   code=Error.FmkWarning)
+                continue
+            # If the data makers of the chain are stateless, a data only depends on its seed.
+            # Otherwise, the whole session has to be replayed.
+            for idx in sorted(cases):
+                run(seed, cases, [idx], *chain)
+            if cases:
+                run(seed, cases, range(1, max(cases) + 1), *chain)
+            for data_id, _ in cases.values():
+                self.set_error("Data {:d} cannot be regenerated (its data makers are not "
+                               "deterministic)".format(data_id), code=Error.FmkWarning)
+
+        self._cleanup_all_dmakers(reset_existing_seed=True)
+
+        return regenerated
+
+    def fmkdb_insert_evolution_stats(self, population, generation, scores):
+        if not scores:
+            return
+        prj_name = self.prj.name if self.prj else None
+        self.fmkDB.insert_evolution_stats(str(population), generation, len(scores),
+                                          max(scores), sum(scores) / len(scores), min(scores),
+                                          datetime.datetime.now(), prj_name)
+
+    def fmkdb_insert_perf(self, data_list, durations):
+        # durations are stored in milliseconds
+        values = [durations[stage] / 1e6 if stage in durations else None
+                  for stage in PerfRecorder.STAGES]
+        for d in data_list:
+            data_id = d.get_data_id()
+            if data_id is not None:
+                self.fmkDB.insert_perf(data_id, *values)
+
+    @EnforceOrder(always_callable=True)
+    def enable_perf_recording(self, persist=False):
+        self.perf.enable(persist=persist)
+        self._log_fmk_info("Enable performance recording" + (" (stored in FmkDB)" if persist else ""))
+
+    @EnforceOrder(always_callable=True)
+    def disable_perf_recording(self):
+        self.perf.disable()
+        self._log_fmk_info("Disable performance recording")
+
+    @EnforceOrder(always_callable=True)
+    def enable_replay_recording(self):
+        """
+        Record the data generated from data makers chains so that they can be regenerated
+        from the FmkDB (refer to :mod:`fuddly.framework.replay`). Their contents will be stored
+        in the FmkDB only if they trigger negative feedback.
+        """
+        self.replay.enable()
+        self._log_fmk_info("Enable replay recording (only data with negative feedback are stored)")
+
+    @EnforceOrder(always_callable=True)
+    def disable_replay_recording(self):
+        self.replay.disable()
+        self._log_fmk_info("Disable replay recording")
+
+    @EnforceOrder(always_callable=True)
+    def reset_perf_records(self):
+        self.perf.reset()
+
+    @EnforceOrder(always_callable=True)
+    def show_perf(self):
+        self.lg.print_console("-=[ Sending Loop Performance ]=-", rgb=Color.INFO, style=FontStyle.BOLD)
+        self.lg.print_console("")
+        if not self.perf.enabled:
+            self.lg.print_console("Performance recording is disabled", rgb=Color.SUBINFO)
+            self.lg.print_console("")
+
+        stats = self.perf.get_stats()
+        if not stats:
+            self.lg.print_console("No record", rgb=Color.SUBINFO)
+        else:
+            def ms(v):
+                return '{:.3f}'.format(v / 1e6)
+
+            header = '{:<14s} {:<40s} {:>8s} {:>10s} {:>10s} {:>10s} {:>10s}'
+            self.lg.print_console(header.format('stage', 'scope', 'count', 'p50 (ms)', 'p99 (ms)',
+                                                'max (ms)', 'mean (ms)'), rgb=Color.SUBINFO)
+            for stage, scope, count, p50, p99, max_v, mean in stats:
+                self.lg.print_console(header.format(stage, scope[:40], str(count), ms(p50), ms(p99),
+                                                    ms(max_v), ms(mean)), rgb=Color.SUBINFO)
+
+        self.lg.print_console("\n", nl_before=False)
+
     def _log_fmk_info(self, msg):
         if self.lg:
             self.lg.log_fmk_info(msg, do_record=False)
@@ -3046,25 +3569,16 @@ class FmkPlumbing(object):
             self.set_error("Workspace is disabled!", code=Error.CommandError)
             return None
 
-        if self.__current:
-            entry = self.__current[-1]
-            return entry
-        else:
-            return None
+        return self.__current.last()
 
     @EnforceOrder(accepted_states=["S2"])
     def get_from_data_bank(self, i):
-        try:
-            entry = self.__data_bank[i]
-        except KeyError:
-            return None
-
-        return entry
+        return self.__data_bank.get(i)
 
     @EnforceOrder(accepted_states=["S2"])
     def iter_data_bank(self):
-        for i in self.__data_bank:
-            yield self.__data_bank[i]
+        for data in self.__data_bank:
+            yield data
 
     def _show_entry(self, data):
         gen = self.__current_gen
@@ -3122,7 +3636,7 @@ class FmkPlumbing(object):
     def show_data_bank(self):
         self.lg.print_console("-=[ Data Bank ]=-\n", rgb=Color.INFO, style=FontStyle.BOLD)
 
-        for idx, entry in self.__data_bank.items():
+        for idx, entry in self.__data_bank.items(materialize=False):
             msg = "===[ {:d} ]===".format(idx)
             msg += "=" * (max(80 - len(msg), 0))
             self.lg.print_console(msg, rgb=Color.INFO)
@@ -3138,15 +3652,14 @@ class FmkPlumbing(object):
 
         self.lg.print_console("-=[ Workspace ]=-\n", rgb=Color.INFO, style=FontStyle.BOLD)
 
-        for data in self.__current:
+        for _, data in self.__current.items(materialize=False):
             self._show_entry(data)
 
         self.lg.print_console("\n", nl_before=False)
 
     @EnforceOrder(accepted_states=["S2"])
     def empty_data_bank(self):
-        self.__data_bank = {}
-        self.__db_idx = 0
+        self.__data_bank.clear()
 
     @EnforceOrder(accepted_states=["S2"])
     def empty_workspace(self):
@@ -3154,7 +3667,7 @@ class FmkPlumbing(object):
             self.set_error("Workspace is disabled!", code=Error.CommandError)
             return
 
-        self.__current = []
+        self.__current.clear()
 
     @EnforceOrder(accepted_states=["S2"])
     def register_current_in_data_bank(self):
@@ -3162,9 +3675,8 @@ class FmkPlumbing(object):
             self.set_error("Workspace is disabled!", code=Error.CommandError)
             return
 
-        if self.__current:
-            for data in self.__current:
-                self.register_in_data_bank(data)
+        for data in self.__current:
+            self.register_in_data_bank(data)
 
     @EnforceOrder(accepted_states=["S2"])
     def register_last_in_data_bank(self):
@@ -3172,8 +3684,9 @@ class FmkPlumbing(object):
             self.set_error("Workspace is disabled!", code=Error.CommandError)
             return
 
-        if self.__current:
-            self.register_in_data_bank(self.__current[-1])
+        data = self.__current.last()
+        if data is not None:
+            self.register_in_data_bank(data)
 
     @EnforceOrder(accepted_states=["S2"])
     def show_operators(self):
@@ -3410,6 +3923,40 @@ class FmkPlumbing(object):
 
         """
 
+        recipe = None
+        if self.replay.enabled and seed is None:
+            if reset_dmakers:
+                self.replay.reset()
+            try:
+                recipe = self.replay.next_case(action_list, valid_gen=valid_gen,
+                                               save_gen_seed=save_gen_seed)
+            except ValueError as err:
+                self.set_error("The data will be stored as its data makers chain cannot be "
+                               "recorded for replay: {!s}".format(err), code=Error.FmkWarning)
+
+        if recipe is None:
+            data = self._process_data(action_list, seed=seed, valid_gen=valid_gen,
+                                      save_gen_seed=save_gen_seed, reset_dmakers=reset_dmakers)
+        else:
+            data = self._process_recorded_data(recipe.seed, recipe.case_index, action_list,
+                                               valid_gen=valid_gen, save_gen_seed=save_gen_seed,
+                                               reset_dmakers=reset_dmakers)
+
+        if data is not None:
+            # a data processed from a seed can also be a copy of a recorded data
+            data.replay_recipe = recipe
+
+        return data
+
+    def _process_recorded_data(self, seed, case_index, action_list, **kwargs):
+        with self.replay.seeded_rng(seed, case_index):
+            data = self._process_data(action_list, **kwargs)
+            # nodes are frozen with the same seed, as their random parts are resolved at that time
+            if data is not None and data.has_node_content():
+                data.content.freeze()
+        return data
+
+    def _process_data(self, action_list, seed=None, valid_gen=False, save_gen_seed=False, reset_dmakers=False):
         l = []
         action_list = action_list[:]
 
@@ -3628,6 +4175,7 @@ class FmkPlumbing(object):
             if not setup_crashed and not setup_err:
                 try:
                     invalid_data = False
+                    perf_start = self.perf.start()
                     if isinstance(dmaker_obj, Generator):
                         if dmaker_obj.produced_seed is not None:
                             data = Data(dmaker_obj.produced_seed.get_content(do_copy=True))
@@ -3661,6 +4209,9 @@ class FmkPlumbing(object):
                     else:
                         raise ValueError
 
+                    self.perf.stop(PerfRecorder.GENERATION if isinstance(dmaker_obj, Generator)
+                                   else PerfRecorder.DISRUPTION, perf_start, scope=dmaker_type)
+
                     self._do_after_dmaker_data_retrieval(data)
 
                     if invalid_data:
@@ -3760,6 +4311,8 @@ class FmkPlumbing(object):
         return self._cleanup_all_dmakers(reset_existing_seed=reset_existing_seed)
 
     def _cleanup_all_dmakers(self, reset_existing_seed=True):
+        self.replay.reset()
+        self._discard_prefetched_data()
         if not self.__initialized_dmakers:
             return
 
@@ -3778,6 +4331,8 @@ class FmkPlumbing(object):
 
     @EnforceOrder(accepted_states=["S1", "S2"])
     def cleanup_dmaker( self, dmaker_type=None, name=None, dmaker_obj=None, reset_existing_seed=True, error_on_init=True):
+        self.replay.reset()
+        self._discard_prefetched_data()
         if dmaker_obj is not None:
             if reset_existing_seed and isinstance(dmaker_obj, Generator):
                 dmaker_obj.produced_seed = None
@@ -3866,6 +4421,15 @@ class FmkPlumbing(object):
                 msg += "stopped"
             self.lg.print_console(msg, rgb=Color.SUBINFO)
 
+            stats = self.mon.get_probe_latency_stats(p)
+            if stats is not None and stats['arm'].count:
+                msg = "  | latency (ms) over {:d} data:".format(stats['arm'].count)
+                for name, hist in stats.items():
+                    if hist.count:
+                        msg += " {:s} mean={:.3f} p99={:.3f} max={:.3f} |".format(
+                            name, hist.mean / 1e6, hist.percentile(99) / 1e6, hist.max / 1e6)
+                self.lg.print_console(msg, rgb=Color.SUBINFO)
+
         self.lg.print_console("\n", nl_before=False)
 
     @EnforceOrder(accepted_states=["S2"])
@@ -5334,6 +5898,34 @@ class FmkShell(cmd.Cmd):
         self.__error = False
         return False
 
+    def do_set_adaptive_feedback_timeout(self, line):
+        """
+        Adapt the feedback timeout of the targets to their response latencies. The current
+        feedback timeout becomes the upper bound of the adaptive one.
+        |  syntax: set_adaptive_feedback_timeout <on|off> [targetID]
+        |  |_ if targetID is not provided, it applies to all enabled targets
+        """
+        self.__error = True
+
+        args = line.split()
+        args_len = len(args)
+
+        if args_len not in (1, 2) or args[0] not in ('on', 'off'):
+            return False
+
+        tg_id = None
+        if args_len > 1:
+            try:
+                tg_id = int(args[1])
+            except ValueError:
+                self.__error_msg = "Parameter 2 shall be an integer!"
+                return False
+
+        self.fz.set_adaptive_feedback_timeout(args[0] == 'on', tg_id=tg_id)
+
+        self.__error = False
+        return False
+
     def do_switch_feedback_mode(self, line):
         """
         Switch target feedback mode between:
@@ -5434,6 +6026,54 @@ class FmkShell(cmd.Cmd):
         self.__error = False
         return False
 
+    def do_set_prefetch(self, line):
+        """
+        Set the number of data prepared in advance when data are sent in a loop,
+        while the framework waits for the feedback of the data in flight (Default = 0).
+        |  syntax: set_prefetch <arg>
+        |  |_ possible values for <arg>:
+        |      0 : data are generated right before being sent
+        |      N : up to N data are generated in advance
+        """
+        self.__error = True
+
+        args = line.split()
+        args_len = len(args)
+
+        if args_len != 1:
+            return False
+        try:
+            val = int(args[0])
+        except ValueError:
+            return False
+
+        self.__error = not self.fz.set_prefetch_depth(val)
+        return False
+
+    def do_set_batch(self, line):
+        """
+        Set the number of data sent in one call to the targets when data are sent
+        in a loop (Default = 1).
+        |  syntax: set_batch <arg>
+        |  |_ possible values for <arg>:
+        |      1 : each data is sent on its own
+        |      N : up to N data are handed over to the targets in one call
+        """
+        self.__error = True
+
+        args = line.split()
+        args_len = len(args)
+
+        if args_len != 1:
+            return False
+        try:
+            val = int(args[0])
+        except ValueError:
+            return False
+
+        self.__error = not self.fz.set_sending_batch_size(val)
+        return False
+
     def do_show_db(self, line):
         """Show the Data Bank"""
         self.fz.show_data_bank()
@@ -5794,6 +6434,58 @@ class FmkShell(cmd.Cmd):
         self.fz.disable_fmkdb()
         return False
 
+    def do_show_perf(self, line):
+        """
+        Show the time spent in each stage of the sending loop (per data maker and per target)
+        |_ syntax: show_perf [reset]
+        """
+        self.__error = True
+        args = line.split()
+        if args and args != ['reset']:
+            return False
+
+        self.fz.show_perf()
+        if args:
+            self.fz.reset_perf_records()
+
+        self.__error = False
+        return False
+
+    def do_enable_perf(self, line):
+        """
+        Enable the recording of the time spent in each stage of the sending loop
+        |_ syntax: enable_perf [persist]
+        |_ with 'persist', the durations of each data are also stored in the table PERF of the FmkDB
+        """
+        self.__error = True
+        args = line.split()
+        if args and args != ['persist']:
+            return False
+
+        self.fz.enable_perf_recording(persist=bool(args))
+
+        self.__error = False
+        return False
+
+    def do_disable_perf(self, line):
+        """Disable the recording of the time spent in each stage of the sending loop"""
+        self.fz.disable_perf_recording()
+        return False
+
+    def do_enable_replay(self, line):
+        """
+        Record the data generated by data makers so that they can be regenerated from the FMKDB
+        (with 'fmkdb_fetch_data') instead of being stored. Only the data that trigger negative
+        feedback are stored.
+        """
+        self.fz.enable_replay_recording()
+        return False
+
+    def do_disable_replay(self, line):
+        """Disable the recording of the data for replay"""
+        self.fz.disable_replay_recording()
+        return False
+
     def do_enable_fbk_handlers(self, line):
         """Enable Feedback Handlers"""
         self.fz.prj.enable_feedback_handlers()
@@ -0,0 +1,200 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+Prefetching of the data of a sending loop.
+
+:class:`DataPrefetcher` prepares the next data of a loop within a separate thread, while the
+framework waits for the target feedback of the data in flight. In order not to race with the
+framework, the producer thread only runs while the framework is idle, that is to say within
+:meth:`DataPrefetcher.idle` contexts. Thus, the data are produced in the same order and with
+the same framework state as in a sequential loop, only earlier.
+"""
+
+import collections
+import contextlib
+import threading
+
+
+class DataPrefetcher(object):
+    """
+    Produce items through the `produce` callable within a separate thread, up to `depth` items
+    ahead of the consumer (the thread that has called :meth:`start`).
+
+    An item for which `sync_point` returns True (e.g., a data that carries callbacks able to
+    change what comes next) is the last one produced until the consumer has handled it, i.e.,
+    until it asks for the next one.
+    """
+
+    def __init__(self, produce, depth, count=None, sync_point=None):
+        """
+        Args:
+            produce: callable returning a new item.
+            depth (int): maximum number of items produced ahead of the consumer.
+            count (int): number of items to produce. None means no limit.
+            sync_point: callable telling if the producer has to wait for an item
+              to be handled before producing the next one.
+        """
+        assert depth > 0
+        self.depth = depth
+        self.discarded = 0
+        self._produce = produce
+        self._remaining = count
+        self._sync_point = sync_point
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._window = threading.Lock()
+        self._idle_depth = 0
+        self._paused = False
+        self._pending_sync = False
+        self._finished = False
+        self._stopped = False
+        self._deferred = None
+        self._thread = None
+
+    def start(self):
+        self._window.acquire()
+        self._thread = threading.Thread(target=self._run, name='DataPrefetcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the producer. The items not retrieved by the consumer are discarded.
+
+        Returns:
+            list: the discarded items (the ones whose production failed excepted)
+        """
+        with self._cond:
+            self._stopped = True
+            discarded = [item for item, _, _, exc in self._queue if exc is None]
+            self.discarded += len(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        self._window.release()
+        self._thread.join()
+        return discarded
+
+    def in_producer(self):
+        return threading.current_thread() is self._thread
+
+    def defer(self, func):
+        """
+        Within the producer thread, postpone the call to `func` until the item being produced
+        is retrieved by the consumer (e.g., to report errors in the order of the sequential loop).
+        """
+        self._deferred.append(func)
+
+    @contextlib.contextmanager
+    def idle(self):
+        """
+        Let the producer run while the consumer is within this context (which can be nested).
+        """
+        self._idle_depth += 1
+        if self._idle_depth == 1:
+            self._window.release()
+        try:
+            yield
+        finally:
+            self._idle_depth -= 1
+            if self._idle_depth == 0:
+                self._window.acquire()
+
+    def get(self):
+        """
+        Return the next item (waiting for it if needed), or None if all of them have been
+        produced.
+        """
+        with self.idle():
+            with self._cond:
+                if self._pending_sync:
+                    # the synchronization point has been handled by the consumer
+                    self._pending_sync = False
+                    self._paused = False
+                    self._cond.notify_all()
+                while not self._queue and not self._finished and self._remaining != 0:
+                    self._cond.wait()
+                if not self._queue:
+                    return None
+                item, is_sync_point, deferred, exc = self._queue.popleft()
+                self._pending_sync = is_sync_point
+                self._cond.notify_all()
+
+        for func in deferred:
+            func()
+        if exc is not None:
+            raise exc
+        return item
+
+    def discard(self):
+        """
+        Discard the items produced ahead of the consumer, as they have become obsolete
+        (e.g., the data makers have been reset). They will be produced again.
+        """
+        if self.in_producer():
+            return
+        with self._cond:
+            if self._remaining is not None:
+                self._remaining += len(self._queue)
+            self.discarded += len(self._queue)
+            self._queue.clear()
+            # unless the consumer is handling a synchronization point
+            self._paused = self._pending_sync
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and (self._paused or len(self._queue) >= self.depth
+                                             or self._remaining == 0):
+                    self._cond.wait()
+                if self._stopped:
+                    break
+
+            with self._window:
+                with self._cond:
+                    if self._stopped or self._paused or len(self._queue) >= self.depth \
+                            or self._remaining == 0:
+                        # the queue may have changed while waiting for the window
+                        continue
+                self._deferred = []
+                try:
+                    item, exc = self._produce(), None
+                except Exception as err:
+                    item, exc = None, err
+                deferred, self._deferred = self._deferred, None
+
+            with self._cond:
+                is_sync_point = exc is not None or \
+                                (self._sync_point is not None and self._sync_point(item))
+                self._queue.append((item, is_sync_point, deferred, exc))
+                if self._remaining is not None:
+                    self._remaining -= 1
+                self._paused = is_sync_point
+                self._cond.notify_all()
+                if exc is not None:
+                    break
+
+        with self._cond:
+            self._finished = True
+            self._cond.notify_all()
@@ -45,9 +45,12 @@ class Project(object):
     wkspace_enabled = None
     wkspace_size = None
     wkspace_free_slot_ratio_when_full = None
+    wkspace_max_live_entries = None
+    data_bank_max_live_entries = None
 
     def __init__(self, enable_fbk_processing=True,
                  wkspace_enabled=True, wkspace_size=1000, wkspace_free_slot_ratio_when_full=0.5,
+                 wkspace_max_live_entries=None, data_bank_max_live_entries=None,
                  fmkdb_enabled=True,
                  default_fbk_timeout=None, default_fbk_mode=None,
                  default_sending_delay=None, default_burst_value=None):
@@ -62,6 +65,14 @@ class Project(object):
             wkspace_free_slot_ratio_when_full: when the workspace is full, provide the ratio
               of the workspace size that will be used as the amount of entries to free in
               the workspace.
+            wkspace_max_live_entries: Maximum number of data of the workspace that are kept
+              in memory. The least recently used ones are serialized to a temporary file
+              and rebuilt on access, by absorbing their bytes with the atom they come from
+              (or as raw data if it fails). Only their bytes, data model, data ID, data maker
+              history and information are restored, meaning their callbacks, feedback
+              timeout and other attributes are lost. If `None` (default), every data
+              is kept in memory.
+            data_bank_max_live_entries: same as `wkspace_max_live_entries` but for the Data Bank.
             fmkdb_enabled: If set to `True`, the fmkDB will be used. Otherwise, no DB transactions will
               occur and thus the fmkDB won't be filled during the session.
             default_fbk_timeout: If not None, when the project will be run, this value will be used
@@ -85,6 +96,8 @@ class Project(object):
         self.wkspace_enabled = wkspace_enabled
         self.wkspace_size = wkspace_size
         self.wkspace_free_slot_ratio_when_full = wkspace_free_slot_ratio_when_full
+        self.wkspace_max_live_entries = wkspace_max_live_entries
+        self.data_bank_max_live_entries = data_bank_max_live_entries
         self.fmkdb_enabled = fmkdb_enabled
 
         self.default_fbk_timeout = default_fbk_timeout
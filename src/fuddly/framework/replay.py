@@ -0,0 +1,239 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+"""
+Recording of the data makers chains, so that generated data can be regenerated instead of
+being stored.
+
+When :class:`ReplayRecorder` is enabled, each call to :meth:`FmkPlumbing.process_data` is
+run with the :mod:`random` module seeded from the session of its chain of data makers (the
+action list it is given) and the rank of the call within this session. A session starts
+with a random seed when the chain is used for the first time after the data makers have
+been reset. A data can thus be regenerated by running its chain from fresh data makers,
+with the same seeds, as many times as its rank. The SHA-256 hash of the data is recorded
+to verify the regenerated bytes.
+
+During the generation, the functions of the :mod:`random` module draw from a generator
+dedicated to the generating thread, so that the other threads of the framework (probes,
+targets, ...) neither disturb the generation nor are disturbed by it. The data makers have
+thus to call these functions through the module (``random.choice()``), as functions imported
+from it before the recording started (``from random import choice``) still draw from the
+shared generator.
+
+The chain of data makers is recorded in JSON, so that recorded chains can be loaded safely.
+Only the user inputs made of JSON types, ``bytes`` and ``tuple`` can be recorded.
+"""
+
+import contextlib
+import hashlib
+import json
+import random
+import threading
+
+from fuddly.framework.global_resources import UI
+
+
+def content_hash(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+_thread_rng = threading.local()
+_rng_proxies_lock = threading.Lock()
+_rng_proxies_installed = False
+
+
+def _install_rng_proxies():
+    """
+    Replace the functions of the :mod:`random` module (which are methods of its hidden
+    shared generator) by functions using the generator of the current thread if any.
+    """
+    global _rng_proxies_installed
+
+    def make_proxy(name, shared_fct):
+        def proxy(*args, **kwargs):
+            rng = getattr(_thread_rng, 'rng', None)
+            if rng is None:
+                return shared_fct(*args, **kwargs)
+            return getattr(rng, name)(*args, **kwargs)
+        proxy.__name__ = name
+        proxy.__doc__ = shared_fct.__doc__
+        return proxy
+
+    with _rng_proxies_lock:
+        if _rng_proxies_installed:
+            return
+        for name in random.__all__:
+            fct = getattr(random, name)
+            if getattr(fct, '__self__', None) is random._inst:
+                setattr(random, name, make_proxy(name, fct))
+        _rng_proxies_installed = True
+
+
+def _encode_inputs(obj):
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    elif isinstance(obj, bytes):
+        return {'bytes': obj.hex()}
+    elif isinstance(obj, tuple):
+        return {'tuple': [_encode_inputs(o) for o in obj]}
+    elif isinstance(obj, list):
+        return [_encode_inputs(o) for o in obj]
+    elif isinstance(obj, dict) and all(isinstance(k, str) for k in obj):
+        return {'dict': {k: _encode_inputs(v) for k, v in obj.items()}}
+    else:
+        raise ValueError('{!r} cannot be recorded for replay'.format(obj))
+
+
+def _decode_inputs(obj):
+    if isinstance(obj, list):
+        return [_decode_inputs(o) for o in obj]
+    elif isinstance(obj, dict):
+        (kind, value), = obj.items()
+        if kind == 'bytes':
+            return bytes.fromhex(value)
+        elif kind == 'tuple':
+            return tuple(_decode_inputs(o) for o in value)
+        else:
+            return {k: _decode_inputs(v) for k, v in value.items()}
+    else:
+        return obj
+
+
+class ReplayRecipe(object):
+    """
+    Information needed to regenerate a data.
+
+    Args:
+        seed (int): seed of the session of the chain
+        case_index (int): rank of the data within the session (starting from 1)
+        chain (bytes): serialized chain of data makers (refer to :meth:`ReplayRecorder.dump_chain`)
+    """
+
+    def __init__(self, seed, case_index, chain):
+        self.seed = seed
+        self.case_index = case_index
+        self.chain = chain
+
+    def __repr__(self):
+        return 'ReplayRecipe(seed={:d}, case_index={:d})'.format(self.seed, self.case_index)
+
+
+class ReplayRecorder(object):
+
+    def __init__(self):
+        self.enabled = False
+        self._sessions = {}
+        self._sys_random = random.SystemRandom()
+
+    def enable(self):
+        self.enabled = True
+        self.reset()
+
+    def disable(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        """To be called when the data makers are reset: every chain will start a new session"""
+        self._sessions = {}
+
+    def next_case(self, action_list, valid_gen=False, save_gen_seed=False):
+        """
+        Returns:
+            ReplayRecipe: the recipe of the next data generated by `action_list`
+
+        Raises:
+            ValueError: if the chain cannot be recorded
+        """
+        chain = self.dump_chain(action_list, valid_gen=valid_gen, save_gen_seed=save_gen_seed)
+        seed, case_index = self._sessions.get(chain, (None, 0))
+        if seed is None:
+            # SQLite integers are signed 64-bit integers
+            seed = self._sys_random.getrandbits(63)
+        self._sessions[chain] = (seed, case_index + 1)
+
+        return ReplayRecipe(seed, case_index + 1, chain)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def seeded_rng(seed, case_index):
+        """
+        Make the :mod:`random` module use, within the current thread, a generator seeded
+        for the generation of a data. The other threads keep using the shared generator.
+        """
+        _install_rng_proxies()
+        previous = getattr(_thread_rng, 'rng', None)
+        _thread_rng.rng = random.Random('{:d}:{:d}'.format(seed, case_index))
+        try:
+            yield
+        finally:
+            _thread_rng.rng = previous
+
+    @staticmethod
+    def dump_chain(action_list, valid_gen=False, save_gen_seed=False):
+        """
+        Returns:
+            bytes: the JSON serialization of the chain
+
+        Raises:
+            ValueError: if the actions or their user inputs cannot be serialized
+        """
+        actions = []
+        for action in action_list:
+            if isinstance(action, (tuple, list)) and len(action) == 2 \
+                    and (action[1] is None or isinstance(action[1], UI)):
+                action, user_input = action
+                inputs = None if user_input is None else user_input.get_inputs()
+            else:
+                inputs = None
+            if isinstance(action, (tuple, list)):
+                if len(action) != 2 or not all(isinstance(a, str) for a in action):
+                    raise ValueError('{!r} cannot be recorded for replay'.format(action))
+                action = list(action)
+            elif not isinstance(action, str):
+                raise ValueError('{!r} cannot be recorded for replay'.format(action))
+            actions.append([action, None if inputs is None else _encode_inputs(inputs)])
+
+        return json.dumps({'actions': actions, 'valid_gen': bool(valid_gen),
+                           'save_gen_seed': bool(save_gen_seed)}, sort_keys=True).encode('ascii')
+
+    @staticmethod
+    def load_chain(chain):
+        """
+        Returns:
+            tuple: the action list and the `valid_gen` and `save_gen_seed` parameters of
+            :meth:`FmkPlumbing.process_data`
+
+        Raises:
+            ValueError: if `chain` has not been serialized by :meth:`dump_chain`
+        """
+        try:
+            chain = json.loads(chain.decode('ascii'))
+            action_list = []
+            for action, inputs in chain['actions']:
+                action = tuple(action) if isinstance(action, list) else action
+                action_list.append(action if inputs is None else (action, UI(**_decode_inputs(inputs))))
+            return action_list, chain['valid_gen'], chain['save_gen_seed']
+        except (UnicodeDecodeError, ValueError, KeyError, TypeError, AttributeError) as err:
+            raise ValueError('invalid data makers chain ({!s})'.format(err))
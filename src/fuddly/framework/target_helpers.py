@@ -21,8 +21,14 @@
 #
 ################################################################################
 
+import collections
 import datetime
+import math
+import os
 import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 from fuddly.framework.data import Data
 from fuddly.framework.knowledge.feedback_collector import FeedbackSource
@@ -32,6 +38,39 @@ class TargetStuck(Exception): pass
 class TargetError(Exception): pass
 class TargetNotReady(Exception): pass
 
+# maximum number of buffers accepted by one writev()/sendmsg() call
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+
+def consume_buffers(buffers, nbytes):
+    """
+    Drop the first `nbytes` bytes of a list of buffers without copying the remaining ones
+    (e.g., after a partial writev()/sendmsg()).
+
+    Returns:
+        list: the remaining buffers
+    """
+    for idx, buf in enumerate(buffers):
+        if nbytes < len(buf):
+            return [memoryview(buf)[nbytes:]] + buffers[idx+1:]
+        nbytes -= len(buf)
+    return []
+
+
+def write_buffers(fd, buffers):
+    """
+    Write a list of buffers (e.g., from :meth:`Data.to_buffers`) to the file descriptor `fd`
+    with writev(), without joining them.
+    """
+    buffers = [buf for buf in buffers if buf]
+    while buffers:
+        written = os.writev(fd, buffers[:IOV_MAX])
+        buffers = consume_buffers(buffers, written)
+
+
 class Target(object):
     """
     Class abstracting the real target we interact with.
@@ -100,6 +139,8 @@ class Target(object):
                                    nl_before=False, rgb=Color.COMPONENT_START)
         self._pending_data = []
         self._pending_data_id = None
+        # each target gets its own lock so that different targets can be fed concurrently
+        self._send_data_lock = threading.Lock()
         self._started = self.start()
         return self._started
 
@@ -193,6 +234,22 @@ class Target(object):
         """
         return None
 
+    def get_last_sending_date(self):
+        """
+        Returns:
+            datetime: date of the last sending performed through :meth:`send_data_sync`
+              or :meth:`send_multiple_data_sync` (None if nothing has been sent yet)
+        """
+        return self._last_sending_date
+
+    def get_last_sent_data_id(self):
+        """
+        Returns:
+            int: estimated ID of the last data the framework has sent to the target (the last
+            one for a multiple sending), `None` if it is not known
+        """
+        return self._pending_data_id
+
     def cleanup(self):
         """
         To be overloaded if something needs to be performed after each data emission.
@@ -356,6 +413,13 @@ class Target(object):
                                            nl_before=False, rgb=Color.WARNING)
                 # raise TargetNotReady
 
+    def get_data_recipient(self, data):
+        """
+        Return the target that actually received `data`. To be overloaded by targets
+        that dispatch data to other targets (e.g., :class:`TargetPool`).
+        """
+        return self
+
     def add_extensions(self, probe):
         if self._extensions is None:
             self._extensions = []
@@ -372,6 +436,101 @@ class Target(object):
         return self._extensions if self._extensions is not None else []
 
 
+class FeedbackTimeoutTuner(object):
+    """
+    Adaptive feedback timeout of a target, computed from its response latencies, i.e., the
+    delays between the sending of the data and the target acknowledgments
+    (refer to :meth:`Target.get_last_target_ack_date`).
+
+    The timeout is set to a high percentile of the last latencies plus a margin, within
+    [`min_timeout`, `max_timeout`]. It is only changed when the new value differs from the
+    current one by more than `hysteresis` (ratio). When the target does not answer in time,
+    the timeout is widened at once, and the missing response is accounted as a latency
+    of the widened timeout.
+    """
+
+    def __init__(self, max_timeout, min_timeout=0.001, percentile=99, margin=0.005,
+                 window=200, min_samples=20, widen_factor=2.0, hysteresis=0.2):
+        """
+        Args:
+            max_timeout (float): upper bound of the timeout (in seconds), which is also the
+              timeout used until `min_samples` latencies are collected.
+            min_timeout (float): lower bound of the timeout.
+            percentile (float): percentile of the latencies the timeout is based on.
+            margin (float): time (in seconds) added to the percentile.
+            window (int): number of the last latencies taken into account.
+            min_samples (int): number of latencies required before adapting the timeout.
+            widen_factor (float): factor applied to the timeout when a response is missing.
+            hysteresis (float): minimum relative change for the timeout to be updated.
+        """
+        assert 0 < percentile <= 100
+        self.max_timeout = max_timeout
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.percentile = percentile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.widen_factor = widen_factor
+        self.hysteresis = hysteresis
+        self.timeout = max_timeout
+        self.timeouts = 0
+        self._latencies = collections.deque(maxlen=window)
+
+    def reset(self, max_timeout=None):
+        if max_timeout is not None:
+            self.max_timeout = max_timeout
+            self.min_timeout = min(self.min_timeout, max_timeout)
+        self.timeout = self.max_timeout
+        self.timeouts = 0
+        self._latencies.clear()
+
+    @property
+    def sample_count(self):
+        return len(self._latencies)
+
+    def get_percentile(self):
+        """
+        Returns:
+            float: the percentile of the latencies (nearest-rank method), or None
+            if no latency has been collected
+        """
+        if not self._latencies:
+            return None
+        latencies = sorted(self._latencies)
+        rank = max(math.ceil(self.percentile / 100 * len(latencies)), 1)
+        return latencies[rank - 1]
+
+    def _bound(self, timeout):
+        return min(max(timeout, self.min_timeout), self.max_timeout)
+
+    def add_latency(self, latency):
+        """
+        Returns:
+            bool: True if the timeout has been changed
+        """
+        self._latencies.append(latency)
+        if len(self._latencies) < self.min_samples:
+            return False
+        timeout = self._bound(self.get_percentile() + self.margin)
+        if abs(timeout - self.timeout) <= self.hysteresis * self.timeout:
+            return False
+        self.timeout = timeout
+        return True
+
+    def add_timeout(self):
+        """
+        To be called when the target has not answered within the timeout.
+
+        Returns:
+            bool: True if the timeout has been changed
+        """
+        self.timeouts += 1
+        timeout = self._bound(self.timeout * self.widen_factor)
+        self._latencies.append(timeout)
+        changed = timeout != self.timeout
+        self.timeout = timeout
+        return changed
+
+
 class EmptyTarget(Target):
 
     _feedback_mode = Target.FBK_WAIT_FULL_TIME
@@ -387,3 +546,287 @@ class EmptyTarget(Target):
 
     def send_multiple_data(self, data_list, from_fmk=False):
         pass
+
+
+class _PoolMemberLogger(object):
+    """
+    Logger given to the members of a :class:`TargetPool`, in order to attribute
+    to each member the feedback it collects through the Logger facility.
+    """
+
+    def __init__(self, logger, pool, member):
+        self._logger = logger
+        self._pool = pool
+        self._member = member
+
+    def collect_feedback(self, content, status_code=None, subref=None, fbk_src=None,
+                         related_data=None):
+        self._logger.collect_feedback(content, status_code=status_code, subref=subref,
+                                      fbk_src=self._member if fbk_src is None else fbk_src,
+                                      related_tg=self._member, related_data=related_data)
+        self._pool._check_member_status(self._member, status_code)
+
+    def __getattr__(self, name):
+        return getattr(self._logger, name)
+
+
+class TargetPool(Target):
+    """
+    Logical target that wraps a pool of identical targets (e.g., several instances of
+    the same program, or the same service listening on different ports).
+
+    Each data sent to the pool is dispatched to one of its members, which enables to
+    feed the members with different test cases concurrently: the pool is ready for new
+    data as soon as one of its members is. Feedback is attributed to the member that produced it
+    (the FmkDB records the member as the target of the data and as the source of the feedback),
+    and a member reporting a negative status is recovered in the background while the others go on.
+
+    Args:
+        targets (list): the members of the pool
+        name (str): name of the pool
+        policy (int): :const:`TargetPool.ROUND_ROBIN` or :const:`TargetPool.LEAST_LOADED`
+        max_recovery_attempts (int): number of recovery attempts of a failed member before
+          removing it from the pool
+    """
+
+    ROUND_ROBIN = 1
+    LEAST_LOADED = 2
+
+    _feedback_mode = Target.FBK_WAIT_UNTIL_RECV
+    supported_feedback_mode = [Target.FBK_WAIT_UNTIL_RECV]
+
+    def __init__(self, targets, name=None, policy=ROUND_ROBIN, max_recovery_attempts=3):
+        Target.__init__(self, name)
+        assert targets
+        assert policy in (TargetPool.ROUND_ROBIN, TargetPool.LEAST_LOADED)
+        self.members = list(targets)
+        self.policy = policy
+        self.max_recovery_attempts = max_recovery_attempts
+        # re-entrant, as draining the feedback of a member (while the lock is held) may report
+        # a negative status through _check_member_status()
+        self._members_lock = threading.RLock()
+        self._next_idx = 0
+        self._state = None
+        self._recipients = None
+        self._last_recipient = None
+        self._executor = None
+
+    def set_logger(self, logger):
+        self._logger = logger
+        for m in self.members:
+            m.set_logger(_PoolMemberLogger(logger, self, m))
+
+    def set_data_model(self, dm):
+        Target.set_data_model(self, dm)
+        for m in self.members:
+            m.set_data_model(dm)
+
+    def set_project(self, prj):
+        Target.set_project(self, prj)
+        for m in self.members:
+            m.set_project(prj)
+
+    def _set_feedback_timeout_specific(self, fbk_timeout):
+        for m in self.members:
+            m.set_feedback_timeout(fbk_timeout)
+
+    def start(self):
+        self._state = {}
+        self._recipients = weakref.WeakKeyDictionary()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.members),
+                                            thread_name_prefix='target_pool')
+        for idx, m in enumerate(self.members):
+            try:
+                ok = m._start('{!s} - member #{:d} of {!s}'.format(m, idx, self), idx)
+            except Exception as e:
+                self._logger.print_console('*** Pool member {!s} failed to start: {!s}'.format(m, e),
+                                           rgb=Color.ERROR)
+                ok = False
+            self._state[m] = {'healthy': ok, 'in_flight': 0, 'sent': 0,
+                              'sent_date': None, 'recovering': None}
+
+        return any(st['healthy'] for st in self._state.values())
+
+    def stop(self):
+        for idx, m in enumerate(self.members):
+            if m.is_started():
+                m._stop('{!s} - member #{:d} of {!s}'.format(m, idx, self), idx)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        return True
+
+    def get_description(self):
+        prefix = '{:s} | '.format(self.name) if self.name is not None else ''
+        policy = 'round-robin' if self.policy == TargetPool.ROUND_ROBIN else 'least-loaded'
+        return '{:s}members: {:d}, {:s}'.format(prefix, len(self.members), policy)
+
+    def _is_member_free(self, member):
+        st = self._state[member]
+        if st['in_flight'] == 0:
+            return True
+
+        timeout = member.feedback_timeout if member.feedback_timeout is not None else 0
+        if member.fbk_wait_until_recv_mode and member.is_feedback_received():
+            done = True
+        else:
+            done = (datetime.datetime.now() - st['sent_date']).total_seconds() >= timeout
+
+        if done:
+            self._drain_member_feedback(member)
+            member.cleanup()
+            st['in_flight'] = 0
+
+        return done
+
+    def _drain_member_feedback(self, member):
+        # feedback provided through Target.get_feedback() is transferred to the Logger
+        # collector, in order to keep track of the member it comes from
+        fbk = member.get_feedback()
+        if fbk is None:
+            return
+
+        err_code = fbk.get_error_code()
+        if fbk.has_fbk_collector():
+            for ref, content, status, _, data in fbk.iter_and_cleanup_collector(with_related_data=True):
+                member._logger.collect_feedback(content, status_code=status, subref=ref,
+                                                related_data=data)
+        raw_fbk = fbk.get_bytes()
+        if raw_fbk is not None:
+            member._logger.collect_feedback(raw_fbk, status_code=err_code)
+        elif err_code is not None:
+            self._check_member_status(member, err_code)
+        fbk.cleanup()
+
+    def _available_members(self):
+        # the health is checked again once the member is free, as its feedback may have
+        # triggered its recovery
+        return [m for m in self.members
+                if self._state[m]['healthy'] and m.is_target_ready_for_new_data()
+                and self._is_member_free(m) and self._state[m]['healthy']]
+
+    def _select_member(self):
+        with self._members_lock:
+            candidates = self._available_members()
+            if not candidates:
+                # every member is busy, the data is queued on a healthy one
+                candidates = [m for m in self.members if self._state[m]['healthy']]
+                if not candidates:
+                    raise TargetStuck('No member of the pool {!s} is available'.format(self))
+
+            if self.policy == TargetPool.ROUND_ROBIN:
+                nb = len(self.members)
+                for i in range(nb):
+                    m = self.members[(self._next_idx + i) % nb]
+                    if m in candidates:
+                        self._next_idx = (self._next_idx + i + 1) % nb
+                        break
+            else:
+                m = min(candidates,
+                        key=lambda x: (self._state[x]['in_flight'], self._state[x]['sent']))
+
+            st = self._state[m]
+            st['in_flight'] += 1
+            st['sent'] += 1
+            st['sent_date'] = datetime.datetime.now()
+            return m
+
+    def _send_to_member(self, member, data_list, from_fmk):
+        for d in data_list:
+            self._recipients[d] = member
+        self._last_recipient = member
+        if len(data_list) > 1:
+            try:
+                member.send_multiple_data_sync(data_list, from_fmk=from_fmk)
+                return
+            except NotImplementedError:
+                pass
+        for d in data_list:
+            member.send_data_sync(d, from_fmk=from_fmk)
+
+    def send_data(self, data, from_fmk=False):
+        self._send_to_member(self._select_member(), [data], from_fmk)
+
+    def send_multiple_data(self, data_list, from_fmk=False):
+        dispatch = {}
+        for d in data_list:
+            dispatch.setdefault(self._select_member(), []).append(d)
+
+        futures = [self._executor.submit(self._send_to_member, m, dl, from_fmk)
+                   for m, dl in dispatch.items()]
+        for fut in futures:
+            fut.result()
+
+    def get_data_recipient(self, data):
+        return self._recipients.get(data, self)
+
+    def is_target_ready_for_new_data(self):
+        # busy members queue the data, thus the pool is ready as long as one member is healthy
+        return any(st['healthy'] for st in self._state.values())
+
+    def is_feedback_received(self):
+        # the framework is told to go on as soon as one member is free, which enables to
+        # feed the other members while they are still processing their test case
+        with self._members_lock:
+            return bool(self._available_members())
+
+    def get_last_target_ack_date(self):
+        if self._last_recipient is None:
+            return None
+        return self._last_recipient.get_last_target_ack_date()
+
+    def collect_unsolicited_feedback(self, timeout=0):
+        deadline = time.monotonic() + timeout
+        ok = True
+        for m in self.members:
+            if self._state[m]['healthy']:
+                ok = m.collect_unsolicited_feedback(timeout=max(0, deadline - time.monotonic())) and ok
+        return ok
+
+    def _check_member_status(self, member, status):
+        if status is None or status >= member.STATUS_THRESHOLD_FOR_RECOVERY:
+            return
+
+        with self._members_lock:
+            st = self._state[member]
+            if st['recovering'] is not None:
+                return
+            st['healthy'] = False
+            st['recovering'] = self._executor.submit(self._recover_member, member)
+
+    def _recover_member(self, member):
+        ok = False
+        for _ in range(self.max_recovery_attempts):
+            try:
+                ok = member.recover_target()
+            except NotImplementedError:
+                break
+            except Exception as e:
+                self._logger.print_console('*** Recovery of pool member {!s} failed: {!s}'.format(member, e),
+                                           rgb=Color.ERROR)
+            if ok:
+                break
+
+        with self._members_lock:
+            st = self._state[member]
+            st['recovering'] = None
+            st['healthy'] = ok
+            st['in_flight'] = 0
+
+        if not ok:
+            self._logger.print_console('*** Pool member {!s} cannot be recovered and is disabled'
+                                       .format(member), rgb=Color.WARNING)
+        return ok
+
+    def recover_target(self):
+        """
+        Called by the framework when the whole pool is considered failed. Members that are not
+        healthy are recovered (or waited for if their recovery is in progress), and the pool is
+        recovered if at least one member is back.
+        """
+        for m in self.members:
+            recovering = self._state[m]['recovering']
+            if recovering is not None:
+                recovering.result()
+            elif not self._state[m]['healthy']:
+                self._recover_member(m)
+        return any(st['healthy'] for st in self._state.values())
@@ -318,18 +318,28 @@ class TestTarget(Target):
             self._send_data_finished_event.set()
         else:
             time.sleep(0.001)
-            if self._bound_targets:
-                for tg in self._bound_targets:
-                    tg._shared_queue.put((data.to_bytes(), str(self)))
-            else:
-                self._logger.collect_feedback(content=self._handle_fbk(data),
-                                              status_code=random.randint(-3, 3))
-
+            self._consume_data(data)
             self._last_ack_date = datetime.datetime.now() + datetime.timedelta(microseconds=random.randint(20, 40))
 
     def send_multiple_data(self, data_list, from_fmk=False):
-        for data in data_list:
-            self.send_data(data, from_fmk=from_fmk)
+        if self.output_shmem:
+            for data in data_list:
+                self.send_data(data, from_fmk=from_fmk)
+        else:
+            # the data are consumed within one round trip
+            time.sleep(0.001)
+            for data in data_list:
+                self._consume_data(data)
+            self._last_ack_date = datetime.datetime.now() + datetime.timedelta(microseconds=random.randint(20, 40))
+
+    def _consume_data(self, data):
+        if self._bound_targets:
+            for tg in self._bound_targets:
+                tg._shared_queue.put((data.to_bytes(), str(self)))
+        else:
+            self._logger.collect_feedback(content=self._handle_fbk(data),
+                                          status_code=random.randint(-3, 3),
+                                          related_data=data)
 
 
     def is_target_ready_for_new_data(self):
@@ -29,7 +29,7 @@ import signal
 import subprocess
 
 from fuddly.framework.global_resources import workspace_folder
-from fuddly.framework.target_helpers import Target
+from fuddly.framework.target_helpers import Target, write_buffers
 from fuddly.framework.knowledge.feedback_collector import FeedbackCollector
 
 
@@ -115,16 +115,16 @@ class LocalTarget(Target):
 
     def send_data(self, data, from_fmk=False):
         self._before_sending_data()
-        data = data.to_bytes()
+        buffers = data.to_buffers()
 
         if self._send_via_stdin:
             name = ''
         elif self._send_via_cmdline:
-            name = data
+            name = b''.join(buffers)
         else:
             name = os.path.join(workspace_folder, 'fuzz_test_' + self._suffix + self._tmpfile_ext)
             with open(name, 'wb') as f:
-                 f.write(data)
+                 write_buffers(f.fileno(), buffers)
 
         if self._pre_args is not None and self._post_args is not None:
             if self._send_via_stdin:
@@ -147,7 +147,7 @@ class LocalTarget(Target):
 
         if self._send_via_stdin:
             with self._app.stdin as f:
-                f.write(data)
+                write_buffers(f.fileno(), buffers)
 
         if not self._send_via_stdin and not self._send_via_cmdline:
             fl = fcntl.fcntl(self._app.stderr, fcntl.F_GETFL)
@@ -36,7 +36,7 @@ from _socket import error as socket_error
 
 from fuddly.framework.data import Data
 from fuddly.framework.node import Node, NodeSemanticsCriteria
-from fuddly.framework.target_helpers import Target, TargetStuck
+from fuddly.framework.target_helpers import Target, TargetStuck, IOV_MAX, consume_buffers
 from fuddly.framework.knowledge.feedback_collector import FeedbackCollector
 
 from fuddly.framework.value_types import *
@@ -58,6 +58,148 @@ eth_hdr_desc = \
 eth_hdr_node = NodeBuilder(add_env=True).create_graph_from_desc(eth_hdr_desc)
 
 
+class ConnectionPool(object):
+    """
+    Connections held with a :class:`NetworkTarget` client interface (refer to its parameters
+    `hold_connection` and `pool_size`).
+
+    Idle connections are reused in priority, once checked alive. Dead ones (e.g., closed by
+    the target) are dropped and transparently replaced. When every connection is in use and
+    the pool is full, the least recently used one is shared.
+    """
+
+    def __init__(self, connect, size=1, reconnect_attempts=3, backoff=0.05):
+        """
+        Args:
+            connect: callable returning a new connection, or None if it fails.
+            size (int): maximum number of connections.
+            reconnect_attempts (int): number of connection attempts when a dead connection is
+              replaced (the target is expected to come back, e.g., after a restart).
+            backoff (float): delay in seconds before the second attempt, doubled at each
+              new attempt.
+        """
+        assert size >= 1
+        self._connect = connect
+        self.size = size
+        self.reconnect_attempts = reconnect_attempts
+        self.backoff = backoff
+        self.created = 0
+        self.reused = 0
+        self.dropped = 0
+        self.failed = 0
+        self._idle = []
+        self._busy = []
+        self._lock = threading.Lock()
+
+    def __contains__(self, skt):
+        with self._lock:
+            return skt in self._idle or skt in self._busy
+
+    def __len__(self):
+        return len(self._idle) + len(self._busy)
+
+    @staticmethod
+    def is_alive(skt):
+        """
+        Check without blocking that the connection has not been closed by the peer
+        """
+        try:
+            if skt.fileno() == -1:
+                return False
+            if skt.type != socket.SOCK_STREAM:
+                return True
+            ready_to_read, _, _ = select.select([skt], [], [], 0)
+            # readable without pending data means that the peer closed the connection
+            return not ready_to_read or skt.recv(1, socket.MSG_PEEK) != b''
+        except (OSError, ValueError):
+            return False
+
+    def acquire(self):
+        """
+        Returns:
+            a live connection, or None if the connection to the target failed
+        """
+        with self._lock:
+            dropped = self.dropped
+            while self._idle:
+                skt = self._idle.pop()
+                if self._check(skt):
+                    self._busy.append(skt)
+                    self.reused += 1
+                    return skt
+
+            if len(self._busy) >= self.size:
+                for skt in list(self._busy):
+                    if self._check(skt):
+                        self._busy.remove(skt)
+                        self._busy.append(skt)
+                        self.reused += 1
+                        return skt
+
+            attempts = self.reconnect_attempts if self.dropped > dropped else 1
+            delay = self.backoff
+            for i in range(attempts):
+                if i > 0:
+                    time.sleep(delay)
+                    delay *= 2
+                skt = self._connect()
+                if skt:
+                    self._busy.append(skt)
+                    self.created += 1
+                    return skt
+                self.failed += 1
+
+            return None
+
+    def _check(self, skt):
+        if self.is_alive(skt):
+            return True
+        if skt in self._busy:
+            self._busy.remove(skt)
+        self.dropped += 1
+        skt.close()
+        return False
+
+    def release(self, skt):
+        """
+        Make an acquired connection available for the next sendings
+        """
+        with self._lock:
+            if skt in self._busy:
+                self._busy.remove(skt)
+                self._idle.append(skt)
+
+    def discard(self, skt):
+        """
+        Remove a connection from the pool (without closing it)
+        """
+        with self._lock:
+            self._discard(skt)
+
+    def _discard(self, skt):
+        for sockets in (self._idle, self._busy):
+            if skt in sockets:
+                sockets.remove(skt)
+                self.dropped += 1
+
+    def close(self):
+        with self._lock:
+            for skt in self._idle + self._busy:
+                skt.close()
+            self._idle = []
+            self._busy = []
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: pool metrics
+        """
+        with self._lock:
+            return {'size': self.size, 'connections': len(self), 'idle': len(self._idle),
+                    'created': self.created, 'reused': self.reused, 'dropped': self.dropped,
+                    'failed': self.failed}
+
+
 class NetworkTarget(Target):
     """
     Generic target class for interacting with a network resource. Can
@@ -77,7 +219,7 @@ class NetworkTarget(Target):
     def __init__(self, host='localhost', port=12345, socket_type=(socket.AF_INET, socket.SOCK_STREAM),
                  data_semantics=UNKNOWN_SEMANTIC,
                  server_mode=False, listen_on_start=True, target_address=None, wait_for_client=True,
-                 hold_connection=False, keep_first_client=True,
+                 hold_connection=False, keep_first_client=True, pool_size=1,
                  mac_src=None, mac_dst=None, add_eth_header=False,
                  fbk_timeout=2, fbk_mode=Target.FBK_WAIT_FULL_TIME, sending_delay=1, recover_timeout=0.5):
         """
@@ -115,6 +257,11 @@ class NetworkTarget(Target):
           hold_connection (bool): If `True`, we will maintain the connection while
             sending data to the real target. Otherwise, after each data emission,
             we close the related socket.
+          pool_size (int): Used only if `hold_connection` is `True` and the interface is not in
+            server mode. Maximum number of connections held with the target. Idle connections
+            are reused once checked alive, and dead ones are transparently replaced.
+            Refer to :class:`ConnectionPool`. Pool metrics are provided by
+            :meth:`NetworkTarget.get_connection_pool_stats` and :meth:`NetworkTarget.get_description`.
           keep_first_client (bool): Used only in server mode (`server_mode` is `True`) with `SOCK_STREAM`
             socket type. If set to `True`, the first client that connects to the server will remain
             the one used for data sending until the target is reloaded. Otherwise, last client
@@ -185,11 +332,13 @@ class NetworkTarget(Target):
         self._default_fbk_id = {}
 
         self.hold_connection = {}
+        self._pool_size = {}
 
         self.register_new_interface(host=host, port=port, socket_type=socket_type, data_semantics=data_semantics,
                                     server_mode=server_mode, target_address=target_address,
                                     wait_for_client=wait_for_client, hold_connection=hold_connection,
-                                    keep_first_client=keep_first_client, mac_src=mac_src,
+                                    keep_first_client=keep_first_client, pool_size=pool_size,
+                                    mac_src=mac_src,
                                     mac_dst=mac_dst, add_eth_header=add_eth_header)
         self.multiple_destination = False
 
@@ -205,6 +354,7 @@ class NetworkTarget(Target):
         self._server_thread_lock = threading.Lock()
         self._network_send_lock = threading.Lock()
         self._raw_server_private = None
+        self._hclient_pools = None
         self._recover_timeout = recover_timeout
 
         self._listen_on_start = listen_on_start
@@ -226,7 +376,7 @@ class NetworkTarget(Target):
 
     def register_new_interface(self, host, port, socket_type, data_semantics, server_mode=False,
                                target_address = None, wait_for_client=True,
-                               hold_connection=False, keep_first_client=True,
+                               hold_connection=False, keep_first_client=True, pool_size=1,
                                mac_src=None, mac_dst=None, add_eth_header=False):
 
         if not self._is_valid_socket_type(socket_type):
@@ -243,6 +393,7 @@ class NetworkTarget(Target):
         self._server_mode_additional_info[(host, port)] = (target_address, wait_for_client, keep_first_client)
         self._default_fbk_id[(host, port)] = self._default_fbk_socket_id + ' - {:s}:{:d}'.format(host, port)
         self.hold_connection[(host, port)] = hold_connection
+        self._pool_size[(host, port)] = pool_size
         if socket_type[1] == socket.SOCK_RAW:
             self._mac_src[(host, port)] = self.get_mac_addr(host) if mac_src is None else mac_src
             self._mac_dst[(host, port)] = b'\xff\xff\xff\xff\xff\xff' if mac_dst is None else mac_dst
@@ -392,12 +543,10 @@ class NetworkTarget(Target):
 
     def remove_dynamic_interface(self, host, port):
         if (host, port) in self._dynamic_interfaces.keys():
+            pool = None
             if (host, port) in self.hold_connection:
                 del self.hold_connection[(host, port)]
-                if (host, port) in self._hclient_hp2sock:
-                    s = self._hclient_hp2sock[(host, port)]
-                    del self._hclient_hp2sock[(host, port)]
-                    del self._hclient_sock2hp[s]
+                pool = self._hclient_pools.pop((host, port), None)
 
             req_sock, ref_id = self._dynamic_interfaces[(host, port)]
             del self._dynamic_interfaces[(host, port)]
@@ -415,6 +564,8 @@ class NetworkTarget(Target):
                     del self._additional_fbk_lengths[req_sock]
             if req_sock != -1 and req_sock is not None:
                 req_sock.close()
+            if pool is not None:
+                pool.close()
         else:
             print('\n*** WARNING: Unable to remove inexistent interface ({:s}:{:d})'.format(host,port))
 
@@ -469,8 +620,7 @@ class NetworkTarget(Target):
         self._raw_server_private = {}  # useful only for hold_connection
 
         # Used by _raw_connect_to()
-        self._hclient_sock2hp = {}  # only for hold_connection
-        self._hclient_hp2sock = {}  # only for hold_connection
+        self._hclient_pools = {}  # only for hold_connection
 
         self._additional_fbk_sockets = []
         self._additional_fbk_ids = {}
@@ -515,8 +665,8 @@ class NetworkTarget(Target):
             s.close()
         for s in self._last_client_sock2hp.keys():
             s.close()
-        for s in self._hclient_sock2hp.keys():
-            s.close()
+        for pool in self._hclient_pools.values():
+            pool.close()
         for s in self._additional_fbk_sockets:
             s.close()
 
@@ -524,8 +674,7 @@ class NetworkTarget(Target):
         self._server_thread_share = None
         self._last_client_sock2hp = None
         self._last_client_hp2sock = None
-        self._hclient_sock2hp = None
-        self._hclient_hp2sock = None
+        self._hclient_pools = None
         self._additional_fbk_sockets = None
         self._additional_fbk_ids = None
         self._additional_fbk_lengths = None
@@ -564,9 +713,20 @@ class NetworkTarget(Target):
             data_to_send = {intf: None for intf in self._semantics_to_intf.values()}
             for data in data_list:
                 intf = self._get_net_info_from(data)
-                data_to_send[intf] = data.to_bytes()
+                # the data sent through the same interface are pipelined
+                if data_to_send[intf] is None:
+                    data_to_send[intf] = []
+                data_to_send[intf].append(data)
             for intf, data in data_to_send.items():
-                sending_list.append((data,)+intf)
+                socket_type, server_mode = intf[2:]
+                if data and len(data) > 1 and not server_mode \
+                        and not self._can_split_pipelined_feedback(socket_type):
+                    # each data is sent over its own connection, so that the feedback of the
+                    # data is not mixed up
+                    for d in data:
+                        sending_list.append(([d],)+intf)
+                else:
+                    sending_list.append((data,)+intf)
 
         for data, host, port, socket_type, server_mode in sending_list:
             if server_mode:
@@ -586,6 +746,10 @@ class NetworkTarget(Target):
                     if s not in sockets:
                         sockets.append(s)
                         data_refs[s] = (data, host, port, None)
+                    elif data is not None:
+                        # a held connection shared because the pool is full: the data are
+                        # pipelined over it
+                        data_refs[s][0].extend(data)
 
         if data_refs:
             if from_fmk:
@@ -654,21 +818,37 @@ class NetworkTarget(Target):
         return host, port, self._socket_type[key], self.server_mode[(host, port)]
 
     def _connect_to_target(self, host, port, socket_type):
-        if self.hold_connection[(host, port)] and (host, port) in self._hclient_hp2sock.keys():
-            try:
-                fd = self._hclient_hp2sock[(host, port)].fileno()
-                if fd == -1:
-                    # if the socket has been closed, -1 is received by python3
-                    raise OSError
-            except Exception:
-                print('\n*** WARNING: Current socket was closed unexpectedly! --> create new one.')
-                # we remove the bad references then go on with the rest of the function
-                with self.socket_desc_lock:
-                    del self._hclient_sock2hp[self._hclient_hp2sock[(host, port)]]
-                    del self._hclient_hp2sock[(host, port)]
-            else:
-                return self._hclient_hp2sock[(host, port)]
+        if self.hold_connection[(host, port)]:
+            with self.socket_desc_lock:
+                pool = self._hclient_pools.get((host, port))
+                if pool is None:
+                    pool = ConnectionPool(lambda: self._new_connection(host, port, socket_type),
+                                          size=self._pool_size.get((host, port), 1))
+                    self._hclient_pools[(host, port)] = pool
+            return pool.acquire()
+
+        return self._new_connection(host, port, socket_type)
 
+    def _get_client_pool(self, skt):
+        if self._hclient_pools is None:
+            return None
+        for pool in list(self._hclient_pools.values()):
+            if skt in pool:
+                return pool
+        return None
+
+    def get_connection_pool_stats(self):
+        """
+        Returns:
+            dict: metrics (refer to :meth:`ConnectionPool.get_stats`) of the connection pool of
+            each client interface that holds its connections, indexed by `(host, port)`
+        """
+        pools = self._hclient_pools
+        if not pools:
+            return {}
+        return {hp: pool.get_stats() for hp, pool in list(pools.items())}
+
+    def _new_connection(self, host, port, socket_type):
         skt_sz = len(socket_type)
         if skt_sz == 2:
             family, sock_type = socket_type
@@ -697,10 +877,6 @@ class NetworkTarget(Target):
 
             s.setblocking(0)
 
-        if self.hold_connection[(host, port)]:
-            self._hclient_sock2hp[s] = (host, port)
-            self._hclient_hp2sock[(host, port)] = s
-
         return s
 
 
@@ -912,7 +1088,7 @@ class NetworkTarget(Target):
 
 
     def _collect_feedback_from(self, thread_id, fbk_sockets, fbk_ids, fbk_lengths, epobj, fileno2fd,
-                               fbk_timeout, flush_received_fbk, pre_fbk):
+                               fbk_timeout, flush_received_fbk, pre_fbk, fbk_data=None):
 
         def _check_and_handle_obsolete_socket(skt, error=None, error_list=None):
             # print('\n*** NOTE: Remove obsolete socket {!r}'.format(socket))
@@ -936,12 +1112,11 @@ class NetworkTarget(Target):
             else:
                 self._server_thread_lock.release()
                 with self.socket_desc_lock:
-                    if skt in self._hclient_sock2hp.keys():
+                    pool = self._get_client_pool(skt)
+                    if pool is not None:
                         if error is not None:
                             error_list.append((fbk_ids[skt], error))
-                        host, port = self._hclient_sock2hp[skt]
-                        del self._hclient_sock2hp[skt]
-                        del self._hclient_hp2sock[(host, port)]
+                        pool.discard(skt)
                     if skt in self._additional_fbk_sockets:
                         if error is not None:
                             error_list.append((self._additional_fbk_ids[skt], error))
@@ -1056,14 +1231,22 @@ class NetworkTarget(Target):
                 dont_stop = False
 
         for s, chks in chunks.items():
-            fbk = b'\n'.join(chks)
+            related_data = fbk_data.get(s) if fbk_data else None
+            if related_data and len(related_data) > 1:
+                fbk_parts = self._split_pipelined_feedback(chks, related_data,
+                                                           stream=s.type == socket.SOCK_STREAM)
+            else:
+                fbk_parts = [(related_data[0] if related_data else None, b'\n'.join(chks))]
             with self._fbk_handling_lock:
-                if fbk != b'':
-                    fbkid = fbk_ids[s]
-                    fbk, err = self._feedback_handling(fbk, fbkid)
-                    self._feedback_collect(fbk, fbkid, error=err)
-                if (self._additional_fbk_sockets is None or s not in self._additional_fbk_sockets) and \
-                        (self._hclient_sock2hp is None or s not in self._hclient_sock2hp.keys()) and \
+                for data, fbk in fbk_parts:
+                    if fbk != b'':
+                        fbkid = fbk_ids[s]
+                        fbk, err = self._feedback_handling(fbk, fbkid)
+                        self._feedback_collect(fbk, fbkid, error=err, related_data=data)
+                pool = self._get_client_pool(s)
+                if pool is not None:
+                    pool.release(s)
+                elif (self._additional_fbk_sockets is None or s not in self._additional_fbk_sockets) and \
                         (self._last_client_sock2hp is None or s not in self._last_client_sock2hp.keys()):
                     s.close()
 
@@ -1077,6 +1260,43 @@ class NetworkTarget(Target):
 
         return
 
+    def _split_pipelined_feedback(self, chunks, data_list, stream):
+        """
+        Split the feedback received through an interface on which several data have
+        been pipelined, in order to attribute each part to the data it responds to.
+        By default, the feedback is split in parts of ``feedback_length`` bytes if this length
+        is defined, or per datagram if as many datagrams as data have been received.
+        Otherwise, the whole feedback is attributed to every data.
+
+        To be overloaded for protocols whose response boundaries can be inferred from the
+        content of the feedback. If it is not, the data are not pipelined through client
+        stream interfaces without ``feedback_length``: each one is sent over its own
+        connection (refer to the parameter `pool_size` for held connections).
+
+        Args:
+            chunks (list): chunks received from the interface (datagrams for a non-stream socket)
+            data_list (list): data pipelined through the interface, in their sending order
+            stream (bool): True if the interface relies on a stream socket
+
+        Returns:
+            list: pairs `(data, feedback)`
+        """
+        if self.feedback_length:
+            fbk = b''.join(chunks)
+            parts = [[data, fbk[idx*self.feedback_length:(idx+1)*self.feedback_length]]
+                     for idx, data in enumerate(data_list)]
+            parts[-1][1] += fbk[len(data_list)*self.feedback_length:]
+            return [tuple(p) for p in parts]
+        elif not stream and len(chunks) == len(data_list):
+            return list(zip(data_list, chunks))
+        else:
+            fbk = b'\n'.join(chunks)
+            return [(data, fbk) for data in data_list]
+
+    def _can_split_pipelined_feedback(self, socket_type):
+        return bool(self.feedback_length) or socket_type[1] != socket.SOCK_STREAM or \
+            type(self)._split_pipelined_feedback is not NetworkTarget._split_pipelined_feedback
+
     def _send_data(self, sockets, data_refs, fbk_timeout, from_fmk, pre_fbk=None):
         # Should be called with the lock self_network_send_lock.
         # Especially needed in the context of self.send_multiple_data() as different threads can reach
@@ -1120,6 +1340,8 @@ class NetworkTarget(Target):
 
             return
 
+        fbk_data = {}
+
         ready_to_read, ready_to_write, in_error = select.select([], sockets, [], self.sending_delay)
         if ready_to_write:
 
@@ -1128,38 +1350,24 @@ class NetworkTarget(Target):
                 epobj.register(s, select.EPOLLIN)
                 fileno2fd[s.fileno()] = s
 
-                raw_data = data.to_bytes() if isinstance(data, Data) else data
-                totalsent = 0
-                send_retry = 0
-                while totalsent < len(raw_data) and send_retry < 10:
-                    try:
-                        if address is None:
-                            sent = s.send(raw_data[totalsent:])
-                        else:
-                            # with SOCK_RAW, address is ignored
-                            sent = s.sendto(raw_data[totalsent:], address)
-                    except socket.error as serr:
-                        send_retry += 1
-                        print('\n*** ERROR(while sending): ' + str(serr))
-                        if serr.errno == socket.errno.EWOULDBLOCK:
-                            time.sleep(0.2)
-                            continue
-                        elif serr.errno == socket.errno.EMSGSIZE:  # for SOCK_RAW
-                            self._feedback.add_fbk_from(self._INTERNALS_ID,
-                                                        'Message was not sent because it was too long!',
-                                                        status=-1)
-                            break
-                        else:
-                            if from_fmk:
-                                self._fbk_collector_to_launch_cpt -= 1
-                            raise TargetStuck("system not ready for sending data! {!r}".format(serr))
-                    else:
-                        if sent == 0:
-                            s.close()
-                            if from_fmk:
-                                self._fbk_collector_to_launch_cpt -= 1
-                            raise TargetStuck("socket connection broken")
-                        totalsent = totalsent + sent
+                # `data` is either a Data, some bytes, a list of buffers or a list of Data
+                # to be pipelined
+                if isinstance(data, Data):
+                    payloads = [data]
+                elif isinstance(data, (bytes, bytearray, memoryview)):
+                    payloads = [[data]]
+                elif data and isinstance(data[0], Data):
+                    payloads = list(data)
+                else:
+                    payloads = [data]
+                fbk_data[s] = [d for d in payloads if isinstance(d, Data)]
+                payloads = [d.to_buffers() if isinstance(d, Data) else d for d in payloads]
+                if s.type == socket.SOCK_STREAM:
+                    # the payloads are pipelined over the connection
+                    payloads = [[buf for bufs in payloads for buf in bufs]]
+
+                for buffers in payloads:
+                    self._send_buffers(s, buffers, address, from_fmk)
 
                 if fbk_sockets is None:
                     assert fbk_ids is None
@@ -1172,18 +1380,57 @@ class NetworkTarget(Target):
 
                 fbk_sockets.append(s)
                 fbk_ids[s] = self._default_fbk_id[(host, port)]
-                fbk_lengths[s] = self.feedback_length
+                if self.feedback_length is None or len(fbk_data[s]) < 2:
+                    fbk_lengths[s] = self.feedback_length
+                else:
+                    fbk_lengths[s] = self.feedback_length * len(fbk_data[s])
 
             if from_fmk:
                 self._start_fbk_collector(fbk_sockets, fbk_ids, fbk_lengths, epobj, fileno2fd,
-                                          pre_fbk=pre_fbk, timeout=fbk_timeout)
+                                          pre_fbk=pre_fbk, timeout=fbk_timeout, fbk_data=fbk_data)
 
         else:
             raise TargetStuck("system not ready for sending data!")
 
+    def _send_buffers(self, s, buffers, address, from_fmk):
+        # the buffers are sent with scatter/gather I/O, without being joined
+        buffers = [buf for buf in buffers if buf]
+        if s.type != socket.SOCK_STREAM and len(buffers) > IOV_MAX:
+            # a datagram has to be sent through one call
+            buffers = [b''.join(buffers)]
+        send_retry = 0
+        while buffers and send_retry < 10:
+            try:
+                if address is None:
+                    sent = s.sendmsg(buffers[:IOV_MAX])
+                else:
+                    # with SOCK_RAW, address is ignored
+                    sent = s.sendmsg(buffers[:IOV_MAX], [], 0, address)
+            except socket.error as serr:
+                send_retry += 1
+                print('\n*** ERROR(while sending): ' + str(serr))
+                if serr.errno == socket.errno.EWOULDBLOCK:
+                    time.sleep(0.2)
+                    continue
+                elif serr.errno == socket.errno.EMSGSIZE:  # for SOCK_RAW
+                    self._feedback.add_fbk_from(self._INTERNALS_ID,
+                                                'Message was not sent because it was too long!',
+                                                status=-1)
+                    break
+                else:
+                    if from_fmk:
+                        self._fbk_collector_to_launch_cpt -= 1
+                    raise TargetStuck("system not ready for sending data! {!r}".format(serr))
+            else:
+                if sent == 0:
+                    s.close()
+                    if from_fmk:
+                        self._fbk_collector_to_launch_cpt -= 1
+                    raise TargetStuck("socket connection broken")
+                buffers = consume_buffers(buffers, sent)
 
     def _start_fbk_collector(self, fbk_sockets, fbk_ids, fbk_lengths, epobj, fileno2fd,
-                             pre_fbk=None, timeout=None, flush_received_fbk=False):
+                             pre_fbk=None, timeout=None, flush_received_fbk=False, fbk_data=None):
 
         self._feedback_thread_qty += 1
         feedback_thread = threading.Thread(None, self._collect_feedback_from,
@@ -1191,13 +1438,13 @@ class NetworkTarget(Target):
                                            args=(self._feedback_thread_qty,
                                                  fbk_sockets, fbk_ids, fbk_lengths, epobj, fileno2fd,
                                                  timeout, flush_received_fbk,
-                                                 pre_fbk))
+                                                 pre_fbk, fbk_data))
         feedback_thread.start()
 
-    def _feedback_collect(self, fbk, ref, error=0):
+    def _feedback_collect(self, fbk, ref, error=0, related_data=None):
         if error < 0:
             self._feedback.set_error_code(error)
-        self._feedback.add_fbk_from(ref, fbk, status=error)
+        self._feedback.add_fbk_from(ref, fbk, status=error, related_data=related_data)
 
     def _feedback_complete(self):
         self._fbk_collector_finished_cpt += 1
@@ -1297,7 +1544,8 @@ class NetworkTarget(Target):
         else:
             return None
 
-    def get_description(self):
+    def get_description(self, with_pool_stats=True):
+        pool_stats = self.get_connection_pool_stats() if with_pool_stats else {}
         desc_added = []
         desc = ''
         for key, host in self._host.items():
@@ -1308,7 +1556,15 @@ class NetworkTarget(Target):
             server_mode = self.server_mode[(host, port)]
             hold_connection = self.hold_connection[(host, port)]
             socket_type = self._get_socket_type(host, port)
-            desc += '{:s}:{:d}#{!s} (serv:{!r},hold:{!r}), '.format(
-                host, port, socket_type, server_mode, hold_connection)
+            pool_desc = ''
+            if with_pool_stats and (host, port) in pool_stats:
+                pool_desc = ',pool:{connections:d}/{size:d}[created:{created:d},reused:{reused:d},' \
+                            'dropped:{dropped:d},failed:{failed:d}]'.format(**pool_stats[(host, port)])
+            desc += '{:s}:{:d}#{!s} (serv:{!r},hold:{!r}{:s}), '.format(
+                host, port, socket_type, server_mode, hold_connection, pool_desc)
 
         return desc[:-2]
+
+    def __str__(self):
+        # the pool metrics are not part of the name of the target (e.g., for the feedback sources)
+        return self.__class__.__name__ + ' [' + self.get_description(with_pool_stats=False) + ']'
@@ -115,8 +115,15 @@ class SSHTarget(Target):
         return True
 
     def recover_target(self):
-        self.stop()
-        return self.start()
+        # the backend may be shared with probes, thus its connection is restarted whatever
+        # the number of its users
+        self.chan_desc = None
+        if self.sftp is not None:
+            self.sftp.close()
+        self.ssh_backend.reset()
+        self.sftp = self.ssh_backend.client.open_sftp() if self.file_paremeter_path else None
+
+        return True
 
     def send_data(self, data, from_fmk=False):
         self._fbk_received = False
@@ -135,7 +142,18 @@ class SSHTarget(Target):
             cmd = self.targeted_command.format(data_str)
 
         try:
-            self.chan_desc = self.ssh_backend.exec_command(cmd)
+            try:
+                self.chan_desc = self.ssh_backend.exec_command(cmd)
+            except BackendError as err:
+                if err.status != -3:
+                    raise
+                # the SSH connection is not active anymore
+                try:
+                    self.ssh_backend.reset()
+                except Exception as exc:
+                    raise BackendError('SSH connection reset failure: {!s}'.format(exc),
+                                       status=-3)
+                self.chan_desc = self.ssh_backend.exec_command(cmd)
             self._last_ack_date = datetime.datetime.now()
             self._fbk_received = True
         except BackendError as err:
@@ -165,3 +165,21 @@ except ImportError:
     z3 = None
     print('WARNING [FMK]: python-z3 or z3-solver module is not installed! '
           'Should be installed to support constraint-based nodes.')
+
+numpy_module = True
+try:
+    import numpy as np
+except ImportError:
+    numpy_module = False
+    np = None
+    print('WARNING [FMK]: python-numpy module is not installed! '
+          'Should be installed to speed up bulk mutation primitives.')
+
+zstd_module = True
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd_module = False
+    zstd = None
+    print('WARNING [FMK]: python-zstandard module is not installed! '
+          'FmkDB contents will be compressed with zlib.')
@@ -41,7 +41,7 @@ printer1_tg = PrinterTarget(tmpfile_ext='.png')
 printer1_tg.set_target_ip('127.0.0.1')
 printer1_tg.set_printer_name('PDF')
 
-local_backend = Shell_Backend(timeout=2)
+local_backend = Shell_Backend(timeout=2, persistent=True)
 @blocking_probe(project)
 class display_mem_check(ProbeMem):
     backend = local_backend
@@ -27,6 +27,7 @@ from __future__ import print_function
 import time
 
 import sys
+import inspect
 import unittest
 import ddt
 
@@ -36,8 +37,11 @@ from fuddly.framework.fuzzing_primitives import *
 from fuddly.framework.plumbing import *
 from fuddly.framework.data_model import *
 from fuddly.framework.encoders import *
+from fuddly.framework.database import content_of
 
-from fuddly.test import ignore_data_model_specifics, run_long_tests, exit_on_import_error
+from fuddly.framework.targets.debug import TestTarget
+
+from fuddly.test import ignore_data_model_specifics, run_long_tests, exit_on_import_error, mock
 
 
 def setUpModule():
@@ -1870,6 +1874,44 @@ class TestModelWalker(unittest.TestCase):
         # almostequal because collision in String test cases can lead to less test cases
         # (related to random bitflip test case that could collide with case_sensitive test case)
 
+    def test_walk_depth(self):
+        class DepthVisitor(BasicVisitor):
+            def consume_node(self, node):
+                self.depths.append(len(inspect.stack(0)))
+                return BasicVisitor.consume_node(self, node)
+
+        def walk(depth):
+            desc = {'name': 'leaf', 'contents': String(values=['A', 'B', 'C'])}
+            for i in range(depth):
+                desc = {'name': 'level{:d}'.format(i), 'contents': [desc]}
+            consumer = DepthVisitor()
+            consumer.depths = []
+            cases = [rnode.to_bytes() for rnode, _, _, _ in
+                     ModelWalker(NodeBuilder().create_graph_from_desc(desc), consumer)]
+            return cases, max(consumer.depths)
+
+        shallow_cases, shallow_depth = walk(2)
+        deep_cases, deep_depth = walk(40)
+        self.assertEqual(shallow_cases, [b'A', b'B', b'C'])
+        self.assertEqual(deep_cases, shallow_cases)
+        # the generators of the walked levels are driven from a stack and do not nest
+        self.assertEqual(deep_depth, shallow_depth)
+
+    def test_TypedNodeDisruption_ranges(self):
+        def walk(**kwargs):
+            random.seed(7)
+            nt = node_simple.get_clone()
+            walker = ModelWalker(nt, TypedNodeDisruption(max_runs_per_node=1),
+                                 make_determinist=True, **kwargs)
+            return [(idx, rnode.to_bytes()) for rnode, consumed_node, orig_node_val, idx in walker]
+
+        full_walk = walk()
+
+        # disjoint ranges cover the whole walk
+        first_range = walk(initial_step=1, max_steps=200)
+        second_range = walk(initial_step=201)
+        self.assertEqual(first_range + second_range, full_walk)
+
     def test_TypedNodeDisruption_BitfieldCollapse(self):
         '''
         Test case similar to test_TermNodeDisruption_1() but with more
@@ -4729,6 +4771,175 @@ class TestFMK(unittest.TestCase):
         self.assertEqual(scenario.env.cbk_false_cpt, 4)
         self.assertEqual(str(steps[-1]), '4DEFAULT')
 
+    def test_concurrent_sending(self):
+        fmk.reload_all(tg_ids=[7, 8])
+        used_targets = []
+
+        def slow_send_data(tg, data, from_fmk=False):
+            time.sleep(0.5)
+            used_targets.append(tg)
+
+        with mock.patch.object(TestTarget, 'send_data', autospec=True, side_effect=slow_send_data):
+            d = Data(b'concurrent sending')
+            d.tg_ids = [7, 8]
+            t0 = time.monotonic()
+            fmk.send_data_and_log([d])
+            duration = time.monotonic() - t0
+
+        self.assertEqual(len(used_targets), 2)
+        self.assertNotEqual(used_targets[0], used_targets[1])
+        self.assertLess(duration, 1.0)
+
+    def test_perf_recording(self):
+        fmk.reload_all(tg_ids=[7])
+        fmk.reset_perf_records()
+        fmk.enable_perf_recording(persist=True)
+        try:
+            # the target serializes the data to provide them back as feedback
+            with mock.patch.object(fmk.targets[7], '_repeat_input', True):
+                sent = fmk.process_data_and_send(DataProcess(['OFF_GEN', 'tTYPE']), max_loop=3)
+        finally:
+            fmk.disable_perf_recording()
+
+        self.assertEqual(len(sent), 3)
+        stats = {(stage, scope): count for stage, scope, count, _, _, _, _ in fmk.perf.get_stats()}
+        # tTYPE is a stateful disruptor, thus the generator is only called once
+        self.assertEqual(stats[('generation', 'OFF_GEN')], 1)
+        self.assertEqual(stats[('disruption', 'tTYPE')], 3)
+        for stage in ('to_bytes', 'sending', 'tg_readiness', 'feedback', 'probes', 'fmkdb'):
+            self.assertEqual(stats[(stage, PerfRecorder.GLOBAL)], 3)
+        tg_desc = fmk.available_targets_desc[fmk.targets[7]]
+        for stage in ('to_bytes', 'sending', 'feedback'):
+            self.assertEqual(stats[(stage, tg_desc)], 3)
+
+        data_id = sent[-1].get_data_id()
+        perf = fmk.fmkDB.execute_sql_statement(
+            "SELECT SENDING, FMKDB FROM PERF WHERE ID == {data_id:d};".format(data_id=data_id))
+        self.assertTrue(perf)
+        self.assertTrue(perf[0][0] > 0 and perf[0][1] > 0)
+
+        stats = fmk.perf.get_stats()
+        fmk.send_data_and_log([Data(b'not recorded')])
+        self.assertEqual(fmk.perf.get_stats(), stats)
+
+    def test_perf_recording_with_prefetch_and_probes(self):
+        fmk.reload_all(tg_ids=[0])
+        fmk.reset_perf_records()
+        self.assertTrue(fmk.mon.start_probe('P1', related_tg=fmk.targets[0]))
+        fmk.mon.wait_for_probe_initialization()
+        fmk.enable_perf_recording(persist=True)
+        try:
+            sent = fmk.process_data_and_send(DataProcess(['TESTNODE']), max_loop=4, prefetch=2)
+        finally:
+            fmk.disable_perf_recording()
+            fmk.stop_probe('P1')
+
+        self.assertEqual(len(sent), 4)
+        stats = {(stage, scope): count for stage, scope, count, _, _, _, _ in fmk.perf.get_stats()}
+        self.assertEqual(stats[('probes', fmk.available_targets_desc[fmk.targets[0]])], 4)
+
+        # the generation done by the prefetching thread is stored with the data it has produced
+        perf = fmk.fmkDB.execute_sql_statement(
+            "SELECT GENERATION FROM PERF WHERE {:d} <= ID AND ID <= {:d} ORDER BY ID;"
+            .format(sent[0].get_data_id(), sent[-1].get_data_id()))
+        self.assertEqual(len(perf), 4)
+        self.assertTrue(all(generation is not None for generation, in perf))
+        self.assertEqual(stats[('generation', 'TESTNODE')], 4)
+
+    def test_replay_recording(self):
+        fmk.reload_all(tg_ids=[7])
+        fmk.enable_replay_recording()
+        try:
+            sent = fmk.process_data_and_send(DataProcess(['TESTNODE']), max_loop=3)
+            sent += fmk.process_data_and_send(DataProcess(['TESTNODE', ('tTYPE', UI(deep=True))]),
+                                              max_loop=5)
+        finally:
+            fmk.disable_replay_recording()
+
+        self.assertEqual(len(sent), 8)
+        expected = {d.get_data_id(): d.to_bytes() for d in sent}
+        first_id, last_id = min(expected), max(expected)
+
+        records = fmk.fmkDB.execute_sql_statement(
+            "SELECT DATA.ID, {:s}, MIN(FEEDBACK.STATUS) FROM DATA "
+            "LEFT JOIN FEEDBACK ON DATA.ID == FEEDBACK.DATA_ID "
+            "WHERE {:d} <= DATA.ID AND DATA.ID <= {:d} GROUP BY DATA.ID;"
+            .format(content_of('DATA'), first_id, last_id))
+        self.assertEqual(len(records), 8)
+        for data_id, content, status in records:
+            # TestTarget provides a random status between -3 and 3
+            if status is not None and status < 0:
+                self.assertEqual(content, expected[data_id])
+            else:
+                self.assertIsNone(content)
+
+        # negative feedback received after other data have been sent still stores the content
+        late = [data_id for data_id, content, _ in records if content is None and data_id != last_id]
+        if late:
+            fmk.lg.collect_feedback(b'late feedback', status_code=-1,
+                                    related_data=[d for d in sent if d.get_data_id() == late[0]][0])
+            fmk.lg.log_collected_feedback()
+            content = fmk.fmkDB.execute_sql_statement(
+                "SELECT {:s} FROM DATA WHERE ID == {:d};".format(content_of('DATA'), late[0]))
+            self.assertEqual(content[0][0], expected[late[0]])
+
+        regenerated = fmk.fmkdb_fetch_data(start_id=first_id, end_id=last_id)
+        self.assertEqual({d.get_data_id(): d.to_bytes() for d in regenerated}, expected)
+
+        # data processed from a seed are not recorded for replay
+        fmk.enable_replay_recording()
+        try:
+            sent = fmk.process_data_and_send(DataProcess([('tTYPE', UI(deep=True))], seed=sent[-1]))
+        finally:
+            fmk.disable_replay_recording()
+        self.assertIsNone(sent[0].replay_recipe)
+        content = fmk.fmkDB.execute_sql_statement(
+            "SELECT {:s} FROM DATA WHERE ID == {:d};".format(content_of('DATA'),
+                                                             sent[0].get_data_id()))
+        self.assertEqual(content[0][0], sent[0].to_bytes())
+
+    def test_prefetched_data_skipped(self):
+        fmk.reload_all(tg_ids=[7])
+        send_data_and_log = fmk.send_data_and_log
+        calls = []
+
+        def stop_after_3_sendings(data_list, **kwargs):
+            go_on, sdata = send_data_and_log(data_list, **kwargs)
+            calls.append(data_list)
+            # let the prefetcher fill its queue
+            with fmk._prefetching_window():
+                time.sleep(0.2)
+            return go_on and len(calls) % 3 != 0, sdata
+
+        def walking_indexes(data_list):
+            return [int(info.split(':')[1]) for d in data_list
+                    for (dmaker_type, _), info_lists in d.info.items() if dmaker_type == 'tTYPE'
+                    for infos in info_lists for info in infos
+                    if info.startswith('model walking index')]
+
+        with mock.patch.object(fmk, 'send_data_and_log', side_effect=stop_after_3_sendings):
+            sent = fmk.process_data_and_send(DataProcess(['TESTNODE', 'tTYPE']), max_loop=20,
+                                             prefetch=2)
+        self.assertEqual(walking_indexes(sent), [1, 2, 3])
+
+        # the prefetched data that have not been sent are served first to the next loop
+        sent = fmk.process_data_and_send(DataProcess(['TESTNODE', 'tTYPE']), max_loop=3)
+        self.assertEqual(walking_indexes(sent), [4, 5, 6])
+
+        with mock.patch.object(fmk, 'send_data_and_log', side_effect=stop_after_3_sendings):
+            sent = fmk.process_data_and_send(DataProcess(['TESTNODE', 'tTYPE']), max_loop=20,
+                                             prefetch=2)
+        self.assertEqual(walking_indexes(sent), [7, 8, 9])
+        self.assertTrue(fmk._unsent_prefetched)
+
+        # ... unless the data makers are reset
+        fmk.cleanup_all_dmakers(reset_existing_seed=True)
+        sent = fmk.process_data_and_send(DataProcess(['TESTNODE', 'tTYPE']), max_loop=1)
+        self.assertEqual(walking_indexes(sent), [1])
+        self.assertFalse(fmk._unsent_prefetched)
+
+        fmk.cleanup_all_dmakers(reset_existing_seed=True)
+
     @unittest.skipIf(not run_long_tests, "Long test case")
     def test_evolutionary_fuzzing(self):
         fmk.reload_all(tg_ids=[7])
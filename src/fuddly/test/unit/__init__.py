@@ -26,4 +26,17 @@ __all__ = []
 from fuddly.test.unit.test_node import *
 from fuddly.test.unit.test_node_builder import *
 from fuddly.test.unit.test_monitor import *
+from fuddly.test.unit.test_comm_backends import *
 from fuddly.test.unit.test_plotty import *
+from fuddly.test.unit.test_constraint_helpers import *
+from fuddly.test.unit.test_evolutionary_helpers import *
+from fuddly.test.unit.test_target_helpers import *
+from fuddly.test.unit.test_basic_primitives import *
+from fuddly.test.unit.test_encoders import *
+from fuddly.test.unit.test_data_model import *
+from fuddly.test.unit.test_perf import *
+from fuddly.test.unit.test_benchmarks import *
+from fuddly.test.unit.test_data_bank import *
+from fuddly.test.unit.test_replay import *
+from fuddly.test.unit.test_database import *
+from fuddly.test.unit.test_prefetch import *
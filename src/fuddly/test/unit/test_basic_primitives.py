@@ -0,0 +1,136 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import math
+import random
+import unittest
+from unittest import mock
+
+import ddt
+
+from fuddly.framework import basic_primitives as bp
+from fuddly.libs.external_modules import numpy_module
+
+# the NumPy implementations are forced with a zero threshold
+implementations = [math.inf, 0] if numpy_module else [math.inf]
+
+
+def _nb_flipped_bits(a, b):
+    return sum(bin(x ^ y).count('1') for x, y in zip(a, b))
+
+
+@ddt.ddt
+class TestBasicPrimitives(unittest.TestCase):
+
+    def _force(self, threshold):
+        patcher = mock.patch.multiple(bp, NUMPY_THRESHOLD=threshold, NUMPY_STR_THRESHOLD=threshold)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @ddt.data(*implementations)
+    def test_rand_string(self, threshold):
+        self._force(threshold)
+        self.assertEqual(len(bp.rand_string(size=500)), 500)
+        self.assertTrue(set(bp.rand_string(size=500, str_set='XYZ')) <= set('XYZ'))
+        self.assertTrue(set(bp.rand_string(size=50, str_set='é✓')) <= set('é✓'))
+        self.assertTrue(15 <= len(bp.rand_string(min=15, max=30)) <= 30)
+
+    @ddt.data(*implementations)
+    def test_corrupt_bytes(self, threshold):
+        self._force(threshold)
+        orig = b'A' * 1000
+        val = bp.corrupt_bytes(orig, n=100)
+        self.assertIsInstance(val, bytes)
+        self.assertEqual(sum(a != b for a, b in zip(orig, val)), 100)
+
+        val = bp.corrupt_bytes(orig, p=0.05, ctrl_char=True)
+        corrupted = [b for a, b in zip(orig, val) if a != b]
+        self.assertEqual(len(corrupted), 50)
+        self.assertTrue(all(b in bp.CTRL_CHARS for b in corrupted))
+
+    @ddt.data(*implementations)
+    def test_corrupt_bits(self, threshold):
+        self._force(threshold)
+        orig = bytes(range(256)) * 4
+        self.assertEqual(_nb_flipped_bits(orig, bp.corrupt_bits(orig, n=300)), 300)
+        self.assertEqual(_nb_flipped_bits(orig, bp.corrupt_bits(orig, n=len(orig)*8)), len(orig)*8)
+
+        val = bp.corrupt_bits(b'\x00' * 100, p=0.5, ascii=True)
+        self.assertTrue(all(b < 0x80 for b in val))
+
+    @ddt.data(*implementations)
+    def test_inplace_corruption(self, threshold):
+        self._force(threshold)
+        buf = bytearray(b'A' * 300)
+        bp.corrupt_bytes_inplace(memoryview(buf)[100:200], n=100)
+        self.assertEqual(buf[:100] + buf[200:], b'A' * 200)
+        self.assertNotIn(ord('A'), buf[100:200])
+
+        buf = bytearray(300)
+        bp.corrupt_bits_inplace(memoryview(buf)[100:200], n=800)
+        self.assertEqual(buf, bytes(100) + b'\xff' * 100 + bytes(100))
+
+    @ddt.data(*implementations)
+    def test_mutants(self, threshold):
+        self._force(threshold)
+        orig = b'A' * 200
+        mutants = bp.corrupt_bytes_mutants(orig, 20, n=10)
+        self.assertEqual(len(mutants), 20)
+        for m in mutants:
+            self.assertEqual(sum(a != b for a, b in zip(orig, m)), 10)
+
+        mutants = bp.corrupt_bits_mutants(orig, 20, n=10, ascii=True)
+        self.assertEqual(len(set(mutants)), 20)
+        for m in mutants:
+            self.assertLessEqual(_nb_flipped_bits(orig, m), 10)
+            self.assertTrue(all(b < 0x80 for b in m))
+
+        mutants = bp.corrupt_bits_mutants(orig, 5, n=10)
+        for m in mutants:
+            self.assertEqual(_nb_flipped_bits(orig, m), 10)
+
+    @unittest.skipIf(not numpy_module, 'python-numpy module is not installed')
+    @ddt.data(1000, 100)
+    def test_mutants_bounded_keys(self, keys_max):
+        # the random keys are drawn by chunks of rows, or the positions are drawn per row
+        # when a single row exceeds the bound
+        self._force(0)
+        patcher = mock.patch.object(bp, 'MUTANT_KEYS_MAX', keys_max)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        orig = b'A' * 200
+        mutants = bp.corrupt_bytes_mutants(orig, 23, n=50)
+        self.assertEqual(len(mutants), 23)
+        for m in mutants:
+            self.assertEqual(sum(a != b for a, b in zip(orig, m)), 50)
+
+    @ddt.data(*implementations)
+    def test_reproducibility(self, threshold):
+        self._force(threshold)
+        outcomes = []
+        for _ in range(2):
+            random.seed(42)
+            outcomes.append((bp.rand_string(size=300), bp.corrupt_bytes(b'A' * 300, n=100),
+                             bp.corrupt_bits_mutants(b'A' * 300, 4, n=100)))
+        self.assertEqual(outcomes[0], outcomes[1])
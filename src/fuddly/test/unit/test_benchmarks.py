@@ -0,0 +1,62 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+import json
+import subprocess
+import sys
+import unittest
+
+from fuddly.benchmarks import compare, make_result
+from fuddly.benchmarks import bench_fmkdb
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_compare(self):
+        baseline = [make_result('fmkdb', 'data', 100, 1, 'inserts/s', size=64),
+                    make_result('fmkdb', 'data', 100, 1, 'inserts/s', size=4096),
+                    make_result('walkers', 'tALT', 0, 1, 'steps/s', atom='SHAPE')]
+        results = [make_result('fmkdb', 'data', 95, 1, 'inserts/s', size=64),
+                   make_result('fmkdb', 'data', 50, 1, 'inserts/s', size=4096),
+                   make_result('walkers', 'tALT', 0, 1, 'steps/s', atom='SHAPE'),
+                   make_result('fmkdb', 'data', 1, 1, 'inserts/s', size=1)]
+
+        self.assertEqual(results[1]['key'], 'fmkdb:data:size=4096')
+        self.assertEqual(compare(results, baseline, tolerance=0.1),
+                         [('fmkdb:data:size=4096', 100.0, 50.0)])
+        self.assertEqual(compare(results, baseline, tolerance=0.6), [])
+
+    def test_fmkdb_bench(self):
+        results = bench_fmkdb.run(sizes=(16,), max_inserts=10)
+        self.assertEqual([r['key'] for r in results],
+                         ['fmkdb:data:size=16', 'fmkdb:data_with_logs:size=16'])
+        self.assertTrue(all(r['count'] == 10 and r['rate'] > 0 for r in results))
+
+    def test_output_is_json(self):
+        # warnings printed by the framework (e.g., when imported) do not pollute the results
+        out = subprocess.run([sys.executable, '-m', 'fuddly.benchmarks', 'primitives',
+                              '--max-duration', '0.01'],
+                             capture_output=True, text=True, timeout=120)
+        self.assertEqual(out.returncode, 0)
+        self.assertIn('results', json.loads(out.stdout))
@@ -0,0 +1,165 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+import os
+import select
+import subprocess
+import threading
+import unittest
+
+from fuddly.framework.comm_backends import *
+
+
+def _local_shell():
+    proc = subprocess.Popen(['/bin/sh'], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT)
+
+    def send(data):
+        proc.stdin.write(data)
+        proc.stdin.flush()
+
+    def recv(timeout):
+        ready, _, _ = select.select([proc.stdout], [], [], timeout)
+        return os.read(proc.stdout.fileno(), 65536) if ready else None
+
+    def close():
+        proc.kill()
+        proc.wait()
+        proc.stdin.close()
+        proc.stdout.close()
+
+    return send, recv, close
+
+
+class ShellSessionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.session = None
+
+    def tearDown(self):
+        if self.session is not None:
+            self.session.close()
+
+    def _start(self, **kwargs):
+        send, recv, close = _local_shell()
+        self.session = ShellSession(send, recv, close=close, **kwargs)
+        return self.session
+
+    def test_outputs(self):
+        session = self._start(batch_window=0)
+        self.assertEqual(session.submit('echo test').result(5), b'test\n')
+        self.assertEqual(session.submit('printf "a\\nb"').result(5), b'a\nb')
+        self.assertEqual(session.submit('echo err >&2').result(5), b'err\n')
+        # the commands cannot consume the script sent to the shell
+        self.assertEqual(session.submit('cat').result(5), b'')
+
+        req = session.submit('false')
+        self.assertEqual(req.result(5), b'')
+        self.assertEqual(req.status, 1)
+
+        self.assertRaises(BackendError, session.submit('fuddly_unknown_cmd').result, 5)
+        self.assertFalse(session.broken)
+
+    def test_batch(self):
+        session = self._start(batch_window=0.2)
+        requests = [None] * 8
+
+        def submit(idx):
+            requests[idx] = session.submit('echo {:d}'.format(idx))
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(requests))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for idx, req in enumerate(requests):
+            self.assertEqual(req.result(5), bytes('{:d}\n'.format(idx), 'latin-1'))
+        self.assertEqual(session.batch_count, 1)
+
+    def test_timeout(self):
+        session = self._start(batch_window=0, timeout=0.2)
+        req = session.submit('sleep 5')
+        with self.assertRaises(BackendError) as cm:
+            req.result(5)
+        self.assertEqual(cm.exception.status, -1)
+        self.assertTrue(session.broken)
+
+        with self.assertRaises(BackendError) as cm:
+            session.submit('echo test').result(5)
+        self.assertEqual(cm.exception.status, -3)
+
+
+class ShellBackendTest(unittest.TestCase):
+
+    def test_persistent(self):
+        backend = Shell_Backend(timeout=5, persistent=True)
+        # shared by two users
+        backend.start()
+        backend.start()
+        try:
+            self.assertEqual(backend.read_output(backend.exec_command('echo test')), b'test\n')
+            shell = backend._shell
+            self.assertEqual(backend.read_output(backend.exec_command('echo $$')),
+                             bytes('{:d}\n'.format(shell.pid), 'latin-1'))
+            self.assertRaises(BackendError, backend.read_output,
+                              backend.exec_command('fuddly_unknown_cmd'))
+
+            backend.stop()
+            self.assertIs(backend._shell, shell)
+
+            # a new shell is spawned if the current one does not work anymore
+            self.assertRaises(BackendError, backend.read_output, backend.exec_command('exit'))
+            self.assertEqual(backend.read_output(backend.exec_command('echo test')), b'test\n')
+            self.assertIsNot(backend._shell, shell)
+        finally:
+            backend.stop()
+
+        self.assertIsNone(backend._shell)
+        self.assertIsNotNone(shell.returncode)
+
+    def test_reset(self):
+        backend = Shell_Backend(timeout=5, persistent=True)
+        # nothing to restart
+        backend.reset()
+        self.assertIsNone(backend._shell)
+
+        # shared by two users
+        backend.start()
+        backend.start()
+        try:
+            self.assertEqual(backend.read_output(backend.exec_command('echo test')), b'test\n')
+            shell = backend._shell
+            backend.reset()
+            self.assertIsNotNone(shell.returncode)
+            self.assertEqual(backend.read_output(backend.exec_command('echo test')), b'test\n')
+            self.assertIsNot(backend._shell, shell)
+
+            # the reset keeps the users of the backend
+            backend.stop()
+            self.assertIsNotNone(backend._shell)
+        finally:
+            backend.stop()
+
+        self.assertIsNone(backend._shell)
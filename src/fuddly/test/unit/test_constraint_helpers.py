@@ -0,0 +1,135 @@
+################################################################################
+#
+#  Copyright 2014-2016 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import unittest
+
+from fuddly.libs.external_modules import csp_module
+from fuddly.framework.constraint_helpers import *
+from fuddly.framework.csp_solver import IntervalDomain, ValueDomain
+import fuddly.framework.csp_solver as native_csp
+
+
+def _build_csp(backend, x_dom=(120, 130), y_dom=(30, 40), z_dom=(1, 3)):
+    csp = CSP(constraints=[Constraint(relation=lambda d1, d2: d1[1]+1 == d2[0] or d1[1]+2 == d2[0],
+                                      vars=('delim_1', 'delim_2')),
+                           Constraint(relation=lambda x, y, z: x == 3*y + z,
+                                      vars=('x_val', 'y_val', 'z_val'))],
+              backend=backend)
+    csp.set_var_domain('delim_1', [b' [', b' ('])
+    csp.set_var_domain('delim_2', [b'-', b']', b')'])
+    csp.set_var_domain('x_val', None, min=x_dom[0], max=x_dom[1])
+    csp.set_var_domain('y_val', None, min=y_dom[0], max=y_dom[1])
+    csp.set_var_domain('z_val', None, min=z_dom[0], max=z_dom[1])
+    csp.freeze()
+    return csp
+
+def _walk_solutions(csp, limit=None):
+    solutions = []
+    csp.next_solution()
+    while not csp.exhausted_solutions:
+        solutions.append(tuple(sorted(csp.get_solution().items())))
+        if limit is not None and len(solutions) >= limit:
+            break
+        csp.next_solution()
+    return solutions
+
+
+class TestNativeCSPSolver(unittest.TestCase):
+
+    def test_interval_domain(self):
+        dom = IntervalDomain(10, 20)
+        self.assertEqual(dom.size, 11)
+        dom.remove(10)
+        dom.remove(15)
+        dom.remove(20)
+        self.assertEqual(list(dom), [11, 12, 13, 14, 16, 17, 18, 19])
+        self.assertNotIn(15, dom)
+        state = dom.get_state()
+        dom.remove(11)
+        self.assertEqual(dom.mini, 12)
+        dom.set_state(state)
+        self.assertEqual(dom.size, 8)
+
+    def test_wide_domains_are_not_expanded(self):
+        p = native_csp.Problem()
+        p.addVariable('x', IntervalDomain(0, 2**32 - 1))
+        p.addVariable('y', [2, 3])
+        p.addConstraint(lambda x, y: x == y + 10, ('x', 'y'))
+        p.addConstraint(lambda x: x > 11, ('x',))
+        sol = p.getSolution()
+        self.assertEqual(sol, {'x': 12, 'y': 2})
+        # only the bounds of a wide domain are tightened
+        self.assertIsInstance(p._domains['x'], IntervalDomain)
+        self.assertGreater(p._domains['x'].maxi, 2**31)
+
+    def test_arc_consistency(self):
+        p = native_csp.Problem()
+        p.addVariable('a', range(0, 10))
+        p.addVariable('b', range(0, 10))
+        p.addConstraint(lambda a, b: a == b + 8, ('a', 'b'))
+        self.assertTrue(p._propagate())
+        self.assertEqual(list(p._domains['a']), [8, 9])
+        self.assertEqual(list(p._domains['b']), [0, 1])
+
+    def test_unsat(self):
+        p = native_csp.Problem()
+        p.addVariable('a', [1, 2])
+        p.addConstraint(lambda a: a > 5, ('a',))
+        self.assertEqual(p.getSolutions(), [])
+
+    def test_duplicated_variable(self):
+        p = native_csp.Problem()
+        p.addVariable('a', [1, 2])
+        self.assertRaises(ValueError, p.addVariable, 'a', [3])
+
+    def test_csp_native_backend(self):
+        csp = _build_csp(CSPBackend.Native)
+        self.assertEqual(csp.backend, CSPBackend.Native)
+        solutions = _walk_solutions(csp)
+        self.assertEqual(len(solutions), 8)
+        self.assertEqual(len(set(solutions)), 8)
+        for sol in solutions:
+            sol = dict(sol)
+            self.assertEqual(sol['x_val'], 3*sol['y_val'] + sol['z_val'])
+
+    @unittest.skipIf(not csp_module, 'python-constraint module is not installed')
+    def test_csp_backends_equivalence(self):
+        native_sols = _walk_solutions(_build_csp(CSPBackend.Native))
+        pycst_sols = _walk_solutions(_build_csp(CSPBackend.PythonConstraint))
+        self.assertEqual(set(native_sols), set(pycst_sols))
+
+    def test_csp_native_default_values(self):
+        csp = _build_csp(CSPBackend.Native)
+        csp.set_var_domain('delim_1', [b' [', b' ('], default=b' (')
+        csp.freeze()
+        solutions = _walk_solutions(csp)
+        self.assertEqual(dict(solutions[0])['delim_1'], b' (')
+        self.assertEqual(len(set(solutions)), 8)
+
+    def test_csp_native_wide_domains(self):
+        csp = _build_csp(CSPBackend.Native, x_dom=(0, 2**16-1), y_dom=(0, 2**14-1), z_dom=(0, 3))
+        solutions = _walk_solutions(csp, limit=5)
+        self.assertEqual(len(solutions), 5)
+        for sol in solutions:
+            sol = dict(sol)
+            self.assertEqual(sol['x_val'], 3*sol['y_val'] + sol['z_val'])
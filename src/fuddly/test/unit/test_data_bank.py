@@ -0,0 +1,173 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+import shutil
+import tempfile
+import unittest
+
+from fuddly.framework.data import Data
+from fuddly.framework.data_bank import DataBank, SpillStore
+from fuddly.framework.data_model import DataModel
+from fuddly.framework.value_types import String, UINT8
+
+
+class Bank_DataModel(DataModel):
+
+    name = 'bank_test'
+
+    def build_data_model(self):
+        self.register({'name': 'msg',
+                       'contents': [
+                           {'name': 'len', 'contents': UINT8(), 'mutable': False},
+                           {'name': 'payload', 'contents': String(values=['hello'])},
+                       ]})
+
+
+class TestDataBank(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dm = Bank_DataModel()
+        cls.dm.build_data_model()
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _bank(self, max_live_entries):
+        bank = DataBank(max_live_entries=max_live_entries, folder=self.folder,
+                        dm_resolver={self.dm.name: self.dm}.get)
+        self.addCleanup(bank.clear)
+        return bank
+
+    def _data(self, idx):
+        atom = self.dm.get_atom('msg')
+        atom['msg/len$'][0].set_default_value(idx)
+        data = Data(atom)
+        data.set_data_model(self.dm)
+        data.set_initial_dmaker(('GEN', 'g_msg', None))
+        data.add_info('data #{:d}'.format(idx))
+        data.bind_info('GEN', 'g_msg')
+        return data
+
+    def test_spill_and_rematerialize(self):
+        bank = self._bank(max_live_entries=2)
+        datas = [self._data(i) for i in range(5)]
+        for data in datas:
+            bank.append(data)
+
+        self.assertEqual(len(bank), 5)
+        self.assertEqual(bank.spilled_entries, 3)
+        self.assertEqual(bank.indexes(), [1, 2, 3, 4, 5])
+        self.assertIs(bank.last(), datas[-1])
+
+        # raw access does not bring the data back in memory
+        raw = bank.get(1, materialize=False)
+        self.assertFalse(raw.has_node_content())
+        self.assertEqual(raw.to_bytes(), datas[0].to_bytes())
+        self.assertEqual(bank.spilled_entries, 3)
+
+        data = bank.get(1)
+        self.assertTrue(data.has_node_content())
+        self.assertEqual(data.content.name, 'msg')
+        self.assertEqual(data.to_bytes(), datas[0].to_bytes())
+        self.assertIs(data.get_data_model(), self.dm)
+        self.assertEqual(data.get_initial_dmaker(), ('GEN', 'g_msg', None))
+        self.assertEqual(list(data.read_info('GEN', 'g_msg')), [['data #0']])
+        # the least recently used data (#4) has been evicted in favor of #1
+        self.assertEqual(bank.spilled_entries, 3)
+        self.assertIs(bank.get(1), data)
+        self.assertIs(bank.get(5), datas[-1])
+
+        self.assertEqual([d.to_bytes() for d in bank], [d.to_bytes() for d in datas])
+        self.assertIsNone(bank.get(6))
+
+    def test_iteration_keeps_spilled_data_on_disk(self):
+        bank = self._bank(max_live_entries=2)
+        datas = [self._data(i) for i in range(5)]
+        for data in datas:
+            bank.append(data)
+
+        rebuilt = list(bank)
+        self.assertEqual([d.to_bytes() for d in rebuilt], [d.to_bytes() for d in datas])
+        self.assertTrue(all(d.has_node_content() for d in rebuilt))
+        self.assertIs(rebuilt[-1], datas[-1])
+        # the data kept in memory are unchanged
+        self.assertEqual(bank.spilled_entries, 3)
+        self.assertIs(bank.get(4, materialize=False), datas[3])
+        self.assertIsNot(bank.get(1, materialize=False), rebuilt[0])
+
+    def test_raw_fallback(self):
+        bank = self._bank(max_live_entries=1)
+        data = self._data(1)
+        data.update_from(b'not absorbable')
+        data.set_data_model(self.dm)
+        bank.append(data)
+        bank.append(self._data(2))
+
+        rebuilt = bank.get(1)
+        self.assertFalse(rebuilt.has_node_content())
+        self.assertEqual(rebuilt.to_bytes(), b'not absorbable')
+        self.assertIs(rebuilt.get_data_model(), self.dm)
+
+    def test_remove_and_clear(self):
+        bank = self._bank(max_live_entries=2)
+        for i in range(6):
+            bank.append(self._data(i))
+
+        bank.remove_oldest(3)
+        self.assertEqual(bank.indexes(), [4, 5, 6])
+        self.assertEqual(bank.spilled_entries, 1)
+        self.assertEqual(bank.get(4).to_bytes(), self._data(3).to_bytes())
+
+        bank.clear()
+        self.assertEqual(len(bank), 0)
+        self.assertEqual(bank.spilled_entries, 0)
+        self.assertIsNone(bank.last())
+        self.assertEqual(bank.append(self._data(0)), 1)
+
+    def test_unbounded(self):
+        bank = self._bank(max_live_entries=None)
+        datas = [self._data(i) for i in range(10)]
+        for data in datas:
+            bank.append(data)
+        self.assertEqual(bank.spilled_entries, 0)
+        self.assertEqual(list(bank), datas)
+
+    def test_spill_store_compaction(self):
+        store = SpillStore(folder=self.folder)
+        store.compaction_threshold = 0
+        for i in range(4):
+            store.write(i, bytes([i]) * 10)
+        store.discard(0)
+        store.discard(1)
+        self.assertEqual(store._size, 40)
+        store.discard(2)
+        # the discarded records now take more space than the live ones
+        self.assertEqual(store._size, 10)
+        self.assertEqual(store.read(3), b'\x03' * 10)
+        store.close()
+        self.assertEqual(len(store), 0)
@@ -0,0 +1,164 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from fuddly.framework.data_model import *
+from fuddly.framework.value_types import *
+
+
+class CacheTest_DataModel(DataModel):
+
+    name = 'cache_test'
+
+    def __init__(self, with_lambda=False):
+        DataModel.__init__(self)
+        self.with_lambda = with_lambda
+        self.build_cpt = 0
+
+    def build_data_model(self):
+        self.build_cpt += 1
+        len_vt = UINT8 if not self.with_lambda else UINT16_be
+        desc = {'name': 'msg',
+                'contents': [
+                    {'name': 'len',
+                     'contents': LEN(vt=len_vt),
+                     'node_args': 'payload'},
+                    {'name': 'payload',
+                     'contents': String(values=['hello', 'world'])},
+                    {'name': 'crc',
+                     'contents': CRC(vt=UINT32_be),
+                     'node_args': ['len', 'payload']},
+                ]}
+        if self.with_lambda:
+            desc['contents'].append({'name': 'fct',
+                                     'contents': lambda: Node('x', values=['x'])})
+        self.register(desc)
+        self.register_atom_for_decoding(self.get_atom('msg'))
+
+
+class TestDataModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = DataModelCache(folder=self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _load(self, dm):
+        dm._dm_db = {dm.name: dm}
+        loaded = self.cache.load(dm)
+        if not loaded:
+            dm.build_data_model()
+            if loaded is False:
+                self.cache.store(dm)
+        return loaded
+
+    def test_cached_build(self):
+        dm = CacheTest_DataModel()
+        self.assertFalse(self._load(dm))
+        self.assertEqual(dm.build_cpt, 1)
+
+        cached_dm = CacheTest_DataModel()
+        self.assertTrue(self._load(cached_dm))
+        self.assertEqual(cached_dm.build_cpt, 1)
+        self.assertEqual(list(cached_dm.atom_identifiers()), ['msg'])
+
+        random.seed(4)
+        expected = dm.get_atom('msg').to_bytes()
+        random.seed(4)
+        atom = cached_dm.get_atom('msg')
+        self.assertEqual(atom.to_bytes(), expected)
+        # the Env of an atom copy references a (shallow) copy of its data model
+        self.assertIs(atom.env.get_data_model()._dm_hashtable, cached_dm._dm_hashtable)
+        self.assertEqual(cached_dm.node_backend.get_all_confs(), dm.node_backend.get_all_confs())
+
+        # the atom registered for decoding is restored too
+        abs_atom, _ = cached_dm.get_atom_for_absorption('msg')
+        self.assertEqual(abs_atom.absorb(expected)[0], AbsorbStatus.FullyAbsorbed)
+
+    def test_enabled_for_bundled_models(self):
+        with mock.patch('fuddly.framework.data_model.DataModelCache') as cache_cls:
+            dm = CacheTest_DataModel()
+            dm.module_name = 'user_data_models.cache_test'
+            dm._build_or_load_data_model()
+            cache_cls.assert_not_called()
+            self.assertEqual(dm.build_cpt, 1)
+
+            dm.build_cache = True
+            dm._build_or_load_data_model()
+            self.assertEqual(cache_cls.call_count, 1)
+
+            dm = CacheTest_DataModel()
+            dm.module_name = 'fuddly.data_models.cache_test'
+            dm._build_or_load_data_model()
+            self.assertEqual(cache_cls.call_count, 2)
+
+    def test_not_serializable(self):
+        dm = CacheTest_DataModel(with_lambda=True)
+        self.assertFalse(self._load(dm))
+        self.assertEqual(os.listdir(self.folder), ['cache_test.pickle'])
+
+        dm = CacheTest_DataModel(with_lambda=True)
+        self.assertIsNone(self._load(dm))
+        self.assertEqual(dm.build_cpt, 1)
+
+    def test_invalidation(self):
+        self._load(CacheTest_DataModel())
+        dm = CacheTest_DataModel()
+        dm._dm_db = {dm.name: dm}
+        DataModelCache._fmk_digest = b'modified framework'
+        try:
+            self.assertFalse(self.cache.load(dm))
+        finally:
+            DataModelCache._fmk_digest = None
+        self.assertTrue(self.cache.load(dm))
+
+    def test_integrity(self):
+        self._load(CacheTest_DataModel())
+        path = os.path.join(self.folder, 'cache_test.pickle')
+        with open(path, 'rb') as f:
+            header, blob = f.read().split(b'\n', 1)
+
+        def check_rejected(content):
+            with open(path, 'wb') as f:
+                f.write(content)
+            dm = CacheTest_DataModel()
+            dm._dm_db = {dm.name: dm}
+            self.assertFalse(self.cache.load(dm))
+
+        # altered content (still deserializable)
+        self.assertIn(b'hello', blob)
+        check_rejected(header + b'\n' + blob.replace(b'hello', b'HELLO'))
+        # other format version
+        check_rejected(header.replace(b'"version": 1', b'"version": 0') + b'\n' + blob)
+        # entry of the former format (not preceded by a JSON header)
+        check_rejected(pickle.dumps({'cache_test': 'digest'}) + blob)
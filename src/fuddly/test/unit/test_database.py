@@ -0,0 +1,157 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+import contextlib
+import io
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+import fuddly.framework.global_resources as gr
+from fuddly.framework.database import Database, pack_content, unpack_content, content_of
+
+
+class TestDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.db_path = os.path.join(self.folder, 'fmkDB.db')
+
+    def _count_blobs(self):
+        con = sqlite3.connect(self.db_path)
+        count = con.execute('SELECT COUNT(*) FROM BLOBS').fetchone()[0]
+        con.close()
+        return count
+
+    def test_pack_content(self):
+        for raw in [b'', b'short', b'A'*1000, os.urandom(1000)]:
+            packed = pack_content(raw)
+            self.assertEqual(unpack_content(packed), raw)
+            self.assertLessEqual(len(packed), len(raw) + 1)
+        self.assertLess(len(pack_content(b'A'*1000)), 100)
+
+    def test_deduplication(self):
+        db = Database(fmkdb_path=self.db_path)
+        self.assertTrue(db.start())
+        try:
+            db.insert_data_model('dm')
+            db.insert_project('prj')
+            now = datetime.now()
+            for raw in [b'A'*500, b'B'*500, b'A'*500]:
+                data_id = db.insert_data('GEN', 'dm', raw, len(raw), now, now, 'tg', 'prj')
+                db.insert_feedback(data_id, 'src', now, b'A'*500, status_code=0)
+            db.flush_feedback()
+            db.insert_data_content(data_id, b'B'*500)
+            self.assertEqual(db.execute_sql_statement('SELECT COUNT(*) FROM BLOBS')[0][0], 2)
+            contents = db.execute_sql_statement(
+                'SELECT {:s} FROM DATA ORDER BY ID'.format(content_of('DATA')))
+            self.assertEqual([c for c, in contents], [b'A'*500, b'B'*500, b'B'*500])
+
+            # orphaned contents are removed along with their data
+            db.remove_data(2, colorized=False)
+            self.assertEqual(db.execute_sql_statement('SELECT COUNT(*) FROM BLOBS')[0][0], 2)
+            db.remove_data(3, colorized=False)
+            db.remove_data(1, colorized=False)
+            self.assertEqual(db.execute_sql_statement('SELECT COUNT(*) FROM BLOBS')[0][0], 0)
+        finally:
+            db.stop()
+
+    def test_failed_blob_insertion(self):
+        db = Database(fmkdb_path=self.db_path)
+        self.assertTrue(db.start())
+        try:
+            db.insert_data_model('dm')
+            db.insert_project('prj')
+            now = datetime.now()
+            db.execute_sql_statement("CREATE TRIGGER FAIL BEFORE INSERT ON BLOBS "
+                                     "BEGIN SELECT RAISE(ABORT, 'disk full'); END;")
+            with contextlib.redirect_stdout(io.StringIO()):
+                db.insert_data('GEN', 'dm', b'C'*500, 500, now, now, 'tg', 'prj')
+                db.execute_sql_statement('DROP TRIGGER FAIL;')
+            # the content has not been stored, so it is not considered as known
+            data_id = db.insert_data('GEN', 'dm', b'C'*500, 500, now, now, 'tg', 'prj')
+            contents = db.execute_sql_statement(
+                'SELECT {:s} FROM DATA WHERE ID == {:d}'.format(content_of('DATA'), data_id))
+            self.assertEqual(contents, [(b'C'*500,)])
+        finally:
+            db.stop()
+
+    def _create_former_db(self):
+        with open(gr.fmk_folder + Database.DDL_fname) as fd:
+            ddl = fd.read()
+        # schema of the databases created before the introduction of the BLOBS table
+        ddl = re.sub(r'CONTENT_HASH\s+BLOB REFERENCES BLOBS \(HASH\)', 'CONTENT BLOB', ddl)
+        ddl = re.sub(r'CREATE TABLE BLOBS \(.*?\) WITHOUT ROWID;', '', ddl, flags=re.S)
+        con = sqlite3.connect(self.db_path)
+        con.executescript(ddl)
+        with con:
+            con.execute("INSERT INTO DATAMODEL(NAME) VALUES('dm')")
+            for raw in [b'X'*300, b'Y'*300, b'X'*300, None]:
+                con.execute('INSERT INTO DATA(TYPE,DM_NAME,CONTENT) VALUES(?,?,?)',
+                            ('GEN', 'dm', raw))
+            con.execute('INSERT INTO FEEDBACK(DATA_ID,SOURCE,CONTENT,STATUS) VALUES(?,?,?,?)',
+                        (1, 'src', b'Y'*300, -1))
+        con.close()
+
+    def test_migration(self):
+        self._create_former_db()
+
+        db = Database(fmkdb_path=self.db_path)
+        stats = db.migrate()
+        self.assertEqual(stats['records'], 4)
+        self.assertEqual(stats['blobs'], 2)
+        self.assertTrue(os.path.isfile(stats['backup']))
+        self.assertIsNone(db.migrate())
+        self.assertEqual(self._count_blobs(), 2)
+
+        self.assertTrue(db.start())
+        try:
+            contents = db.execute_sql_statement(
+                'SELECT ID, {:s} FROM DATA ORDER BY ID'.format(content_of('DATA')))
+            self.assertEqual(contents, [(1, b'X'*300), (2, b'Y'*300), (3, b'X'*300), (4, None)])
+            fbk = db.execute_sql_statement(
+                'SELECT DATA_ID, {:s} FROM FEEDBACK'.format(content_of('FEEDBACK')))
+            self.assertEqual(fbk, [(1, b'Y'*300)])
+            # new data IDs follow the migrated ones
+            now = datetime.now()
+            self.assertEqual(db.insert_data('GEN', 'dm', b'Z', 1, now, now, 'tg', 'prj'), 5)
+        finally:
+            db.stop()
+
+    def test_former_db_refused_on_start(self):
+        self._create_former_db()
+
+        # former databases are refused instead of being converted behind the user's back
+        db = Database(fmkdb_path=self.db_path)
+        self.assertTrue(db.needs_migration())
+        mtime = os.path.getmtime(self.db_path)
+        self.assertFalse(db.start())
+        self.assertFalse(os.path.exists(self.db_path + '.bak'))
+        self.assertEqual(os.path.getmtime(self.db_path), mtime)
+        self.assertTrue(db.needs_migration())
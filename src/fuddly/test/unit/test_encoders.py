@@ -0,0 +1,71 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+import random
+import unittest
+
+import ddt
+
+from fuddly.framework.encoders import *
+from fuddly.benchmarks.bench_encoders import CODECS, random_input
+
+
+@ddt.ddt
+class TestEncoders(unittest.TestCase):
+
+    @ddt.data(*CODECS)
+    def test_legacy_equivalence(self, codec):
+        enc_cls, legacy_cls = CODECS[codec]
+        enc, legacy = enc_cls(), legacy_cls()
+        rng = random.Random(codec)
+        for size in list(range(1, 33)) + [63, 64, 65, 200, 1001]:
+            val = random_input(codec, size, rng=rng)
+            encoded = enc.encode(val)
+            self.assertEqual(encoded, legacy.encode(val))
+            self.assertEqual(enc.encode(memoryview(val)), encoded)
+            self.assertEqual(enc.decode(encoded), legacy.decode(encoded))
+            if codec == 'bit_reverse' or (codec == 'gsm7' and size % 8 != 0):
+                self.assertEqual(enc.decode(encoded)[:size], val)
+
+    @ddt.data(*CODECS)
+    def test_batch_and_stream(self, codec):
+        enc = CODECS[codec][0]()
+        rng = random.Random(codec)
+        vals = [random_input(codec, rng.randint(1, 300), rng=rng) for _ in range(20)]
+        encoded = [enc.encode(v) for v in vals]
+        self.assertEqual(enc.encode_many(vals), encoded)
+        self.assertEqual(enc.decode_many(encoded), [enc.decode(v) for v in encoded])
+        for val, enc_val in zip(vals, encoded):
+            self.assertEqual(b''.join(enc.encode_stream(val, chunk_size=21)), enc_val)
+
+    def test_gsm7_invalid_chars(self):
+        enc = GSM7bitPacking_Enc()
+        self.assertEqual(enc.encode(b'\x80\x00'), b'\x80\x00')
+        self.assertRaises(ValueError, enc.encode, b'\xff\x01')
+
+    def test_bit_inverter(self):
+        enc = BitInverter_Enc()
+        self.assertEqual(enc.encode(b'\x01\x00'), b'\x80')
+        self.assertEqual(enc.encode(b'\x0f'), b'\xf0')
+        self.assertEqual(BIT_REVERSE_TABLE[0x12], 0x48)
@@ -0,0 +1,178 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import random
+import time
+import unittest
+from unittest import mock
+
+import ddt
+
+from fuddly.framework.evolutionary_helpers import *
+from fuddly.framework.knowledge.feedback_collector import FeedbackSource
+from fuddly.framework.monitor import Probe
+from fuddly.framework.target_helpers import EmptyTarget
+from fuddly.framework.value_types import String
+
+
+def _build_data(idx):
+    node = Node('root', subnodes=[Node('a', value_type=String(values=['A{}'.format(idx)])),
+                                  Node('b', value_type=String(values=['B{}'.format(idx)])),
+                                  Node('c', value_type=String(values=['C{}'.format(idx)]))])
+    return Data(node)
+
+
+class FakeFmk(object):
+
+    def __init__(self):
+        self.stats = []
+        self.cpt = 0
+        self.lg = mock.Mock()
+
+    def handle_data_desc(self, data_desc, resolve_dataprocess=True, save_generator_seed=False):
+        self.cpt += 1
+        return _build_data(self.cpt)
+
+    def process_data(self, action_list, seed=None):
+        return seed
+
+    def fmkdb_insert_evolution_stats(self, population, generation, scores):
+        self.stats.append((generation, list(scores)))
+
+
+@ddt.ddt
+class TestEvolutionaryHelpers(unittest.TestCase):
+
+    def test_feedback_fitness(self):
+        tg_src = FeedbackSource(mock.Mock())
+        probe_src = FeedbackSource(Probe())
+        ind = Individual(None, None)
+        ind.feedback = [(tg_src, -2, None, b''),
+                        (tg_src, 3, None, b''),
+                        (probe_src, -1, None, b''),
+                        (probe_src, None, None, b'')]
+
+        self.assertEqual(FeedbackFitness()(ind), 3.0)
+        self.assertEqual(FeedbackFitness(target_weight=0.5, probe_weight=4.0)(ind), 5.0)
+        self.assertEqual(FeedbackFitness(coverage_func=lambda i: 10, coverage_weight=0.1)(ind), 4.0)
+
+        ind.feedback = None
+        self.assertEqual(FeedbackFitness()(ind), 0.0)
+
+    @ddt.data(None, 4)
+    def test_evolution(self, workers):
+        fmk = FakeFmk()
+        pop = EvolutionaryPopulation(fmk, init_process=None, max_size=10, max_generation_nb=3,
+                                     fitness=lambda ind: float(ind.data.to_bytes() == b'A1B1C1'),
+                                     elite_nb=1, survival_rate=0.4, workers=workers)
+        pop.reset()
+        self.assertEqual(len(pop), 10)
+        best = pop[0]
+        best_content = best.data.to_bytes()
+
+        pop.evolve()
+
+        self.assertEqual(pop.generation, 2)
+        self.assertEqual(len(pop), 10)
+        self.assertEqual(fmk.stats[0][0], 1)
+        self.assertEqual(sorted(fmk.stats[0][1]), [0.0]*9 + [1.0])
+        # elitism: the best individual is kept unaltered
+        self.assertIs(pop[0], best)
+        self.assertEqual(best.data.to_bytes(), best_content)
+        self.assertTrue(all(ind.score is None for ind in pop[4:]))
+
+    def test_crossover_workers_reproducibility(self):
+        def crossover(ind_1, ind_2):
+            draws = []
+            for _ in range(5):
+                draws.append(random.random())
+                # let the other workers draw in between
+                time.sleep(0.001)
+            return Data(repr(draws).encode()),
+
+        outcomes = []
+        for _ in range(2):
+            random.seed(7)
+            pop = EvolutionaryPopulation(FakeFmk(), init_process=None, max_size=10,
+                                         fitness=lambda ind: 0.0, crossover_algo=crossover,
+                                         survival_rate=0.2, workers=4)
+            pop.reset()
+            pop.evolve()
+            outcomes.append([ind.data.to_bytes() for ind in pop[2:]])
+        self.assertEqual(len(outcomes[0]), 4)
+        self.assertEqual(outcomes[0], outcomes[1])
+
+    def test_feedback_attribution(self):
+        fmk = FakeFmk()
+        sc = EvolutionaryScenariosFactory.build(
+            fmk, 'evol', EvolutionaryPopulation,
+            {'init_process': None, 'max_size': 4, 'fitness': lambda ind: 0.0}, vtg_ids=[0, 1])
+        cbk_after = next(sc.anchor.transitions)._callbacks[HOOK.after_fbk]
+        population = sc.anchor.data_desc[0].process[0][1].population
+        population.reset()
+
+        targets = [EmptyTarget(), EmptyTarget()]
+        for idx, (ind, tg) in enumerate(zip(population[:2], targets)):
+            ind.data.estimated_data_id = 10 + idx
+            tg._pending_data_id = 10 + idx
+            self.assertEqual(tg.get_last_sent_data_id(), 10 + idx)
+        population.index = 2
+
+        fbk_gate = [(FeedbackSource(targets[0]), -1, None, b'tg0'),
+                    (FeedbackSource(Probe(), related_tg=targets[1]), -2, None, b'probe'),
+                    (FeedbackSource(Probe()), -3, None, b'unrelated')]
+        self.assertTrue(cbk_after(None, None, None, fbk_gate))
+
+        self.assertEqual([entry[3] for entry in population[0].feedback], [b'tg0'])
+        self.assertEqual([entry[3] for entry in population[1].feedback], [b'probe'])
+        self.assertEqual(fmk.lg.log_fmk_info.call_count, 1)
+
+    def test_tournament_selection(self):
+        fmk = FakeFmk()
+        pop = EvolutionaryPopulation(fmk, init_process=None, max_size=10,
+                                     fitness=lambda ind: 0.0, elite_nb=2,
+                                     tournament_size=10, survival_rate=0.5)
+        pop.reset()
+        for idx, ind in enumerate(pop[:]):
+            ind.score = float(idx)
+        pop._kill()
+        # with a tournament involving every candidate, the best ones are always selected
+        self.assertEqual([ind.score for ind in pop[:]], [9.0, 8.0, 7.0, 6.0, 5.0])
+        self.assertEqual(len(pop._elites), 2)
+
+    @ddt.data(CrossoverHelper.crossover_algo1,
+              CrossoverHelper.get_configured_crossover_algo2(0.5))
+    def test_crossover(self, crossover_algo):
+        ind_1, ind_2 = _build_data(1), _build_data(2)
+        ind_1.content.freeze()
+        ind_2.content.freeze()
+        values = sorted(ind_1.to_bytes()[i:i+2] for i in range(0, 6, 2)) \
+                 + sorted(ind_2.to_bytes()[i:i+2] for i in range(0, 6, 2))
+
+        child_1, child_2 = crossover_algo(ind_1, ind_2)
+
+        self.assertNotEqual(child_1.to_bytes(), b'A1B1C1')
+        self.assertNotEqual(child_2.to_bytes(), b'A2B2C2')
+        new_values = sorted(child_1.to_bytes()[i:i+2] for i in range(0, 6, 2)) \
+                     + sorted(child_2.to_bytes()[i:i+2] for i in range(0, 6, 2))
+        self.assertEqual(sorted(new_values), sorted(values))
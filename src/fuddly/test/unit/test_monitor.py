@@ -21,6 +21,10 @@
 #
 ################################################################################
 
+import os
+import shutil
+import subprocess
+import tempfile
 import unittest
 from fuddly.test import mock
 from fuddly.framework.monitor import *
@@ -116,3 +120,127 @@ class ProbeUserTest(unittest.TestCase):
             if i+1 < len(execution_times):
                 self.assertTrue(0 <= (execution_times[i+1] - execution_times[i]).total_seconds()
                                 - self.probe_user.get_probe_delay() <= delta)
+
+
+class BlockingProbesTest(unittest.TestCase):
+    """Test case used to test the synchronization of the blocking probes with the framework."""
+
+    def setUp(self):
+        self.fmk_ops = mock.Mock()
+        self.monitor = Monitor()
+        self.monitor.set_fmk_ops(self.fmk_ops)
+        self.monitor.set_logger(mock.Mock())
+        self.monitor.set_targets([mock.Mock()])
+        self.monitor.set_data_model(mock.Mock())
+
+    def tearDown(self):
+        self.monitor.stop_all_probes()
+
+    def _add_probes(self, arm_durations):
+        for idx, duration in enumerate(arm_durations):
+            def arm(self, dm, target, logger, duration=duration):
+                time.sleep(duration)
+            def main(self, dm, target, logger):
+                return ProbeStatus(0)
+            probe_cls = type('probe{:d}'.format(idx), (Probe,), {'arm': arm, 'main': main})
+            self.monitor.add_probe(probe_cls(), blocking=True)
+            self.monitor.start_probe(probe_cls.__name__)
+        self.monitor.wait_for_probe_initialization()
+
+    def test_concurrent_arming(self):
+        self._add_probes([0.2] * 4)
+
+        start = time.monotonic()
+        self.monitor.notify_imminent_data_sending()
+        elapsed = time.monotonic() - start
+        self.monitor.notify_data_sending_event()
+        self.monitor.wait_for_probe_status_retrieval()
+
+        self.assertLess(elapsed, 0.6)
+        self.fmk_ops.set_error.assert_not_called()
+        for idx in range(4):
+            stats = self.monitor.get_probe_latency_stats('probe{:d}'.format(idx))
+            self.assertEqual(stats['arm'].count, 1)
+            self.assertGreaterEqual(stats['arm'].max, 0.2e9)
+            self.assertEqual(stats['status'].count, 1)
+
+    @mock.patch.object(ProbeUser, 'timeout', 0.3)
+    def test_shared_deadline(self):
+        self._add_probes([1, 1, 0])
+
+        start = time.monotonic()
+        self.monitor.notify_imminent_data_sending()
+        elapsed = time.monotonic() - start
+
+        # both stuck probes are reported, once the (shared) timeout has elapsed
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(self.fmk_ops.set_error.call_count, 2)
+
+
+@unittest.skipUnless(os.path.isfile('/proc/self/stat'), 'procfs not available')
+class ProcfsProbesTest(unittest.TestCase):
+    """Test case used to test the procfs-based probes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        # a dedicated name, so that the probes only monitor our process
+        self.process_name = 'fdly{:d}'.format(os.getpid())
+        self.exe = os.path.join(self.tmpdir, self.process_name)
+        os.symlink(shutil.which('sleep'), self.exe)
+        self.proc = None
+        self.logger = mock.Mock()
+
+    def tearDown(self):
+        self._kill()
+        shutil.rmtree(self.tmpdir)
+
+    def _run(self):
+        self.proc = subprocess.Popen([self.exe, '60'])
+        for _ in range(100):
+            with open('/proc/{:d}/stat'.format(self.proc.pid), 'rb') as f:
+                if self.process_name.encode() in f.read():
+                    break
+            time.sleep(0.01)
+
+    def _kill(self):
+        if self.proc is not None:
+            self.proc.kill()
+            self.proc.wait()
+            self.proc = None
+
+    def test_probe_pid(self):
+        class pid_probe(ProcfsProbePID):
+            process_name = self.process_name
+            delay = 0
+            delay_between_attempts = 0
+            max_attempts = 1
+
+        probe = pid_probe()
+        self._run()
+        status = probe.start(None, None, self.logger)
+        self.assertEqual(status.value, self.proc.pid)
+        self.assertEqual(probe.main(None, None, self.logger).value, self.proc.pid)
+
+        self._kill()
+        self._run()
+        self.assertEqual(probe.main(None, None, self.logger).value, -1)
+        self.assertEqual(probe.main(None, None, self.logger).value, self.proc.pid)
+
+        self._kill()
+        self.assertEqual(probe.main(None, None, self.logger).value, -2)
+        probe.stop(None, None, self.logger)
+
+    def test_probe_mem(self):
+        class mem_probe(ProcfsProbeMem):
+            process_name = self.process_name
+            tolerance = None
+
+        probe = mem_probe()
+        self._run()
+        status = probe.start(None, None, self.logger)
+        self.assertGreater(status.value, 0)
+        self.assertGreater(probe.main(None, None, self.logger).value, 0)
+
+        self._kill()
+        self.assertEqual(probe.main(None, None, self.logger).value, -2)
+        probe.stop(None, None, self.logger)
@@ -81,3 +81,15 @@ class TestBitFieldCondition(unittest.TestCase):
     @ddt.unpack
     def test_invalid_with_both_arguments(self, sf, val, neg_val):
         self.assertRaises(Exception, BitFieldCondition, sf=sf, val=val, neg_val=neg_val)
+
+
+class TestNodeBuffers(unittest.TestCase):
+
+    def test_to_buffers(self):
+        node = Node('root', subnodes=[Node('a', values=[b'AA']),
+                                      Node('b', subnodes=[Node('c', values=[b'C']),
+                                                          Node('d', values=[b''])]),
+                                      Node('e', values=[b'EEE'])])
+        self.assertEqual(node.to_buffers(), [b'AA', b'C', b'', b'EEE'])
+        self.assertEqual(node.to_bytes(), b'AACEEE')
+        self.assertEqual(node['root/a$'][0].to_buffers(), [b'AA'])
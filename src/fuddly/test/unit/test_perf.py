@@ -0,0 +1,114 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+import threading
+import unittest
+
+from fuddly.framework.data import Data
+from fuddly.framework.perf import LatencyHistogram, PerfRecorder, serialization_timer, \
+    timing_serialization
+
+
+class TestPerf(unittest.TestCase):
+
+    def test_histogram_percentiles(self):
+        hist = LatencyHistogram()
+        self.assertIsNone(hist.percentile(50))
+        self.assertIsNone(hist.mean)
+
+        for v in range(1, 10001):
+            hist.add(v * 1000)
+
+        self.assertEqual(hist.count, 10000)
+        self.assertEqual(hist.max, 10000000)
+        self.assertAlmostEqual(hist.mean, 5000500)
+        precision = 1 / 2**LatencyHistogram.SUB_BITS
+        for p, expected in ((0, 1000), (50, 5000000), (99, 9900000), (100, 10000000)):
+            self.assertLessEqual(abs(hist.percentile(p) - expected), expected * precision)
+
+    def test_recorder(self):
+        perf = PerfRecorder()
+        self.assertIsNone(perf.start())
+        perf.stop(PerfRecorder.SENDING, perf.start())
+        self.assertEqual(perf.get_stats(), [])
+
+        perf.enable(persist=True)
+        self.assertTrue(perf.persist)
+        perf.record(PerfRecorder.SENDING, 300)
+        perf.record(PerfRecorder.SENDING, 100, scope='tg1', cycle=False)
+        perf.record(PerfRecorder.GENERATION, 50, scope='gen')
+        perf.record(PerfRecorder.GENERATION, 70, scope='gen')
+        perf.stop(PerfRecorder.FMKDB, perf.start())
+
+        cycle = perf.end_cycle()
+        self.assertEqual(cycle[PerfRecorder.SENDING], 300)
+        self.assertEqual(cycle[PerfRecorder.GENERATION], 120)
+        self.assertIn(PerfRecorder.FMKDB, cycle)
+        self.assertEqual(perf.end_cycle(), {})
+
+        stats = perf.get_stats()
+        self.assertEqual([(s[0], s[1], s[2]) for s in stats],
+                         [(PerfRecorder.GENERATION, 'gen', 2),
+                          (PerfRecorder.SENDING, PerfRecorder.GLOBAL, 1),
+                          (PerfRecorder.SENDING, 'tg1', 1),
+                          (PerfRecorder.FMKDB, PerfRecorder.GLOBAL, 1)])
+        self.assertEqual(stats[0][5], 70)
+        self.assertEqual(stats[0][6], 60)
+
+        perf.disable()
+        self.assertFalse(perf.persist)
+        perf.reset()
+        self.assertEqual(perf.get_stats(), [])
+
+    def test_cycle_per_thread(self):
+        perf = PerfRecorder()
+        perf.enable()
+        perf.record(PerfRecorder.SENDING, 300)
+
+        cycles = []
+        def prefetch():
+            perf.record(PerfRecorder.GENERATION, 50, scope='gen')
+            cycles.append(perf.end_cycle())
+
+        th = threading.Thread(target=prefetch)
+        th.start()
+        th.join()
+        self.assertEqual(cycles, [{PerfRecorder.GENERATION: 50}])
+        self.assertEqual(perf.end_cycle(), {PerfRecorder.SENDING: 300})
+
+        perf.add_to_cycle(cycles[0])
+        perf.add_to_cycle(None)
+        self.assertEqual(perf.end_cycle(), {PerfRecorder.GENERATION: 50})
+
+    def test_serialization_timer(self):
+        data = Data(b'serialized')
+        self.assertIsNone(serialization_timer())
+        with timing_serialization() as timer:
+            self.assertIs(serialization_timer(), timer)
+            data.to_bytes()
+            duration = timer[0]
+            self.assertGreater(duration, 0)
+            data.to_buffers()
+            self.assertGreater(timer[0], duration)
+        self.assertIsNone(serialization_timer())
@@ -1,12 +1,25 @@
 
-import fuddly.tools.plotty.Formula as Formula
+from fuddly.libs.external_modules import numpy_module
 import fuddly.tools.plotty.cli.parse.formula as parse_formula
 import fuddly.tools.plotty.cli.parse.range as parse_range
+from fuddly.framework.database import Database
 
+import os
+import sqlite3
+import tempfile
 import unittest
 import ddt
 
+from datetime import datetime, timedelta
 
+if numpy_module:
+    import fuddly.tools.plotty.Formula as Formula
+    from fuddly.tools.plotty.PlottyDatabase import PlottyDatabase, ids_predicate
+    import numpy as np
+    from matplotlib.dates import date2num
+
+
+@unittest.skipIf(not numpy_module, 'python-numpy module is not installed')
 @ddt.ddt
 class PlottyTest(unittest.TestCase):
 
@@ -18,7 +31,7 @@ class PlottyTest(unittest.TestCase):
         {'expression': "exp((a + b) / c)", 'variables': set(["a", "b", "c"]), 'functions': set(["exp"])},
         {
             'expression': "sqrt((1-a*exp(2t) + w^pi) / (sin(2x / pi) + cos(pi/y)))", 
-            'variables': set(["a", "t", "w", "pi", "x", "y"]),
+            'variables': set(["a", "t", "w", "x", "y"]),
             'functions': set(["sqrt", "exp", "sin", "cos"])
         }
     )
@@ -30,6 +43,49 @@ class PlottyTest(unittest.TestCase):
         self.assertSetEqual(set(math_expression.function_names), functions)
 
 
+    @ddt.data(
+        {'expression': "a", 'vectorized': True},
+        {'expression': "(a + b) * 3 - c / 2", 'vectorized': True},
+        {'expression': "-a^2 + b % 3", 'vectorized': True},
+        {'expression': "sqrt(abs(a - c)) + exp(b / 10) + max(a, b, c)", 'vectorized': True},
+        {'expression': "2", 'vectorized': True},
+        {'expression': "a * pi - epsilon", 'vectorized': True},
+        {'expression': "2pi + c", 'vectorized': False},
+        {'expression': "2a + b", 'vectorized': False},
+        {'expression': "a > b ? a : b", 'vectorized': False},
+    )
+    @ddt.unpack
+    def test_should_evaluate_columns_as_point_by_point(self, expression, vectorized):
+        math_expression = Formula.MathExpression(expression)
+        self.assertEqual(math_expression.is_vectorized, vectorized)
+
+        columns = {
+            'a': np.arange(1., 11.),
+            'b': np.arange(10., 0., -1.),
+            'c': np.linspace(-5., 5., 10)
+        }
+        result = math_expression.evaluate_columns(columns, 10)
+
+        expected = [
+            math_expression.evaluate({name: columns[name][i] for name in columns})
+            for i in range(10)
+        ]
+        np.testing.assert_allclose(result, expected)
+
+
+    def test_should_convert_dates_and_null_values_when_evaluating_columns(self):
+        formula = Formula.Formula.from_string("SENT_DATE ~ ID")
+        date = datetime(2024, 1, 1, 12, 0, 0)
+        sent_dates = np.empty(3, dtype=object)
+        sent_dates[:] = [date, None, date + timedelta(seconds=1)]
+
+        x, y = formula.evaluate_columns({'ID': np.array([1, 2, 3]), 'SENT_DATE': sent_dates})
+
+        np.testing.assert_array_equal(x, [1., 2., 3.])
+        self.assertAlmostEqual(y[0], date2num(date))
+        self.assertTrue(np.isnan(y[1]))
+        self.assertAlmostEqual(y[2], date2num(date + timedelta(seconds=1)))
+
     @ddt.data(
         {'formula': "a ~ b"},
         {'formula': "a + b ~ c"},
@@ -128,6 +184,53 @@ class PlottyTest(unittest.TestCase):
 
         self.assertSetEqual(set(result), expected_set)
 
+
+    @ddt.data(
+        {'ranges': [range(1, 4)], 'expected': [1, 2, 3]},
+        {'ranges': [range(0, 5), range(3, 8)], 'expected': list(range(0, 8))},
+        {'ranges': [range(2, 20, 5), range(30, 32)], 'expected': [2, 7, 12, 17, 30, 31]},
+    )
+    @ddt.unpack
+    def test_should_select_ids_in_ranges_with_sql_predicate(self, ranges, expected):
+        connection = sqlite3.connect(':memory:')
+        connection.execute("CREATE TABLE DATA (ID INTEGER PRIMARY KEY, SIZE INTEGER)")
+        connection.executemany("INSERT INTO DATA VALUES (?, ?)", [(i, i*10) for i in range(50)])
+
+        predicate, params = ids_predicate(ranges, 'ID')
+        result = connection.execute(f"SELECT ID FROM DATA WHERE {predicate}", params).fetchall()
+
+        self.assertListEqual([r[0] for r in result], expected)
+
+
+    def test_should_only_retrieve_new_rows_when_following(self):
+        path = os.path.join(tempfile.mkdtemp(), 'fmkDB.db')
+        fmkdb = Database(path)
+        fmkdb.start()
+        fmkdb.stop()
+
+        database = PlottyDatabase(path)
+        self.assertEqual(len(database.request('DATA', [range(0, 10)], 'ID', ['ID'])['ID']), 0)
+
+        def insert(ids):
+            connection = sqlite3.connect(path)
+            with connection:
+                connection.executemany("INSERT INTO DATA(ID, SIZE) VALUES (?, ?)",
+                                       [(i, i*10) for i in ids])
+            connection.close()
+
+        insert([1, 2, 3, 20])
+        columns, last_seen = database.request_new('DATA', [range(0, 10)], 'ID', ['ID', 'SIZE'], 0)
+        self.assertListEqual(columns['SIZE'].tolist(), [10, 20, 30])
+        self.assertEqual(last_seen, 3)
+
+        insert([4, 5])
+        columns, last_seen = database.request_new('DATA', [range(0, 10)], 'ID', ['SIZE'], last_seen)
+        self.assertListEqual(columns['SIZE'].tolist(), [40, 50])
+
+        columns, new_last_seen = database.request_new('DATA', [range(0, 10)], 'ID', ['SIZE'], last_seen)
+        self.assertEqual(len(columns['SIZE']), 0)
+        self.assertEqual(new_last_seen, last_seen)
+
 #endregion
 
 
@@ -0,0 +1,126 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+import threading
+import time
+import unittest
+
+from fuddly.framework.prefetch import DataPrefetcher
+
+
+class Producer(object):
+
+    def __init__(self, sync_points=()):
+        self.produced = 0
+        self.sync_points = sync_points
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.produced += 1
+            return self.produced
+
+    def is_sync_point(self, item):
+        return item in self.sync_points
+
+
+def _wait_for(cond, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+class DataPrefetcherTest(unittest.TestCase):
+
+    def test_order_and_depth(self):
+        producer = Producer()
+        prefetcher = DataPrefetcher(producer, 3, count=10)
+        prefetcher.start()
+        try:
+            # the producer only runs while the consumer is idle
+            time.sleep(0.05)
+            self.assertEqual(producer.produced, 0)
+            with prefetcher.idle():
+                _wait_for(lambda: producer.produced == 3)
+                time.sleep(0.05)
+            self.assertEqual(producer.produced, 3)
+
+            self.assertEqual([prefetcher.get() for _ in range(10)], list(range(1, 11)))
+            self.assertIsNone(prefetcher.get())
+            self.assertEqual(producer.produced, 10)
+        finally:
+            prefetcher.stop()
+        self.assertEqual(prefetcher.discarded, 0)
+
+    def test_sync_point(self):
+        producer = Producer(sync_points=(2,))
+        prefetcher = DataPrefetcher(producer, 5, sync_point=producer.is_sync_point)
+        prefetcher.start()
+        try:
+            self.assertEqual(prefetcher.get(), 1)
+            self.assertEqual(prefetcher.get(), 2)
+            # nothing is produced while the synchronization point is being handled
+            with prefetcher.idle():
+                time.sleep(0.05)
+            self.assertEqual(producer.produced, 2)
+
+            self.assertEqual(prefetcher.get(), 3)
+            with prefetcher.idle():
+                _wait_for(lambda: producer.produced == 8)
+        finally:
+            prefetcher.stop()
+        self.assertEqual(prefetcher.discarded, 5)
+
+    def test_discard(self):
+        producer = Producer()
+        prefetcher = DataPrefetcher(producer, 2, count=4)
+        prefetcher.start()
+        try:
+            self.assertEqual(prefetcher.get(), 1)
+            with prefetcher.idle():
+                _wait_for(lambda: producer.produced == 3)
+            prefetcher.discard()
+            # the discarded items are replaced
+            self.assertEqual([prefetcher.get() for _ in range(3)], [4, 5, 6])
+            self.assertIsNone(prefetcher.get())
+        finally:
+            prefetcher.stop()
+        self.assertEqual(prefetcher.discarded, 2)
+
+    def test_deferred_calls_and_errors(self):
+        calls = []
+        prefetcher = None
+
+        def produce():
+            prefetcher.defer(lambda: calls.append(threading.current_thread()))
+            raise ValueError
+
+        prefetcher = DataPrefetcher(produce, 2)
+        prefetcher.start()
+        try:
+            self.assertRaises(ValueError, prefetcher.get)
+            self.assertEqual(calls, [threading.current_thread()])
+            self.assertIsNone(prefetcher.get())
+        finally:
+            prefetcher.stop()
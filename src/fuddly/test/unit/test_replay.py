@@ -0,0 +1,131 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+
+import pickle
+import random
+import threading
+import unittest
+
+from fuddly.framework.global_resources import UI
+from fuddly.framework.replay import ReplayRecorder
+
+
+class TestReplay(unittest.TestCase):
+
+    def test_sessions(self):
+        recorder = ReplayRecorder()
+        recorder.enable()
+
+        chain_1 = ['GEN', ('tTYPE', UI(deep=True))]
+        chain_2 = [('GEN', 'g_gen'), ('tALT', None)]
+
+        r1 = recorder.next_case(chain_1)
+        r2 = recorder.next_case(chain_2)
+        r3 = recorder.next_case(['GEN', ('tTYPE', UI(deep=True))])
+        self.assertEqual((r1.case_index, r2.case_index, r3.case_index), (1, 1, 2))
+        self.assertEqual(r1.seed, r3.seed)
+        self.assertNotEqual(r1.seed, r2.seed)
+        self.assertEqual(r1.chain, r3.chain)
+
+        # save_gen_seed changes the behavior of the chain
+        self.assertEqual(recorder.next_case(chain_1, save_gen_seed=True).case_index, 1)
+
+        recorder.reset()
+        r4 = recorder.next_case(chain_1)
+        self.assertEqual(r4.case_index, 1)
+        self.assertNotEqual(r4.seed, r1.seed)
+
+        action_list, valid_gen, save_gen_seed = ReplayRecorder.load_chain(r2.chain)
+        self.assertEqual(action_list, [('GEN', 'g_gen'), 'tALT'])
+        self.assertEqual((valid_gen, save_gen_seed), (False, False))
+        action_list, _, _ = ReplayRecorder.load_chain(r1.chain)
+        self.assertEqual(action_list[0], 'GEN')
+        self.assertEqual(action_list[1][0], 'tTYPE')
+        self.assertEqual(action_list[1][1].get_inputs(), {'deep': True})
+
+        with self.assertRaises(ValueError):
+            recorder.next_case(['GEN', ('tTYPE', UI(fct=lambda x: x))])
+
+    def test_chain_serialization(self):
+        inputs = {'path': ('a', 'b'), 'val': b'\x00\xff', 'vals': [1, 2.5, None], 'opt': {'x': True}}
+        chain = ReplayRecorder.dump_chain([(('GEN', 'g_gen'), UI(**inputs)), 'tALT'], valid_gen=True)
+        self.assertEqual(chain, ReplayRecorder.dump_chain([(('GEN', 'g_gen'), UI(**inputs)), 'tALT'],
+                                                          valid_gen=True))
+        action_list, valid_gen, save_gen_seed = ReplayRecorder.load_chain(chain)
+        self.assertEqual(action_list[0][0], ('GEN', 'g_gen'))
+        self.assertEqual(action_list[0][1].get_inputs(), inputs)
+        self.assertEqual(action_list[1], 'tALT')
+        self.assertEqual((valid_gen, save_gen_seed), (True, False))
+
+        with self.assertRaises(ValueError):
+            ReplayRecorder.dump_chain([('tTYPE', UI(obj=object()))])
+        with self.assertRaises(ValueError):
+            ReplayRecorder.dump_chain([('tTYPE', UI(opt={1: 2}))])
+
+        # chains are never unpickled
+        with self.assertRaises(ValueError):
+            ReplayRecorder.load_chain(pickle.dumps({'actions': [], 'valid_gen': False,
+                                                    'save_gen_seed': False}))
+
+    def test_seeded_rng(self):
+        random.seed(1)
+        outside = [random.random() for _ in range(3)]
+
+        random.seed(1)
+        random.random()
+        with ReplayRecorder.seeded_rng(123, 4):
+            values = [random.random() for _ in range(5)]
+        # the state of the random module is restored
+        self.assertEqual([random.random() for _ in range(2)], outside[1:])
+
+        with ReplayRecorder.seeded_rng(123, 4):
+            self.assertEqual([random.random() for _ in range(5)], values)
+        with ReplayRecorder.seeded_rng(123, 5):
+            self.assertNotEqual([random.random() for _ in range(5)], values)
+
+    def test_seeded_rng_other_threads(self):
+        with ReplayRecorder.seeded_rng(123, 4):
+            values = [random.random() for _ in range(50)]
+
+        random.seed(1)
+        outside = [random.random() for _ in range(50)]
+
+        random.seed(1)
+        drawn = []
+        started = threading.Event()
+
+        def draw():
+            started.set()
+            drawn.extend(random.random() for _ in range(50))
+
+        with ReplayRecorder.seeded_rng(123, 4):
+            thread = threading.Thread(target=draw)
+            thread.start()
+            started.wait()
+            regenerated = [random.random() for _ in range(50)]
+            thread.join()
+
+        # the generation is not disturbed by the other threads, and conversely
+        self.assertEqual(regenerated, values)
+        self.assertEqual(drawn, outside)
@@ -0,0 +1,516 @@
+################################################################################
+#
+#  Copyright 2026 Eric Lacombe <eric.lacombe@security-labs.org>
+#
+################################################################################
+#
+#  This file is part of fuddly.
+#
+#  fuddly is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  fuddly is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with fuddly. If not, see <http://www.gnu.org/licenses/>
+#
+################################################################################
+
+import os
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+
+import ddt
+
+from fuddly.framework.data import Data
+from fuddly.framework.knowledge.feedback_collector import FeedbackCollector
+from fuddly.framework.node import Node
+from fuddly.framework.target_helpers import *
+from fuddly.framework.targets.network import ConnectionPool, NetworkTarget
+from fuddly.framework.comm_backends import BackendError
+from fuddly.libs.external_modules import ssh_module
+
+if ssh_module:
+    from fuddly.framework.targets.ssh import SSHTarget
+
+
+class FakeMember(Target):
+
+    def __init__(self, name, fail_on=None, recover_ok=True, fbk_error=None):
+        Target.__init__(self, name)
+        self.received = []
+        self.fail_on = fail_on
+        self.recover_ok = recover_ok
+        self.fbk_error = fbk_error
+        self.recovered = threading.Event()
+
+    def start(self):
+        return True
+
+    def stop(self):
+        return True
+
+    def send_data(self, data, from_fmk=False):
+        self.received.append(data)
+        content = data.to_bytes()
+        status = -1 if content == self.fail_on else 0
+        self._logger.collect_feedback(content=b'ack ' + content, status_code=status)
+
+    def get_feedback(self):
+        # error reported through Target.get_feedback(), either with some content or not
+        if self.fbk_error is None:
+            return None
+        fbk = FeedbackCollector()
+        code, with_content = self.fbk_error
+        fbk.set_error_code(code)
+        if with_content:
+            fbk.add_fbk_from('stderr', b'error', status=code)
+        self.fbk_error = None
+        return fbk
+
+    def recover_target(self):
+        self.recovered.set()
+        return self.recover_ok
+
+
+@ddt.ddt
+class TestTargetPool(unittest.TestCase):
+
+    def _build_pool(self, members, policy=TargetPool.ROUND_ROBIN):
+        self.logger = mock.Mock()
+        prj = mock.Mock()
+        prj.name = 'test'
+        pool = TargetPool(members, name='pool', policy=policy)
+        pool.set_logger(self.logger)
+        pool.set_project(prj)
+        pool.set_feedback_timeout(0)
+        self.assertTrue(pool._start('pool', 0))
+        self.addCleanup(pool._stop, 'pool', 0)
+        return pool
+
+    def _feedback_sources(self):
+        return [c.kwargs['related_tg'] for c in self.logger.collect_feedback.call_args_list]
+
+    def test_round_robin(self):
+        members = [FakeMember('m{}'.format(i)) for i in range(3)]
+        pool = self._build_pool(members)
+        data = [Data('d{}'.format(i)) for i in range(6)]
+        for d in data:
+            pool.send_data_sync(d, from_fmk=True)
+
+        for i, m in enumerate(members):
+            self.assertEqual(m.received, [data[i], data[i+3]])
+            self.assertIs(pool.get_data_recipient(data[i]), m)
+        self.assertEqual(self._feedback_sources(), members * 2)
+        self.assertIs(pool.get_data_recipient(Data('other')), pool)
+
+    def test_least_loaded(self):
+        members = [FakeMember('m{}'.format(i)) for i in range(2)]
+        pool = self._build_pool(members, policy=TargetPool.LEAST_LOADED)
+        members[0].feedback_timeout = 60  # m0 stays busy
+        pool.send_data_sync(Data('a'), from_fmk=True)
+        pool.send_data_sync(Data('b'), from_fmk=True)
+        pool.send_data_sync(Data('c'), from_fmk=True)
+        self.assertEqual([d.to_bytes() for d in members[0].received], [b'a'])
+        self.assertEqual([d.to_bytes() for d in members[1].received], [b'b', b'c'])
+        self.assertTrue(pool.is_feedback_received())
+
+    def test_send_multiple_data(self):
+        members = [FakeMember('m{}'.format(i)) for i in range(2)]
+        pool = self._build_pool(members)
+        data = [Data('d{}'.format(i)) for i in range(4)]
+        pool.send_multiple_data_sync(data, from_fmk=True)
+        self.assertEqual(sorted(len(m.received) for m in members), [2, 2])
+        for d in data:
+            self.assertIn(d, pool.get_data_recipient(d).received)
+
+    @ddt.data(True, False)
+    def test_member_recovery(self, recover_ok):
+        members = [FakeMember('m0', fail_on=b'crash', recover_ok=recover_ok),
+                   FakeMember('m1')]
+        pool = self._build_pool(members)
+
+        pool.send_data_sync(Data('crash'), from_fmk=True)
+        self.assertTrue(members[0].recovered.wait(2))
+        # the other member keeps receiving data in the meantime
+        pool.send_data_sync(Data('x'), from_fmk=True)
+        self.assertEqual([d.to_bytes() for d in members[1].received], [b'x'])
+
+        deadline = time.monotonic() + 2
+        while pool._state[members[0]]['recovering'] is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(pool._state[members[0]]['healthy'], recover_ok)
+        self.assertTrue(pool.recover_target())
+
+    @ddt.data(True, False)
+    def test_member_error_from_get_feedback(self, with_content):
+        members = [FakeMember('m0', fbk_error=(-2, with_content)), FakeMember('m1')]
+        pool = self._build_pool(members)
+        pool.send_data_sync(Data('a'), from_fmk=True)
+
+        # the error is handled while the pool lock is held
+        checker = threading.Thread(target=pool.is_feedback_received, daemon=True)
+        checker.start()
+        checker.join(2)
+        self.assertFalse(checker.is_alive())
+        self.assertTrue(members[0].recovered.wait(2))
+
+        pool.send_data_sync(Data('b'), from_fmk=True)
+        self.assertEqual([d.to_bytes() for d in members[1].received], [b'b'])
+
+    def test_no_healthy_member(self):
+        member = FakeMember('m0', fail_on=b'crash', recover_ok=False)
+        pool = self._build_pool([member])
+        pool.send_data_sync(Data('crash'), from_fmk=True)
+        self.assertTrue(member.recovered.wait(2))
+        pool._executor.shutdown(wait=True)
+        self.assertFalse(pool.is_target_ready_for_new_data())
+        self.assertFalse(pool.is_feedback_received())
+        self.assertFalse(pool.recover_target())
+        self.assertRaises(TargetStuck, pool.send_data, Data('x'))
+
+
+class TestBuffers(unittest.TestCase):
+
+    def test_consume_buffers(self):
+        buffers = [b'abc', b'', b'de', b'fgh']
+        self.assertEqual(consume_buffers(buffers, 0), buffers)
+        remaining = consume_buffers(buffers, 4)
+        self.assertIsInstance(remaining[0], memoryview)
+        self.assertEqual(b''.join(remaining), b'efgh')
+        self.assertEqual(consume_buffers(buffers, 8), [])
+
+    def test_write_buffers(self):
+        # more buffers than what a single writev() accepts
+        buffers = [bytes([i % 256]) * 100 for i in range(IOV_MAX + 10)]
+        rd, wr = os.pipe()
+        received = []
+        reader = threading.Thread(target=lambda: received.extend(iter(lambda: os.read(rd, 65536), b'')))
+        reader.start()
+        write_buffers(wr, buffers)
+        os.close(wr)
+        reader.join()
+        os.close(rd)
+        self.assertEqual(b''.join(received), b''.join(buffers))
+
+    def test_network_target(self):
+        server = socket.socket()
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        received = []
+
+        def serve():
+            conn, _ = server.accept()
+            with conn:
+                received.extend(iter(lambda: conn.recv(65536), b''))
+
+        srv_thread = threading.Thread(target=serve)
+        srv_thread.start()
+
+        tg = NetworkTarget(host='127.0.0.1', port=server.getsockname()[1],
+                           hold_connection=False, listen_on_start=False)
+        tg.set_timeout(fbk_timeout=0.05, sending_delay=1)
+        tg.set_logger(mock.Mock())
+        tg.set_project(mock.Mock())
+        self.assertTrue(tg._start('net', 0))
+
+        node = Node('root', subnodes=[Node('n{:d}'.format(i), values=[bytes([i % 256]) * i])
+                                      for i in range(IOV_MAX + 10)])
+        tg.send_data_sync(Data(node), from_fmk=True)
+        self.assertTrue(tg._stop('net', 0))
+        srv_thread.join(5)
+        self.assertEqual(b''.join(received), node.to_bytes())
+
+
+class TestFeedbackTimeoutTuner(unittest.TestCase):
+
+    def test_tuning(self):
+        tuner = FeedbackTimeoutTuner(0.5, percentile=90, margin=0.005, window=20, min_samples=10)
+        for i in range(9):
+            self.assertFalse(tuner.add_latency(0.002))
+        self.assertEqual(tuner.timeout, 0.5)
+        self.assertTrue(tuner.add_latency(0.002))
+        self.assertAlmostEqual(tuner.timeout, 0.007)
+        # changes within the hysteresis are ignored
+        self.assertFalse(tuner.add_latency(0.003))
+        self.assertAlmostEqual(tuner.timeout, 0.007)
+
+        # a missing response widens the timeout at once
+        self.assertTrue(tuner.add_timeout())
+        self.assertAlmostEqual(tuner.timeout, 0.014)
+        self.assertTrue(tuner.add_timeout())
+        self.assertAlmostEqual(tuner.timeout, 0.028)
+        self.assertEqual(tuner.timeouts, 2)
+        # ... and the timeout follows the latencies once the target answers again
+        self.assertTrue(tuner.add_latency(0.002))
+        self.assertAlmostEqual(tuner.timeout, 0.019)
+        self.assertEqual(tuner.get_percentile(), 0.014)
+
+        for i in range(20):
+            tuner.add_timeout()
+        self.assertEqual(tuner.timeout, 0.5)
+
+        tuner.reset(max_timeout=0.2)
+        self.assertEqual((tuner.timeout, tuner.sample_count, tuner.timeouts), (0.2, 0, 0))
+        self.assertIsNone(tuner.get_percentile())
+
+
+@ddt.ddt
+class TestConnectionPool(unittest.TestCase):
+
+    def _connect(self):
+        skt, peer = socket.socketpair()
+        self.addCleanup(skt.close)
+        self.addCleanup(peer.close)
+        self.peers[skt] = peer
+        return skt
+
+    def setUp(self):
+        self.peers = {}
+
+    def test_acquire_release(self):
+        pool = ConnectionPool(self._connect, size=2)
+        s1 = pool.acquire()
+        s2 = pool.acquire()
+        self.assertIsNot(s1, s2)
+        # the pool is full: the least recently used connection is shared
+        self.assertIs(pool.acquire(), s1)
+        pool.release(s2)
+        self.assertIs(pool.acquire(), s2)
+
+        # a connection closed by the peer is replaced
+        pool.release(s1)
+        self.peers[s1].close()
+        s3 = pool.acquire()
+        self.assertNotIn(s3, (s1, s2))
+        self.assertEqual(s1.fileno(), -1)
+        self.assertEqual(pool.get_stats(),
+                         {'size': 2, 'connections': 2, 'idle': 0, 'created': 3, 'reused': 2,
+                          'dropped': 1, 'failed': 0})
+
+        pool.close()
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(s2.fileno(), -1)
+
+    def test_reconnection_backoff(self):
+        attempts = []
+
+        def connect():
+            attempts.append(time.monotonic())
+            return self._connect() if len(attempts) in (1, 4) else None
+
+        pool = ConnectionPool(connect, reconnect_attempts=3, backoff=0.05)
+        skt = pool.acquire()
+        pool.release(skt)
+        self.peers[skt].close()
+        # the dead connection is replaced at the third attempt
+        skt = pool.acquire()
+        self.assertIsNotNone(skt)
+        self.assertEqual(len(attempts), 4)
+        self.assertGreaterEqual(attempts[3] - attempts[1], 0.15)
+
+        pool.release(skt)
+        self.peers[skt].close()
+        self.assertIsNone(pool.acquire())
+        self.assertEqual(len(attempts), 7)
+        # without any dead connection to replace, there is no retry
+        self.assertIsNone(pool.acquire())
+        self.assertEqual(len(attempts), 8)
+        self.assertEqual(pool.failed, 6)
+
+    @ddt.data(False, True)
+    def test_network_target(self, server_closes):
+        server = socket.socket()
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+        received = []
+
+        def serve():
+            conns = []
+            while len(received) < 3:
+                if server_closes or not conns:
+                    conns.append(server.accept()[0])
+                received.append(conns[-1].recv(65536))
+                conns[-1].sendall(b'ack')
+                if server_closes:
+                    conns[-1].close()
+            for conn in conns:
+                conn.close()
+
+        srv_thread = threading.Thread(target=serve)
+        srv_thread.start()
+
+        tg = NetworkTarget(host='127.0.0.1', port=server.getsockname()[1],
+                           hold_connection=True, pool_size=2, listen_on_start=False)
+        tg.set_timeout(fbk_timeout=0.5, sending_delay=1)
+        tg.set_feedback_mode(Target.FBK_WAIT_UNTIL_RECV)
+        tg.set_logger(mock.Mock())
+        tg.set_project(mock.Mock())
+        self.assertTrue(tg._start('net', 0))
+        desc = str(tg)
+
+        for i in range(3):
+            tg.send_data_sync(Data('data{:d}'.format(i)), from_fmk=True)
+            deadline = time.monotonic() + 2
+            while not tg.is_feedback_received() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        srv_thread.join(5)
+        self.assertEqual(received, [b'data0', b'data1', b'data2'])
+
+        stats = tg.get_connection_pool_stats()[('127.0.0.1', server.getsockname()[1])]
+        self.assertEqual(stats['created'], 3 if server_closes else 1)
+        self.assertEqual(stats['reused'], 0 if server_closes else 2)
+        self.assertIn('pool:', tg.get_description())
+        self.assertEqual(str(tg), desc)
+        self.assertTrue(tg._stop('net', 0))
+
+
+@ddt.ddt
+class TestPipelining(unittest.TestCase):
+
+    @ddt.data(socket.SOCK_STREAM, socket.SOCK_DGRAM)
+    def test_network_target(self, sock_type):
+        server = socket.socket(socket.AF_INET, sock_type)
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        if sock_type == socket.SOCK_STREAM:
+            server.listen(1)
+        received = []
+
+        def serve():
+            if sock_type == socket.SOCK_STREAM:
+                conn, _ = server.accept()
+                with conn:
+                    while len(b''.join(received)) < 15:
+                        received.append(conn.recv(65536))
+                    for i in range(3):
+                        conn.sendall(b'ack' + str(i).encode())
+                    conn.recv(1)
+            else:
+                for i in range(3):
+                    dgram, addr = server.recvfrom(65536)
+                    received.append(dgram)
+                    server.sendto(b'ack' + dgram[-1:], addr)
+
+        srv_thread = threading.Thread(target=serve)
+        srv_thread.start()
+
+        tg = NetworkTarget(host='127.0.0.1', port=server.getsockname()[1],
+                           socket_type=(socket.AF_INET, sock_type), listen_on_start=False)
+        tg.set_timeout(fbk_timeout=0.5, sending_delay=1)
+        if sock_type == socket.SOCK_STREAM:
+            tg.feedback_length = 4
+        tg.set_logger(mock.Mock())
+        tg.set_project(mock.Mock())
+        self.assertTrue(tg._start('net', 0))
+
+        data_list = [Data('data{:d}'.format(i)) for i in range(3)]
+        tg.send_multiple_data_sync(data_list, from_fmk=True)
+        deadline = time.monotonic() + 2
+        while not tg.is_feedback_received() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(tg._stop('net', 0))
+        srv_thread.join(5)
+
+        # the three data have been sent through the same interface
+        self.assertEqual(b''.join(received), b'data0data1data2')
+        fbk = {data: content for _, content, _, _, data
+               in tg.get_feedback().iter_and_cleanup_collector(with_related_data=True)}
+        self.assertEqual([fbk.get(d) for d in data_list], [[b'ack0'], [b'ack1'], [b'ack2']])
+
+    @ddt.data((False, 1), (True, 3), (True, 1))
+    @ddt.unpack
+    def test_stream_without_feedback_length(self, hold_connection, pool_size):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+        server.settimeout(0.5)
+        received = []
+
+        def serve():
+            conns = []
+            try:
+                while len(b''.join(received)) < 15:
+                    conn, _ = server.accept()
+                    conns.append(conn)
+                    chunk = conn.recv(65536)
+                    received.append(chunk)
+                    conn.sendall(b'ack' + chunk[4::5])
+            except socket.timeout:
+                pass
+            for conn in conns:
+                conn.close()
+
+        srv_thread = threading.Thread(target=serve)
+        srv_thread.start()
+
+        tg = NetworkTarget(host='127.0.0.1', port=server.getsockname()[1],
+                           socket_type=(socket.AF_INET, socket.SOCK_STREAM),
+                           hold_connection=hold_connection, pool_size=pool_size,
+                           listen_on_start=False)
+        tg.set_timeout(fbk_timeout=0.5, sending_delay=1)
+        tg.set_logger(mock.Mock())
+        tg.set_project(mock.Mock())
+        self.assertTrue(tg._start('net', 0))
+
+        data_list = [Data('data{:d}'.format(i)) for i in range(3)]
+        tg.send_multiple_data_sync(data_list, from_fmk=True)
+        deadline = time.monotonic() + 2
+        while not tg.is_feedback_received() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        srv_thread.join(5)
+        self.assertTrue(tg._stop('net', 0))
+
+        fbk = {data: content for _, content, _, _, data
+               in tg.get_feedback().iter_and_cleanup_collector(with_related_data=True)}
+        if pool_size == 1 and hold_connection:
+            # the data are pipelined over the held connection: the feedback is attributed to
+            # each of them
+            self.assertEqual(received, [b'data0data1data2'])
+            self.assertEqual([fbk.get(d) for d in data_list], [[b'ack012']] * 3)
+        else:
+            # each data is sent over its own connection
+            self.assertEqual(sorted(received), [b'data0', b'data1', b'data2'])
+            self.assertEqual([fbk.get(d) for d in data_list], [[b'ack0'], [b'ack1'], [b'ack2']])
+
+
+@unittest.skipIf(not ssh_module, 'python-paramiko module is not installed')
+class TestSSHTarget(unittest.TestCase):
+
+    def setUp(self):
+        self.tg = SSHTarget(username='user', read_stderr=False)
+        self.tg.ssh_backend = mock.Mock()
+        self.tg.set_logger(mock.Mock())
+
+    def test_reset_inactive_connection(self):
+        self.tg.ssh_backend.exec_command.side_effect = [BackendError('inactive', status=-3),
+                                                        'chan']
+        self.tg.ssh_backend.read_stdout.return_value = 'out'
+        self.tg.send_data(Data('cmd'))
+
+        self.tg.ssh_backend.reset.assert_called_once_with()
+        self.assertEqual(self.tg.chan_desc, 'chan')
+        self.tg._logger.collect_feedback.assert_called_once_with(content='out', status_code=0,
+                                                                 subref='stdout')
+
+        # other errors are provided as feedback
+        self.tg.ssh_backend.exec_command.side_effect = BackendError('timeout', status=-1)
+        self.tg.send_data(Data('cmd'))
+        self.tg.ssh_backend.reset.assert_called_once_with()
+
+    def test_recover_target(self):
+        self.tg.sftp = None
+        self.assertTrue(self.tg.recover_target())
+        self.tg.ssh_backend.reset.assert_called_once_with()
+        self.tg.ssh_backend.stop.assert_not_called()
@@ -113,6 +113,9 @@ group.add_argument('--remove-data', nargs=2, metavar=('FIRST_DATA_ID','LAST_DATA
                    help='Remove data from provided data ID range and all related information from fmkDB')
 group.add_argument('-r', '--remove-one-data', type=int, metavar='DATA_ID',
                    help='Remove data ID and all related information from fmkDB')
+group.add_argument('--migrate', action='store_true',
+                   help='Convert a fmkDB created by a previous version of fuddly, so that data '
+                        'and feedback contents are deduplicated and compressed')
 
 group = parser.add_argument_group('Fuddly Database Analysis')
 group.add_argument('--data-with-impact', action='store_true',
@@ -167,6 +170,8 @@ def handle_date(date_str):
 
 
 def main():
+    global colorize
+
     args = parser.parse_args()
 
     fmkdb = args.fmkdb
@@ -228,6 +233,24 @@ def main():
         decoding_hints = None
 
     fmkdb = Database(fmkdb_path=fmkdb)
+
+    if args.migrate:
+        stats = fmkdb.migrate()
+        if stats is None:
+            print(colorize("*** The database {:s} does not need to be migrated ***"
+                           .format(fmkdb.fmk_db_path), rgb=Color.FMKINFO))
+        else:
+            saved = stats['old_db_size'] - stats['new_db_size']
+            print(colorize("*** The database {:s} has been migrated (former one saved as {:s}) ***"
+                           .format(fmkdb.fmk_db_path, stats['backup']), rgb=Color.FMKINFO))
+            print(colorize("  | {:d} contents ({:d} bytes) stored as {:d} blobs ({:d} bytes)"
+                           .format(stats['records'], stats['content_size'],
+                                   stats['blobs'], stats['blobs_size']), rgb=Color.FMKSUBINFO))
+            print(colorize("  | database size: {:d} -> {:d} bytes ({:d} bytes saved)"
+                           .format(stats['old_db_size'], stats['new_db_size'], saved),
+                           rgb=Color.FMKSUBINFO))
+        sys.exit(0)
+
     ok = fmkdb.start()
     if not ok:
         print(colorize("*** ERROR: The database {:s} is invalid! ***".format(fmkdb.fmk_db_path),
@@ -1,10 +1,42 @@
 from matplotlib.dates import date2num
 from fuddly.tools.plotty.cli.parse.formula import parse_formula
 
+import ast
 import cexprtk
+import numpy as np
 
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+
+# constants (pi, epsilon, inf) usable within an expression
+_constants_table = cexprtk.Symbol_Table({}, add_constants=True)
+CONSTANTS = dict(_constants_table.constants)
+del _constants_table
+
+# exprtk functions that have an element-wise NumPy equivalent
+VECTORIZED_FUNCTIONS = {
+    'abs': np.abs,
+    'sqrt': np.sqrt,
+    'exp': np.exp,
+    'log': np.log,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'floor': np.floor,
+    'ceil': np.ceil,
+    'min': lambda *args: np.minimum.reduce(np.broadcast_arrays(*args)),
+    'max': lambda *args: np.maximum.reduce(np.broadcast_arrays(*args)),
+}
+
+VECTORIZED_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Mod: np.fmod,
+    ast.Pow: np.power,
+}
 
 
 class MathExpression:
@@ -15,6 +47,9 @@ class MathExpression:
         variable_names, function_names = self.__collect_names()
         self.__variable_names = variable_names
         self.__function_names = function_names
+        self.__vectorized = self.__compile_vectorized()
+        self.__symbol_table: Optional[cexprtk.Symbol_Table] = None
+        self.__compiled: Optional[cexprtk.Expression] = None
 
     @property
     def variable_names(self) -> list[str]:
@@ -36,18 +71,98 @@ class MathExpression:
             if on_build_name != "":
                 if char == '(':
                     function_names.append(on_build_name)
-                else:
+                elif on_build_name not in CONSTANTS:
                     variable_names.append(on_build_name)
                 on_build_name = ""
 
-        if on_build_name != "":
+        if on_build_name != "" and on_build_name not in CONSTANTS:
             variable_names.append(on_build_name)
 
         return (variable_names, function_names)
 
 
+    def __compile_vectorized(self) -> Optional[Callable[[dict[str, np.ndarray]], Any]]:
+        """
+        Compile the expression once into a function operating on whole columns.
+        Return None if the expression uses some syntax that cannot be vectorized, in which
+        case it is evaluated point by point by exprtk.
+        """
+        try:
+            tree = ast.parse(self.expression.replace('^', '**'), mode='eval')
+        except SyntaxError:
+            return None
+
+        def build(node):
+            if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                    and not isinstance(node.value, bool):
+                value = float(node.value)
+                return lambda columns: value
+            if isinstance(node, ast.Name) and node.id in CONSTANTS:
+                value = CONSTANTS[node.id]
+                return lambda columns: value
+            if isinstance(node, ast.Name):
+                name = node.id
+                return lambda columns: columns[name]
+            if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+                operand = build(node.operand)
+                if isinstance(node.op, ast.USub):
+                    return lambda columns: np.negative(operand(columns))
+                return operand
+            if isinstance(node, ast.BinOp) and type(node.op) in VECTORIZED_OPERATORS:
+                operator = VECTORIZED_OPERATORS[type(node.op)]
+                left, right = build(node.left), build(node.right)
+                return lambda columns: operator(left(columns), right(columns))
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+                    and node.func.id in VECTORIZED_FUNCTIONS and node.args and not node.keywords:
+                function = VECTORIZED_FUNCTIONS[node.func.id]
+                args = [build(arg) for arg in node.args]
+                return lambda columns: function(*(arg(columns) for arg in args))
+            raise ValueError
+
+        try:
+            return build(tree.body)
+        except ValueError:
+            return None
+
+
+    @property
+    def is_vectorized(self) -> bool:
+        return self.__vectorized is not None
+
+
+    def __compile(self):
+        """Parse the expression once, binding its variables to a symbol table"""
+        self.__symbol_table = cexprtk.Symbol_Table(
+            {name: 0.0 for name in self.__variable_names},
+            add_constants=True
+        )
+        self.__compiled = cexprtk.Expression(self.expression, self.__symbol_table)
+
+
     def evaluate(self, instanciation: dict[str, Any]) -> float:
-        return cexprtk.evaluate_expression(self.expression, instanciation)
+        if self.__compiled is None:
+            self.__compile()
+
+        variables = self.__symbol_table.variables
+        for name in self.__variable_names:
+            variables[name] = instanciation[name]
+        return self.__compiled()
+
+
+    def evaluate_columns(self, columns: dict[str, np.ndarray], size: int) -> np.ndarray:
+        """
+        Evaluate the expression over whole columns of float values (all of length `size`)
+        """
+        if self.__vectorized is not None:
+            with np.errstate(all='ignore'):
+                result = self.__vectorized(columns)
+            return np.array(np.broadcast_to(result, (size,)), dtype=np.float64)
+
+        names = self.variable_names
+        result = np.empty(size, dtype=np.float64)
+        for i in range(size):
+            result[i] = self.evaluate({name: float(columns[name][i]) for name in names})
+        return result
 
 
     def __str__(self) -> str:
@@ -101,5 +216,29 @@ class Formula:
             self.y_expression.evaluate(instanciation)
         )
 
+    @staticmethod
+    def __to_operable_column(column: np.ndarray) -> np.ndarray:
+        if column.dtype != object:
+            return column.astype(np.float64)
+
+        result = np.full(len(column), np.nan)
+        mask = np.array([value is not None for value in column], dtype=bool)
+        values = column[mask]
+        if len(values) != 0 and isinstance(values[0], datetime):
+            result[mask] = date2num(values.astype('datetime64[us]'))
+        else:
+            result[mask] = values.astype(np.float64)
+        return result
+
+    def evaluate_columns(self, columns: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        size = len(next(iter(columns.values()))) if columns else 0
+        operable_columns = {
+            name: Formula.__to_operable_column(column) for name, column in columns.items()
+        }
+        return (
+            self.x_expression.evaluate_columns(operable_columns, size),
+            self.y_expression.evaluate_columns(operable_columns, size)
+        )
+
     def __str__(self) -> str:
         return f"{self.__y_expression} ~ {self.__x_expression}"
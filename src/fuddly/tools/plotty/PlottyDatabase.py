@@ -1,32 +1,39 @@
-
 from fuddly.framework.database import Database
 
+import numpy as np
+
 from typing import Optional
-from fuddly.tools.plotty.globals import DBResult
+from fuddly.tools.plotty.globals import DBColumns
 
 from fuddly.tools.plotty.utils import print_error
 
 
-class CachedDatabaseTable:
+def ids_predicate(data_ids: list[range], data_ids_column_name: str) -> tuple[str, list[int]]:
+    """
+    Translate a union of ID ranges into an SQL predicate (and its parameters), so that
+    the filtering is performed by the database.
+    """
+    conditions = []
+    params = []
+    for interval in data_ids:
+        cond = f"({data_ids_column_name} >= ? AND {data_ids_column_name} < ?"
+        params += [interval.start, interval.stop]
+        if interval.step != 1:
+            cond += f" AND ({data_ids_column_name} - ?) % ? = 0"
+            params += [interval.start, interval.step]
+        conditions.append(cond + ")")
 
-    def __init__(
-            self,
-            name: str,
-            column_names: list[str],
-            values: DBResult
-    ):
-        self.name = name
-        self.column_names = column_names
-        self.values = values
-        self.__column_names_lookup_table = \
-            {column: i for i, column in enumerate(column_names)}
-
-    def get(self, data_ids: list[range], data_ids_column_name: str, column_names: list[str]) -> DBResult:
-        column_indexes = [self.__column_names_lookup_table[column] for column in column_names]
-        id_column_index = self.__column_names_lookup_table[data_ids_column_name]
-        filter_condition = lambda line: any(line[id_column_index] in interval for interval in data_ids)
-        right_id_lines = list(filter(filter_condition, self.values))
-        return [tuple(line[i] for i in column_indexes) for line in right_id_lines]
+    return ' OR '.join(conditions), params
+
+
+def to_column(values: list) -> np.ndarray:
+    """Build a NumPy array from raw SQL values, keeping non-numerical values as objects"""
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return np.array(values)
+
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
 
 
 class PlottyDatabase(object):
@@ -48,7 +55,8 @@ class PlottyDatabase(object):
         if not self.__cached:
             self.path = path
             self.__database = Database(path)
-            self.__cached_tables: dict[str, CachedDatabaseTable] = dict()
+            # columns already retrieved, per (table, ID column, ID ranges)
+            self.__cached_columns: dict[tuple, DBColumns] = dict()
 
             self.__cached_databases[path] = self
             self.__cached = True
@@ -56,36 +64,42 @@ class PlottyDatabase(object):
 
     def __database_request(
             self,
-            table_name: str
-    ) -> Optional[tuple[list[str], DBResult]]:
+            table_name: str,
+            data_ids: list[range],
+            data_ids_column_name: str,
+            column_names: list[str],
+            last_seen: Optional[int] = None
+    ) -> Optional[DBColumns]:
         start_ok = self.__database.start()
         if not start_ok:
             print_error(f"The database '{self.path}' could not start")
             return None
 
-        column_names = Database.column_names_from(self.__database, table_name)
+        requested_columns = [name for name in column_names if name != 'rowid']
+        if not self.has_columns(table_name, requested_columns + [data_ids_column_name]):
+            self.__database.stop()
+            return None
 
+        predicate, params = ids_predicate(data_ids, data_ids_column_name)
+        if last_seen is not None:
+            predicate = f"rowid > ? AND ({predicate})"
+            params = [last_seen] + params
         database_answer = self.__database.execute_sql_statement(
-            f"SELECT * FROM {table_name};",
+            f"SELECT {', '.join(column_names)} FROM {table_name} WHERE {predicate} ORDER BY rowid;",
+            params=params
         )
-        if database_answer is None:
-            return None
 
         self.__database.stop()
 
-        return column_names, database_answer
-
-
-    def __pull_table(self, table_name: str) -> bool:
-        database_answer = self.__database_request(table_name)
         if database_answer is None:
-            return False
-        column_names, values = database_answer
+            return None
 
-        new_table = CachedDatabaseTable(table_name, column_names, values)
-        self.__cached_tables[table_name] = new_table
+        if database_answer:
+            raw_columns = zip(*database_answer)
+        else:
+            raw_columns = ([] for _ in column_names)
 
-        return True
+        return {name: to_column(list(values)) for name, values in zip(column_names, raw_columns)}
 
 
     def has_columns(self, table_name: str, column_names: list[str]) -> bool:
@@ -99,16 +113,61 @@ class PlottyDatabase(object):
         data_ids: list[range],
         data_ids_column_name: str,
         column_names: list[str]
-    ) -> Optional[DBResult]:
+    ) -> Optional[DBColumns]:
+        """
+        Retrieve the requested columns from the rows of `table_name` whose `data_ids_column_name`
+        belongs to one of the `data_ids` ranges. Only the missing columns are retrieved from
+        the database.
+        """
 
         if len(data_ids) == 0 or len(column_names) == 0:
             return None
 
-        if table_name not in self.__cached_tables.keys():
-            pull_ok = self.__pull_table(table_name)
-            if not pull_ok:
-                print_error(f"The table {table_name} could not be retrieved")
+        key = (table_name, data_ids_column_name,
+               tuple((r.start, r.stop, r.step) for r in data_ids))
+        cached = self.__cached_columns.setdefault(key, {})
+
+        missing = list(dict.fromkeys(c for c in column_names if c not in cached))
+        if missing:
+            columns = self.__database_request(table_name, data_ids, data_ids_column_name, missing)
+            if columns is None:
                 return None
+            cached.update(columns)
+
+        return {name: cached[name] for name in column_names}
+
+
+    def request_new(
+        self,
+        table_name: str,
+        data_ids: list[range],
+        data_ids_column_name: str,
+        column_names: list[str],
+        last_seen: int
+    ) -> Optional[tuple[DBColumns, int]]:
+        """
+        Same as :meth:`request`, but only retrieve the rows inserted after the row `last_seen`
+        (SQLite rowid, 0 to start from the first row). Results are not cached.
+
+        Return the columns and the rowid of the last retrieved row (or `last_seen` if
+        no new row has been found).
+        """
+
+        if len(data_ids) == 0 or len(column_names) == 0:
+            return None
+
+        columns = self.__database_request(
+            table_name,
+            data_ids,
+            data_ids_column_name,
+            ['rowid'] + list(dict.fromkeys(column_names)),
+            last_seen
+        )
+        if columns is None:
+            return None
 
-        return self.__cached_tables[table_name].get(data_ids, data_ids_column_name, column_names)
+        rowids = columns.pop('rowid')
+        if len(rowids) != 0:
+            last_seen = int(rowids[-1])
 
+        return {name: columns[name] for name in column_names}, last_seen
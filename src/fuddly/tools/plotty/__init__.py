@@ -1 +1,11 @@
-from fuddly.tools.plotty.plotty import *
+from fuddly.libs.external_modules import numpy_module
+
+if numpy_module:
+    from fuddly.tools.plotty.plotty import *
+else:
+    from fuddly.tools.plotty.globals import PlottyGlobals
+    from fuddly.tools.plotty.utils import print_error
+
+    def main():
+        print_error("plotty relies on the python-numpy module, which is not installed")
+        return PlottyGlobals.ERR_MISSING_MODULE
@@ -1,7 +1,7 @@
 from fuddly.tools.plotty.Formula import Formula
 from fuddly.tools.plotty.PlottyDatabase import PlottyDatabase
 from fuddly.tools.plotty.cli.parse.range import parse_int_range_union
-from fuddly.tools.plotty.globals import GridMatch, PlottyOptions
+from fuddly.tools.plotty.globals import GridMatch, PlottyGlobals, PlottyOptions
 from fuddly.tools.plotty.utils import print_warning, print_error
 
 from fuddly.framework.database import Database
@@ -48,6 +48,31 @@ def setup_parser():
         required=False
     )
 
+    group.add_argument(
+        '-tb',
+        '--table',
+        type=str,
+        default=PlottyGlobals.data_table_name,
+        help='Table of the fmkDB where the variables of the formula are looked for. Default is '
+            'DATA. The table PERF provides the time spent (in ms) in each stage of the sending loop '
+            '(if recorded by the framework)',
+        required=False
+    )
+
+    group.add_argument(
+        '-fw',
+        '--follow',
+        metavar='PERIOD',
+        type=float,
+        nargs='?',
+        const=1.0,
+        default=None,
+        help='Keep polling the fmkDB every PERIOD seconds (default is 1) for the data recorded '
+            'since the last poll, and append them to the figure until it is closed. '
+            'Only the data whose ids are in the given range are considered',
+        required=False
+    )
+
     group = __parser.add_argument_group('Display Options')
 
     group.add_argument(
@@ -152,6 +177,8 @@ def parse_arguments():
 
     PlottyOptions.fmkdb = list(map(lambda db: PlottyDatabase(db), fmkdb))
 
+    PlottyGlobals.data_table_name = args.table.upper()
+
     data_ids = args.data_ids
     if data_ids is None:
         __parser.error('Data ids are mandatory')
@@ -231,3 +258,11 @@ def parse_arguments():
     PlottyOptions.vertical_shift = args.vertical_shift
 
     PlottyOptions.date_format = args.date_format
+
+    follow = args.follow
+    if follow is not None:
+        if follow <= 0:
+            __parser.error('Please provide a positive polling period')
+        if PlottyOptions.other_data_ids:
+            __parser.error('--follow cannot be used with --other-data_ids')
+    PlottyOptions.follow = follow
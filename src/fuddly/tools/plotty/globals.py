@@ -1,8 +1,11 @@
-from typing import Any, TypeAlias
+from typing import Optional, TypeAlias, TYPE_CHECKING
 from enum import Enum
 
+if TYPE_CHECKING:
+    import numpy as np
 
-DBResult: TypeAlias = list[tuple[Any]]
+
+DBColumns: TypeAlias = 'dict[str, np.ndarray]'
 
 
 class GridMatch(Enum):
@@ -23,12 +26,14 @@ class PlottyOptions:
     other_data_ids: list[list[range]]
     vertical_shift: float
     date_format: str
+    follow: Optional[float]
 
 
 class PlottyGlobals:
     EXIT_SUCCESS = 0
     ERR_INVALID_VAR_NAMES = -1
     ERR_INVALID_FMDBK = -2
+    ERR_MISSING_MODULE = -3
     colors: list[str] = ['b', 'r', 'g']
     main_marker: str = 'o'
     poi_color: str = 'r'
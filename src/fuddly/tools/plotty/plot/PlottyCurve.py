@@ -32,15 +32,38 @@ class PlottyCurve(APlottyGeometry):
     def plot(self, axes: Axes, color: str) -> list[PlottyPoint]:
 
         if len(self.__points) == 0:
-            return
+            return self.__points
 
-        x_data = list(map(lambda point: point.x, self.__points))
-        y_data = list(map(lambda point: point.y, self.__points))
-        if self.__draw_line:
+        PlottyCurve.__plot_points(axes, color, self.__points, self.__draw_line)
+
+        return self.__points
+
+
+    def extend(self, axes: Axes, color: str, points: list[PlottyPoint]) -> list[PlottyPoint]:
+        """Add new points at the end of the curve and plot them"""
+
+        if len(points) == 0:
+            return points
+
+        # the line is joined to the previous last point
+        previous = self.__points[-1:]
+        self.__points.extend(points)
+        if self.__draw_line and previous:
+            axes.plot([previous[0].x, points[0].x], [previous[0].y, points[0].y], color=color)
+        PlottyCurve.__plot_points(axes, color, points, self.__draw_line)
+
+        return points
+
+
+    @staticmethod
+    def __plot_points(axes: Axes, color: str, points: list[PlottyPoint], draw_line: bool):
+        x_data = list(map(lambda point: point.x, points))
+        y_data = list(map(lambda point: point.y, points))
+        if draw_line:
             axes.plot(x_data, y_data, color=color)
 
         if not PlottyOptions.hide_points:
-            for point in self.__points:
+            for point in points:
                 axes.plot(
                     point.x,
                     point.y,
@@ -48,7 +71,7 @@ class PlottyCurve(APlottyGeometry):
                     marker=point.marker
                 )
 
-        for point in self.__points:
+        for point in points:
             if point.label is not None:
                 PlottyFigure.add_annotation(
                     axes,
@@ -57,8 +80,6 @@ class PlottyCurve(APlottyGeometry):
                     point.label
                 )
 
-        return self.__points
-
 
     def plot_additionals(self, axes: Axes) -> list[PlottyPoint]:
         if PlottyOptions.poi <= 0:
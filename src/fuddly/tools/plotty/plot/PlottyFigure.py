@@ -1,5 +1,5 @@
 
-from typing import Optional
+from typing import Callable, Optional
 from datetime import datetime
 
 from matplotlib import pyplot as plt
@@ -86,6 +86,30 @@ class PlottyFigure:
         plt.show()
 
 
+    def extend_area(
+            self,
+            area: 'PlottyFigureArea',
+            main_points: list[PlottyPoint],
+            additional_points: list[list[PlottyPoint]]
+    ):
+        area.extend(self.__axes, main_points, additional_points)
+
+
+    def follow(self, update: Callable[[], bool], period: float):
+        """
+        Show the figure and call `update` every `period` seconds until the figure is closed.
+        `update` shall return True if new points have been added to the figure.
+        """
+        plt.show(block=False)
+        while plt.fignum_exists(self.__figure.number):
+            if update():
+                self.__post_process()
+                self.__axes.relim()
+                self.__axes.autoscale_view()
+                self.__figure.canvas.draw_idle()
+            plt.pause(period)
+
+
     def __post_process(self):
         self.__setup_axes()
         self.__setup_grid()
@@ -67,6 +67,24 @@ class PlottyFigureArea:
         self.plot(axes)
 
 
+    def extend(
+            self,
+            axes: Axes,
+            main_points: list['PlottyPoint'],
+            additional_points: list[list['PlottyPoint']]
+    ):
+        """
+        Append new points to the geometries of the area (`additional_points` being given in
+        the order the additional geometries were added) and plot them
+        """
+        color = PlottyGlobals.colors[self.__index]
+        points = self.__main_geometry.extend(axes, color, main_points)
+        self.__figure.add_plotted_points(points)
+        for geometry, new_points in zip(self.__additional_geometries, additional_points):
+            points = geometry.extend(axes, color, new_points)
+            self.__figure.add_plotted_points(points)
+
+
     def plot(self, axes: Axes):
         color = PlottyGlobals.colors[self.__index]
         points = self.__main_geometry.plot(axes, color)
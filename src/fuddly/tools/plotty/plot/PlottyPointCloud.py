@@ -24,20 +24,37 @@ class PlottyPointCloud(APlottyGeometry):
         if len(self.__points) == 0:
             return self.__points
 
-        x_data = list(map(lambda point: point.x, self.__points))
-        y_data = list(map(lambda point: point.y, self.__points))
-        colors = list(map(lambda point: point.color, self.__points))
-        markers = list(map(lambda point: point.marker, self.__points))
+        PlottyPointCloud.__plot_points(axes, self.__points)
+
+        return self.__points
+
+
+    def extend(self, axes: Axes, color: str, points: list[PlottyPoint]) -> list[PlottyPoint]:
+        """Add new points to the cloud and plot them"""
+
+        if len(points) == 0:
+            return points
+
+        self.__points.extend(points)
+        PlottyPointCloud.__plot_points(axes, points)
+
+        return points
+
+
+    @staticmethod
+    def __plot_points(axes: Axes, points: list[PlottyPoint]):
+        x_data = list(map(lambda point: point.x, points))
+        y_data = list(map(lambda point: point.y, points))
+        colors = list(map(lambda point: point.color, points))
+        markers = list(map(lambda point: point.marker, points))
         for marker in markers:
             axes.scatter(x_data, y_data, color=colors, marker=marker)
 
-        for point in self.__points:
+        for point in points:
             if point.label is not None:
                 PlottyFigure.add_annotation(
                     axes,
                     point.x,
                     point.y,
                     point.label
-                )
-
-        return self.__points
\ No newline at end of file
+                )
\ No newline at end of file
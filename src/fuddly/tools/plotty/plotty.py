@@ -20,6 +20,8 @@ from fuddly.tools.plotty.utils import print_error, print_warning
 
 x_type = None
 y_type = None
+# per table, rowid of the last row retrieved in incremental mode
+last_seen: dict[str, int] = {}
 
 def get_points(
         database: PlottyDatabase,
@@ -28,52 +30,68 @@ def get_points(
         ids_column_name: str,
         column_names: str,
         annotation_column_names: list[str],
-        is_typing_reference: bool
+        is_typing_reference: bool,
+        incremental: bool = False
 ) -> Optional[list[PlottyPoint]]:
 
-    data = database.request(
-        table_name,
-        data_ids,
-        ids_column_name,
-        column_names
-    )
+    if incremental:
+        answer = database.request_new(
+            table_name,
+            data_ids,
+            ids_column_name,
+            column_names + (annotation_column_names or []),
+            last_seen.get(table_name, 0)
+        )
+        if answer is None:
+            return None
+        data, last_seen[table_name] = answer
+    else:
+        data = database.request(
+            table_name,
+            data_ids,
+            ids_column_name,
+            column_names
+        )
+
+    if data is None:
+        return None
 
     if is_typing_reference:
         global x_type
+        x_type = None
         if len(PlottyOptions.formula.x_expression.variable_names) == 1:
             column_name = tuple(PlottyOptions.formula.x_expression.variable_names)[0]
-            column_index = column_names.index(column_name)
-            x_type = type(data[0][column_index])
+            column = data[column_name]
+            x_type = type(column[0]) if len(column) != 0 else None
         global y_type
         y_type = None
         if len(PlottyOptions.formula.y_expression.variable_names) == 1:
             column_name = tuple(PlottyOptions.formula.y_expression.variable_names)[0]
-            column_index = column_names.index(column_name)
-            y_type = type(data[0][column_index])
+            column = data[column_name]
+            y_type = type(column[0]) if len(column) != 0 else None
 
-    if data is None:
-        return None
-    
-    points_coordinates = []
-    for entry in data:
-        instanciation = \
-        {
-            (column_names[i] if column_names[i] != PlottyGlobals.async_data_id_column_name else PlottyGlobals.data_id_column_name)
-            : entry[i] for i in range(len(column_names))
-        }
-        points_coordinates.append(PlottyOptions.formula.evaluate(instanciation))
+    columns = {
+        (name if name != PlottyGlobals.async_data_id_column_name else PlottyGlobals.data_id_column_name)
+        : data[name] for name in column_names
+    }
+    x_values, y_values = PlottyOptions.formula.evaluate_columns(columns)
+    points_coordinates = zip(x_values.tolist(), y_values.tolist())
 
     annotations = None
     if annotation_column_names is not None and len(annotation_column_names) != 0:
-        all_annotations = database.request(
-            table_name,
-            data_ids,
-            ids_column_name,
-            annotation_column_names
-        )
-        annotations = []
-        for raw_annotation in all_annotations:
-            annotations.append('\n'.join([str(value) for value in raw_annotation]))
+        if incremental:
+            all_annotations = data
+        else:
+            all_annotations = database.request(
+                table_name,
+                data_ids,
+                ids_column_name,
+                annotation_column_names
+            )
+        annotations = [
+            '\n'.join([str(value) for value in raw_annotation])
+            for raw_annotation in zip(*(all_annotations[name] for name in annotation_column_names))
+        ]
     
     points = []
     for i, coord in enumerate(points_coordinates):
@@ -89,13 +107,13 @@ def get_points(
 
 
 
-def create_figure_area(
+def get_area_points(
         database: PlottyDatabase,
         data_ids: list[range],
-        area_index: int,
-        is_typing_reference: bool
-) -> tuple[PlottyFigureArea, PlottyFigureArea]:
-    
+        is_typing_reference: bool,
+        incremental: bool = False
+) -> tuple[list[PlottyPoint], Optional[list[PlottyPoint]]]:
+
     column_names = PlottyOptions.formula.variable_names.copy()
     data_points = get_points(
         database, 
@@ -104,40 +122,63 @@ def create_figure_area(
         PlottyGlobals.data_id_column_name,
         column_names,
         PlottyOptions.annotations,
-        is_typing_reference
+        is_typing_reference,
+        incremental
     )
     
     if data_points is None:
         print_error('Given formula contains unknown variable names')
         sys.exit(PlottyGlobals.ERR_INVALID_VAR_NAMES)
 
-    data_geometry = PlottyCurve(data_points)
-    area = PlottyFigureArea(data_geometry, area_index)
-
     compatible_async = database.has_columns(
         PlottyGlobals.async_data_table_name, 
         PlottyOptions.formula.variable_names
     )
 
-    if compatible_async:
-        for i in range(len(column_names)):
-            if column_names[i] == PlottyGlobals.data_id_column_name:
-                column_names[i] = PlottyGlobals.async_data_id_column_name
+    if not compatible_async:
+        return data_points, None
 
-        async_data_points = get_points(
-            database,
-            PlottyGlobals.async_data_table_name,
-            data_ids,
-            PlottyGlobals.async_data_id_column_name,
-            column_names,
-            PlottyOptions.async_annotations,
-            False
-        )
+    for i in range(len(column_names)):
+        if column_names[i] == PlottyGlobals.data_id_column_name:
+            column_names[i] = PlottyGlobals.async_data_id_column_name
+
+    async_data_points = get_points(
+        database,
+        PlottyGlobals.async_data_table_name,
+        data_ids,
+        PlottyGlobals.async_data_id_column_name,
+        column_names,
+        PlottyOptions.async_annotations,
+        False,
+        incremental
+    )
+
+    for point in async_data_points:
+        point.color = PlottyGlobals.async_color
+        point.marker = PlottyGlobals.async_marker
 
-        for point in async_data_points:
-            point.color = PlottyGlobals.async_color
-            point.marker = PlottyGlobals.async_marker
+    return data_points, async_data_points
 
+
+def create_figure_area(
+        database: PlottyDatabase,
+        data_ids: list[range],
+        area_index: int,
+        is_typing_reference: bool,
+        incremental: bool = False
+) -> PlottyFigureArea:
+
+    data_points, async_data_points = get_area_points(
+        database,
+        data_ids,
+        is_typing_reference,
+        incremental
+    )
+
+    data_geometry = PlottyCurve(data_points)
+    area = PlottyFigureArea(data_geometry, area_index)
+
+    if async_data_points is not None:
         async_data_geometry = PlottyPointCloud(async_data_points)
         area.add_geometry(async_data_geometry)
     else:
@@ -148,15 +189,38 @@ def create_figure_area(
     return area
 
 
+def follow(figure: PlottyFigure, area: PlottyFigureArea):
+    """
+    Append to the figure the data recorded in the fmkDB since the last update, until
+    the figure is closed
+    """
+
+    def update() -> bool:
+        data_points, async_data_points = get_area_points(
+            PlottyOptions.fmkdb[0],
+            PlottyOptions.data_ids,
+            False,
+            incremental=True
+        )
+        if len(data_points) == 0 and not async_data_points:
+            return False
+        figure.extend_area(area, data_points, [async_data_points or []])
+        return True
+
+    figure.follow(update, PlottyOptions.follow)
+
+
 def main():
     arguments.setup_parser()
     arguments.parse_arguments()
 
+    incremental = PlottyOptions.follow is not None
     main_area = create_figure_area(
         PlottyOptions.fmkdb[0],
         PlottyOptions.data_ids,
         0,
-        True
+        True,
+        incremental
     )
     figure = PlottyFigure(main_area)
     figure.x_type = x_type
@@ -172,7 +236,10 @@ def main():
         figure.add_area(area)
 
     figure.plot_areas()
-    figure.show()
+    if incremental:
+        follow(figure, main_area)
+    else:
+        figure.show()
 
 
 if __name__ == "__main__":